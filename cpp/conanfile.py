@@ -5,12 +5,17 @@ class LogliteConan(ConanFile):
     name = "loglite"
     settings = "os", "arch", "compiler", "build_type"
     generators = "CMakeDeps", "CMakeToolchain"
-    options = {"with_tests": [True, False], "with_python": [True, False]}
+    options = {
+        "with_tests": [True, False],
+        "with_python": [True, False],
+        "with_zmq": [True, False],
+    }
     default_options = {
         "boost/*:header_only": True,
         "date/*:tz_db": "system",
         "with_tests": True,
         "with_python": False,
+        "with_zmq": True,
     }
 
     def requirements(self):
@@ -37,6 +42,10 @@ class LogliteConan(ConanFile):
         self.requires("yaml-cpp/0.9.0")
         self.requires("date/3.0.4")
         self.requires("fmt/12.1.0")
+        self.requires("zstd/1.5.7")
+
+        if self.options.with_zmq:
+            self.requires("zeromq/4.3.5")
 
         if self.options.with_tests:
             self.requires("gtest/1.17.0")
@@ -0,0 +1,199 @@
+#include "admission.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <functional>
+#include <utility>
+
+namespace loglite {
+
+namespace {
+
+constexpr std::string_view kOtherSource = "(other)";
+
+// String form of a field for matching and source keys; missing fields are "".
+std::string field_text(const nlohmann::json& entry, const std::string& field) {
+    auto it = entry.find(field);
+    if (it == entry.end() || it->is_null()) return {};
+    return it->is_string() ? it->get<std::string>() : it->dump();
+}
+
+}  // namespace
+
+AdmissionController::AdmissionController(AdmissionConfig cfg) : cfg_(std::move(cfg)) {}
+
+int AdmissionController::match_rule(const nlohmann::json& entry) const {
+    for (std::size_t i = 0; i < cfg_.rules.size(); ++i) {
+        const bool matches = std::ranges::all_of(cfg_.rules[i].match, [&](const auto& kv) {
+            if (kv.second == "*") return entry.contains(kv.first);
+            return field_text(entry, kv.first) == kv.second;
+        });
+        if (matches) return static_cast<int>(i);
+    }
+    return -1;
+}
+
+AdmissionController::Source& AdmissionController::source_for(const nlohmann::json& entry,
+                                                             int rule) {
+    std::string key = std::to_string(rule);
+    for (const auto& field : cfg_.key_fields) {
+        key += '\x1f';
+        key += field_text(entry, field);
+    }
+
+    auto it = sources_.find(key);
+    if (it != sources_.end()) return it->second;
+
+    nlohmann::json labels = nlohmann::json::object();
+    if (sources_.size() >= kMaxSources) {
+        key = std::to_string(rule) + '\x1e';
+        if (auto other = sources_.find(key); other != sources_.end()) return other->second;
+        labels["source"] = kOtherSource;
+    } else {
+        for (const auto& field : cfg_.key_fields) labels[field] = field_text(entry, field);
+    }
+
+    Source src;
+    src.labels = std::move(labels);
+    src.rule = rule;
+    src.tokens = capacity(rule);
+    src.refilled_at = Clock::now();
+    return sources_.emplace(std::move(key), std::move(src)).first->second;
+}
+
+double AdmissionController::capacity(int rule) const {
+    if (rule < 0) return 0.0;
+    const auto& r = cfg_.rules[rule];
+    return static_cast<double>(r.burst > 0 ? r.burst : std::max(r.rate, 1));
+}
+
+void AdmissionController::refill(Source& src, Clock::time_point now) const {
+    if (src.rule < 0) return;
+    const auto rate = cfg_.rules[src.rule].rate;
+    if (now <= src.refilled_at) return;
+    const double elapsed = std::chrono::duration<double>(now - src.refilled_at).count();
+    src.tokens = std::min(capacity(src.rule), src.tokens + elapsed * rate);
+    src.refilled_at = now;
+}
+
+bool AdmissionController::keep_sample(int rule) {
+    if (rule < 0) return true;
+    const double p = cfg_.rules[rule].sample_rate;
+    if (p >= 1.0) return true;
+    return std::uniform_real_distribution<double>{0.0, 1.0}(rng_) < p;
+}
+
+AdmissionDecision AdmissionController::Admit(const nlohmann::json& entry) {
+    if (!cfg_.enabled) return AdmissionDecision::kAdmit;
+
+    std::lock_guard lk(mtx_);
+    const int rule = match_rule(entry);
+    auto& src = source_for(entry, rule);
+
+    if (!keep_sample(rule)) {
+        ++src.sampled;
+        return AdmissionDecision::kSample;
+    }
+    if (rule >= 0 && cfg_.rules[rule].rate > 0) {
+        refill(src, Clock::now());
+        if (src.tokens < 1.0) {
+            ++src.rejected;
+            return AdmissionDecision::kReject;
+        }
+        src.tokens -= 1.0;
+    }
+    ++src.admitted;
+    return AdmissionDecision::kAdmit;
+}
+
+AdmissionResult AdmissionController::AdmitBatch(std::vector<nlohmann::json>& entries) {
+    AdmissionResult result;
+    if (!cfg_.enabled) {
+        result.admitted = entries.size();
+        return result;
+    }
+
+    std::lock_guard lk(mtx_);
+    const auto now = Clock::now();
+
+    // Sample first; remember which source each entry charges.  Counters are only
+    // updated once the batch's outcome is known: a rejected batch is retried whole,
+    // so its sampling decisions are not final.
+    std::vector<Source*> sources;
+    std::vector<bool> keep;
+    sources.reserve(entries.size());
+    keep.reserve(entries.size());
+    for (const auto& entry : entries) {
+        const int rule = match_rule(entry);
+        sources.push_back(&source_for(entry, rule));
+        keep.push_back(keep_sample(rule));
+    }
+
+    // Tokens needed per rate-limited source.
+    std::unordered_map<Source*, double> need;
+    for (std::size_t i = 0; i < entries.size(); ++i) {
+        auto* src = sources[i];
+        if (keep[i] && src->rule >= 0 && cfg_.rules[src->rule].rate > 0) need[src] += 1.0;
+    }
+
+    double wait_s = 0.0;
+    for (auto& [src, n] : need) {
+        refill(*src, now);
+        const double required = std::min(n, capacity(src->rule));
+        if (src->tokens < required) {
+            // Only the sources short of tokens count the rejection.
+            src->rejected += static_cast<int64_t>(n);
+            wait_s = std::max(wait_s, (required - src->tokens) / cfg_.rules[src->rule].rate);
+        }
+    }
+
+    if (wait_s > 0.0) {
+        result.rejected = entries.size();
+        result.retry_after = std::chrono::seconds{
+            std::max<int64_t>(1, static_cast<int64_t>(std::ceil(wait_s)))};
+        entries.clear();
+        return result;
+    }
+
+    for (auto& [src, n] : need) src->tokens -= n;
+    std::vector<nlohmann::json> kept;
+    kept.reserve(entries.size());
+    for (std::size_t i = 0; i < entries.size(); ++i) {
+        if (keep[i]) {
+            ++sources[i]->admitted;
+            kept.push_back(std::move(entries[i]));
+        } else {
+            ++sources[i]->sampled;
+            ++result.sampled;
+        }
+    }
+    result.admitted = kept.size();
+    entries = std::move(kept);
+    return result;
+}
+
+nlohmann::json AdmissionController::ToJSON() const {
+    nlohmann::json sources = nlohmann::json::array();
+    if (cfg_.enabled) {
+        std::lock_guard lk(mtx_);
+        std::vector<const Source*> ordered;
+        for (const auto& [_, src] : sources_) ordered.push_back(&src);
+        // Busiest sources first.
+        std::ranges::sort(ordered, std::greater<>{}, [](const Source* s) {
+            return s->admitted + s->sampled + s->rejected;
+        });
+        for (const auto* p : ordered) {
+            const auto& src = *p;
+            sources.push_back({
+                {"source", src.labels},
+                {"rule", src.rule >= 0 ? nlohmann::json(src.rule) : nlohmann::json(nullptr)},
+                {"admitted", src.admitted},
+                {"sampled", src.sampled},
+                {"rejected", src.rejected},
+            });
+        }
+    }
+    return {{"enabled", cfg_.enabled}, {"sources", std::move(sources)}};
+}
+
+}  // namespace loglite
@@ -0,0 +1,92 @@
+#ifndef LOGLITE_ADMISSION_HPP_
+#define LOGLITE_ADMISSION_HPP_
+
+#include "types.hpp"
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <mutex>
+#include <random>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+// ── Admission control ─────────────────────────────────────────────────────────
+//
+// Decides, before an entry reaches the Backlog, whether it is kept.  A "source"
+// is the tuple of AdmissionConfig::key_fields values of an entry (by default
+// service and level).  The first AdmissionRule whose `match` fits the entry
+// applies; entries matching no rule are always admitted.
+//
+//   1. Sampling: the entry is kept with probability `sample_rate`.  Sampled-out
+//      entries are dropped silently (they are not an error for the client).
+//   2. Rate limit: each (rule, source) pair owns a token bucket refilled at
+//      `rate` entries/s up to `burst`.  An entry without a token is rejected.
+//
+// A bucket that is full always admits a request, even one larger than the bucket
+// (it goes into debt), so oversized batches are delayed rather than refused
+// forever.  Distinct sources are capped at kMaxSources; later ones share a
+// single "(other)" source.
+
+enum class AdmissionDecision { kAdmit, kSample, kReject };
+
+struct AdmissionResult {
+    std::size_t admitted{};
+    std::size_t sampled{};
+    std::size_t rejected{};
+    std::chrono::seconds retry_after{};  // > 0 when rejected
+};
+
+class AdmissionController {
+   public:
+    static constexpr std::size_t kMaxSources = 1000;
+
+    explicit AdmissionController(AdmissionConfig cfg);
+
+    [[nodiscard]] bool Enabled() const noexcept { return cfg_.enabled; }
+
+    // Single entry, for harvesters and push_to_backlog: nothing to retry.
+    AdmissionDecision Admit(const nlohmann::json& entry);
+
+    // All-or-nothing for one HTTP request: sampled-out entries are removed from
+    // `entries`; if any source is over budget, the whole batch is rejected and
+    // `entries` is cleared, so the client can retry it.  A rejected batch only
+    // counts `rejected` for the over-budget sources, and no sampling.
+    AdmissionResult AdmitBatch(std::vector<nlohmann::json>& entries);
+
+    // Per-source admitted/sampled/rejected counters, as reported by GET /stats.
+    [[nodiscard]] nlohmann::json ToJSON() const;
+
+   private:
+    using Clock = std::chrono::steady_clock;
+
+    struct Source {
+        nlohmann::json labels;
+        int rule{-1};
+        double tokens{};
+        Clock::time_point refilled_at{};
+        int64_t admitted{};
+        int64_t sampled{};
+        int64_t rejected{};
+    };
+
+    [[nodiscard]] int match_rule(const nlohmann::json& entry) const;
+    Source& source_for(const nlohmann::json& entry, int rule);
+    [[nodiscard]] double capacity(int rule) const;
+    void refill(Source& src, Clock::time_point now) const;
+    bool keep_sample(int rule);
+
+    AdmissionConfig cfg_;
+    mutable std::mutex mtx_;
+    std::unordered_map<std::string, Source> sources_;
+    std::mt19937_64 rng_{std::random_device{}()};
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_ADMISSION_HPP_
@@ -5,14 +5,25 @@
 #include "context.hpp"
 #include "harvesters/base.hpp"
 #include "harvesters/file.hpp"
+#include "harvesters/ring.hpp"
+#ifdef LOGLITE_WITH_ZMQ
+#include "harvesters/zmq.hpp"
+#endif
 #include "log.hpp"
 #include "metrics.hpp"
 #include "migrations.hpp"
 #include "server.hpp"
+#include "shards.hpp"
+#include "snapshot.hpp"
 
+#include <algorithm>
 #include <atomic>
 #include <chrono>
+#include <deque>
 #include <memory>
+#include <set>
+#include <stdexcept>
+#include <string>
 #include <vector>
 
 namespace loglite {
@@ -24,27 +35,98 @@ namespace {
 // Module-level state set during RunServer so PushToBacklog / StopServer work.
 // Protected by the guarantee that only one server runs per process.
 Backlog* g_backlog{nullptr};
+AdmissionController* g_admission{nullptr};
 Server* g_server{nullptr};
 
+bool IsFileHarvesterType(std::string_view type) {
+    return type == "loglite.harvesters.FileHarvester" || type == "FileHarvester";
+}
+
+bool IsZmqHarvesterType(std::string_view type) {
+#ifdef LOGLITE_WITH_ZMQ
+    return type == "loglite.harvesters.ZMQHarvester" || type == "ZMQHarvester";
+#else
+    return false;
+#endif
+}
+
+bool IsNativeHarvesterType(std::string_view type) {
+    return IsFileHarvesterType(type) || IsZmqHarvesterType(type);
+}
+
+std::unique_ptr<harvesters::Harvester> BuildNativeHarvester(const Config::HarvesterDef& hdef,
+                                                            Backlog& backlog) {
+    if (IsFileHarvesterType(hdef.type)) {
+        auto it = hdef.config.find("path");
+        if (it == hdef.config.end()) {
+            log::WARN("FileHarvester '{}': missing 'path' config", hdef.name);
+            return nullptr;
+        }
+        return std::make_unique<harvesters::FileHarvester>(hdef.name, it->second, backlog);
+    }
+
+#ifdef LOGLITE_WITH_ZMQ
+    auto it = hdef.config.find("endpoint");
+    if (it == hdef.config.end() || it->second.empty()) {
+        log::WARN("ZMQHarvester '{}': missing 'endpoint' config", hdef.name);
+        return nullptr;
+    }
+    try {
+        return std::make_unique<harvesters::ZmqHarvester>(
+            hdef.name, it->second, backlog, harvesters::ZmqHarvester::ParseOptions(hdef.config));
+    } catch (const std::invalid_argument& e) {
+        log::WARN("ZMQHarvester '{}': {}", hdef.name, e.what());
+    }
+#endif
+    return nullptr;
+}
+
 std::vector<std::unique_ptr<harvesters::Harvester>> BuildNativeHarvesters(const Config& cfg,
                                                                           Backlog& backlog) {
     std::vector<std::unique_ptr<harvesters::Harvester>> harvesters;
+    std::set<std::string> workers;
     for (const auto& hdef : cfg.harvesters) {
-        if (hdef.type == "loglite.harvesters.FileHarvester" || hdef.type == "FileHarvester") {
-            auto it = hdef.config.find("path");
-            if (it == hdef.config.end()) {
-                log::WARN("FileHarvester '{}': missing 'path' config", hdef.name);
-                continue;
+        if (IsNativeHarvesterType(hdef.type)) {
+            if (!hdef.worker.empty()) {
+                log::WARN("Harvester '{}' runs in the server process; ignoring worker '{}'",
+                          hdef.name, hdef.worker);
             }
-            harvesters.push_back(
-                std::make_unique<harvesters::FileHarvester>(hdef.name, it->second, backlog));
+            if (auto harvester = BuildNativeHarvester(hdef, backlog)) {
+                harvesters.push_back(std::move(harvester));
+            }
+        } else if (!hdef.worker.empty()) {
+            workers.insert(hdef.worker);
         } else {
             log::WARN("Unknown harvester type '{}', skipping", hdef.type);
         }
     }
+
+    // One ring per Python worker process; the process itself is started by the CLI.
+    for (const auto& worker : workers) {
+        harvesters.push_back(std::make_unique<harvesters::RingHarvester>(
+            worker, static_cast<std::size_t>(cfg.harvester_ring_size_bytes), backlog));
+    }
     return harvesters;
 }
 
+// Shards 1..N-1 of a sharded server: each owns its database file, backlog and
+// writer thread.  Shard 0 is RunServer's own database (see LogShard).
+struct ExtraShard {
+    ExtraShard(Config shard_cfg, std::size_t backlog_size)
+        : cfg(std::move(shard_cfg)), db_write(cfg), backlog(backlog_size) {
+        db_write.Open();
+        db_write.Initialize();
+        db_read = std::make_unique<ReadDatabasePool>(cfg, db_write.catalog(),
+                                                     cfg.resolve_pool_size());
+    }
+
+    Config cfg;
+    WriterDatabase db_write;
+    std::unique_ptr<ReadDatabasePool> db_read;
+    Backlog backlog;
+    asio::thread_pool write_pool{1u};
+};
+
 }  // namespace
 
 void RunServer(const std::filesystem::path& config_path) {
@@ -58,13 +140,36 @@ void RunServer(const std::filesystem::path& config_path) {
 
     ReadDatabasePool db_read(cfg, db_write.catalog(), cfg.resolve_pool_size());
 
+    // Opt-in sharded writers: one more database file, backlog and writer per shard.
+    const auto shard_count = static_cast<std::size_t>(cfg.shards.count);
+    const auto backlog_size = static_cast<size_t>(cfg.task_backlog_max_size);
+    std::deque<ExtraShard> extra_shards;
+    for (std::size_t i = 1; i < shard_count; ++i) {
+        extra_shards.emplace_back(cfg.ForShard(static_cast<int>(i)), backlog_size);
+    }
+
     // Init server context
-    Backlog backlog{static_cast<size_t>(cfg.task_backlog_max_size)};
-    LogNotifier notifier;
+    Backlog backlog{backlog_size};
+    LogNotifier notifier{shard_count};
     notifier.Notify(db_write.GetMaxLogId());
+    if (shard_count > 1) {
+        // Ids continue above the highest id of any shard, interleaved between shards.
+        int64_t floor = db_write.GetMaxLogId();
+        for (const auto& shard : extra_shards) {
+            floor = std::max(floor, shard.db_write.GetMaxLogId());
+        }
+        db_write.SetIdStride(static_cast<int64_t>(shard_count), 0, floor);
+        for (std::size_t i = 1; i < shard_count; ++i) {
+            auto& db = extra_shards[i - 1].db_write;
+            db.SetIdStride(static_cast<int64_t>(shard_count), static_cast<int64_t>(i), floor);
+            notifier.Notify(db.GetMaxLogId(), i);
+        }
+        log::INFO("Sharded writers: {} databases routed by '{}'", shard_count, cfg.shards.key);
+    }
 
     asio::thread_pool db_write_pool{1u};
     asio::thread_pool db_read_pool{cfg.resolve_pool_size()};
+    asio::thread_pool encode_pool{shard_count};
     const auto server_started_at = std::chrono::steady_clock::now();
     ServerContext ctx{cfg,
                       db_write,
@@ -73,13 +178,28 @@ void RunServer(const std::filesystem::path& config_path) {
                       notifier,
                       asio::make_strand(db_write_pool.get_executor()),
                       db_read_pool.get_executor(),
+                      encode_pool.get_executor(),
                       server_started_at};
 
+    if (shard_count > 1) {
+        std::vector<Backlog*> backlogs{&backlog};
+        for (auto& shard : extra_shards) {
+            ctx.AddShard(shard.db_write, *shard.db_read, shard.backlog,
+                         asio::make_strand(shard.write_pool.get_executor()));
+            backlogs.push_back(&shard.backlog);
+        }
+        backlog.RouteTo(std::move(backlogs),
+                        [router = ShardRouter{shard_count, cfg.shards.key}](
+                            const nlohmann::json& entry) { return router.ShardOf(entry); });
+    }
+
     g_backlog = &backlog;
+    g_admission = &ctx.admission;
 
     // Start harvesters
     auto native = BuildNativeHarvesters(cfg, backlog);
     for (const auto& harvester : native) {
+        harvester->SetAdmission(&ctx.admission);
         harvester->Start();
     }
 
@@ -94,6 +214,7 @@ void RunServer(const std::filesystem::path& config_path) {
     ctx.RequestStop();
     g_server = nullptr;
     g_backlog = nullptr;
+    g_admission = nullptr;
 
     for (const auto& harvester : native) {
         harvester->Stop();
@@ -101,33 +222,56 @@ void RunServer(const std::filesystem::path& config_path) {
 
     db_write_pool.stop();
     db_read_pool.stop();
+    encode_pool.stop();
+    for (auto& shard : extra_shards) shard.write_pool.stop();
     db_write_pool.join();
     db_read_pool.join();
+    encode_pool.join();
+    for (auto& shard : extra_shards) shard.write_pool.join();
 
     db_read.Close();
     db_write.Close();
+    for (auto& shard : extra_shards) {
+        shard.db_read->Close();
+        shard.db_write.Close();
+    }
 }
 
 void StopServer() {
     if (g_server) g_server->Stop();
 }
 
+std::vector<std::string> NativeHarvesterTypes() {
+    std::vector<std::string> types{"FileHarvester", "loglite.harvesters.FileHarvester"};
+#ifdef LOGLITE_WITH_ZMQ
+    types.insert(types.end(), {"ZMQHarvester", "loglite.harvesters.ZMQHarvester"});
+#endif
+    return types;
+}
+
 void PushToBacklog(nlohmann::json entry) {
-    if (g_backlog) g_backlog->Add(std::move(entry));
+    if (!g_backlog) return;
+    if (g_admission && g_admission->Admit(entry) != AdmissionDecision::kAdmit) return;
+    g_backlog->Add(std::move(entry));
 }
 
 // ── Migrations ────────────────────────────────────────────────────────────────
 
+// With sharded writers, every shard's database file is migrated.
+
 void Rollout(const std::filesystem::path& config_path, int start_version) {
     auto cfg = Config::from_file(config_path);
     cfg.auto_rollout = false;
 
-    WriterDatabase db{cfg};
-    db.Open();
-    db.CreateInternalTables();
-    MigrationManager mgr{db, cfg.migrations};
-    if (!mgr.ApplyPendingMigrations(start_version)) {
-        log::INFO("No pending migrations to apply.");
+    for (int i = 0; i < cfg.shards.count; ++i) {
+        const auto shard_cfg = cfg.ForShard(i);
+        WriterDatabase db{shard_cfg};
+        db.Open();
+        db.CreateInternalTables();
+        MigrationManager mgr{db, shard_cfg.migrations};
+        if (!mgr.ApplyPendingMigrations(start_version)) {
+            log::INFO("No pending migrations to apply to {}.", shard_cfg.db_path.string());
+        }
     }
 }
 
@@ -135,11 +279,43 @@ void Rollback(const std::filesystem::path& config_path, int version, bool force)
     auto cfg = Config::from_file(config_path);
     cfg.auto_rollout = false;
 
-    WriterDatabase db{cfg};
-    db.Open();
-    db.CreateInternalTables();
-    MigrationManager mgr{db, cfg.migrations};
-    mgr.RollbackMigration(version, force);
+    for (int i = 0; i < cfg.shards.count; ++i) {
+        const auto shard_cfg = cfg.ForShard(i);
+        WriterDatabase db{shard_cfg};
+        db.Open();
+        db.CreateInternalTables();
+        MigrationManager mgr{db, shard_cfg.migrations};
+        mgr.RollbackMigration(version, force);
+    }
+}
+
+// ── Snapshots ─────────────────────────────────────────────────────────────────
+
+std::filesystem::path Snapshot(const std::filesystem::path& config_path,
+                               const std::filesystem::path& output) {
+    auto cfg = Config::from_file(config_path);
+    if (cfg.shards.count > 1) {
+        throw std::runtime_error("Snapshots are not supported with sharded writers");
+    }
+    auto dest = output.empty()
+                    ? cfg.snapshot_dir / SnapshotFileName(std::chrono::system_clock::now())
+                    : output;
+
+    log::INFO("Writing snapshot of {} to {}", cfg.db_path.string(), dest.string());
+    int reported = -1;
+    SnapshotDatabaseFile(cfg.db_path, dest, cfg.snapshot_step_pages,
+                         [&](const BackupProgress& p) {
+                             if (p.page_count == 0) return;
+                             int pct = 100 * (p.page_count - p.remaining) / p.page_count;
+                             if (pct / 10 == reported / 10) return;
+                             reported = pct;
+                             log::INFO("Snapshot progress: {}% ({}/{} pages)", pct,
+                                       p.page_count - p.remaining, p.page_count);
+                         });
+
+    if (output.empty()) PruneSnapshots(cfg.snapshot_dir, cfg.snapshot_keep);
+    log::INFO("Snapshot written to {}", dest.string());
+    return dest;
 }
 
 }  // namespace loglite
@@ -3,6 +3,8 @@
 
 #include <filesystem>
 #include <nlohmann/json.hpp>
+#include <string>
+#include <vector>
 
 namespace loglite {
 
@@ -22,13 +24,30 @@ void StopServer();
 void Rollout(const std::filesystem::path& config_path, int start_version = -1);
 void Rollback(const std::filesystem::path& config_path, int version, bool force = false);
 
+// ── Snapshots ─────────────────────────────────────────────────────────────────
+//
+// Copy the database to `output` (default: a new file in <sqlite_dir>/snapshots)
+// through a separate read-only connection.  Safe while a server is running;
+// returns the path written.
+
+std::filesystem::path Snapshot(const std::filesystem::path& config_path,
+                               const std::filesystem::path& output = {});
+
 // ── Backlog ───────────────────────────────────────────────────────────────────
 //
-// Thread-safe push into the active server's backlog.  Must only be called
-// after RunServer() has started (i.e. from a harvester thread).
+// Thread-safe push into the active server's backlog, subject to the server's
+// admission control.  Must only be called after RunServer() has started (i.e.
+// from a harvester thread).
 
 void PushToBacklog(nlohmann::json entry);
 
+// ── Harvesters ────────────────────────────────────────────────────────────────
+//
+// Harvester `type` names the server runs natively; the Python harvester manager
+// skips these.  ZMQHarvester is only listed when built with ZeroMQ.
+
+std::vector<std::string> NativeHarvesterTypes();
+
 }  // namespace loglite
 
 #endif  // LOGLITE_API_HPP_
@@ -1,46 +1,163 @@
 #include "backlog.hpp"
 #include "metrics.hpp"
 
+#include <algorithm>
+#include <iterator>
 #include <utility>
 
 namespace loglite {
 
-Backlog::Backlog(size_t max_size) : max_size_(max_size) {}
+Backlog::Backlog(size_t max_size) : max_size_(max_size), threshold_(max_size) {}
 
 void Backlog::Add(nlohmann::json log) {
+    if (pick_) {
+        if (auto shard = pick_(log); shard != 0) {
+            shards_[shard]->add_local(std::move(log));
+            return;
+        }
+    }
+    add_local(std::move(log));
+}
+
+void Backlog::add_local(nlohmann::json log) {
     bool dropped = false;
+    bool signal = false;
     {
         std::lock_guard<std::mutex> lk(mtx_);
         if (queue_.size() >= max_size_) {
             queue_.pop_front();
             dropped = true;
         }
+        if (queue_.empty()) {
+            oldest_at_ = Clock::now();
+            signal = true;
+        }
         queue_.push_back(std::move(log));
 
-        // Notify flush when the buffer is near full to avoid dropping logs.
-        if (queue_.size() >= max_size_ * 0.95) {
+        // Notify flush when the batch is ready or the buffer is near full.
+        if (!is_full_.load(std::memory_order_relaxed) && reached_threshold()) {
             is_full_.store(true, std::memory_order_release);
+            signal = true;
         }
+        if (signal) wake();
     }
+    total_added_.fetch_add(1, std::memory_order_relaxed);
     if (dropped) {
         metrics::MetricsRegistry::Instance().Collect(metrics::kBacklogDrop);
     }
 }
 
-std::vector<nlohmann::json> Backlog::Flush() {
+void Backlog::AddBatch(std::vector<nlohmann::json> logs) {
+    if (!pick_) {
+        add_batch_local(std::move(logs));
+        return;
+    }
+    std::vector<std::vector<nlohmann::json>> parts(shards_.size());
+    for (auto& log : logs) {
+        auto shard = pick_(log);
+        parts[shard].push_back(std::move(log));
+    }
+    for (std::size_t i = 0; i < parts.size(); ++i) shards_[i]->add_batch_local(std::move(parts[i]));
+}
+
+void Backlog::add_batch_local(std::vector<nlohmann::json> logs) {
+    if (logs.empty()) return;
+    int64_t dropped = 0;
+    bool signal = false;
+    {
+        std::lock_guard<std::mutex> lk(mtx_);
+        if (queue_.empty()) {
+            oldest_at_ = Clock::now();
+            signal = true;
+        }
+        for (auto& log : logs) {
+            if (queue_.size() >= max_size_) {
+                queue_.pop_front();
+                ++dropped;
+            }
+            queue_.push_back(std::move(log));
+        }
+
+        if (!is_full_.load(std::memory_order_relaxed) && reached_threshold()) {
+            is_full_.store(true, std::memory_order_release);
+            signal = true;
+        }
+        if (signal) wake();
+    }
+    total_added_.fetch_add(logs.size(), std::memory_order_relaxed);
+    if (dropped > 0) {
+        metrics::MetricsRegistry::Instance().Collect(metrics::kBacklogDrop, 0.0, dropped);
+    }
+}
+
+std::vector<nlohmann::json> Backlog::Flush(size_t max_rows) {
     std::lock_guard lk(mtx_);
-    is_full_.store(false, std::memory_order_relaxed);
+    const auto n = static_cast<std::ptrdiff_t>(std::min(max_rows, queue_.size()));
     std::vector<nlohmann::json> out(std::make_move_iterator(queue_.begin()),
-                                    std::make_move_iterator(queue_.end()));
-    queue_.clear();
+                                    std::make_move_iterator(queue_.begin() + n));
+    queue_.erase(queue_.begin(), queue_.begin() + n);
+
+    // Arrival times are not kept per entry; leftovers count as having just arrived.
+    if (queue_.empty())
+        oldest_at_.reset();
+    else
+        oldest_at_ = Clock::now();
+    is_full_.store(reached_threshold(), std::memory_order_relaxed);
     return out;
 }
 
 bool Backlog::IsFull() const noexcept { return is_full_.load(std::memory_order_acquire); }
 
+bool Backlog::NearCapacity() const {
+    {
+        std::lock_guard lk(mtx_);
+        if (past_watermark()) return true;
+    }
+    return std::ranges::any_of(shards_, [this](const Backlog* shard) {
+        return shard != this && shard->NearCapacity();
+    });
+}
+
 size_t Backlog::Size() const {
     std::lock_guard lk(mtx_);
     return queue_.size();
 }
 
+uint64_t Backlog::TotalAdded() const noexcept {
+    return total_added_.load(std::memory_order_relaxed);
+}
+
+std::optional<Backlog::Clock::time_point> Backlog::OldestAt() const {
+    std::lock_guard lk(mtx_);
+    return oldest_at_;
+}
+
+void Backlog::SetFlushThreshold(size_t rows) {
+    std::lock_guard lk(mtx_);
+    threshold_ = std::max<size_t>(rows, 1);
+    is_full_.store(reached_threshold(), std::memory_order_release);
+}
+
+void Backlog::SetWaker(std::shared_ptr<asio::steady_timer> waker) {
+    std::lock_guard lk(mtx_);
+    waker_ = std::move(waker);
+}
+
+void Backlog::RouteTo(std::vector<Backlog*> shards,
+                      std::function<std::size_t(const nlohmann::json&)> pick) {
+    shards_ = std::move(shards);
+    pick_ = std::move(pick);
+}
+
+bool Backlog::reached_threshold() const {
+    return !queue_.empty() && (queue_.size() >= threshold_ || past_watermark());
+}
+
+bool Backlog::past_watermark() const { return queue_.size() >= max_size_ * 0.95; }
+
+void Backlog::wake() const {
+    if (!waker_) return;
+    asio::post(waker_->get_executor(), [waker = waker_] { waker->cancel(); });
+}
+
 }  // namespace loglite
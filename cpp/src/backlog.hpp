@@ -2,13 +2,22 @@
 #define LOGLITE_BACKLOG_HPP_
 
 #include <atomic>
+#include <chrono>
 #include <cstddef>
+#include <cstdint>
 #include <deque>
+#include <functional>
+#include <limits>
+#include <memory>
 #include <mutex>
+#include <optional>
 #include <vector>
 
+#include <boost/asio.hpp>
 #include <nlohmann/json.hpp>
 
+namespace asio = boost::asio;
+
 namespace loglite {
 
 // ── Backlog ────────────────────────────────────────────────────────────────────
@@ -20,28 +29,74 @@ namespace loglite {
 // inserting the new one (drop-oldest policy), so memory use is bounded
 // even if the flush task falls behind or dies.
 //
-// `IsFull()` is polled by the flush task so it can exit the periodic wait early
-// when the queue crosses a ~95% high watermark — before drop-oldest triggers
-// at the hard cap (task_backlog_max_size).
+// `IsFull()` turns true once the queue reaches the flush threshold chosen by the
+// flush task (SetFlushThreshold), and never later than a ~95% high watermark —
+// before drop-oldest triggers at the hard cap (task_backlog_max_size).
+//
+// The flush task does not poll: it registers a timer with SetWaker(), and Add()
+// cancels it (on the timer's executor) when the queue goes from empty to
+// non-empty and when it reaches the flush threshold.
+//
+// With sharded writers, producers keep adding to shard 0's backlog; RouteTo()
+// makes it forward each entry to the backlog of the shard it belongs to, each
+// drained by that shard's flush task.
 
 class Backlog {
    public:
+    using Clock = std::chrono::steady_clock;
+
     explicit Backlog(size_t max_size);
 
     void Add(nlohmann::json log);
 
-    // Move all pending entries out of the backlog in one critical section.
-    std::vector<nlohmann::json> Flush();
+    // Add() for a whole batch under one lock, waking the flush task at most once.
+    void AddBatch(std::vector<nlohmann::json> logs);
+
+    // Move up to `max_rows` of the oldest pending entries out of the backlog in
+    // one critical section.
+    std::vector<nlohmann::json> Flush(size_t max_rows = std::numeric_limits<size_t>::max());
 
     bool IsFull() const noexcept;
 
+    // Past the ~95% high watermark, where drop-oldest is imminent; producers that
+    // can wait (e.g. streaming ingest) should stop reading until it clears.  When
+    // routing, true if any shard's backlog is.
+    bool NearCapacity() const;
+
     size_t Size() const;
 
+    // Entries ever added (including dropped ones); used to measure ingest rate.
+    uint64_t TotalAdded() const noexcept;
+
+    // When the oldest pending entry arrived; nullopt if the backlog is empty.
+    std::optional<Clock::time_point> OldestAt() const;
+
+    void SetFlushThreshold(size_t rows);
+
+    void SetWaker(std::shared_ptr<asio::steady_timer> waker);
+
+    // Forwards every entry for which `pick` returns i > 0 to shards[i]; shards[0]
+    // must be this backlog.  Call before any producer starts.
+    void RouteTo(std::vector<Backlog*> shards,
+                 std::function<std::size_t(const nlohmann::json&)> pick);
+
    private:
+    void add_local(nlohmann::json log);
+    void add_batch_local(std::vector<nlohmann::json> logs);
+    bool reached_threshold() const;
+    bool past_watermark() const;
+    void wake() const;
+
     mutable std::mutex mtx_;
     std::deque<nlohmann::json> queue_;
     size_t max_size_;
+    size_t threshold_;
+    std::optional<Clock::time_point> oldest_at_;
+    std::shared_ptr<asio::steady_timer> waker_;
     std::atomic<bool> is_full_{false};
+    std::atomic<uint64_t> total_added_{0};
+    std::vector<Backlog*> shards_;
+    std::function<std::size_t(const nlohmann::json&)> pick_;
 };
 
 }  // namespace loglite
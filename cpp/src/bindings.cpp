@@ -1,9 +1,11 @@
 #include "api.hpp"
 #include "config.hpp"
+#include "shm_ring.hpp"
 
 #include <Python.h>
 
 #include <fmt/format.h>
+#include <mutex>
 #include <nlohmann/json.hpp>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
@@ -94,6 +96,26 @@ const DateTimeTypes& DatetimeTypes() {
         typ.cast<std::string>()));
 }
 
+// Producer end of a harvester worker's ring.  The ring is single-producer, so
+// pushes from threads inside the worker are serialized here.
+class HarvesterRing {
+   public:
+    explicit HarvesterRing(const std::string& name) : ring_(ShmRing::Open(name)) {}
+
+    bool Push(std::string record) {
+        std::lock_guard lk(mtx_);
+        if (ring_.TryPush(record)) return true;
+        ring_.RecordDrop();
+        return false;
+    }
+
+    [[nodiscard]] uint64_t Dropped() const { return ring_.Dropped(); }
+
+   private:
+    std::mutex mtx_;
+    ShmRing ring_;
+};
+
 }  // namespace
 
 PYBIND11_MODULE(_core, m) {
@@ -103,7 +125,8 @@ PYBIND11_MODULE(_core, m) {
     py::class_<Config::HarvesterDef>(m, "HarvesterDef")
         .def_readonly("type", &Config::HarvesterDef::type)
         .def_readonly("name", &Config::HarvesterDef::name)
-        .def_readonly("config", &Config::HarvesterDef::config);
+        .def_readonly("config", &Config::HarvesterDef::config)
+        .def_readonly("worker", &Config::HarvesterDef::worker);
 
     // ── Config ────────────────────────────────────────────────────────────────
     py::class_<Config>(m, "Config")
@@ -144,6 +167,16 @@ PYBIND11_MODULE(_core, m) {
         },
         py::arg("config_path"), py::arg("version"), py::arg("force") = false);
 
+    // ── Snapshots ─────────────────────────────────────────────────────────────
+    m.def(
+        "snapshot",
+        [](const std::string& config_path, const std::string& output) {
+            py::gil_scoped_release release;
+            return Snapshot(config_path, output).string();
+        },
+        py::arg("config_path"), py::arg("output") = "",
+        "Copy the database to a standalone file; returns the path written.");
+
     // ── Backlog ───────────────────────────────────────────────────────────────
     m.def(
         "push_to_backlog",
@@ -154,4 +187,24 @@ PYBIND11_MODULE(_core, m) {
             PushToBacklog(std::move(entry));
         },
         py::arg("log"), "Push a log entry dict into the active server backlog (thread-safe).");
+
+    // ── Harvesters ────────────────────────────────────────────────────────────
+    m.def("native_harvester_types", &NativeHarvesterTypes,
+          "Harvester type names run by the C++ core; the Python manager skips them.");
+
+    // ── Harvester worker rings ────────────────────────────────────────────────
+    m.def("harvester_ring_name", &ShmRing::NameFor, py::arg("worker"),
+          "Shared-memory ring name for harvester worker `worker` of the server in this process.");
+
+    py::class_<HarvesterRing>(m, "HarvesterRing")
+        .def(py::init<const std::string&>(), py::arg("name"))
+        .def(
+            "push",
+            [](HarvesterRing& self, const py::dict& log) {
+                auto record = PyObjectToJson(log).dump();
+                py::gil_scoped_release release;
+                return self.Push(std::move(record));
+            },
+            py::arg("log"), "Serialize a log entry into the ring; False if it was dropped.")
+        .def_property_readonly("dropped", &HarvesterRing::Dropped);
 }
@@ -0,0 +1,184 @@
+#include "columnar.hpp"
+
+#include <fmt/format.h>
+#include <nlohmann/json.hpp>
+
+#include <bit>
+#include <cstring>
+#include <stdexcept>
+
+namespace loglite {
+
+namespace {
+
+std::string_view type_name(ColumnType t) {
+    switch (t) {
+    case ColumnType::kInt64:
+        return "int64";
+    case ColumnType::kFloat64:
+        return "float64";
+    case ColumnType::kUtf8:
+        return "utf8";
+    case ColumnType::kNull:
+    default:
+        return "null";
+    }
+}
+
+// Serialise fixed-width values as little-endian bytes regardless of host order.
+template <class T>
+std::string to_le_bytes(const std::vector<T>& values) {
+    std::string out(values.size() * sizeof(T), '\0');
+    if constexpr (std::endian::native == std::endian::little) {
+        if (!values.empty()) std::memcpy(out.data(), values.data(), out.size());
+    } else {
+        for (std::size_t i = 0; i < values.size(); ++i) {
+            auto bits = std::bit_cast<std::make_unsigned_t<
+                std::conditional_t<sizeof(T) == 8, int64_t, int32_t>>>(values[i]);
+            for (std::size_t b = 0; b < sizeof(T); ++b)
+                out[i * sizeof(T) + b] = static_cast<char>((bits >> (8 * b)) & 0xFF);
+        }
+    }
+    return out;
+}
+
+nlohmann::json as_binary(std::string_view bytes) {
+    return nlohmann::json::binary(std::vector<uint8_t>(bytes.begin(), bytes.end()));
+}
+
+}  // namespace
+
+void ColumnBuilder::push_validity(bool present) {
+    validity_.push_back(present ? 1 : 0);
+    if (!present) has_null_ = true;
+    ++rows_;
+}
+
+void ColumnBuilder::promote(ColumnType to) {
+    if (to == type_) return;
+
+    switch (to) {
+    case ColumnType::kInt64:
+        ints_.assign(rows_, 0);
+        break;
+    case ColumnType::kFloat64:
+        doubles_.assign(ints_.begin(), ints_.end());
+        doubles_.resize(rows_, 0.0);
+        ints_.clear();
+        break;
+    case ColumnType::kUtf8:
+        for (std::size_t i = 0; i < rows_; ++i) {
+            if (validity_[i]) {
+                if (type_ == ColumnType::kInt64) text_ += fmt::format("{}", ints_[i]);
+                if (type_ == ColumnType::kFloat64) text_ += fmt::format("{}", doubles_[i]);
+            }
+            offsets_.push_back(static_cast<int32_t>(text_.size()));
+        }
+        ints_.clear();
+        doubles_.clear();
+        break;
+    case ColumnType::kNull:
+        break;
+    }
+    type_ = to;
+}
+
+void ColumnBuilder::AppendNull() {
+    switch (type_) {
+    case ColumnType::kInt64:
+        ints_.push_back(0);
+        break;
+    case ColumnType::kFloat64:
+        doubles_.push_back(0.0);
+        break;
+    case ColumnType::kUtf8:
+        offsets_.push_back(static_cast<int32_t>(text_.size()));
+        break;
+    case ColumnType::kNull:
+        break;
+    }
+    push_validity(false);
+}
+
+void ColumnBuilder::AppendInt(int64_t v) {
+    if (type_ == ColumnType::kNull) promote(ColumnType::kInt64);
+
+    if (type_ == ColumnType::kInt64) {
+        ints_.push_back(v);
+    } else if (type_ == ColumnType::kFloat64) {
+        doubles_.push_back(static_cast<double>(v));
+    } else {
+        text_ += fmt::format("{}", v);
+        offsets_.push_back(static_cast<int32_t>(text_.size()));
+    }
+    push_validity(true);
+}
+
+void ColumnBuilder::AppendDouble(double v) {
+    if (type_ == ColumnType::kNull || type_ == ColumnType::kInt64) promote(ColumnType::kFloat64);
+
+    if (type_ == ColumnType::kFloat64) {
+        doubles_.push_back(v);
+    } else {
+        text_ += fmt::format("{}", v);
+        offsets_.push_back(static_cast<int32_t>(text_.size()));
+    }
+    push_validity(true);
+}
+
+void ColumnBuilder::AppendText(std::string_view v) {
+    promote(ColumnType::kUtf8);
+    if (text_.size() + v.size() > static_cast<std::size_t>(INT32_MAX))
+        throw std::runtime_error(fmt::format("Column '{}' exceeds 2 GiB of text", name_));
+    text_ += v;
+    offsets_.push_back(static_cast<int32_t>(text_.size()));
+    push_validity(true);
+}
+
+ColumnBlock ColumnBuilder::Finish() && {
+    ColumnBlock block;
+    block.name = std::move(name_);
+    block.type = type_;
+    if (has_null_) block.validity = std::move(validity_);
+
+    switch (type_) {
+    case ColumnType::kInt64:
+        block.data = to_le_bytes(ints_);
+        break;
+    case ColumnType::kFloat64:
+        block.data = to_le_bytes(doubles_);
+        break;
+    case ColumnType::kUtf8:
+        block.data = std::move(text_);
+        block.offsets = std::move(offsets_);
+        break;
+    case ColumnType::kNull:
+        break;
+    }
+    return block;
+}
+
+std::string ColumnarQueryResult::ToMsgPack() const {
+    nlohmann::json columns_out = nlohmann::json::array();
+    for (const auto& col : columns) {
+        nlohmann::json c = {{"name", col.name},
+                            {"type", type_name(col.type)},
+                            {"data", as_binary(col.data)}};
+        c["validity"] = col.validity.empty()
+                            ? nlohmann::json(nullptr)
+                            : nlohmann::json::binary(std::vector<uint8_t>(col.validity));
+        if (col.type == ColumnType::kUtf8) c["offsets"] = as_binary(to_le_bytes(col.offsets));
+        columns_out.push_back(std::move(c));
+    }
+
+    nlohmann::json out = {{"total", total},
+                          {"offset", offset},
+                          {"limit", limit},
+                          {"rows", rows},
+                          {"columns", std::move(columns_out)}};
+    std::string buf;
+    nlohmann::json::to_msgpack(out, buf);
+    return buf;
+}
+
+}  // namespace loglite
@@ -0,0 +1,68 @@
+#ifndef LOGLITE_COLUMNAR_HPP_
+#define LOGLITE_COLUMNAR_HPP_
+
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <vector>
+
+namespace loglite {
+
+// ── Columnar query results ────────────────────────────────────────────────────
+//
+// Alternative to PaginatedQueryResult for bulk consumers: one block per selected
+// field, laid out like an Arrow array (validity mask + fixed-width values, or
+// offsets + bytes for text) so a client can wrap the buffers without building
+// per-row objects.  Serialised as MessagePack; see docs "GET /logs" for the format.
+
+enum class ColumnType { kNull, kInt64, kFloat64, kUtf8 };
+
+struct ColumnBlock {
+    std::string name;
+    ColumnType type{ColumnType::kNull};
+    std::vector<uint8_t> validity;  // one byte per row (1 = present); empty when no nulls
+    std::string data;               // little-endian values, or concatenated UTF-8 for kUtf8
+    std::vector<int32_t> offsets;   // kUtf8 only: rows + 1 offsets into `data`
+};
+
+struct ColumnarQueryResult {
+    int total{};
+    int offset{};
+    int limit{};
+    int rows{};
+    std::vector<ColumnBlock> columns;
+
+    [[nodiscard]] std::string ToMsgPack() const;
+};
+
+// Accumulates one column.  The type is inferred from the values appended so far
+// and widens as needed: null → int64 → float64 → utf8.
+class ColumnBuilder {
+   public:
+    explicit ColumnBuilder(std::string name) : name_(std::move(name)) {}
+
+    void AppendNull();
+    void AppendInt(int64_t v);
+    void AppendDouble(double v);
+    void AppendText(std::string_view v);
+
+    [[nodiscard]] ColumnBlock Finish() &&;
+
+   private:
+    void promote(ColumnType to);
+    void push_validity(bool present);
+
+    std::string name_;
+    ColumnType type_{ColumnType::kNull};
+    std::size_t rows_{0};
+    bool has_null_{false};
+    std::vector<uint8_t> validity_;
+    std::vector<int64_t> ints_;
+    std::vector<double> doubles_;
+    std::string text_;
+    std::vector<int32_t> offsets_{0};
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_COLUMNAR_HPP_
@@ -1,5 +1,6 @@
 #include "config.hpp"
 #include "log.hpp"
+#include "shm_ring.hpp"
 
 #include <boost/describe.hpp>
 #include <boost/mp11.hpp>
@@ -103,8 +104,8 @@ template <class S>
 void load_yaml_map(S& out, const YAML::Node& node);
 
 /// Convert a single YAML node to a value of type T.
-/// Handles scalars, std::map<string,string>, std::vector<E>, and Boost.Describe structs
-/// recursively.
+/// Handles scalars (incl. floating point), std::map<string,string>, std::vector<E>, and
+/// Boost.Describe structs recursively.
 template <class T>
 T from_yaml(const YAML::Node& node) {
     if constexpr (std::is_same_v<T, std::string>) {
@@ -122,6 +123,8 @@ T from_yaml(const YAML::Node& node) {
         return std::filesystem::path(node.as<std::string>());
     } else if constexpr (std::is_integral_v<T>) {
         return static_cast<T>(node.as<int64_t>());
+    } else if constexpr (std::is_floating_point_v<T>) {
+        return node.as<T>();
     } else if constexpr (std::is_same_v<T, StringMap>) {
         StringMap m;
         // Populate the map from the YAML node.
@@ -188,6 +191,8 @@ void load_root_config(Config& cfg, const StringMap& env, const YAML::Node& yaml)
     });
 }
 
+constexpr int kMaxShards = 64;
+
 }  // namespace
 
 unsigned Config::resolve_pool_size() const {
@@ -245,16 +250,157 @@ Config Config::from_file(const std::filesystem::path& path) {
     if (cfg.task_diagnostics_interval < 30) {
         throw std::runtime_error("'task_diagnostics_interval' must be at least 30 seconds");
     }
+    if (cfg.task_backlog_max_size < 1) {
+        throw std::runtime_error("'task_backlog_max_size' must be at least 1");
+    }
+    if (cfg.task_backlog_target_latency_ms < 1) {
+        throw std::runtime_error("'task_backlog_target_latency_ms' must be at least 1");
+    }
+    if (cfg.task_backlog_max_batch < 1) {
+        throw std::runtime_error("'task_backlog_max_batch' must be at least 1");
+    }
+    for (const auto& c : cfg.compression.zstd_columns) {
+        if (range_contains(cfg.compression.columns, c)) {
+            throw std::runtime_error(fmt::format(
+                "column '{}' is listed in both 'compression.columns' and "
+                "'compression.zstd_columns'",
+                c));
+        }
+    }
+    for (const auto& field : cfg.json_fields) {
+        auto path = JsonFieldPath::Parse(field);
+        if (!path) {
+            throw std::runtime_error(fmt::format(
+                "'json_fields' entry '{}' must look like <column>.<key>[.<key>...]", field));
+        }
+        const auto& comp = cfg.compression;
+        if (comp.enabled && (range_contains(comp.columns, path->column) ||
+                             range_contains(comp.zstd_columns, path->column))) {
+            throw std::runtime_error(fmt::format(
+                "'json_fields' entry '{}' refers to compressed column '{}'", field, path->column));
+        }
+    }
+    if (cfg.compression.zstd_level < 1 || cfg.compression.zstd_level > 22) {
+        throw std::runtime_error("'compression.zstd_level' must be between 1 and 22");
+    }
+    if (cfg.compression.zstd_dict_size < 1) {
+        throw std::runtime_error("'compression.zstd_dict_size' must be at least 1 (KiB)");
+    }
+    if (cfg.compression.zstd_train_samples < 10) {
+        throw std::runtime_error("'compression.zstd_train_samples' must be at least 10");
+    }
+    if (cfg.admission.enabled && cfg.admission.key_fields.empty()) {
+        throw std::runtime_error("'admission.key_fields' must not be empty");
+    }
+    for (const auto& rule : cfg.admission.rules) {
+        if (rule.rate < 0 || rule.burst < 0) {
+            throw std::runtime_error("'admission.rules' rate and burst must not be negative");
+        }
+        if (rule.sample_rate < 0.0 || rule.sample_rate > 1.0) {
+            throw std::runtime_error("'admission.rules' sample_rate must be between 0 and 1");
+        }
+    }
+    if (cfg.dedup.enabled) {
+        const auto& d = cfg.dedup;
+        if (d.key_fields.empty()) {
+            throw std::runtime_error("'dedup.key_fields' must not be empty");
+        }
+        if (d.window_seconds < 1) {
+            throw std::runtime_error("'dedup.window_seconds' must be at least 1");
+        }
+        if (d.max_keys < 1) {
+            throw std::runtime_error("'dedup.max_keys' must be at least 1");
+        }
+        for (const auto& col : {d.count_column, d.first_seen_column, d.last_seen_column}) {
+            if (col.empty() || range_contains(d.key_fields, col)) {
+                throw std::runtime_error(
+                    "'dedup' count / first_seen / last_seen columns must be set and not be key "
+                    "fields");
+            }
+            const auto& comp = cfg.compression;
+            if (comp.enabled &&
+                (range_contains(comp.columns, col) || range_contains(comp.zstd_columns, col))) {
+                throw std::runtime_error(
+                    fmt::format("'dedup' column '{}' must not be a compressed column", col));
+            }
+        }
+    }
+    // Each tier is rolled up from the previous one (raw stats for the first), which must keep
+    // its rows for at least one bucket of the next tier.
+    int64_t prev_resolution = 1;
+    int64_t prev_retention_s = int64_t{cfg.stats_retention_hours} * 3600;
+    for (const auto& tier : cfg.stats_rollups) {
+        if (tier.resolution <= prev_resolution || tier.resolution % prev_resolution != 0) {
+            throw std::runtime_error(
+                "'stats_rollups' resolutions must increase, each a multiple of the previous");
+        }
+        if (tier.retention_hours < 1) {
+            throw std::runtime_error("'stats_rollups' retention_hours must be at least 1");
+        }
+        if (prev_retention_s < tier.resolution) {
+            throw std::runtime_error(
+                "'stats_rollups' each tier's source must be retained for one of its buckets");
+        }
+        prev_resolution = tier.resolution;
+        prev_retention_s = int64_t{tier.retention_hours} * 3600;
+    }
+    if (cfg.query_timeout_ms < 0) {
+        throw std::runtime_error("'query_timeout_ms' must not be negative");
+    }
+    if (cfg.query_max_scan_rows < 0) {
+        throw std::runtime_error("'query_max_scan_rows' must not be negative");
+    }
+    if (cfg.task_vacuum_chunk_ms < 1) {
+        throw std::runtime_error("'task_vacuum_chunk_ms' must be at least 1");
+    }
+    if (cfg.task_checkpoint_interval < 1) {
+        throw std::runtime_error("'task_checkpoint_interval' must be at least 1 second");
+    }
+    if (cfg.snapshot_step_pages < 1) {
+        throw std::runtime_error("'snapshot_step_pages' must be at least 1");
+    }
+    if (cfg.snapshot_step_interval_ms < 0) {
+        throw std::runtime_error("'snapshot_step_interval_ms' must not be negative");
+    }
+    if (cfg.shards.count < 1 || cfg.shards.count > kMaxShards) {
+        throw std::runtime_error(
+            fmt::format("'shards.count' must be between 1 and {}", kMaxShards));
+    }
+    if (cfg.shards.max_offset < 0) throw std::runtime_error("'shards.max_offset' must be >= 0");
+    if (cfg.shards.count > 1) {
+        if (cfg.shards.key.empty()) {
+            throw std::runtime_error("'shards.key' must be set when 'shards.count' > 1");
+        }
+        // Duplicates are collapsed per shard, so they must all be routed to the same one.
+        if (cfg.dedup.enabled && !range_contains(cfg.dedup.key_fields, cfg.shards.key)) {
+            throw std::runtime_error("'shards.key' must be one of 'dedup.key_fields'");
+        }
+    }
 
     // Post init
     cfg.vacuum_max_size_bytes = parse_size_to_bytes(cfg.vacuum_max_size);
     cfg.vacuum_target_size_bytes = parse_size_to_bytes(cfg.vacuum_target_size);
+    cfg.wal_checkpoint_size_bytes = parse_size_to_bytes(cfg.wal_checkpoint_size);
+    cfg.harvester_ring_size_bytes = parse_size_to_bytes(cfg.harvester_ring_size);
+    if (cfg.harvester_ring_size_bytes < static_cast<int64_t>(ShmRing::kMinCapacity)) {
+        throw std::runtime_error("'harvester_ring_size' must be at least 64KB");
+    }
     (void)cfg.resolve_pool_size();
     std::filesystem::create_directories(cfg.sqlite_dir);
     cfg.db_path = cfg.sqlite_dir / "logs.db";
+    cfg.snapshot_dir = cfg.sqlite_dir / "snapshots";
 
     log::INFO("Config loaded from {}", path.string());
     return cfg;
 }
 
+Config Config::ForShard(int index) const {
+    Config out = *this;
+    if (shards.count <= 1) return out;
+    if (index > 0) out.db_path = sqlite_dir / fmt::format("logs-shard{}.db", index);
+    out.vacuum_max_size_bytes = vacuum_max_size_bytes / shards.count;
+    out.vacuum_target_size_bytes = vacuum_target_size_bytes / shards.count;
+    return out;
+}
+
 }  // namespace loglite
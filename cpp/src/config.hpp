@@ -32,35 +32,70 @@ struct Config {
     // ── Log table ─────────────────────────────────────────────────────────────
     std::string log_table_name{"Log"};
     std::string log_timestamp_field{"timestamp"};
+    // JSON paths ("extra.request_id") materialized as indexed generated columns.
+    std::vector<std::string> json_fields;
 
     // ── SSE ───────────────────────────────────────────────────────────────────
     int sse_limit{1000};
     int sse_debounce_ms{500};
 
+    // ── Query budgets ─────────────────────────────────────────────────────────
+    int query_timeout_ms{30000};      // default and cap for GET /logs `timeout_ms`; 0 = no limit
+    int64_t query_max_scan_rows{0};  // cap for GET /logs `max_scan_rows`; 0 = no limit
+
     // ── Vacuum ────────────────────────────────────────────────────────────────
     int vacuum_max_days{3650};
     std::string vacuum_max_size{"1TB"};
     int64_t vacuum_max_size_bytes{};  // derived
     std::string vacuum_target_size{"800GB"};
     int64_t vacuum_target_size_bytes{};  // derived
+    // WAL size the checkpoint task keeps the -wal file near (see WalCheckpointManager).
+    std::string wal_checkpoint_size{"64MB"};
+    int64_t wal_checkpoint_size_bytes{64LL * 1024 * 1024};  // derived
     // ── Background tasks ──────────────────────────────────────────────────────
-    int task_diagnostics_interval{60};   // seconds
-    int task_backlog_flush_interval{5};  // seconds
-    int task_backlog_max_size{200};      // max entries before force-flush
-    int task_vacuum_interval{120};       // seconds
-    int task_vacuum_max_size{5};         // MB budget per incremental vacuum pass
+    int task_diagnostics_interval{60};        // seconds
+    int task_backlog_flush_interval{5};       // seconds; upper bound on a flush wait
+    int task_backlog_max_size{10000};         // hard cap; oldest entries dropped beyond it
+    int task_backlog_target_latency_ms{250};  // aimed-for time from ingest to commit
+    int task_backlog_max_batch{5000};         // max rows per INSERT transaction
+    int task_vacuum_interval{120};            // seconds
+    int task_vacuum_max_size{5};              // MB budget per incremental vacuum pass
+    int task_vacuum_chunk_ms{50};             // aimed-for write-strand time per retention delete
+    int task_checkpoint_interval{10};         // seconds between WAL checkpoint passes
     int stats_retention_hours{24};
+    // Downsampled stats tiers, finest first; each is rolled up from the one before it.
+    std::vector<StatsRollup> stats_rollups{{60, 72}, {900, 24 * 14}, {3600, 24 * 90}};
+
+    // ── Snapshots ─────────────────────────────────────────────────────────────
+    int snapshot_step_pages{256};        // pages copied per backup step
+    int snapshot_step_interval_ms{10};   // pause between steps (lets writes through)
+    int snapshot_keep{3};                // newest snapshots kept in <sqlite_dir>/snapshots
+    std::filesystem::path snapshot_dir;  // derived
 
     // ── Compression ───────────────────────────────────────────────────────────
     CompressionConfig compression;
 
+    // ── Admission control ─────────────────────────────────────────────────────
+    AdmissionConfig admission;
+
+    // ── Deduplication ─────────────────────────────────────────────────────────
+    DedupConfig dedup;
+
+    // ── Sharding ──────────────────────────────────────────────────────────────
+    ShardConfig shards;
+
     // ── Harvesters ────────────────────────────────────────────────────────────
     struct HarvesterDef {
         std::string type;
         std::string name;
         std::map<std::string, std::string> config;
+        // Python harvesters with the same non-empty `worker` share one worker process.
+        std::string worker;
     };
     std::vector<HarvesterDef> harvesters;
+    // Shared-memory ring per harvester worker process.
+    std::string harvester_ring_size{"4MB"};
+    int64_t harvester_ring_size_bytes{4LL * 1024 * 1024};  // derived
 
     // ── Migrations ────────────────────────────────────────────────────────────
     std::vector<Migration> migrations;  // required – no default
@@ -69,18 +104,29 @@ struct Config {
     static Config from_file(const std::filesystem::path& path);
 
     [[nodiscard]] unsigned resolve_pool_size() const;
+
+    // The config of shard `index`: shard 0 keeps db_path, the others use
+    // <sqlite_dir>/logs-shard<index>.db, and each gets an equal share of the vacuum
+    // size limits.  Identical to this config when sharding is off.
+    [[nodiscard]] Config ForShard(int index) const;
 };
 
 // Boost.Describe: every public data member is listed.
-BOOST_DESCRIBE_STRUCT(Config::HarvesterDef, (), (type, name, config))
+BOOST_DESCRIBE_STRUCT(Config::HarvesterDef, (), (type, name, config, worker))
 BOOST_DESCRIBE_STRUCT(Config, (),
                       (host, port, debug, allow_origin, sqlite_dir, db_path, sqlite_params,
-                       db_pool_size, auto_rollout, log_table_name, log_timestamp_field, sse_limit,
-                       sse_debounce_ms, vacuum_max_days, vacuum_max_size, vacuum_max_size_bytes,
-                       vacuum_target_size, vacuum_target_size_bytes, task_diagnostics_interval,
-                       task_backlog_flush_interval, task_backlog_max_size, task_vacuum_interval,
-                       task_vacuum_max_size, stats_retention_hours, compression, harvesters,
-                       migrations))
+                       db_pool_size, auto_rollout, log_table_name, log_timestamp_field, json_fields,
+                       sse_limit, sse_debounce_ms, query_timeout_ms, query_max_scan_rows,
+                       vacuum_max_days, vacuum_max_size, vacuum_max_size_bytes, vacuum_target_size,
+                       vacuum_target_size_bytes, wal_checkpoint_size, wal_checkpoint_size_bytes,
+                       task_diagnostics_interval,
+                       task_backlog_flush_interval, task_backlog_max_size,
+                       task_backlog_target_latency_ms, task_backlog_max_batch,
+                       task_vacuum_interval, task_vacuum_max_size, task_vacuum_chunk_ms,
+                       task_checkpoint_interval, stats_retention_hours, stats_rollups,
+                       snapshot_step_pages, snapshot_step_interval_ms, snapshot_keep, snapshot_dir,
+                       compression, admission, dedup, shards, harvesters, harvester_ring_size,
+                       harvester_ring_size_bytes, migrations))
 
 }  // namespace loglite
 
@@ -1,14 +1,22 @@
 #ifndef LOGLITE_CONTEXT_HPP_
 #define LOGLITE_CONTEXT_HPP_
 
+#include "admission.hpp"
 #include "backlog.hpp"
 #include "config.hpp"
+#include "dedup.hpp"
+#include "flush_policy.hpp"
+#include "index_advisor.hpp"
 #include "notifier.hpp"
 #include "reader_database.hpp"
+#include "snapshot.hpp"
+#include "wal_checkpoint.hpp"
 #include "writer_database.hpp"
 
 #include <atomic>
 #include <chrono>
+#include <cstddef>
+#include <deque>
 #include <memory>
 #include <vector>
 
@@ -18,8 +26,39 @@ namespace asio = boost::asio;
 
 namespace loglite {
 
+// One database file and the write pipeline feeding it: writer connection,
+// readers, backlog, write strand, and the flush, dedup and checkpoint state of
+// its background tasks.  Without sharding there is a single shard over the
+// ServerContext's own database (see shards.hpp).
+
+struct LogShard {
+    std::size_t index;
+    WriterDatabase& db_write;
+    ReadDatabasePool& db_read;
+    Backlog& backlog;
+    asio::strand<asio::thread_pool::executor_type> write_strand;
+    AdaptiveFlushPolicy flush_policy;
+    LogCoalescer dedup;
+    WalCheckpointManager checkpoints;
+
+    LogShard(std::size_t index_in, const Config& config, WriterDatabase& db_write_in,
+             ReadDatabasePool& db_read_in, Backlog& backlog_in,
+             asio::strand<asio::thread_pool::executor_type> write_strand_in)
+        : index(index_in),
+          db_write(db_write_in),
+          db_read(db_read_in),
+          backlog(backlog_in),
+          write_strand(std::move(write_strand_in)),
+          flush_policy(std::chrono::milliseconds{config.task_backlog_target_latency_ms},
+                       static_cast<std::size_t>(config.task_backlog_max_batch),
+                       std::chrono::seconds{config.task_backlog_flush_interval}),
+          dedup(config.dedup, config.log_timestamp_field),
+          checkpoints(config.wal_checkpoint_size_bytes) {}
+};
+
 // Aggregates all shared mutable state passed to handlers and background tasks.
-// Passed by reference; must outlive all coroutines.
+// Passed by reference; must outlive all coroutines.  db_write, db_read, backlog
+// and write_strand are shard 0's, which also holds the stats tables.
 
 struct ServerContext {
     Config& config;
@@ -30,7 +69,15 @@ struct ServerContext {
 
     asio::strand<asio::thread_pool::executor_type> write_strand;
     asio::thread_pool::executor_type reader_executor;
+    // Coalesces and encodes flush batches; kept apart from reader_executor so
+    // ingest never queues behind long GET /logs queries.
+    asio::thread_pool::executor_type encode_executor;
     std::chrono::steady_clock::time_point server_started_at;
+    SnapshotTracker snapshot;
+    AdmissionController admission;
+    FilterWorkload workload;
+    // Shard 0 is built from the members above; AddShard() appends the others.
+    std::deque<LogShard> shards;
 
     std::atomic<bool> stopping{false};
     std::vector<std::shared_ptr<asio::steady_timer>> shutdown_timers;
@@ -39,6 +86,7 @@ struct ServerContext {
                   Backlog& backlog_in, LogNotifier& notifier_in,
                   asio::strand<asio::thread_pool::executor_type> write_strand_in,
                   asio::thread_pool::executor_type reader_executor_in,
+                  asio::thread_pool::executor_type encode_executor_in,
                   std::chrono::steady_clock::time_point server_started_at_in =
                       std::chrono::steady_clock::now())
         : config(config_in),
@@ -48,7 +96,20 @@ struct ServerContext {
           notifier(notifier_in),
           write_strand(std::move(write_strand_in)),
           reader_executor(std::move(reader_executor_in)),
-          server_started_at(server_started_at_in) {}
+          encode_executor(std::move(encode_executor_in)),
+          server_started_at(server_started_at_in),
+          admission(config_in.admission) {
+        shards.emplace_back(0, config, db_write, db_read, backlog, write_strand);
+    }
+
+    LogShard& AddShard(WriterDatabase& shard_write, ReadDatabasePool& shard_read,
+                       Backlog& shard_backlog,
+                       asio::strand<asio::thread_pool::executor_type> shard_strand) {
+        return shards.emplace_back(shards.size(), config, shard_write, shard_read, shard_backlog,
+                                   std::move(shard_strand));
+    }
+
+    [[nodiscard]] bool Sharded() const noexcept { return shards.size() > 1; }
 
     void RegisterShutdownTimer(const std::shared_ptr<asio::steady_timer>& timer) {
         shutdown_timers.push_back(timer);
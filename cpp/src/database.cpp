@@ -5,6 +5,7 @@
 #include <algorithm>
 #include <array>
 #include <fmt/format.h>
+#include <optional>
 #include <ranges>
 #include <stdexcept>
 
@@ -20,6 +21,36 @@ int normalize_vacuum_mode(std::string_view value) {
     throw std::runtime_error(fmt::format("Unknown auto_vacuum value: '{}'", value));
 }
 
+// loglite_unzstd(x): the text of a zstd-compressed value; any other value passes through.
+// Lets filters on zstd columns run against the original text (decompress-and-filter).
+void sql_unzstd(sqlite3_context* ctx, int argc, sqlite3_value** argv) {
+    if (sqlite3_value_type(argv[0]) != SQLITE_BLOB) {
+        sqlite3_result_value(ctx, argv[0]);
+        return;
+    }
+
+    const auto* catalog = static_cast<const DatabaseCatalog*>(sqlite3_user_data(ctx));
+    const auto* blob = static_cast<const char*>(sqlite3_value_blob(argv[0]));
+    const std::string_view frame{blob ? blob : "",
+                                 static_cast<size_t>(sqlite3_value_bytes(argv[0]))};
+    try {
+        auto text = catalog->zstd_codec->Decompress(frame);
+        sqlite3_result_text(ctx, text.data(), static_cast<int>(text.size()), SQLITE_TRANSIENT);
+    } catch (const std::exception& e) {
+        sqlite3_result_error(ctx, e.what(), -1);
+    }
+}
+
+// The number a JSON path filter value spells in canonical form ("200", "1.5"); none for
+// anything else ("00123", "abc") or for values that are not query-string text.
+std::optional<nlohmann::json> json_number_value(const nlohmann::json& v) {
+    if (!v.is_string()) return std::nullopt;
+    const auto& s = v.get_ref<const std::string&>();
+    auto parsed = nlohmann::json::parse(s, nullptr, false);
+    if (parsed.is_number() && parsed.dump() == s) return parsed;
+    return std::nullopt;
+}
+
 }  // namespace
 
 Statement::Statement(sqlite3* db, std::string_view sql) {
@@ -91,6 +122,13 @@ void Database::apply_params(AccessMode mode) {
     }
 }
 
+void Database::register_functions() {
+    ensure_ok(sqlite3_create_function_v2(db_, "loglite_unzstd", 1,
+                                         SQLITE_UTF8 | SQLITE_DETERMINISTIC, catalog_.get(),
+                                         sql_unzstd, nullptr, nullptr, nullptr),
+              "sqlite3_create_function_v2");
+}
+
 void Database::bind_param(sqlite3_stmt* stmt, int idx, const nlohmann::json& v) {
     if (v.is_null())
         sqlite3_bind_null(stmt, idx);
@@ -100,7 +138,10 @@ void Database::bind_param(sqlite3_stmt* stmt, int idx, const nlohmann::json& v)
         sqlite3_bind_int64(stmt, idx, v.get<int64_t>());
     else if (v.is_number_float())
         sqlite3_bind_double(stmt, idx, v.get<double>());
-    else {
+    else if (v.is_binary()) {
+        const auto& bin = v.get_binary();
+        sqlite3_bind_blob(stmt, idx, bin.data(), static_cast<int>(bin.size()), SQLITE_TRANSIENT);
+    } else {
         std::string s = v.is_string() ? v.get<std::string>() : v.dump();
         sqlite3_bind_text(stmt, idx, s.c_str(), static_cast<int>(s.size()), SQLITE_TRANSIENT);
     }
@@ -125,6 +166,21 @@ nlohmann::json Database::column_to_json(sqlite3_stmt* stmt, int col) {
     }
 }
 
+nlohmann::json Database::log_column_to_json(sqlite3_stmt* stmt, int col,
+                                           const std::string& name) const {
+    if (catalog_->zstd_columns.contains(name) && sqlite3_column_type(stmt, col) == SQLITE_BLOB) {
+        const auto* blob = static_cast<const char*>(sqlite3_column_blob(stmt, col));
+        const auto bytes = static_cast<size_t>(sqlite3_column_bytes(stmt, col));
+        return catalog_->zstd_codec->Decompress({blob ? blob : "", bytes});
+    }
+
+    auto val = column_to_json(stmt, col);
+    if (catalog_->compressed_columns.contains(name) && val.is_number_integer()) {
+        val = catalog_->col_dict->GetValue(name, val.get<int>());
+    }
+    return val;
+}
+
 nlohmann::json Database::serialize_value(const nlohmann::json& v) {
     if (v.is_null()) return nullptr;
     if (v.is_boolean()) return v.get<bool>() ? 1 : 0;
@@ -225,12 +281,38 @@ void Database::validate_field(std::string_view name) const {
 
 static constexpr std::string_view kAllowedOps[] = {"=", "!=", ">", ">=", "<", "<=", "~="};
 
+// Left-hand side of a non-dictionary filter.  "<column>.<key>..." filters resolve to the
+// declared generated column when there is one (indexed), else to a json_extract() scan.
+std::string Database::filter_lhs(const QueryFilter& ft) const {
+    if (auto it = catalog_->json_field_columns.find(ft.field);
+        it != catalog_->json_field_columns.end())
+        return it->second;
+
+    if (auto path = JsonFieldPath::Parse(ft.field)) {
+        validate_field(path->column);
+        if (catalog_->compressed_columns.contains(path->column))
+            throw std::runtime_error(
+                fmt::format("Field '{}' is dictionary-compressed and holds no JSON", path->column));
+        return path->Extract(catalog_->zstd_columns.contains(path->column)
+                                 ? fmt::format("loglite_unzstd({})", path->column)
+                                 : path->column);
+    }
+
+    validate_field(ft.field);
+    // zstd columns are compared on their decompressed text; no index can help there.
+    return catalog_->zstd_columns.contains(ft.field) ? fmt::format("loglite_unzstd({})", ft.field)
+                                                     : ft.field;
+}
+
+void Database::ValidateFilters(const std::vector<QueryFilter>& filters) const {
+    (void)build_where_clause(filters);
+}
+
 Database::WhereClause Database::build_where_clause(const std::vector<QueryFilter>& filters) const {
     std::string sql_parts;
     std::vector<nlohmann::json> params;
 
     for (const auto& ft : filters) {
-        validate_field(ft.field);
         if (!range_contains(kAllowedOps, ft.op))
             throw std::runtime_error(fmt::format("Unknown query operator: '{}'", ft.op));
 
@@ -246,12 +328,33 @@ Database::WhereClause Database::build_where_clause(const std::vector<QueryFilter
                 params.push_back(ids[i]);
             }
             sql_parts += ")";
-        } else if (ft.op == "~=") {
-            sql_parts += ft.field + " LIKE ?";
+            continue;
+        }
+
+        const auto lhs = filter_lhs(ft);
+        if (ft.op == "~=") {
+            sql_parts += lhs + " LIKE ?";
             std::string fval = ft.value.is_string() ? ft.value.get<std::string>() : ft.value.dump();
             params.push_back("%" + fval + "%");
+        } else if (auto num = json_number_value(ft.value);
+                   num && ft.field.find('.') != std::string::npos) {
+            // JSON values keep their type, and "123" may be stored as 123 or as "123": equality
+            // tries both.  Ordering compares numbers only, since SQLite sorts all text above
+            // every number (`lhs < ''` holds for numbers alone).
+            if (ft.op == "=") {
+                sql_parts += fmt::format("({0} = ? OR {0} = ?)", lhs);
+                params.push_back(std::move(*num));
+                params.push_back(ft.value);
+            } else if (ft.op == "!=") {
+                sql_parts += fmt::format("({0} != ? AND {0} != ?)", lhs);
+                params.push_back(std::move(*num));
+                params.push_back(ft.value);
+            } else {
+                sql_parts += fmt::format("({0} {1} ? AND {0} < '')", lhs, ft.op);
+                params.push_back(std::move(*num));
+            }
         } else {
-            sql_parts += ft.field + " " + ft.op + " ?";
+            sql_parts += lhs + " " + ft.op + " ?";
             params.push_back(ft.value);
         }
     }
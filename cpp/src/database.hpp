@@ -4,7 +4,9 @@
 #include "config.hpp"
 #include "types.hpp"
 #include "column_dict.hpp"
+#include "zstd_codec.hpp"
 
+#include <map>
 #include <memory>
 #include <sqlite3.h>
 #include <set>
@@ -21,15 +23,22 @@ struct DatabaseCatalog {
     explicit DatabaseCatalog(const Config& cfg) : cfg(cfg) {
         if (cfg.compression.enabled) {
             for (const auto& c : cfg.compression.columns) compressed_columns.insert(c);
+            for (const auto& c : cfg.compression.zstd_columns) zstd_columns.insert(c);
         }
     }
 
     const Config& cfg;
     std::set<std::string> compressed_columns;
+    // Columns that may hold zstd frames: the configured ones plus any with a persisted
+    // dictionary (so rows written under an older config still decode).
+    std::set<std::string> zstd_columns;
+    // Declared json_fields ("extra.request_id") → indexed generated column holding that path.
+    std::map<std::string, std::string> json_field_columns;
     std::vector<ColumnInfo> log_column_info;
     std::vector<ColumnInfo> activity_stats_column_info;
     std::vector<ColumnInfo> db_stats_column_info;
     std::shared_ptr<ColumnDictionary> col_dict;
+    std::shared_ptr<ZstdCodec> zstd_codec;
 };
 
 struct Statement {
@@ -40,6 +49,13 @@ struct Statement {
     ~Statement() { sqlite3_finalize(raw); }
 
     Statement(Statement&& o) noexcept : raw(std::exchange(o.raw, nullptr)) {}
+    Statement& operator=(Statement&& o) noexcept {
+        if (this != &o) {
+            sqlite3_finalize(raw);
+            raw = std::exchange(o.raw, nullptr);
+        }
+        return *this;
+    }
     operator sqlite3_stmt*() const noexcept { return raw; }
 
     Statement(const Statement&) = delete;
@@ -70,6 +86,9 @@ class Database {
     [[nodiscard]] std::string GetMinTimestamp() const;
     [[nodiscard]] const std::vector<ColumnInfo>& GetColumnInfo() const;
 
+    // Throws the same error a query with these filters would (unknown field, operator, ...).
+    void ValidateFilters(const std::vector<QueryFilter>& filters) const;
+
    protected:
     struct WhereClause {
         std::string sql;
@@ -88,9 +107,11 @@ class Database {
 
     [[nodiscard]] WhereClause build_where_clause(const std::vector<QueryFilter>& filters) const;
     void validate_field(std::string_view name) const;
+    [[nodiscard]] std::string filter_lhs(const QueryFilter& ft) const;
 
     // SQLite param helpers
     void apply_params(AccessMode mode);
+    void register_functions();
     void set_pragma(std::string_view name, std::string_view value);
 
     // Generic helpers
@@ -98,6 +119,8 @@ class Database {
     void ensure_ok(int rc, std::string_view ctx) const;
     static void bind_param(sqlite3_stmt* stmt, int idx, const nlohmann::json& v);
     [[nodiscard]] static nlohmann::json column_to_json(sqlite3_stmt* stmt, int col);
+    [[nodiscard]] nlohmann::json log_column_to_json(sqlite3_stmt* stmt, int col,
+                                                    const std::string& name) const;
     [[nodiscard]] static nlohmann::json serialize_value(const nlohmann::json& v);
     [[nodiscard]] static std::vector<std::string> pluck_column_names(
         const std::vector<ColumnInfo>& infos);
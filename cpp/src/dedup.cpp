@@ -0,0 +1,162 @@
+#include "dedup.hpp"
+
+#include <unordered_map>
+#include <utility>
+
+namespace loglite {
+
+LogCoalescer::LogCoalescer(DedupConfig cfg, std::string timestamp_field)
+    : cfg_(std::move(cfg)),
+      timestamp_field_(std::move(timestamp_field)),
+      window_(std::chrono::seconds{cfg_.window_seconds}) {}
+
+std::string LogCoalescer::key_of(const nlohmann::json& entry) const {
+    std::string key;
+    for (const auto& field : cfg_.key_fields) {
+        auto it = entry.find(field);
+        key += it == entry.end() ? std::string{"\x1e"} : it->dump();
+        key += '\x1f';
+    }
+    return key;
+}
+
+void LogCoalescer::expire(Clock::time_point now) {
+    while (!order_.empty()) {
+        auto it = windows_.find(order_.front());
+        if (it != windows_.end()) {
+            if (now - it->second.opened_at < window_) break;
+            windows_.erase(it);
+        }
+        order_.pop_front();
+    }
+}
+
+DedupPlan LogCoalescer::Coalesce(std::vector<nlohmann::json> logs, Clock::time_point now) {
+    DedupPlan plan;
+    if (!cfg_.enabled) {
+        plan.rows = std::move(logs);
+        return plan;
+    }
+
+    std::lock_guard lk(mtx_);
+    expire(now);
+
+    std::unordered_map<std::string, std::size_t> batch_rows;     // key → index in plan.rows
+    std::unordered_map<DedupSlot*, std::size_t> batch_updates;  // slot → index in plan.updates
+    plan.rows.reserve(logs.size() + requeued_.size());
+    plan.slots.reserve(logs.size() + requeued_.size());
+
+    // `count` entries equal to `entry`, the latest of them seen at `last_seen`.
+    auto add = [&](nlohmann::json& entry, int64_t count, nlohmann::json last_seen) {
+        std::string key = key_of(entry);
+
+        if (auto it = batch_rows.find(key); it != batch_rows.end()) {
+            auto& row = plan.rows[it->second];
+            row[cfg_.count_column] = row[cfg_.count_column].get<int64_t>() + count;
+            row[cfg_.last_seen_column] = std::move(last_seen);
+            collapsed_ += count;
+            return;
+        }
+
+        if (auto it = windows_.find(key); it != windows_.end()) {
+            const auto& slot = it->second.slot;
+            auto [u, inserted] = batch_updates.try_emplace(slot.get(), plan.updates.size());
+            if (inserted) plan.updates.push_back({slot, std::move(entry), 0, nullptr});
+            auto& update = plan.updates[u->second];
+            update.count += count;
+            update.last_seen = std::move(last_seen);
+            collapsed_ += count;
+            return;
+        }
+
+        while (windows_.size() >= static_cast<std::size_t>(cfg_.max_keys) && !order_.empty()) {
+            if (windows_.erase(order_.front()) > 0) ++evicted_;
+            order_.pop_front();
+        }
+        auto slot = std::make_shared<DedupSlot>(DedupSlot{key, 0});
+        windows_.emplace(key, Window{slot, now});
+        order_.push_back(key);
+
+        auto ts_it = entry.find(timestamp_field_);
+        entry[cfg_.count_column] = count;
+        entry[cfg_.first_seen_column] = ts_it != entry.end() ? *ts_it : nlohmann::json{};
+        entry[cfg_.last_seen_column] = std::move(last_seen);
+        collapsed_ += count - 1;
+        batch_rows.emplace(std::move(key), plan.rows.size());
+        plan.rows.push_back(std::move(entry));
+        plan.slots.push_back(std::move(slot));
+    };
+
+    // Duplicates of rows that failed to insert are older than this batch.
+    auto requeued = std::exchange(requeued_, {});
+    for (auto& r : requeued) add(r.entry, r.count, std::move(r.last_seen));
+
+    for (auto& entry : logs) {
+        auto ts_it = entry.find(timestamp_field_);
+        add(entry, 1, ts_it != entry.end() ? *ts_it : nlohmann::json{});
+    }
+    return plan;
+}
+
+void LogCoalescer::close_failed(DedupSlot& slot) {
+    slot.row_id = -1;
+    ++failed_;
+    if (auto it = windows_.find(slot.key); it != windows_.end() && it->second.slot.get() == &slot)
+        windows_.erase(it);
+}
+
+void LogCoalescer::requeue(DedupPlan::Pending& pending) {
+    collapsed_ -= pending.count;
+    requeued_.push_back({std::move(pending.entry), pending.count, std::move(pending.last_seen)});
+}
+
+std::vector<DedupUpdate> LogCoalescer::Commit(DedupPlan& plan,
+                                              const std::vector<std::size_t>& sources,
+                                              const std::vector<int64_t>& row_ids) {
+    std::vector<DedupUpdate> updates;
+    if (plan.slots.empty() && plan.updates.empty()) return updates;
+
+    std::lock_guard lk(mtx_);
+    for (std::size_t i = 0; i < row_ids.size() && i < sources.size(); ++i) {
+        if (sources[i] < plan.slots.size()) plan.slots[sources[i]]->row_id = row_ids[i];
+    }
+    for (auto& slot : plan.slots) {
+        if (slot->row_id <= 0) close_failed(*slot);
+    }
+
+    updates.reserve(plan.updates.size());
+    for (auto& pending : plan.updates) {
+        if (pending.slot->row_id <= 0) {
+            requeue(pending);  // its row was never inserted
+            continue;
+        }
+        updates.push_back({pending.slot->row_id, pending.count, std::move(pending.last_seen)});
+    }
+    updated_ += static_cast<int64_t>(updates.size());
+    return updates;
+}
+
+void LogCoalescer::Abort(DedupPlan& plan) {
+    if (plan.slots.empty() && plan.updates.empty()) return;
+
+    std::lock_guard lk(mtx_);
+    for (auto& slot : plan.slots) close_failed(*slot);
+    // Duplicates of rows that do exist become updates again in the next batch.
+    for (auto& pending : plan.updates) requeue(pending);
+}
+
+nlohmann::json LogCoalescer::ToJSON() const {
+    std::lock_guard lk(mtx_);
+    return {
+        {"enabled", cfg_.enabled},
+        {"window_seconds", cfg_.window_seconds},
+        {"open_windows", windows_.size()},
+        {"collapsed", collapsed_},
+        {"updated", updated_},
+        {"evicted", evicted_},
+        {"failed", failed_},
+        {"requeued", requeued_.size()},
+    };
+}
+
+}  // namespace loglite
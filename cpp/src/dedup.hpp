@@ -0,0 +1,112 @@
+#ifndef LOGLITE_DEDUP_HPP_
+#define LOGLITE_DEDUP_HPP_
+
+#include "types.hpp"
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+// ── Ingest-time deduplication ─────────────────────────────────────────────────
+//
+// Collapses entries that are identical on DedupConfig::key_fields into one row
+// per window.  The first entry of a key opens a window of `window_seconds` and
+// becomes a row whose count column holds the number of entries it stands for,
+// with first/last-seen columns set from the entries' timestamps.
+//
+// Coalesce() runs before a batch is encoded: duplicates within the batch are
+// merged into one row, and duplicates of a key whose row was inserted by an
+// earlier batch become updates of that row.  Commit() runs on the write strand
+// after the INSERT, records the ids of the new rows and resolves the updates to
+// row ids; Abort() replaces it when the batch's transaction was rolled back.
+// Batches are coalesced and committed in the same order.
+//
+// A row that was not inserted closes its window.  Duplicates that were meant to
+// update it are queued and become a new row in the next coalesced batch.
+//
+// Open windows are kept in arrival order and closed when they expire; beyond
+// `max_keys` the oldest is closed early (the key's next entry starts a new row).
+
+struct DedupSlot {
+    std::string key;
+    int64_t row_id{};  // 0 until the row is inserted, -1 if its insert failed
+};
+
+struct DedupPlan {
+    std::vector<nlohmann::json> rows;              // entries to insert
+    std::vector<std::shared_ptr<DedupSlot>> slots;  // one per row; empty when disabled
+
+    struct Pending {
+        std::shared_ptr<DedupSlot> slot;
+        nlohmann::json entry;  // the first duplicate, re-inserted if the slot's row failed
+        int64_t count{};
+        nlohmann::json last_seen;
+    };
+    std::vector<Pending> updates;  // duplicates of rows inserted by earlier batches
+};
+
+class LogCoalescer {
+   public:
+    using Clock = std::chrono::steady_clock;
+
+    LogCoalescer(DedupConfig cfg, std::string timestamp_field);
+
+    [[nodiscard]] bool Enabled() const noexcept { return cfg_.enabled; }
+
+    DedupPlan Coalesce(std::vector<nlohmann::json> logs, Clock::time_point now = Clock::now());
+
+    // `row_ids[i]` is the id of the inserted row encoded from `plan.rows[sources[i]]`
+    // (0 if its insert failed).  Returns the updates whose row exists.
+    std::vector<DedupUpdate> Commit(DedupPlan& plan, const std::vector<std::size_t>& sources,
+                                    const std::vector<int64_t>& row_ids);
+    // The batch inserted nothing: as Commit() with every insert failed.
+    void Abort(DedupPlan& plan);
+
+    // Open windows and collapse counters, as reported by GET /stats.
+    [[nodiscard]] nlohmann::json ToJSON() const;
+
+   private:
+    struct Window {
+        std::shared_ptr<DedupSlot> slot;
+        Clock::time_point opened_at;
+    };
+
+    // Duplicates of a row that was never inserted, waiting for the next batch.
+    struct Requeued {
+        nlohmann::json entry;
+        int64_t count{};
+        nlohmann::json last_seen;
+    };
+
+    [[nodiscard]] std::string key_of(const nlohmann::json& entry) const;
+    void expire(Clock::time_point now);
+    void close_failed(DedupSlot& slot);
+    void requeue(DedupPlan::Pending& pending);
+
+    DedupConfig cfg_;
+    std::string timestamp_field_;
+    Clock::duration window_;
+
+    mutable std::mutex mtx_;
+    std::unordered_map<std::string, Window> windows_;
+    std::deque<std::string> order_;  // keys of `windows_`, oldest first
+    std::vector<Requeued> requeued_;
+    int64_t collapsed_{};            // entries folded into another entry's row
+    int64_t updated_{};              // row updates issued
+    int64_t evicted_{};              // windows closed early to stay under max_keys
+    int64_t failed_{};               // rows not inserted; their windows were closed
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_DEDUP_HPP_
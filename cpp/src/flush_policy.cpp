@@ -0,0 +1,76 @@
+#include "flush_policy.hpp"
+
+#include <algorithm>
+#include <cmath>
+
+namespace loglite {
+
+namespace {
+
+// Weight of the newest sample in the moving averages.
+constexpr double kAlpha = 0.3;
+
+double ewma(double prev, double sample, bool& seeded) {
+    if (!seeded) {
+        seeded = true;
+        return sample;
+    }
+    return kAlpha * sample + (1.0 - kAlpha) * prev;
+}
+
+}  // namespace
+
+AdaptiveFlushPolicy::AdaptiveFlushPolicy(std::chrono::milliseconds target_latency,
+                                         std::size_t max_batch,
+                                         std::chrono::milliseconds max_wait)
+    : target_ms_(static_cast<double>(target_latency.count())),
+      max_batch_(std::max<std::size_t>(max_batch, 1)),
+      max_wait_ms_(static_cast<double>(max_wait.count())) {}
+
+void AdaptiveFlushPolicy::ObserveIngest(std::size_t rows,
+                                        std::chrono::steady_clock::duration elapsed) {
+    const double ms = std::chrono::duration<double, std::milli>(elapsed).count();
+    if (ms <= 0.0) return;
+    std::lock_guard lk(mtx_);
+    rate_per_ms_ = ewma(rate_per_ms_, static_cast<double>(rows) / ms, has_rate_);
+}
+
+void AdaptiveFlushPolicy::ObserveInsert(std::size_t rows, double elapsed_ms) {
+    if (rows == 0 || elapsed_ms < 0.0) return;
+    std::lock_guard lk(mtx_);
+    cost_ms_ = ewma(cost_ms_, elapsed_ms / static_cast<double>(rows), has_cost_);
+}
+
+FlushPlan AdaptiveFlushPolicy::Plan() const {
+    std::lock_guard lk(mtx_);
+    const double ideal = rate_per_ms_ * target_ms_ / (1.0 + rate_per_ms_ * cost_ms_);
+    const auto batch = static_cast<std::size_t>(
+        std::clamp(std::floor(ideal), 1.0, static_cast<double>(max_batch_)));
+    const double wait = std::clamp(target_ms_ - static_cast<double>(batch) * cost_ms_, 0.0,
+                                   max_wait_ms_);
+    return {batch, std::chrono::milliseconds{std::llround(wait)}};
+}
+
+double AdaptiveFlushPolicy::IngestRate() const {
+    std::lock_guard lk(mtx_);
+    return rate_per_ms_ * 1000.0;
+}
+
+double AdaptiveFlushPolicy::InsertCostMs() const {
+    std::lock_guard lk(mtx_);
+    return cost_ms_;
+}
+
+nlohmann::json AdaptiveFlushPolicy::ToJSON() const {
+    const auto plan = Plan();
+    return {
+        {"batch_size", plan.batch_size},
+        {"max_wait_ms", plan.max_wait.count()},
+        {"ingest_rate", IngestRate()},
+        {"insert_cost_ms", InsertCostMs()},
+        {"target_latency_ms", target_ms_},
+        {"max_batch", max_batch_},
+    };
+}
+
+}  // namespace loglite
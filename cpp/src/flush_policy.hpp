@@ -0,0 +1,65 @@
+#ifndef LOGLITE_FLUSH_POLICY_HPP_
+#define LOGLITE_FLUSH_POLICY_HPP_
+
+#include <chrono>
+#include <cstddef>
+#include <mutex>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+// ── Adaptive flush policy ─────────────────────────────────────────────────────
+//
+// Decides how large a batch FlushBacklogTask should wait for, and for how long,
+// so that an entry is committed roughly `target_latency` after it was ingested.
+//
+// Two moving averages drive the plan: the ingest rate r (rows/ms, measured
+// between flushes) and the insert cost c (ms/row, measured on the write strand).
+// Rows arriving while we wait w must still be inserted within the budget:
+//
+//     B = r·w   and   w + B·c = target   ⇒   B = r·target / (1 + r·c)
+//
+// B is clamped to [1, max_batch]; the wait is what is left of the budget after
+// inserting B rows, clamped to [0, max_wait].  At low rates this flushes every
+// entry almost immediately; under load it grows the batch until one insert
+// uses most of the latency budget.
+
+struct FlushPlan {
+    std::size_t batch_size{1};
+    std::chrono::milliseconds max_wait{};
+};
+
+class AdaptiveFlushPolicy {
+   public:
+    AdaptiveFlushPolicy(std::chrono::milliseconds target_latency, std::size_t max_batch,
+                        std::chrono::milliseconds max_wait);
+
+    // `rows` entries were added to the backlog over `elapsed`.
+    void ObserveIngest(std::size_t rows, std::chrono::steady_clock::duration elapsed);
+
+    // Inserting `rows` entries took `elapsed_ms` on the write strand.
+    void ObserveInsert(std::size_t rows, double elapsed_ms);
+
+    [[nodiscard]] FlushPlan Plan() const;
+
+    [[nodiscard]] double IngestRate() const;    // rows per second
+    [[nodiscard]] double InsertCostMs() const;  // ms per row
+
+    // Current estimates and plan, as reported by GET /stats.
+    [[nodiscard]] nlohmann::json ToJSON() const;
+
+   private:
+    mutable std::mutex mtx_;
+    double target_ms_;
+    std::size_t max_batch_;
+    double max_wait_ms_;
+    double rate_per_ms_{0.0};
+    double cost_ms_{0.0};
+    bool has_rate_{false};
+    bool has_cost_{false};
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_FLUSH_POLICY_HPP_
@@ -5,8 +5,12 @@
 #include "../utils.hpp"
 
 #include <boost/beast/http.hpp>
+#include <boost/beast/zlib/inflate_stream.hpp>
 #include <nlohmann/json.hpp>
 
+#include <array>
+#include <cstdint>
+#include <optional>
 #include <regex>
 #include <stdexcept>
 #include <string>
@@ -35,6 +39,24 @@ inline http::response<http::string_body> MakeJSONResponse(http::status status,
     return res;
 }
 
+// Non-JSON payloads (e.g. MessagePack); `body` is sent as-is.
+template <class Body>
+inline http::response<http::string_body> MakeBinaryResp(std::string body,
+                                                        std::string_view content_type,
+                                                        const http::request<Body>& req,
+                                                        std::string_view allow_origin = "*") {
+    http::response<http::string_body> res{http::status::ok, req.version()};
+    res.set(http::field::content_type, content_type);
+    res.set(http::field::vary, "Accept");
+    res.set(http::field::access_control_allow_origin, allow_origin);
+    res.set(http::field::access_control_allow_methods, "GET, POST, OPTIONS");
+    res.set(http::field::access_control_allow_headers, "Content-Type");
+    res.keep_alive(req.keep_alive());
+    res.body() = std::move(body);
+    res.prepare_payload();
+    return res;
+}
+
 template <class Body>
 inline http::response<http::string_body> MakeOKResp(const nlohmann::json& body,
                                                     const http::request<Body>& req,
@@ -56,6 +78,18 @@ inline http::response<http::string_body> MakeNotAvailableResp(const nlohmann::js
     return MakeJSONResponse(http::status::service_unavailable, body, req, origin);
 }
 
+// ── Content negotiation ───────────────────────────────────────────────────────
+
+inline constexpr std::string_view kMsgPackContentType = "application/msgpack";
+
+// True when the client asked for MessagePack (columnar) instead of JSON.
+template <class Body>
+inline bool AcceptsMsgPack(const http::request<Body>& req) {
+    const auto accept = req[http::field::accept];
+    return accept.find(kMsgPackContentType) != std::string_view::npos ||
+           accept.find("application/x-msgpack") != std::string_view::npos;
+}
+
 // ── Query-string parsing ──────────────────────────────────────────────────────
 
 // Parse a raw query string ("k1=v1&k2=v2") into a multimap.
@@ -104,6 +138,111 @@ inline std::optional<int> ParseIntParam(std::string_view s) {
     }
 }
 
+// As ParseIntParam, for values that may not fit an int (row ids).
+inline std::optional<int64_t> ParseInt64Param(std::string_view s) {
+    if (s.empty()) return std::nullopt;
+    for (char c : s) {
+        if (!std::isdigit(c) && c != '-') {
+            return std::nullopt;
+        }
+    }
+
+    try {
+        return std::stoll(std::string(s));
+    } catch (const std::invalid_argument&) {
+        return std::nullopt;
+    } catch (const std::out_of_range&) {
+        return std::nullopt;
+    }
+}
+
+// ── Request body decoding ─────────────────────────────────────────────────────
+
+// Upper bound for an inflated request body, so a small gzip bomb can't exhaust memory.
+inline constexpr std::size_t kMaxInflatedBodyBytes = 64 * 1024 * 1024;
+
+inline uint32_t Crc32(std::string_view data) {
+    static constexpr auto kTable = [] {
+        std::array<uint32_t, 256> t{};
+        for (uint32_t i = 0; i < 256; ++i) {
+            uint32_t c = i;
+            for (int k = 0; k < 8; ++k) c = (c & 1) ? 0xEDB88320u ^ (c >> 1) : c >> 1;
+            t[i] = c;
+        }
+        return t;
+    }();
+
+    uint32_t crc = 0xFFFFFFFFu;
+    for (char ch : data) crc = kTable[(crc ^ static_cast<uint8_t>(ch)) & 0xFF] ^ (crc >> 8);
+    return crc ^ 0xFFFFFFFFu;
+}
+
+// Decompress a gzip member (RFC 1952).  Returns std::nullopt on a malformed stream, a
+// truncated stream, or when the output would exceed kMaxInflatedBodyBytes.
+inline std::optional<std::string> Gunzip(std::string_view in) {
+    namespace zlib = boost::beast::zlib;
+
+    // Fixed 10-byte header: magic (1f 8b), method (8 = deflate), flags, mtime, xfl, os.
+    if (in.size() < 18 || static_cast<uint8_t>(in[0]) != 0x1f ||
+        static_cast<uint8_t>(in[1]) != 0x8b || in[2] != 8)
+        return std::nullopt;
+
+    const auto flags = static_cast<uint8_t>(in[3]);
+    std::size_t pos = 10;
+    auto skip_zero_terminated = [&] {
+        while (pos < in.size() && in[pos] != '\0') ++pos;
+        ++pos;
+    };
+    if (flags & 0x04) {  // FEXTRA
+        if (pos + 2 > in.size()) return std::nullopt;
+        pos += 2 + (static_cast<uint8_t>(in[pos]) | (static_cast<uint8_t>(in[pos + 1]) << 8));
+    }
+    if (flags & 0x08) skip_zero_terminated();  // FNAME
+    if (flags & 0x10) skip_zero_terminated();  // FCOMMENT
+    if (flags & 0x02) pos += 2;                // FHCRC
+    if (pos + 8 > in.size()) return std::nullopt;
+
+    // Trailer: CRC32 then ISIZE (uncompressed length mod 2^32), both little-endian.
+    auto read_u32le = [](const char* p) {
+        const auto* b = reinterpret_cast<const uint8_t*>(p);
+        return b[0] | (b[1] << 8) | (b[2] << 16) | (static_cast<uint32_t>(b[3]) << 24);
+    };
+    const uint32_t crc = read_u32le(in.data() + in.size() - 8);
+    const uint32_t isize = read_u32le(in.data() + in.size() - 4);
+
+    zlib::inflate_stream inflater;
+    zlib::z_params zs;
+    zs.next_in = in.data() + pos;
+    zs.avail_in = in.size() - pos - 8;
+
+    // ISIZE is client-controlled, so it only checks the result; the buffer starts from the
+    // compressed size and doubles as needed.
+    std::string out;
+    out.resize(std::min<std::size_t>(std::max<std::size_t>(4 * in.size(), 1024),
+                                     kMaxInflatedBodyBytes));
+    std::size_t produced = 0;
+    for (;;) {
+        if (produced == out.size()) {
+            if (out.size() >= kMaxInflatedBodyBytes) return std::nullopt;
+            out.resize(std::min(out.size() * 2, kMaxInflatedBodyBytes));
+        }
+        zs.next_out = out.data() + produced;
+        zs.avail_out = out.size() - produced;
+
+        boost::beast::error_code ec;
+        inflater.write(zs, zlib::Flush::sync, ec);
+        produced = out.size() - zs.avail_out;
+
+        if (ec == zlib::error::end_of_stream) break;
+        if (ec == zlib::error::need_buffers && zs.avail_out > 0) return std::nullopt;  // truncated
+        if (ec && ec != zlib::error::need_buffers) return std::nullopt;
+    }
+
+    out.resize(produced);
+    if (static_cast<uint32_t>(produced) != isize || Crc32(out) != crc) return std::nullopt;
+    return out;
+}
+
 // ── Filter expression parser ──────────────────────────────────────────────────
 //
 // Each query param value is one or more "<op><value>" tokens, comma-separated.
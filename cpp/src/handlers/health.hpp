@@ -9,8 +9,9 @@ namespace loglite::handlers {
 template <class Body>
 asio::awaitable<http::response<http::string_body>> HandleHealth(const http::request<Body>& req,
                                                                 ServerContext& ctx) {
-    bool ok_flag = co_await ctx.db_read.AsyncUseConnection(
-        ctx.reader_executor, [&](ReaderDatabase& r) { return r.Ping(); });
+    // On the priority lane, so a pool saturated by long queries still reports healthy.
+    bool ok_flag = co_await ctx.db_read.AsyncUsePriorityConnection(
+        [&](ReaderDatabase& r) { return r.Ping(); });
     if (ok_flag) {
         co_return MakeOKResp({{"status", "ok"}}, req, ctx.config.allow_origin);
     } else {
@@ -0,0 +1,53 @@
+#ifndef LOGLITE_HANDLERS_INDEX_ADVICE_HPP_
+#define LOGLITE_HANDLERS_INDEX_ADVICE_HPP_
+
+#include "common.hpp"
+#include "../context.hpp"
+#include "../index_advisor.hpp"
+#include "../log.hpp"
+
+#include <algorithm>
+
+namespace loglite::handlers {
+
+// GET /debug/index-advice[?format=migration]
+// Checks the filter shapes recorded from GET /logs and SSE queries against the
+// log table's indexes and query plans.  With format=migration the "index"
+// suggestions are returned as a YAML migrations block, numbered after the
+// highest configured migration version.
+template <class Body>
+asio::awaitable<http::response<http::string_body>> HandleIndexAdvice(
+    const http::request<Body>& req, ServerContext& ctx) {
+    auto [path, qs] = SplitURLTarget(req.target());
+    auto params = ParseQueryString(qs);
+
+    std::string format = "json";
+    if (auto it = params.find("format"); it != params.end()) format = it->second;
+    if (format != "json" && format != "migration")
+        co_return MakeFailResp(400, "Parameter 'format' must be 'json' or 'migration'", req,
+                               ctx.config.allow_origin);
+
+    try {
+        auto advice = co_await ctx.db_read.AsyncUseConnection(
+            ctx.reader_executor, [&](ReaderDatabase& r) {
+                return AdviseIndexes(r, ctx.config, ctx.workload.Snapshot(),
+                                     ctx.workload.Dropped());
+            });
+
+        if (format == "migration") {
+            int version = 0;
+            for (const auto& m : ctx.config.migrations) version = std::max(version, m.version);
+            co_return MakeBinaryResp(advice.ToMigrationYAML(version + 1),
+                                     "application/yaml; charset=utf-8", req,
+                                     ctx.config.allow_origin);
+        }
+        co_return MakeOKResp(advice.ToJSON(), req, ctx.config.allow_origin);
+    } catch (const std::exception& e) {
+        log::ERROR("Index advice error: {}", e.what());
+        co_return MakeFailResp(500, e.what(), req, ctx.config.allow_origin);
+    }
+}
+
+}  // namespace loglite::handlers
+
+#endif  // LOGLITE_HANDLERS_INDEX_ADVICE_HPP_
@@ -8,6 +8,9 @@
 
 #include <boost/asio.hpp>
 
+#include <string>
+#include <vector>
+
 namespace asio = boost::asio;
 
 namespace loglite::handlers {
@@ -18,19 +21,47 @@ asio::awaitable<http::response<http::string_body>> HandleInsert(const http::requ
     metrics::MetricsRegistry::Instance().Collect(metrics::kIngestRequest,
                                                  static_cast<double>(req.body().size()));
 
+    // Shippers may gzip large batches (Content-Encoding: gzip).
+    std::optional<std::string> inflated;
+    const auto encoding = req[http::field::content_encoding];
+    if (encoding == "gzip") {
+        inflated = Gunzip(req.body());
+        if (!inflated)
+            co_return MakeFailResp(400, "Invalid gzip body", req, ctx.config.allow_origin);
+    } else if (!encoding.empty() && encoding != "identity") {
+        co_return MakeFailResp(415, fmt::format("Unsupported Content-Encoding: {}", encoding),
+                               req, ctx.config.allow_origin);
+    }
+
     try {
-        auto body = nlohmann::json::parse(req.body());
+        auto body = nlohmann::json::parse(inflated ? *inflated : req.body());
 
+        std::vector<nlohmann::json> entries;
         if (body.is_array()) {
-            for (auto& entry : body) ctx.backlog.Add(std::move(entry));
+            entries.reserve(body.size());
+            for (auto& entry : body) entries.push_back(std::move(entry));
         } else if (body.is_object()) {
-            ctx.backlog.Add(std::move(body));
+            entries.push_back(std::move(body));
         } else {
             co_return MakeFailResp(400, "Body must be a JSON object or array", req,
                                    ctx.config.allow_origin);
         }
 
-        co_return MakeOKResp({{"status", "accepted"}}, req, ctx.config.allow_origin);
+        // Over-budget requests are refused as a whole so the client can retry them.
+        auto admission = ctx.admission.AdmitBatch(entries);
+        if (admission.rejected > 0) {
+            auto res = MakeJSONResponse(http::status::too_many_requests,
+                                        {{"error", "Ingest rate limit exceeded"},
+                                         {"retry_after", admission.retry_after.count()}},
+                                        req, ctx.config.allow_origin);
+            res.set(http::field::retry_after, std::to_string(admission.retry_after.count()));
+            co_return res;
+        }
+        for (auto& entry : entries) ctx.backlog.Add(std::move(entry));
+
+        nlohmann::json ok{{"status", "accepted"}};
+        if (admission.sampled > 0) ok["sampled"] = admission.sampled;
+        co_return MakeOKResp(ok, req, ctx.config.allow_origin);
     } catch (const nlohmann::json::parse_error& e) {
         co_return MakeFailResp(400, fmt::format("Invalid JSON: {}", e.what()), req,
                                ctx.config.allow_origin);
@@ -5,13 +5,35 @@
 #include "../context.hpp"
 #include "../log.hpp"
 #include "../metrics.hpp"
+#include "../shards.hpp"
 #include "../utils.hpp"
 
+#include <algorithm>
+#include <chrono>
+#include <concepts>
+#include <cstdint>
+#include <memory>
+#include <optional>
 #include <stdexcept>
 #include <unordered_set>
 
 namespace loglite::handlers {
 
+namespace detail {
+
+// Runs `f` on the reader pool and resumes on the caller's executor; for reads
+// that lease connections from several shards' pools.
+template <std::invocable F>
+asio::awaitable<std::invoke_result_t<F>> on_reader_pool(ServerContext& ctx, F f) {
+    auto caller_ex = co_await asio::this_coro::executor;
+    co_await asio::post(ctx.reader_executor, asio::use_awaitable);
+    auto result = f();
+    co_await asio::post(caller_ex, asio::use_awaitable);
+    co_return result;
+}
+
+}  // namespace detail
+
 template <class Body>
 asio::awaitable<http::response<http::string_body>> HandleQuery(const http::request<Body>& req,
                                                                ServerContext& ctx) {
@@ -37,6 +59,23 @@ asio::awaitable<http::response<http::string_body>> HandleQuery(const http::reque
     auto limit = *limit_opt;
     auto offset = *offset_opt;
 
+    // Optional keyset pagination: rows below this id, without a total count.
+    std::optional<int64_t> before_id;
+    if (auto it = params.find("before_id"); it != params.end()) {
+        before_id = ParseInt64Param(it->second);
+        if (!before_id || *before_id <= 0)
+            co_return MakeFailResp(400, "Parameter 'before_id' must be a positive integer", req,
+                                   ctx.config.allow_origin);
+    }
+
+    // Sharded reads fetch offset + limit rows from every shard (see shards.hpp).
+    if (ctx.Sharded() && offset > ctx.config.shards.max_offset)
+        co_return MakeFailResp(400,
+                               fmt::format("Parameter 'offset' must not exceed {} with sharded "
+                                           "writers; page with 'before_id' instead",
+                                           ctx.config.shards.max_offset),
+                               req, ctx.config.allow_origin);
+
     std::vector<std::string> fields;
     if (fields_str == "*") {
         fields = {"*"};
@@ -47,7 +86,8 @@ asio::awaitable<http::response<http::string_body>> HandleQuery(const http::reque
     }
 
     // ── Build filters from remaining params ───────────────────────────────────
-    static const std::unordered_set<std::string> reserved{"fields", "limit", "offset"};
+    static const std::unordered_set<std::string> reserved{
+        "fields", "limit", "offset", "before_id", "timeout_ms", "max_scan_rows"};
     std::vector<QueryFilter> filters;
 
     for (const auto& [key, value] : params) {
@@ -60,17 +100,121 @@ asio::awaitable<http::response<http::string_body>> HandleQuery(const http::reque
         for (auto& f : key_filters) filters.push_back(std::move(f));
     }
 
+    // ── Query budget ──────────────────────────────────────────────────────────
+    // `timeout_ms` / `max_scan_rows` can only tighten the configured limits.
+    auto budget_param = [&](const char* name, int64_t cap) -> std::optional<int64_t> {
+        auto it = params.find(name);
+        if (it == params.end()) return cap;
+        auto value = ParseIntParam(it->second);
+        if (!value || *value <= 0) return std::nullopt;
+        return cap > 0 ? std::min<int64_t>(*value, cap) : *value;
+    };
+    auto timeout_ms = budget_param("timeout_ms", ctx.config.query_timeout_ms);
+    auto max_scan_rows = budget_param("max_scan_rows", ctx.config.query_max_scan_rows);
+    if (!timeout_ms || !max_scan_rows)
+        co_return MakeFailResp(400,
+                               "Parameters 'timeout_ms' and 'max_scan_rows' must be positive "
+                               "integers",
+                               req, ctx.config.allow_origin);
+
+    auto budget =
+        std::make_shared<QueryBudget>(std::chrono::milliseconds{*timeout_ms}, *max_scan_rows);
+
+    // The server cancels this handler when the client disconnects mid-query.
+    auto cs = co_await asio::this_coro::cancellation_state;
+    if (cs.slot().is_connected())
+        cs.slot().assign([budget](asio::cancellation_type) { budget->Cancel(); });
+
     if (ctx.config.debug)
-        log::DEBUG("Query fields={} limit={} offset={} filters={}", fields_str, limit, offset,
-                   filters.size());
+        log::DEBUG("Query fields={} limit={} offset={} filters={} timeout_ms={} max_scan_rows={}",
+                   fields_str, limit, offset, filters.size(), *timeout_ms, *max_scan_rows);
 
     // ── Execute ───────────────────────────────────────────────────────────────
+    // Runs `query` and records it in the filter workload, also when the budget
+    // interrupts it.
+    auto recorded = [&](auto&& query) {
+        Timer timer;
+        try {
+            auto out = query();
+            ctx.workload.Record(filters, timer.elapsed_ms(), budget->ScannedRows());
+            return out;
+        } catch (const QueryInterrupted&) {
+            ctx.workload.Record(filters, timer.elapsed_ms(), budget->ScannedRows(), true);
+            throw;
+        }
+    };
+    auto run_recorded = [&](ReaderDatabase& r, auto&& query) {
+        ReaderDatabase::ScopedBudget scope{r, *budget};
+        return recorded(query);
+    };
+
     try {
+        // Shard mode: the first offset + limit rows of every shard, one shard after
+        // the other under the same budget, merged newest first (see shards.hpp).
+        if (ctx.Sharded()) {
+            const std::string order_field = before_id ? "id" : ctx.config.log_timestamp_field;
+            auto shard_fields = fields;
+            const bool strip = SelectOrderField(shard_fields, order_field);
+            auto page = co_await detail::on_reader_pool(ctx, [&] {
+                return recorded([&] {
+                    std::vector<PaginatedQueryResult> pages;
+                    for (auto& shard : ctx.shards) {
+                        pages.push_back(shard.db_read.UseConnection([&](ReaderDatabase& r) {
+                            ReaderDatabase::ScopedBudget scope{r, *budget};
+                            return r.Query(shard_fields, filters, limit + offset, 0, before_id);
+                        }));
+                    }
+                    return MergeShardPages(std::move(pages), order_field, limit, offset);
+                });
+            });
+            if (strip) StripField(page, order_field);
+
+            if (AcceptsMsgPack(req)) {
+                if (fields == std::vector<std::string>{"*"}) {
+                    fields.clear();
+                    for (const auto& ci : ctx.db_write.catalog()->log_column_info)
+                        fields.push_back(ci.name);
+                }
+                co_return MakeBinaryResp(ToColumnar(page, fields).ToMsgPack(),
+                                         kMsgPackContentType, req, ctx.config.allow_origin);
+            }
+            co_return MakeOKResp(page.ToJSON(), req, ctx.config.allow_origin);
+        }
+
+        if (AcceptsMsgPack(req)) {
+            auto columns = co_await ctx.db_read.AsyncUseConnection(
+                ctx.reader_executor, [&](ReaderDatabase& r) {
+                    return run_recorded(r, [&] {
+                        return r.QueryColumns(fields, filters, limit, offset, before_id);
+                    });
+                });
+            co_return MakeBinaryResp(columns.ToMsgPack(), kMsgPackContentType, req,
+                                     ctx.config.allow_origin);
+        }
+
         auto result = co_await ctx.db_read.AsyncUseConnection(
-            ctx.reader_executor,
-            [&](ReaderDatabase& r) { return r.Query(fields, filters, limit, offset); });
+            ctx.reader_executor, [&](ReaderDatabase& r) {
+                return run_recorded(
+                    r, [&] { return r.Query(fields, filters, limit, offset, before_id); });
+            });
         co_return MakeOKResp(result.ToJSON(), req, ctx.config.allow_origin);
+    } catch (const QueryInterrupted& e) {
+        if (e.Reason() == BudgetExceeded::kScanLimit) {
+            log::WARN("Query rejected: {}", e.what());
+            co_return MakeFailResp(400, e.what(), req, ctx.config.allow_origin);
+        }
+        if (e.Reason() == BudgetExceeded::kTimeout) {
+            log::WARN("Query rejected: {}", e.what());
+        } else {
+            log::DEBUG("Query cancelled: client disconnected");
+        }
+        co_return MakeFailResp(503, e.what(), req, ctx.config.allow_origin);
     } catch (const std::exception& e) {
+        // Cancellation may also surface as operation_aborted from the executor hops.
+        if (budget->Cancelled()) {
+            log::DEBUG("Query cancelled: client disconnected");
+            co_return MakeFailResp(503, "Query cancelled", req, ctx.config.allow_origin);
+        }
         log::ERROR("Query error: {}", e.what());
         co_return MakeFailResp(500, e.what(), req, ctx.config.allow_origin);
     }
@@ -3,10 +3,12 @@
 
 #include "common.hpp"
 #include "health.hpp"
+#include "index_advice.hpp"
 #include "insert.hpp"
 #include "query.hpp"
 #include "schema.hpp"
 #include "settings.hpp"
+#include "snapshot.hpp"
 #include "stats.hpp"
 #include "version_route.hpp"
 #include "../context.hpp"
@@ -40,6 +42,9 @@ constexpr std::array kRoutes{
     RouteEntry{"/stats", http::verb::get, &HandleStats<http::string_body>},
     RouteEntry{"/settings", http::verb::get, &HandleSettings<http::string_body>},
     RouteEntry{"/schema", http::verb::get, &HandleSchema<http::string_body>},
+    RouteEntry{"/admin/snapshot", http::verb::post, &HandleSnapshotCreate<http::string_body>},
+    RouteEntry{"/admin/snapshot", http::verb::get, &HandleSnapshotStatus<http::string_body>},
+    RouteEntry{"/debug/index-advice", http::verb::get, &HandleIndexAdvice<http::string_body>},
 };
 
 inline asio::awaitable<std::optional<StringResponse>> Dispatch(std::string_view path,
@@ -27,6 +27,8 @@ inline nlohmann::json BuildSettingsPayload(const Config& cfg) {
                   "SQLite table name used to store log records.");
     AppendSetting(settings, "log_timestamp_field", cfg.log_timestamp_field,
                   "Column used for time-based retention and vacuum (ISO-8601 timestamps).");
+    AppendSetting(settings, "json_fields", cfg.json_fields,
+                  "JSON paths stored as indexed generated columns for fast filtering.");
 
     nlohmann::json sqlite_params = nlohmann::json::object();
     for (const auto& [k, v] : cfg.sqlite_params) {
@@ -37,6 +39,12 @@ inline nlohmann::json BuildSettingsPayload(const Config& cfg) {
 
     AppendSetting(settings, "db_pool_size", cfg.db_pool_size, "Reader connection pool size");
 
+    AppendSetting(settings, "query_timeout_ms", cfg.query_timeout_ms,
+                  "Default and maximum time budget of a GET /logs query, in ms (0 = unlimited).");
+
+    AppendSetting(settings, "query_max_scan_rows", cfg.query_max_scan_rows,
+                  "Maximum rows a GET /logs query may scan without an index (0 = unlimited).");
+
     AppendSetting(settings, "auto_rollout", cfg.auto_rollout,
                   "Whether pending migrations are applied automatically on server startup.");
 
@@ -45,11 +53,19 @@ inline nlohmann::json BuildSettingsPayload(const Config& cfg) {
     AppendSetting(settings, "task_vacuum_interval", cfg.task_vacuum_interval,
                   "Seconds between incremental SQLite vacuum passes.");
     AppendSetting(settings, "task_backlog_flush_interval", cfg.task_backlog_flush_interval,
-                  "Seconds between backlog flush passes to SQLite.");
+                  "Upper bound in seconds on how long the backlog flush task sleeps.");
     AppendSetting(settings, "task_backlog_max_size", cfg.task_backlog_max_size,
-                  "Maximum backlog entries before a forced flush to the database.");
+                  "Maximum backlog entries; the oldest are dropped beyond this.");
+    AppendSetting(settings, "task_backlog_target_latency_ms", cfg.task_backlog_target_latency_ms,
+                  "Target milliseconds from ingestion to commit; sizes adaptive flush batches.");
+    AppendSetting(settings, "task_backlog_max_batch", cfg.task_backlog_max_batch,
+                  "Maximum rows written by one backlog flush transaction.");
     AppendSetting(settings, "task_vacuum_max_size", cfg.task_vacuum_max_size,
                   "Megabyte budget per incremental vacuum pass.");
+    AppendSetting(settings, "task_vacuum_chunk_ms", cfg.task_vacuum_chunk_ms,
+                  "Milliseconds each retention delete chunk aims to hold the writer for.");
+    AppendSetting(settings, "task_checkpoint_interval", cfg.task_checkpoint_interval,
+                  "Seconds between WAL checkpoint passes.");
 
     AppendSetting(settings, "vacuum_max_days", cfg.vacuum_max_days,
                   "Drop log rows older than this many days during vacuum.");
@@ -57,8 +73,16 @@ inline nlohmann::json BuildSettingsPayload(const Config& cfg) {
                   "Trigger vacuum when the database file exceeds this size.");
     AppendSetting(settings, "vacuum_target_size", cfg.vacuum_target_size,
                   "After vacuum, trim oldest rows until the database is under this size.");
+    AppendSetting(settings, "wal_checkpoint_size", cfg.wal_checkpoint_size,
+                  "WAL file size that triggers a truncating checkpoint.");
     AppendSetting(settings, "stats_retention_hours", cfg.stats_retention_hours,
                   "Hours to retain collected stats rows before pruning.");
+    nlohmann::json stats_rollups = nlohmann::json::array();
+    for (const auto& tier : cfg.stats_rollups) {
+        stats_rollups.push_back(fmt::format("{}s:{}h", tier.resolution, tier.retention_hours));
+    }
+    AppendSetting(settings, "stats_rollups", stats_rollups,
+                  "Downsampled stats tiers as resolution (seconds) : retention (hours).");
 
     AppendSetting(settings, "compression_enabled", cfg.compression.enabled,
                   "Whether dictionary compression is enabled for configured log columns.");
@@ -69,6 +93,8 @@ inline nlohmann::json BuildSettingsPayload(const Config& cfg) {
     }
     AppendSetting(settings, "harvester_types", harvester_types,
                   "Harvester implementation types configured for this instance.");
+    AppendSetting(settings, "harvester_ring_size", cfg.harvester_ring_size,
+                  "Shared-memory ring size per Python harvester worker process.");
 
     return {{"settings", settings}};
 }
@@ -0,0 +1,223 @@
+#ifndef LOGLITE_HANDLERS_SNAPSHOT_HPP_
+#define LOGLITE_HANDLERS_SNAPSHOT_HPP_
+
+#include "common.hpp"
+#include "../context.hpp"
+#include "../log.hpp"
+#include "../snapshot.hpp"
+#include "../tasks/snapshot.hpp"
+
+#include <boost/asio.hpp>
+#include <boost/beast.hpp>
+#include <boost/beast/http/chunk_encode.hpp>
+
+#include <chrono>
+#include <concepts>
+#include <exception>
+#include <fmt/format.h>
+#include <fstream>
+#include <memory>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <type_traits>
+#include <zstd.h>
+
+namespace asio = boost::asio;
+namespace beast = boost::beast;
+namespace http = beast::http;
+
+namespace loglite::handlers {
+
+using namespace std::chrono_literals;
+
+// ── POST /admin/snapshot ──────────────────────────────────────────────────────
+//
+// Starts a background snapshot (see tasks::SnapshotTask) and returns 202 with its
+// status; 409 if one is already running, 501 with sharded writers (a snapshot is
+// a single database file).
+
+template <class Body>
+asio::awaitable<http::response<http::string_body>> HandleSnapshotCreate(
+    const http::request<Body>& req, ServerContext& ctx) {
+    const auto& origin = ctx.config.allow_origin;
+    if (ctx.Sharded()) {
+        co_return MakeFailResp(501, "Snapshots are not supported with sharded writers", req,
+                               origin);
+    }
+    auto dest = ctx.config.snapshot_dir / SnapshotFileName(std::chrono::system_clock::now());
+
+    if (!ctx.snapshot.TryStart(dest)) {
+        co_return MakeJSONResponse(http::status::conflict,
+                                   {{"error", "A snapshot is already running"},
+                                    {"snapshot", ctx.snapshot.Get().ToJSON()}},
+                                   req, origin);
+    }
+
+    auto ex = co_await asio::this_coro::executor;
+    asio::co_spawn(ex, tasks::SnapshotTask(ctx, std::move(dest)), [](std::exception_ptr eptr) {
+        if (eptr) log::ERROR("[snapshot] task terminated unexpectedly");
+    });
+
+    co_return MakeJSONResponse(http::status::accepted, {{"snapshot", ctx.snapshot.Get().ToJSON()}},
+                               req, origin);
+}
+
+// ── GET /admin/snapshot ───────────────────────────────────────────────────────
+
+template <class Body>
+asio::awaitable<http::response<http::string_body>> HandleSnapshotStatus(
+    const http::request<Body>& req, ServerContext& ctx) {
+    co_return MakeOKResp({{"snapshot", ctx.snapshot.Get().ToJSON()}}, req,
+                         ctx.config.allow_origin);
+}
+
+// ── GET /admin/snapshot/download ──────────────────────────────────────────────
+//
+// Streams the newest completed snapshot as a chunked response.  With
+// ?compress=zstd the file is zstd-compressed on the fly (application/zstd,
+// "<name>.db.zst"), so no compressed copy is ever written to disk.  Like SSE, it
+// owns the stream and closes the connection when done.
+
+inline constexpr std::size_t kSnapshotChunkBytes = 256 * 1024;
+
+namespace detail {
+
+// Reads a snapshot file kSnapshotChunkBytes at a time, zstd-compressing it when
+// a compression context is given.
+class SnapshotChunks {
+   public:
+    SnapshotChunks(std::ifstream in, bool zstd)
+        : in_(std::move(in)),
+          cctx_(zstd ? ZSTD_createCCtx() : nullptr, &ZSTD_freeCCtx),
+          buf_(kSnapshotChunkBytes, '\0'),
+          out_(zstd ? ZSTD_CStreamOutSize() : 0, '\0') {}
+
+    // The next chunk to send, possibly empty; valid until the next call.  Sets
+    // `done` with the last one.
+    std::string_view Next(bool& done) {
+        in_.read(buf_.data(), static_cast<std::streamsize>(buf_.size()));
+        const auto n = static_cast<std::size_t>(in_.gcount());
+        done = in_.eof() || n == 0;
+        if (in_.bad()) throw std::runtime_error("read error");
+        if (!cctx_) return {buf_.data(), n};
+
+        pending_.clear();
+        ZSTD_inBuffer zin{buf_.data(), n, 0};
+        const auto mode = done ? ZSTD_e_end : ZSTD_e_continue;
+        std::size_t left = 0;
+        do {
+            ZSTD_outBuffer zout{out_.data(), out_.size(), 0};
+            left = ZSTD_compressStream2(cctx_.get(), &zout, &zin, mode);
+            if (ZSTD_isError(left)) throw std::runtime_error(ZSTD_getErrorName(left));
+            pending_.append(out_.data(), zout.pos);
+        } while (done ? left != 0 : zin.pos < zin.size);
+        return pending_;
+    }
+
+   private:
+    std::ifstream in_;
+    std::unique_ptr<ZSTD_CCtx, decltype(&ZSTD_freeCCtx)> cctx_;
+    std::string buf_;
+    std::string out_;
+    std::string pending_;
+};
+
+// Runs `f` on `ex` and resumes on the caller's executor, rethrowing there.
+template <class Executor, std::invocable F>
+asio::awaitable<std::invoke_result_t<F>> run_on(Executor ex, F f) {
+    auto caller_ex = co_await asio::this_coro::executor;
+    co_await asio::post(ex, asio::use_awaitable);
+    std::optional<std::invoke_result_t<F>> result;
+    std::exception_ptr eptr;
+    try {
+        result.emplace(f());
+    } catch (...) {
+        eptr = std::current_exception();
+    }
+    co_await asio::post(caller_ex, asio::use_awaitable);
+    if (eptr) std::rethrow_exception(eptr);
+    co_return std::move(*result);
+}
+
+}  // namespace detail
+
+inline asio::awaitable<void> HandleSnapshotDownload(beast::tcp_stream stream,
+                                                    http::request<http::string_body> req,
+                                                    ServerContext& ctx) {
+    const auto& origin = ctx.config.allow_origin;
+    auto [path, qs] = SplitURLTarget(req.target());
+    auto params = ParseQueryString(qs);
+
+    auto send_simple = [&](http::response<http::string_body> res) -> asio::awaitable<void> {
+        res.keep_alive(false);
+        try {
+            co_await http::async_write(stream, res, asio::use_awaitable);
+        } catch (...) {
+        }
+    };
+
+    bool zstd = false;
+    if (auto it = params.find("compress"); it != params.end() && it->second != "none") {
+        if (it->second != "zstd") {
+            co_await send_simple(
+                MakeFailResp(400, "Parameter 'compress' must be 'zstd' or 'none'", req, origin));
+            co_return;
+        }
+        zstd = true;
+    }
+
+    auto file = LatestSnapshot(ctx.config.snapshot_dir);
+    std::ifstream in;
+    if (file) in.open(*file, std::ios::binary);
+    if (!file || !in) {
+        co_await send_simple(MakeFailResp(404, "No snapshot available", req, origin));
+        co_return;
+    }
+
+    auto filename = file->filename().string();
+    if (zstd) filename += ".zst";
+
+    http::response<http::empty_body> res{http::status::ok, req.version()};
+    res.set(http::field::content_type, zstd ? "application/zstd" : "application/vnd.sqlite3");
+    res.set(http::field::content_disposition, fmt::format("attachment; filename=\"{}\"", filename));
+    res.set(http::field::access_control_allow_origin, origin);
+    res.keep_alive(false);
+    res.chunked(true);
+
+    http::response_serializer<http::empty_body> sr{res};
+    try {
+        stream.expires_after(60s);
+        co_await http::async_write_header(stream, sr, asio::use_awaitable);
+    } catch (...) {
+        co_return;
+    }
+
+    detail::SnapshotChunks chunks{std::move(in), zstd};
+    try {
+        bool done = false;
+        while (!done) {
+            // Disk reads and compression run on the reader pool, so a large download
+            // never stalls the other connections on this thread; only the socket
+            // writes happen here.
+            auto chunk = co_await detail::run_on(ctx.reader_executor,
+                                                 [&] { return chunks.Next(done); });
+            if (chunk.empty()) continue;
+
+            stream.expires_after(60s);
+            co_await asio::async_write(stream, http::make_chunk(asio::buffer(chunk)),
+                                       asio::use_awaitable);
+        }
+        co_await asio::async_write(stream, http::make_chunk_last(), asio::use_awaitable);
+    } catch (const std::exception& e) {
+        log::WARN("Snapshot download of {} aborted: {}", filename, e.what());
+    }
+
+    beast::error_code ec;
+    stream.socket().shutdown(asio::ip::tcp::socket::shutdown_send, ec);
+}
+
+}  // namespace loglite::handlers
+
+#endif  // LOGLITE_HANDLERS_SNAPSHOT_HPP_
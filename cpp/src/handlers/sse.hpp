@@ -5,6 +5,7 @@
 #include "../context.hpp"
 #include "../log.hpp"
 #include "../metrics.hpp"
+#include "../shards.hpp"
 #include "../utils.hpp"
 
 #include <boost/asio.hpp>
@@ -13,6 +14,7 @@
 
 #include <chrono>
 #include <sstream>
+#include <vector>
 
 namespace asio = boost::asio;
 namespace beast = boost::beast;
@@ -31,7 +33,10 @@ using namespace std::chrono_literals;
 //   3. Arms the timer to expire after sse_debounce_ms.
 //      - If notify() cancels the timer early → new logs available.
 //      - If timer fires normally → check for any logs missed during processing.
-//   4. Queries DB for id > pushed_id AND id <= current_id and sends SSE chunk.
+//   4. Queries DB for id > pushed_id AND id <= current_id, plus any filters given
+//      in the query string (same syntax as GET /logs), and sends an SSE chunk.
+//      With sharded writers the ids are tracked per shard, and the new rows of
+//      every shard are merged newest first.
 //   5. On write error (client disconnect), returns.
 
 inline asio::awaitable<void> HandleSSE(beast::tcp_stream stream,
@@ -52,6 +57,38 @@ inline asio::awaitable<void> HandleSSE(beast::tcp_stream stream,
         fields = {"*"};
     }
 
+    // ── Parse filters; reject bad ones before the stream starts ───────────────
+    std::vector<QueryFilter> filters;
+    std::string filter_error;
+    for (const auto& [key, value] : params) {
+        if (key == "fields") continue;
+        auto key_filters = ParseQueryFilters(key, value);
+        if (key_filters.empty()) {
+            filter_error = fmt::format("Invalid filter expression for field '{}'", key);
+            break;
+        }
+        for (auto& f : key_filters) filters.push_back(std::move(f));
+    }
+    if (filter_error.empty() && !filters.empty()) {
+        try {
+            co_await ctx.db_read.AsyncUsePriorityConnection([&](ReaderDatabase& r) {
+                r.ValidateFilters(filters);
+                return true;
+            });
+        } catch (const std::exception& e) {
+            filter_error = e.what();
+        }
+    }
+    if (!filter_error.empty()) {
+        auto res = MakeFailResp(400, filter_error, req, origin);
+        res.keep_alive(false);
+        try {
+            co_await http::async_write(stream, res, asio::use_awaitable);
+        } catch (...) {
+        }
+        co_return;
+    }
+
     // ── Send response headers ─────────────────────────────────────────────────
     stream.expires_never();
     http::response<http::empty_body> res{http::status::ok, req.version()};
@@ -76,7 +113,13 @@ inline asio::awaitable<void> HandleSSE(beast::tcp_stream stream,
     auto unsub = std::unique_ptr<LogNotifier, std::function<void(LogNotifier*)>>(
         &ctx.notifier, [&sub](LogNotifier* n) { n->Unsubscribe(sub); });
 
-    int64_t pushed_id = ctx.notifier.GetLastId();
+    const auto shards = ctx.shards.size();
+    std::vector<int64_t> pushed_ids(shards);
+    for (std::size_t i = 0; i < shards; ++i) pushed_ids[i] = ctx.notifier.GetLastId(i);
+    std::vector<int64_t> current_ids(shards);
+    auto shard_fields = fields;
+    const bool strip = shards > 1 && SelectOrderField(shard_fields, cfg.log_timestamp_field);
+
     auto last_push_tp = std::chrono::steady_clock::time_point{};
     auto last_write_tp = std::chrono::steady_clock::now();
 
@@ -92,8 +135,12 @@ inline asio::awaitable<void> HandleSSE(beast::tcp_stream stream,
         // ec == success        → timer fired (timeout, still check for anything missed)
         // ec == operation_aborted → cancelled by notify() (new logs available)
 
-        int64_t current_id = ctx.notifier.GetLastId();
-        if (current_id <= pushed_id) {
+        bool fresh = false;
+        for (std::size_t i = 0; i < shards; ++i) {
+            current_ids[i] = ctx.notifier.GetLastId(i);
+            fresh = fresh || current_ids[i] > pushed_ids[i];
+        }
+        if (!fresh) {
             // Keep-alive: send an empty comment chunk every 15s to keep proxy/client connection
             // open and force socket write to detect disconnects.
             auto now = std::chrono::steady_clock::now();
@@ -115,22 +162,41 @@ inline asio::awaitable<void> HandleSSE(beast::tcp_stream stream,
             continue;
 
         // ── Query new logs ────────────────────────────────────────────────────
-        std::vector<QueryFilter> id_filters{
-            {"id", ">", pushed_id},
-            {"id", "<=", current_id},
-        };
         PaginatedQueryResult result;
         try {
-            result = co_await ctx.db_read.AsyncUseConnection(
-                ctx.reader_executor,
-                [&](ReaderDatabase& r) { return r.Query(fields, id_filters, cfg.sse_limit, 0); });
+            std::vector<PaginatedQueryResult> pages;
+            for (auto& shard : ctx.shards) {
+                const auto i = shard.index;
+                if (current_ids[i] <= pushed_ids[i]) continue;
+                std::vector<QueryFilter> id_filters{
+                    {"id", ">", pushed_ids[i]},
+                    {"id", "<=", current_ids[i]},
+                };
+                id_filters.insert(id_filters.end(), filters.begin(), filters.end());
+                // Polls only read rows past `pushed_ids`, so they are short; the priority
+                // lane keeps them flowing while long GET /logs queries hold the pool.
+                pages.push_back(
+                    co_await shard.db_read.AsyncUsePriorityConnection([&](ReaderDatabase& r) {
+                        Timer timer;
+                        auto out = r.Query(shard_fields, id_filters, cfg.sse_limit, 0);
+                        ctx.workload.Record(id_filters, timer.elapsed_ms());
+                        return out;
+                    }));
+            }
+            if (pages.size() == 1) {
+                result = std::move(pages.front());
+            } else {
+                result = MergeShardPages(std::move(pages), cfg.log_timestamp_field,
+                                         cfg.sse_limit, 0);
+            }
+            if (strip) StripField(result, cfg.log_timestamp_field);
         } catch (const std::exception& e) {
             log::ERROR("SSE query error: {}", e.what());
             continue;
         }
 
         if (result.results.empty()) {
-            pushed_id = current_id;
+            pushed_ids = current_ids;
             continue;
         }
 
@@ -151,7 +217,7 @@ inline asio::awaitable<void> HandleSSE(beast::tcp_stream stream,
             break;  // client disconnected
         }
 
-        pushed_id = current_id;
+        pushed_ids = current_ids;
         last_push_tp = now;
         last_write_tp = now;
 
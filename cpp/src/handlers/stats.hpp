@@ -5,6 +5,7 @@
 #include "../context.hpp"
 #include "../log.hpp"
 
+#include <algorithm>
 #include <chrono>
 #include <fmt/format.h>
 #include <ranges>
@@ -41,7 +42,17 @@ asio::awaitable<http::response<http::string_body>> HandleStats(const http::reque
                                    ctx.config.allow_origin);
     }
 
-    // ── Parse timestamps, validate window ≤ 1 day ────────────────────────────
+    // Optional point budget; lets the window reach back as far as the rollup tiers do.
+    int max_points = 0;
+    if (auto it = params.find("max_points"); it != params.end()) {
+        auto parsed = ParseIntParam(it->second);
+        if (!parsed || *parsed < 1)
+            co_return MakeFailResp(400, "Parameter 'max_points' must be a positive integer", req,
+                                   ctx.config.allow_origin);
+        max_points = *parsed;
+    }
+
+    // ── Parse timestamps, validate window ─────────────────────────────────────
     auto since_tp = loglite::parse_iso8601(since_str);
     auto until_tp = loglite::parse_iso8601(until_str);
     if (!since_tp || !until_tp)
@@ -51,10 +62,18 @@ asio::awaitable<http::response<http::string_body>> HandleStats(const http::reque
     if (*until_tp <= *since_tp)
         co_return MakeFailResp(400, "'until' must be after 'since'", req, ctx.config.allow_origin);
 
-    if (*until_tp - *since_tp > 24h)
-        co_return MakeFailResp(400, "Time window must not exceed 1 day", req,
+    if (max_points == 0 && *until_tp - *since_tp > 24h)
+        co_return MakeFailResp(400, "Time window must not exceed 1 day without 'max_points'", req,
                                ctx.config.allow_origin);
 
+    int max_retention_hours = ctx.config.stats_retention_hours;
+    for (const auto& tier : ctx.config.stats_rollups)
+        max_retention_hours = std::max(max_retention_hours, tier.retention_hours);
+    if (*until_tp - *since_tp > max_retention_hours * 1h)
+        co_return MakeFailResp(
+            400, fmt::format("Time window must not exceed {} hours", max_retention_hours), req,
+            ctx.config.allow_origin);
+
     // ── Resolve field lists ──────────────────────────────────────────────────
     auto split_fields = [](std::string_view s) -> std::vector<std::string> {
         if (s == "*") return {"*"};
@@ -72,12 +91,12 @@ asio::awaitable<http::response<http::string_body>> HandleStats(const http::reque
         auto activities =
             co_await ctx.db_read.AsyncUseConnection(ctx.reader_executor, [&](ReaderDatabase& r) {
                 return r.QueryActivityStats(since_str, until_str, split_fields(activity_fields_str),
-                                            ordering);
+                                            ordering, max_points);
             });
         auto database =
             co_await ctx.db_read.AsyncUseConnection(ctx.reader_executor, [&](ReaderDatabase& r) {
                 return r.QueryDatabaseStats(since_str, until_str, split_fields(database_fields_str),
-                                            ordering);
+                                            ordering, max_points);
             });
 
         const auto uptime_s = std::chrono::duration_cast<std::chrono::seconds>(
@@ -86,11 +105,32 @@ asio::awaitable<http::response<http::string_body>> HandleStats(const http::reque
 
         nlohmann::json body{
             {"activities",
-             {{"fields", std::move(activities.fields)}, {"data", std::move(activities.data)}}},
+             {{"fields", std::move(activities.fields)},
+              {"data", std::move(activities.data)},
+              {"resolution", activities.resolution}}},
             {"database",
-             {{"fields", std::move(database.fields)}, {"data", std::move(database.data)}}},
+             {{"fields", std::move(database.fields)},
+              {"data", std::move(database.data)},
+              {"resolution", database.resolution}}},
             {"uptime", uptime_s},
+            {"flush", ctx.shards.front().flush_policy.ToJSON()},
+            {"admission", ctx.admission.ToJSON()},
+            {"dedup", ctx.shards.front().dedup.ToJSON()},
+            {"checkpoint", ctx.shards.front().checkpoints.ToJSON()},
         };
+        // Shard mode: the sections above are shard 0's; each shard is listed here.
+        if (ctx.Sharded()) {
+            auto shards = nlohmann::json::array();
+            for (const auto& shard : ctx.shards) {
+                shards.push_back({
+                    {"backlog", shard.backlog.Size()},
+                    {"flush", shard.flush_policy.ToJSON()},
+                    {"dedup", shard.dedup.ToJSON()},
+                    {"checkpoint", shard.checkpoints.ToJSON()},
+                });
+            }
+            body["shards"] = std::move(shards);
+        }
         co_return MakeOKResp(body, req, ctx.config.allow_origin);
     } catch (const std::exception& e) {
         log::ERROR("Stats query error: {}", e.what());
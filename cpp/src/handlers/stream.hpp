@@ -0,0 +1,284 @@
+#ifndef LOGLITE_HANDLERS_STREAM_HPP_
+#define LOGLITE_HANDLERS_STREAM_HPP_
+
+#include "common.hpp"
+#include "../context.hpp"
+#include "../log.hpp"
+#include "../metrics.hpp"
+
+#include <boost/asio.hpp>
+#include <boost/beast.hpp>
+#include <boost/beast/http/chunk_encode.hpp>
+
+#include <chrono>
+#include <cstdint>
+#include <limits>
+#include <string>
+#include <string_view>
+
+namespace asio = boost::asio;
+namespace beast = boost::beast;
+namespace http = beast::http;
+
+namespace loglite::handlers {
+
+using namespace std::chrono_literals;
+
+inline constexpr std::size_t kStreamReadBytes = 64 * 1024;
+inline constexpr std::size_t kStreamMaxLineBytes = 1024 * 1024;
+inline constexpr std::int64_t kStreamAckEveryLines = 10000;
+inline constexpr auto kStreamAckInterval = 1s;
+inline constexpr auto kStreamIdleTimeout = 60s;
+inline constexpr auto kStreamBackpressurePause = 10ms;
+
+// ── NDJSON line splitter ──────────────────────────────────────────────────────
+//
+// Reassembles lines across arbitrary read boundaries.  Complete lines (without
+// the trailing "\n" or "\r\n") are passed to `on_line`; blank lines are skipped.
+// Feed() returns false once a line grows beyond `max_line_bytes` without a
+// newline, after which the stream cannot be resynchronised.
+
+class NdjsonLineBuffer {
+   public:
+    explicit NdjsonLineBuffer(std::size_t max_line_bytes = kStreamMaxLineBytes)
+        : max_line_bytes_(max_line_bytes) {}
+
+    template <class OnLine>
+    bool Feed(std::string_view data, OnLine&& on_line) {
+        while (!data.empty()) {
+            const auto nl = data.find('\n');
+            if (nl == std::string_view::npos) {
+                partial_.append(data);
+                return partial_.size() <= max_line_bytes_;
+            }
+            if (partial_.empty()) {
+                emit(data.substr(0, nl), on_line);
+            } else {
+                partial_.append(data.substr(0, nl));
+                if (partial_.size() > max_line_bytes_) return false;
+                emit(partial_, on_line);
+                partial_.clear();
+            }
+            data.remove_prefix(nl + 1);
+        }
+        return true;
+    }
+
+    // Flush a final line that was not newline-terminated.
+    template <class OnLine>
+    void Finish(OnLine&& on_line) {
+        emit(partial_, on_line);
+        partial_.clear();
+    }
+
+   private:
+    template <class OnLine>
+    static void emit(std::string_view line, OnLine& on_line) {
+        if (line.ends_with('\r')) line.remove_suffix(1);
+        if (line.find_first_not_of(" \t") == std::string_view::npos) return;
+        on_line(line);
+    }
+
+    std::size_t max_line_bytes_;
+    std::string partial_;
+};
+
+namespace detail {
+
+struct StreamTotals {
+    std::int64_t accepted{};
+    std::int64_t rejected{};
+    std::int64_t sampled{};
+    std::int64_t throttled{};
+    std::int64_t bytes{};
+    std::int64_t lines{};
+    std::string last_error;
+
+    [[nodiscard]] std::string AckLine(bool done, std::string_view error = {}) const {
+        nlohmann::json ack{{"accepted", accepted}, {"rejected", rejected}};
+        if (sampled > 0) ack["sampled"] = sampled;
+        if (throttled > 0) ack["throttled"] = throttled;
+        if (!last_error.empty()) ack["last_rejection"] = last_error;
+        if (done) ack["done"] = true;
+        if (!error.empty()) ack["error"] = error;
+        return ack.dump() + "\n";
+    }
+};
+
+}  // namespace detail
+
+// ── POST /logs/stream ─────────────────────────────────────────────────────────
+//
+// Long-lived NDJSON ingest: one JSON object per line, usually sent with
+// Transfer-Encoding: chunked.  Like SSE, it owns the stream; `header` is the
+// caller's parser with only the request header read.
+//   1. Validates the headers (Content-Type: application/x-ndjson, no
+//      Content-Encoding) and answers "Expect: 100-continue".
+//   2. Sends 200 headers with a chunked application/x-ndjson response.
+//   3. Reads the body in kStreamReadBytes pieces with no body limit and adds
+//      each complete line to the backlog as it arrives.  Invalid lines are
+//      counted and reported, not fatal.
+//   4. Every kStreamAckInterval or kStreamAckEveryLines lines, writes an ack
+//      line {"accepted": N, "rejected": M, ...} with running totals.  Entries
+//      dropped by admission control are counted as "sampled" / "throttled".
+//   5. While the backlog is near capacity it stops reading, so TCP flow
+//      control pushes back on the client instead of entries being dropped.
+//   6. At the end of the body writes a final ack with "done": true and closes.
+
+inline asio::awaitable<void> HandleLogStream(beast::tcp_stream stream, beast::flat_buffer buf,
+                                             http::request_parser<http::empty_body>& header,
+                                             ServerContext& ctx) {
+    const auto& origin = ctx.config.allow_origin;
+    const auto& req = header.get();
+
+    auto send_simple = [&](http::response<http::string_body> res) -> asio::awaitable<void> {
+        res.keep_alive(false);
+        try {
+            co_await http::async_write(stream, res, asio::use_awaitable);
+        } catch (...) {
+        }
+    };
+
+    if (!req[http::field::content_type].starts_with("application/x-ndjson")) {
+        co_await send_simple(
+            MakeFailResp(415, "Content-Type must be application/x-ndjson", req, origin));
+        co_return;
+    }
+    if (const auto enc = req[http::field::content_encoding]; !enc.empty() && enc != "identity") {
+        co_await send_simple(MakeFailResp(
+            415, fmt::format("Unsupported Content-Encoding for streaming: {}", enc), req, origin));
+        co_return;
+    }
+
+    try {
+        if (beast::iequals(req[http::field::expect], "100-continue")) {
+            http::response<http::empty_body> cont{http::status::continue_, req.version()};
+            co_await http::async_write(stream, cont, asio::use_awaitable);
+        }
+
+        http::response<http::empty_body> res{http::status::ok, req.version()};
+        res.set(http::field::content_type, "application/x-ndjson");
+        res.set(http::field::cache_control, "no-cache");
+        res.set(http::field::access_control_allow_origin, origin);
+        res.keep_alive(false);
+        res.chunked(true);
+        http::response_serializer<http::empty_body> sr{res};
+        stream.expires_after(kStreamIdleTimeout);
+        co_await http::async_write_header(stream, sr, asio::use_awaitable);
+    } catch (...) {
+        co_return;
+    }
+
+    http::request_parser<http::buffer_body> parser{std::move(header)};
+    parser.body_limit(std::numeric_limits<std::uint64_t>::max());
+
+    auto ex = co_await asio::this_coro::executor;
+    asio::steady_timer pause{ex};
+    NdjsonLineBuffer lines;
+    detail::StreamTotals totals;
+    std::string chunk(kStreamReadBytes, '\0');
+    std::string error;
+
+    auto on_line = [&](std::string_view line) {
+        ++totals.lines;
+        try {
+            auto entry = nlohmann::json::parse(line);
+            if (!entry.is_object()) {
+                ++totals.rejected;
+                totals.last_error = fmt::format("line {}: must be a JSON object", totals.lines);
+                return;
+            }
+            switch (ctx.admission.Admit(entry)) {
+            case AdmissionDecision::kSample:
+                ++totals.sampled;
+                return;
+            case AdmissionDecision::kReject:
+                ++totals.throttled;
+                return;
+            case AdmissionDecision::kAdmit:
+                break;
+            }
+            ctx.backlog.Add(std::move(entry));
+            ++totals.accepted;
+        } catch (const nlohmann::json::parse_error&) {
+            ++totals.rejected;
+            totals.last_error = fmt::format("line {}: invalid JSON", totals.lines);
+        }
+    };
+
+    auto window_started = std::chrono::steady_clock::now();
+    std::int64_t window_bytes = 0;
+    std::int64_t acked_lines = 0;
+
+    // Writes a running-total ack and records the window as one ingest observation.
+    auto ack = [&](bool done) -> asio::awaitable<void> {
+        if (window_bytes > 0) {
+            metrics::MetricsRegistry::Instance().Collect(metrics::kIngestRequest,
+                                                         static_cast<double>(window_bytes));
+        }
+        window_bytes = 0;
+        window_started = std::chrono::steady_clock::now();
+        acked_lines = totals.lines;
+
+        auto line = totals.AckLine(done, error);
+        stream.expires_after(kStreamIdleTimeout);
+        co_await asio::async_write(stream, http::make_chunk(asio::buffer(line)),
+                                   asio::use_awaitable);
+    };
+
+    try {
+        while (!parser.is_done()) {
+            while (ctx.backlog.NearCapacity() && !ctx.StopRequested()) {
+                pause.expires_after(kStreamBackpressurePause);
+                co_await pause.async_wait(asio::as_tuple(asio::use_awaitable));
+            }
+            if (ctx.StopRequested()) {
+                error = "server is shutting down";
+                break;
+            }
+
+            parser.get().body().data = chunk.data();
+            parser.get().body().size = chunk.size();
+            stream.expires_after(kStreamIdleTimeout);
+            auto [ec, _] =
+                co_await http::async_read(stream, buf, parser, asio::as_tuple(asio::use_awaitable));
+            if (ec && ec != http::error::need_buffer) {
+                error = ec.message();
+                break;
+            }
+
+            const auto n = chunk.size() - parser.get().body().size;
+            totals.bytes += static_cast<std::int64_t>(n);
+            window_bytes += static_cast<std::int64_t>(n);
+            if (!lines.Feed({chunk.data(), n}, on_line)) {
+                error = fmt::format("line {} exceeds {} bytes", totals.lines + 1,
+                                    kStreamMaxLineBytes);
+                break;
+            }
+            if (parser.is_done()) lines.Finish(on_line);
+
+            if (totals.lines - acked_lines >= kStreamAckEveryLines ||
+                std::chrono::steady_clock::now() - window_started >= kStreamAckInterval) {
+                co_await ack(false);
+            }
+        }
+
+        co_await ack(true);
+        co_await asio::async_write(stream, http::make_chunk_last(), asio::use_awaitable);
+    } catch (const std::exception& e) {
+        log::WARN("Log stream aborted after {} line(s): {}", totals.lines, e.what());
+    }
+
+    if (!error.empty())
+        log::WARN("Log stream ended after {} line(s): {}", totals.lines, error);
+    else
+        log::DEBUG("Log stream finished: {} accepted, {} rejected, {} bytes", totals.accepted,
+                   totals.rejected, totals.bytes);
+
+    beast::error_code ec;
+    stream.socket().shutdown(asio::ip::tcp::socket::shutdown_send, ec);
+}
+
+}  // namespace loglite::handlers
+
+#endif  // LOGLITE_HANDLERS_STREAM_HPP_
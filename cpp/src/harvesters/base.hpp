@@ -1,18 +1,22 @@
 #ifndef LOGLITE_HARVESTERS_BASE_HPP_
 #define LOGLITE_HARVESTERS_BASE_HPP_
 
+#include "../admission.hpp"
 #include "../backlog.hpp"
 #include "../log.hpp"
 
 #include <nlohmann/json.hpp>
 #include <string>
+#include <vector>
 
 namespace loglite::harvesters {
 
 // ── Harvester base ─────────────────────────────────────────────────────────────
 //
 // All harvesters own a reference to the shared Backlog and push JSON log entries
-// via ingest().  Concrete harvesters implement start() / stop().
+// via ingest().  Concrete harvesters implement start() / stop().  When an
+// AdmissionController is attached, entries it samples out or throttles are
+// dropped before reaching the backlog.
 
 class Harvester {
    public:
@@ -25,11 +29,27 @@ class Harvester {
 
     std::string_view Name() const { return name_; }
 
+    void SetAdmission(AdmissionController* admission) { admission_ = admission; }
+
    protected:
-    void Ingest(nlohmann::json entry) { backlog_.Add(std::move(entry)); }
+    void Ingest(nlohmann::json entry) {
+        if (admission_ && admission_->Admit(entry) != AdmissionDecision::kAdmit) return;
+        backlog_.Add(std::move(entry));
+    }
+
+    // Ingest() for a batch: admitted entries go into the backlog under one lock.
+    void IngestBatch(std::vector<nlohmann::json> entries) {
+        if (admission_) {
+            std::erase_if(entries, [this](const nlohmann::json& entry) {
+                return admission_->Admit(entry) != AdmissionDecision::kAdmit;
+            });
+        }
+        backlog_.AddBatch(std::move(entries));
+    }
 
     std::string name_;
     Backlog& backlog_;
+    AdmissionController* admission_{nullptr};
 };
 
 }  // namespace loglite::harvesters
@@ -0,0 +1,129 @@
+#ifndef LOGLITE_HARVESTERS_RING_HPP_
+#define LOGLITE_HARVESTERS_RING_HPP_
+
+#include "base.hpp"
+#include "../shm_ring.hpp"
+
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <mutex>
+#include <string>
+#include <thread>
+
+namespace loglite::harvesters {
+
+// ── RingHarvester ──────────────────────────────────────────────────────────────
+//
+// Drains the shared-memory ring of one Python harvester worker process (see
+// `loglite.harvesters.worker`) into the backlog.  Each record is one JSON
+// object serialized by the worker.
+//
+// Behavior:
+//   - The ring is created here, so it exists for the lifetime of the server;
+//     workers that are restarted reopen the same ring.
+//   - Up to `max_batch` records are drained per pass; when the ring is empty
+//     the thread backs off from `min_idle` up to `max_idle`.
+//   - While the backlog is near capacity, records are left in the ring and the
+//     worker's pushes start failing (counted as drops) instead of evicting
+//     entries already queued.
+
+class RingHarvester final : public Harvester {
+   public:
+    struct Options {
+        std::size_t max_batch{1024};
+        std::chrono::milliseconds min_idle{1};
+        std::chrono::milliseconds max_idle{20};
+    };
+
+    RingHarvester(std::string name, std::size_t capacity, Backlog& backlog)
+        : RingHarvester(std::move(name), capacity, backlog, Options{}) {}
+
+    RingHarvester(std::string name, std::size_t capacity, Backlog& backlog, Options options)
+        : Harvester(std::move(name), backlog),
+          ring_(ShmRing::Create(ShmRing::NameFor(name_), capacity)),
+          options_(options) {}
+
+    void Start() override {
+        std::lock_guard lock(lifecycle_mutex_);
+        if (thread_.joinable()) return;
+
+        thread_ = std::jthread{[this](std::stop_token st) noexcept { run_safely(st); }};
+        log::INFO("RingHarvester '{}' started: draining {} ({} bytes)", name_, ring_.Name(),
+                  ring_.Capacity());
+    }
+
+    void Stop() override {
+        std::lock_guard lock(lifecycle_mutex_);
+        if (!thread_.joinable()) return;
+
+        thread_.request_stop();
+        thread_.join();
+        log::INFO("RingHarvester '{}' stopped", name_);
+    }
+
+    [[nodiscard]] const ShmRing& Ring() const noexcept { return ring_; }
+
+   private:
+    void run_safely(std::stop_token st) noexcept {
+        try {
+            run(st);
+        } catch (const std::exception& e) {
+            log::ERROR("RingHarvester '{}': reader terminated unexpectedly: {}", name_, e.what());
+        } catch (...) {
+            log::ERROR("RingHarvester '{}': reader terminated due to unknown exception", name_);
+        }
+    }
+
+    void run(std::stop_token st) {
+        std::string record;
+        auto idle = options_.min_idle;
+        uint64_t reported_drops = ring_.Dropped();
+
+        while (!st.stop_requested()) {
+            std::size_t drained = 0;
+            while (drained < options_.max_batch && !backlog_.NearCapacity() &&
+                   ring_.TryPop(record)) {
+                ingest_record(record);
+                ++drained;
+            }
+
+            if (const uint64_t drops = ring_.Dropped(); drops != reported_drops) {
+                log::WARN("RingHarvester '{}': worker dropped {} entries (ring full)", name_,
+                          drops - reported_drops);
+                reported_drops = drops;
+            }
+
+            if (drained == options_.max_batch) {
+                idle = options_.min_idle;
+                continue;
+            }
+            std::this_thread::sleep_for(idle);
+            idle = drained > 0 ? options_.min_idle : std::min(idle * 2, options_.max_idle);
+        }
+
+        // Whatever the worker managed to write before shutdown still goes in.
+        while (ring_.TryPop(record)) {
+            ingest_record(record);
+        }
+    }
+
+    void ingest_record(const std::string& record) {
+        auto entry = nlohmann::json::parse(record, nullptr, false);
+        if (entry.is_discarded() || !entry.is_object()) {
+            log::WARN("RingHarvester '{}': dropping malformed record ({} bytes)", name_,
+                      record.size());
+            return;
+        }
+        Ingest(std::move(entry));
+    }
+
+    ShmRing ring_;
+    Options options_;
+    std::mutex lifecycle_mutex_;
+    std::jthread thread_;
+};
+
+}  // namespace loglite::harvesters
+
+#endif  // LOGLITE_HARVESTERS_RING_HPP_
@@ -0,0 +1,264 @@
+#ifndef LOGLITE_HARVESTERS_ZMQ_HPP_
+#define LOGLITE_HARVESTERS_ZMQ_HPP_
+
+#include "base.hpp"
+#include "../utils.hpp"
+
+#include <algorithm>
+#include <cctype>
+#include <cerrno>
+#include <chrono>
+#include <cstddef>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include <zmq.h>
+
+namespace loglite::harvesters {
+
+// ── ZmqHarvester ───────────────────────────────────────────────────────────────
+//
+// Receives JSON log entries from a ZeroMQ PULL or SUB socket.  Native
+// counterpart of the Python `loglite.harvesters.ZMQHarvester`, with the same
+// config keys (`endpoint`, `socket_type`, `bind`) plus `subscribe`.
+//
+// Behavior:
+//   - The thread blocks in zmq_poll() for at most `poll_interval`, then drains
+//     every pending message without blocking (up to `max_batch`) and pushes
+//     them into the backlog in one batch.
+//   - A frame holding a JSON object is one entry; a JSON array of objects is
+//     several.  In a multipart message every JSON frame is parsed, so a leading
+//     non-JSON envelope frame (e.g. a SUB topic) is skipped.
+//   - Entries without a `timestamp` get the receive time.
+//   - While the backlog is near capacity, messages are left in the socket:
+//     PUSH senders block at their high-water mark, PUB senders drop.
+//   - Socket setup errors (bad endpoint, address in use) are logged and end the
+//     thread, as in the Python harvester.
+
+class ZmqHarvester final : public Harvester {
+   public:
+    enum class SocketType { kPull, kSub };
+
+    struct Options {
+        SocketType socket_type{SocketType::kPull};
+
+        // Bind to the endpoint instead of connecting to it.
+        bool bind{false};
+
+        // SUB topic prefix; empty subscribes to everything.
+        std::string subscribe;
+
+        // Longest wait per wakeup; also bounds how long Stop() takes.
+        std::chrono::milliseconds poll_interval{100};
+
+        // Most messages drained per wakeup.
+        std::size_t max_batch{4096};
+    };
+
+    ZmqHarvester(std::string name, std::string endpoint, Backlog& backlog)
+        : ZmqHarvester(std::move(name), std::move(endpoint), backlog, Options{}) {}
+
+    ZmqHarvester(std::string name, std::string endpoint, Backlog& backlog, Options options)
+        : Harvester(std::move(name), backlog),
+          endpoint_(std::move(endpoint)),
+          options_(options) {}
+
+    // Options from a harvester definition's `config` map (`endpoint` is read by
+    // the caller); throws std::invalid_argument for unknown values.
+    static Options ParseOptions(const std::map<std::string, std::string>& config) {
+        Options options;
+        if (auto it = config.find("socket_type"); it != config.end()) {
+            if (it->second == "PULL") {
+                options.socket_type = SocketType::kPull;
+            } else if (it->second == "SUB") {
+                options.socket_type = SocketType::kSub;
+            } else {
+                throw std::invalid_argument("invalid socket_type '" + it->second +
+                                            "' (expected PULL or SUB)");
+            }
+        }
+        if (auto it = config.find("bind"); it != config.end()) {
+            std::string value = it->second;
+            std::ranges::transform(value, value.begin(), ::tolower);
+            if (value == "true" || value == "1" || value == "yes") {
+                options.bind = true;
+            } else if (value == "false" || value == "0" || value == "no") {
+                options.bind = false;
+            } else {
+                throw std::invalid_argument("invalid bind '" + it->second + "'");
+            }
+        }
+        if (auto it = config.find("subscribe"); it != config.end()) {
+            options.subscribe = it->second;
+        }
+        return options;
+    }
+
+    void Start() override {
+        std::lock_guard lock(lifecycle_mutex_);
+        if (thread_.joinable()) {
+            log::WARN("ZmqHarvester '{}': Start() called while already running", name_);
+            return;
+        }
+
+        thread_ = std::jthread{[this](std::stop_token st) noexcept { run_safely(st); }};
+        log::INFO("ZmqHarvester '{}' started: {} {}", name_,
+                  options_.bind ? "bound to" : "connecting to", endpoint_);
+    }
+
+    void Stop() override {
+        std::lock_guard lock(lifecycle_mutex_);
+        if (!thread_.joinable()) return;
+
+        thread_.request_stop();
+        thread_.join();
+        log::INFO("ZmqHarvester '{}' stopped", name_);
+    }
+
+   private:
+    // Context and socket are created and closed on the harvester thread; ZeroMQ
+    // sockets must not migrate between threads.
+    struct Socket {
+        void* context{zmq_ctx_new()};
+        void* socket{};
+
+        ~Socket() {
+            if (socket) {
+                int linger = 0;
+                zmq_setsockopt(socket, ZMQ_LINGER, &linger, sizeof(linger));
+                zmq_close(socket);
+            }
+            if (context) zmq_ctx_term(context);
+        }
+    };
+
+    static std::string zmq_error() { return zmq_strerror(zmq_errno()); }
+
+    void run_safely(std::stop_token st) noexcept {
+        try {
+            run(st);
+        } catch (const std::exception& e) {
+            log::ERROR("ZmqHarvester '{}': receiver terminated unexpectedly: {}", name_, e.what());
+        } catch (...) {
+            log::ERROR("ZmqHarvester '{}': receiver terminated due to unknown exception", name_);
+        }
+    }
+
+    bool open(Socket& s) {
+        if (!s.context) throw std::runtime_error("zmq_ctx_new: " + zmq_error());
+        const int type = options_.socket_type == SocketType::kSub ? ZMQ_SUB : ZMQ_PULL;
+        s.socket = zmq_socket(s.context, type);
+        if (!s.socket) throw std::runtime_error("zmq_socket: " + zmq_error());
+
+        if (type == ZMQ_SUB && zmq_setsockopt(s.socket, ZMQ_SUBSCRIBE, options_.subscribe.data(),
+                                              options_.subscribe.size()) != 0) {
+            throw std::runtime_error("ZMQ_SUBSCRIBE: " + zmq_error());
+        }
+
+        const int rc = options_.bind ? zmq_bind(s.socket, endpoint_.c_str())
+                                     : zmq_connect(s.socket, endpoint_.c_str());
+        if (rc != 0) {
+            log::ERROR("ZmqHarvester '{}': failed to {} {}: {}", name_,
+                       options_.bind ? "bind" : "connect to", endpoint_, zmq_error());
+            return false;
+        }
+        return true;
+    }
+
+    void run(std::stop_token st) {
+        Socket s;
+        if (!open(s)) return;
+
+        const auto poll_ms = static_cast<long>(options_.poll_interval.count());
+        std::vector<nlohmann::json> batch;
+        while (!st.stop_requested()) {
+            if (backlog_.NearCapacity()) {
+                std::this_thread::sleep_for(options_.poll_interval);
+                continue;
+            }
+
+            zmq_pollitem_t item{s.socket, 0, ZMQ_POLLIN, 0};
+            const int ready = zmq_poll(&item, 1, poll_ms);
+            if (ready < 0) {
+                if (zmq_errno() == EINTR) continue;
+                throw std::runtime_error("zmq_poll: " + zmq_error());
+            }
+            if (ready == 0) continue;
+
+            drain(s.socket, batch);
+            if (!batch.empty()) {
+                IngestBatch(std::move(batch));
+                batch.clear();
+            }
+        }
+    }
+
+    // Receives pending messages without blocking until the socket is empty or
+    // `max_batch` messages were read.
+    void drain(void* socket, std::vector<nlohmann::json>& batch) {
+        zmq_msg_t frame;
+        zmq_msg_init(&frame);
+        std::size_t messages = 0;
+        std::size_t malformed = 0;
+
+        while (messages < options_.max_batch) {
+            if (zmq_msg_recv(&frame, socket, ZMQ_DONTWAIT) < 0) {
+                if (zmq_errno() == EAGAIN || zmq_errno() == EINTR) break;
+                zmq_msg_close(&frame);
+                throw std::runtime_error("zmq_msg_recv: " + zmq_error());
+            }
+            ++messages;
+
+            // All frames of a multipart message are already queued together.
+            bool parsed = parse_frame(frame, batch);
+            while (zmq_msg_more(&frame)) {
+                if (zmq_msg_recv(&frame, socket, ZMQ_DONTWAIT) < 0) break;
+                parsed = parse_frame(frame, batch) || parsed;
+            }
+            if (!parsed) ++malformed;
+        }
+        zmq_msg_close(&frame);
+
+        if (malformed > 0) {
+            log::WARN("ZmqHarvester '{}': dropped {} malformed message(s)", name_, malformed);
+        }
+        if (batch.empty()) return;
+
+        const auto now = format_utc(std::chrono::system_clock::now());
+        for (auto& entry : batch) {
+            if (!entry.contains("timestamp")) entry["timestamp"] = now;
+        }
+    }
+
+    // Appends the entries held by one frame; false if it held none.
+    static bool parse_frame(zmq_msg_t& frame, std::vector<nlohmann::json>& batch) {
+        const auto* data = static_cast<const char*>(zmq_msg_data(&frame));
+        auto payload = nlohmann::json::parse(data, data + zmq_msg_size(&frame), nullptr, false);
+        if (payload.is_object()) {
+            batch.push_back(std::move(payload));
+            return true;
+        }
+        if (!payload.is_array()) return false;
+
+        bool any = false;
+        for (auto& element : payload) {
+            if (!element.is_object()) continue;
+            batch.push_back(std::move(element));
+            any = true;
+        }
+        return any;
+    }
+
+    std::string endpoint_;
+    Options options_;
+    std::mutex lifecycle_mutex_;
+    std::jthread thread_;
+};
+
+}  // namespace loglite::harvesters
+
+#endif  // LOGLITE_HARVESTERS_ZMQ_HPP_
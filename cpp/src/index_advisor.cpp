@@ -0,0 +1,332 @@
+#include "index_advisor.hpp"
+
+#include "config.hpp"
+#include "reader_database.hpp"
+#include "utils.hpp"
+
+#include <algorithm>
+#include <fmt/format.h>
+#include <iterator>
+#include <ranges>
+
+namespace loglite {
+
+namespace {
+
+// A partial index is proposed when an equality field saw at most this many values.
+constexpr std::size_t kPartialMaxValues = 3;
+
+std::string op_class(std::string_view op) {
+    if (op == "=" || op == "!=" || op == "~=") return std::string(op);
+    return "range";
+}
+
+std::string value_text(const nlohmann::json& v) {
+    return v.is_string() ? v.get<std::string>() : v.dump();
+}
+
+std::string sql_quote(std::string_view s) {
+    std::string out = "'";
+    for (char c : s) {
+        if (c == '\'') out += '\'';
+        out += c;
+    }
+    return out + "'";
+}
+
+std::string join(const std::vector<std::string>& parts, std::string_view sep) {
+    std::string out;
+    for (const auto& p : parts) {
+        if (!out.empty()) out += sep;
+        out += p;
+    }
+    return out;
+}
+
+}  // namespace
+
+// ── FilterWorkload ────────────────────────────────────────────────────────────
+
+std::string FilterShapeStats::Key() const {
+    std::string key;
+    for (const auto& [field, op] : terms) {
+        if (!key.empty()) key += ", ";
+        key += field + " " + op;
+    }
+    return key;
+}
+
+void FilterWorkload::Record(const std::vector<QueryFilter>& filters, double elapsed_ms,
+                            int64_t scanned_rows, bool interrupted) {
+    if (filters.empty()) return;
+
+    FilterShapeStats probe;
+    for (const auto& f : filters) probe.terms.emplace_back(f.field, op_class(f.op));
+    std::ranges::sort(probe.terms);
+    const auto [first, last] = std::ranges::unique(probe.terms);
+    probe.terms.erase(first, last);
+    auto key = probe.Key();
+
+    std::lock_guard lk(mtx_);
+    auto it = shapes_.find(key);
+    if (it == shapes_.end()) {
+        if (shapes_.size() >= kMaxShapes) {
+            ++dropped_;
+            return;
+        }
+        it = shapes_.emplace(std::move(key), std::move(probe)).first;
+    }
+
+    auto& shape = it->second;
+    ++shape.count;
+    shape.total_ms += elapsed_ms;
+    shape.max_ms = std::max(shape.max_ms, elapsed_ms);
+    shape.scanned_rows += scanned_rows;
+    if (interrupted) ++shape.interrupted;
+    shape.sample = filters;
+
+    for (const auto& f : filters) {
+        if (f.op != "=" || shape.eq_overflow[f.field]) continue;
+        auto& values = shape.eq_values[f.field];
+        ++values[value_text(f.value)];
+        if (values.size() > kMaxValuesPerField) {
+            values.clear();
+            shape.eq_overflow[f.field] = true;
+        }
+    }
+}
+
+std::vector<FilterShapeStats> FilterWorkload::Snapshot() const {
+    std::vector<FilterShapeStats> out;
+    {
+        std::lock_guard lk(mtx_);
+        out.reserve(shapes_.size());
+        for (const auto& [_, shape] : shapes_) out.push_back(shape);
+    }
+    std::ranges::sort(out, std::greater<>{}, &FilterShapeStats::total_ms);
+    return out;
+}
+
+int64_t FilterWorkload::Dropped() const {
+    std::lock_guard lk(mtx_);
+    return dropped_;
+}
+
+// ── Advice ────────────────────────────────────────────────────────────────────
+
+nlohmann::json IndexAdvice::ToJSON() const {
+    nlohmann::json idx = nlohmann::json::array();
+    for (const auto& ii : indexes) {
+        idx.push_back({{"name", ii.name},
+                       {"columns", ii.columns},
+                       {"unique", ii.unique},
+                       {"partial", ii.partial},
+                       {"sql", ii.sql}});
+    }
+
+    nlohmann::json sugg = nlohmann::json::array();
+    for (const auto& s : suggestions) {
+        sugg.push_back({{"name", s.name},
+                        {"kind", s.kind},
+                        {"sql", s.create_sql},
+                        {"rollback", s.drop_sql},
+                        {"reason", s.reason},
+                        {"queries", s.queries},
+                        {"total_ms", s.total_ms}});
+    }
+
+    return {{"table", table},
+            {"indexes", std::move(idx)},
+            {"shapes", shapes},
+            {"suggestions", std::move(sugg)},
+            {"dropped_queries", dropped}};
+}
+
+std::string IndexAdvice::ToMigrationYAML(int version) const {
+    // JSON strings are valid double-quoted YAML scalars.
+    auto scalar = [](const std::string& s) { return nlohmann::json(s).dump(); };
+
+    std::string rollout, rollback;
+    for (const auto& s : suggestions) {
+        if (s.kind == "index") {
+            rollout += fmt::format("      - {}\n", scalar(s.create_sql));
+            rollback += fmt::format("      - {}\n", scalar(s.drop_sql));
+        } else {
+            rollout +=
+                fmt::format("      # Alternative ({}): - {}\n", s.kind, scalar(s.create_sql));
+        }
+    }
+    if (rollback.empty()) return "# No index suggestions for the recorded filter workload.\n";
+
+    return fmt::format(
+        "# Suggested by GET /debug/index-advice for table {}. Review before applying.\n"
+        "migrations:\n"
+        "  - version: {}\n"
+        "    rollout:\n{}"
+        "    rollback:\n{}",
+        table, version, rollout, rollback);
+}
+
+IndexAdvice AdviseIndexes(const ReaderDatabase& db, const Config& cfg,
+                          const std::vector<FilterShapeStats>& shapes, int64_t dropped) {
+    IndexAdvice advice;
+    advice.table = cfg.log_table_name;
+    advice.indexes = db.ListLogIndexes();
+    advice.dropped = dropped;
+    const auto catalog = db.catalog();
+
+    auto add_suggestion = [&](IndexSuggestion s, const FilterShapeStats& shape) {
+        auto it = std::ranges::find(advice.suggestions, s.create_sql, &IndexSuggestion::create_sql);
+        if (it == advice.suggestions.end()) {
+            advice.suggestions.push_back(std::move(s));
+            it = std::prev(advice.suggestions.end());
+        }
+        it->queries += shape.count;
+        it->total_ms += shape.total_ms;
+        return it->name;
+    };
+
+    for (const auto& shape : shapes) {
+        nlohmann::json terms = nlohmann::json::array();
+        for (const auto& [field, op] : shape.terms) terms.push_back({{"field", field}, {"op", op}});
+        nlohmann::json entry{{"filters", std::move(terms)},
+                             {"count", shape.count},
+                             {"total_ms", shape.total_ms},
+                             {"avg_ms", shape.count ? shape.total_ms / shape.count : 0.0},
+                             {"max_ms", shape.max_ms},
+                             {"scanned_rows", shape.scanned_rows},
+                             {"interrupted", shape.interrupted}};
+
+        std::vector<std::string> plan;
+        try {
+            plan = db.ExplainQuery(shape.sample);
+        } catch (const std::exception& e) {
+            entry["error"] = e.what();
+            advice.shapes.push_back(std::move(entry));
+            continue;
+        }
+        const bool searched =
+            std::ranges::any_of(plan, [](const auto& line) { return line.starts_with("SEARCH"); });
+        entry["plan"] = plan;
+        entry["uses_index"] = searched;
+
+        nlohmann::json notes = nlohmann::json::array();
+        nlohmann::json suggested = nlohmann::json::array();
+        if (!searched) {
+            // Index key: equality columns, then one range column.
+            std::vector<std::string> eq;
+            std::string range;
+            std::map<std::string, std::string> column_of;  // eq column → filter field
+            for (const auto& [field, op] : shape.terms) {
+                std::string column = field;
+                if (auto it = catalog->json_field_columns.find(field);
+                    it != catalog->json_field_columns.end()) {
+                    column = it->second;
+                } else if (JsonFieldPath::Parse(field)) {
+                    notes.push_back(fmt::format(
+                        "'{}' is not listed in json_fields; add it there to index this path",
+                        field));
+                    continue;
+                } else if (catalog->zstd_columns.contains(field)) {
+                    notes.push_back(fmt::format(
+                        "'{}' is zstd-compressed; filters on it cannot use an index", field));
+                    continue;
+                }
+
+                if (op == "~=") {
+                    notes.push_back(fmt::format(
+                        "substring filters (~=) on '{}' cannot use an index", field));
+                } else if (op == "!=") {
+                    notes.push_back(
+                        fmt::format("'!=' on '{}' cannot narrow an index search", field));
+                } else if (op == "=") {
+                    eq.push_back(column);
+                    column_of[column] = field;
+                } else if (range.empty() || column == cfg.log_timestamp_field) {
+                    range = column;
+                }
+            }
+
+            std::vector<std::string> columns = eq;
+            if (!range.empty() && !range_contains(eq, range)) columns.push_back(range);
+
+            if (columns.empty()) {
+                notes.push_back("no filter in this shape can be served by an index");
+            } else if (auto existing = std::ranges::find_if(
+                           advice.indexes,
+                           [&](const IndexInfo& ii) {
+                               return !ii.partial && ii.columns.size() >= columns.size() &&
+                                      std::equal(columns.begin(), columns.end(),
+                                                 ii.columns.begin());
+                           });
+                       existing != advice.indexes.end()) {
+                notes.push_back(fmt::format(
+                    "index '{}' covers these columns but the planner does not use it; "
+                    "try running ANALYZE",
+                    existing->name));
+            } else {
+                const auto reason =
+                    fmt::format("[{}] scans {} ({} queries, {:.1f} ms avg)", shape.Key(),
+                                cfg.log_table_name, shape.count,
+                                shape.count ? shape.total_ms / shape.count : 0.0);
+
+                IndexSuggestion full;
+                full.name = fmt::format("idx_{}_{}", cfg.log_table_name, join(columns, "_"));
+                full.kind = "index";
+                full.create_sql = fmt::format("CREATE INDEX IF NOT EXISTS {} ON {}({})", full.name,
+                                              cfg.log_table_name, join(columns, ", "));
+                full.drop_sql = fmt::format("DROP INDEX IF EXISTS {}", full.name);
+                full.reason = reason;
+                suggested.push_back(add_suggestion(std::move(full), shape));
+
+                // Partial alternative on the equality field with the fewest observed values.
+                const std::map<std::string, int64_t>* best = nullptr;
+                std::string best_column;
+                for (const auto& column : eq) {
+                    const auto& field = column_of[column];
+                    if (field != column || catalog->compressed_columns.contains(field)) continue;
+                    auto it = shape.eq_values.find(field);
+                    if (it == shape.eq_values.end() || it->second.empty() ||
+                        it->second.size() > kPartialMaxValues)
+                        continue;
+                    if (!best || it->second.size() < best->size()) {
+                        best = &it->second;
+                        best_column = column;
+                    }
+                }
+                if (best) {
+                    std::vector<std::string> rest;
+                    for (const auto& c : columns)
+                        if (c != best_column) rest.push_back(c);
+                    if (rest.empty()) rest.push_back(best_column);
+
+                    std::vector<std::string> terms_sql;
+                    for (const auto& [value, _] : *best)
+                        terms_sql.push_back(fmt::format("{} = {}", best_column, sql_quote(value)));
+
+                    IndexSuggestion partial;
+                    partial.name = fmt::format("idx_{}_{}_where_{}", cfg.log_table_name,
+                                               join(rest, "_"), best_column);
+                    partial.kind = "partial";
+                    partial.create_sql =
+                        fmt::format("CREATE INDEX IF NOT EXISTS {} ON {}({}) WHERE {}",
+                                    partial.name, cfg.log_table_name, join(rest, ", "),
+                                    join(terms_sql, " OR "));
+                    partial.drop_sql = fmt::format("DROP INDEX IF EXISTS {}", partial.name);
+                    partial.reason =
+                        fmt::format("{}; '{}' only took {} value(s), so a partial index is smaller",
+                                    reason, best_column, best->size());
+                    suggested.push_back(add_suggestion(std::move(partial), shape));
+                }
+            }
+        }
+        entry["notes"] = std::move(notes);
+        entry["suggestions"] = std::move(suggested);
+        advice.shapes.push_back(std::move(entry));
+    }
+
+    std::ranges::stable_sort(advice.suggestions, std::greater<>{}, &IndexSuggestion::total_ms);
+    return advice;
+}
+
+}  // namespace loglite
@@ -0,0 +1,104 @@
+#ifndef LOGLITE_INDEX_ADVISOR_HPP_
+#define LOGLITE_INDEX_ADVISOR_HPP_
+
+#include "types.hpp"
+
+#include <cstddef>
+#include <cstdint>
+#include <map>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+struct Config;
+class ReaderDatabase;
+
+// ── Filter workload ───────────────────────────────────────────────────────────
+//
+// Records the shape of every filtered log query: which fields are filtered and
+// how (equality, range, inequality, substring), with how often and how long
+// queries of that shape took.  Values are not part of the shape, but the
+// distinct values seen for equality filters are kept (up to kMaxValuesPerField)
+// so the advisor can propose partial indexes for hot values.  Queries stopped
+// by their budget are recorded too, since they are the slowest of all.
+
+struct FilterShapeStats {
+    // (field, operator class) pairs, sorted; class is one of "=", "!=", "range", "~=".
+    std::vector<std::pair<std::string, std::string>> terms;
+    int64_t count{};
+    double total_ms{};
+    double max_ms{};
+    int64_t scanned_rows{};  // full-scan steps seen by the query budget
+    int64_t interrupted{};   // queries stopped by their budget
+    std::vector<QueryFilter> sample;  // the latest filters of this shape, for EXPLAIN
+    // Equality values per field with their counts; cleared once it overflows.
+    std::map<std::string, std::map<std::string, int64_t>> eq_values;
+    std::map<std::string, bool> eq_overflow;
+
+    [[nodiscard]] std::string Key() const;
+};
+
+class FilterWorkload {
+   public:
+    static constexpr std::size_t kMaxShapes = 256;
+    static constexpr std::size_t kMaxValuesPerField = 8;
+
+    void Record(const std::vector<QueryFilter>& filters, double elapsed_ms,
+                int64_t scanned_rows = 0, bool interrupted = false);
+
+    // Copy of every shape, most total time first.
+    [[nodiscard]] std::vector<FilterShapeStats> Snapshot() const;
+    // Queries not recorded because kMaxShapes distinct shapes were already seen.
+    [[nodiscard]] int64_t Dropped() const;
+
+   private:
+    mutable std::mutex mtx_;
+    std::map<std::string, FilterShapeStats> shapes_;
+    int64_t dropped_{};
+};
+
+// ── Index advisor ─────────────────────────────────────────────────────────────
+//
+// For each recorded shape, runs EXPLAIN QUERY PLAN on its latest filters.  A
+// plan that only SCANs the log table gets a proposal: equality columns first
+// (by name), then one range column (the timestamp field when filtered), so one
+// B-tree search narrows both.  When an equality field only ever saw a few
+// values, a partial index restricted to them is proposed as a smaller
+// alternative, in the form of the README's idx_level example but with OR terms,
+// which SQLite can match against `field = ?`.  Substring filters, zstd columns
+// and undeclared JSON paths cannot use an index and are reported as notes.
+
+struct IndexSuggestion {
+    std::string name;
+    std::string kind;  // "index" or "partial"
+    std::string create_sql;
+    std::string drop_sql;
+    std::string reason;
+    int64_t queries{};  // queries of the shapes this index would serve
+    double total_ms{};
+};
+
+struct IndexAdvice {
+    std::string table;
+    std::vector<IndexInfo> indexes;
+    nlohmann::json shapes = nlohmann::json::array();
+    std::vector<IndexSuggestion> suggestions;
+    int64_t dropped{};
+
+    [[nodiscard]] nlohmann::json ToJSON() const;
+    // A migrations: block with the "index" suggestions (partial ones commented out).
+    [[nodiscard]] std::string ToMigrationYAML(int version) const;
+};
+
+[[nodiscard]] IndexAdvice AdviseIndexes(const ReaderDatabase& db, const Config& cfg,
+                                        const std::vector<FilterShapeStats>& shapes,
+                                        int64_t dropped = 0);
+
+}  // namespace loglite
+
+#endif  // LOGLITE_INDEX_ADVISOR_HPP_
@@ -38,6 +38,15 @@ int main(int argc, char** argv) {
         ->required();
     rollback_cmd->add_flag("-f,--force", rollback_force, "Skip confirmation prompt");
 
+    // ── snapshot ──────────────────────────────────────────────────────────────
+    auto* snapshot_cmd =
+        app.add_subcommand("snapshot", "Copy the database to a standalone file (online-safe)");
+    std::string snapshot_config;
+    std::string snapshot_output;
+    snapshot_cmd->add_option("-c,--config", snapshot_config, "Path to config YAML")->required();
+    snapshot_cmd->add_option("-o,--output", snapshot_output,
+                             "Destination file (default: <sqlite_dir>/snapshots/)");
+
     CLI11_PARSE(app, argc, argv);
 
     // ── execute command ────────────────────────────────────────────────────────
@@ -54,6 +63,10 @@ int main(int argc, char** argv) {
             loglite::Rollback(rollback_config, rollback_version, rollback_force);
             return 0;
         }
+        if (snapshot_cmd->parsed()) {
+            loglite::Snapshot(snapshot_config, snapshot_output);
+            return 0;
+        }
     } catch (const std::exception& e) {
         loglite::log::ERROR("Fatal: {}", e.what());
         return 1;
@@ -36,6 +36,11 @@ void MetricsRegistry::DecrementGauge(std::string_view name) {
     --gauges_[name];
 }
 
+void MetricsRegistry::SetGauge(std::string_view name, int64_t value) {
+    std::lock_guard lk(mtx_);
+    gauges_[name] = value;
+}
+
 int64_t MetricsRegistry::Gauge(std::string_view name) const {
     std::lock_guard lk(mtx_);
     auto it = gauges_.find(name);
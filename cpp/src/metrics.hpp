@@ -17,8 +17,10 @@ inline constexpr std::string_view kQueryRequest = "query_request";
 inline constexpr std::string_view kIngestRequest = "ingest_request";
 inline constexpr std::string_view kBacklogDrop = "backlog_drop";
 inline constexpr std::string_view kInsertBatch = "insert_batch";
+inline constexpr std::string_view kFlushBatchTarget = "flush_batch_target";
 inline constexpr std::string_view kHttpConnection = "http_connection";
 inline constexpr std::string_view kSseSession = "sse_session";
+inline constexpr std::string_view kWalCheckpointLag = "wal_checkpoint_lag";
 
 struct Observation {
     std::chrono::steady_clock::time_point at;
@@ -35,6 +37,7 @@ class MetricsRegistry {
     void Collect(std::string_view name, double value = 0.0, int64_t item_count = 1);
     void IncrementGauge(std::string_view name);
     void DecrementGauge(std::string_view name);
+    void SetGauge(std::string_view name, int64_t value);
     [[nodiscard]] int64_t Gauge(std::string_view name) const;
     [[nodiscard]] std::vector<Observation> Flush();
     void Reset(std::chrono::seconds window = 60s);
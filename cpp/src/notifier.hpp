@@ -18,11 +18,18 @@ namespace loglite {
 // an asio::steady_timer.  When new logs are flushed, notify() atomically updates
 // last_id and cancels all subscriber timers.
 //
+// With sharded writers the last id is tracked per shard: each shard's flush task
+// notifies its own, and subscribers keep a pushed id per shard.
+//
 // asio::steady_timer::cancel() is documented thread-safe (it posts through the
 // io_context), so it's correct to call from the flush task's thread.
 
 class LogNotifier {
    public:
+    explicit LogNotifier(std::size_t shards = 1)
+        : shards_(std::max<std::size_t>(shards, 1)),
+          last_ids_(std::make_unique<std::atomic<int64_t>[]>(shards_)) {}
+
     struct Subscription {
         // Shared so the notifier can cancel safely even if the handler is gone.
         std::shared_ptr<asio::steady_timer> timer;
@@ -41,14 +48,18 @@ class LogNotifier {
         std::erase(subs_, sub);
     }
 
-    void Notify(int64_t id) {
-        last_id_.store(id, std::memory_order_release);
+    void Notify(int64_t id, std::size_t shard = 0) {
+        last_ids_[shard].store(id, std::memory_order_release);
         std::lock_guard lk(mtx_);
         for (auto& sub : subs_)
             sub->timer->cancel();  // posts cancellation through io_context – thread-safe
     }
 
-    int64_t GetLastId() const noexcept { return last_id_.load(std::memory_order_acquire); }
+    int64_t GetLastId(std::size_t shard = 0) const noexcept {
+        return last_ids_[shard].load(std::memory_order_acquire);
+    }
+
+    std::size_t Shards() const noexcept { return shards_; }
 
     size_t SubscriberCount() const {
         std::lock_guard lk(mtx_);
@@ -56,7 +67,8 @@ class LogNotifier {
     }
 
    private:
-    std::atomic<int64_t> last_id_{0};
+    std::size_t shards_;
+    std::unique_ptr<std::atomic<int64_t>[]> last_ids_;
     mutable std::mutex mtx_;
     std::vector<std::shared_ptr<Subscription>> subs_;
 };
@@ -0,0 +1,45 @@
+#include "query_budget.hpp"
+
+#include <fmt/format.h>
+
+namespace loglite {
+
+namespace {
+
+std::string describe(const QueryBudget& budget) {
+    switch (budget.Exceeded()) {
+    case BudgetExceeded::kTimeout:
+        return fmt::format("Query exceeded its time budget of {} ms", budget.Timeout().count());
+    case BudgetExceeded::kScanLimit:
+        return fmt::format("Query exceeded its scan budget of {} rows", budget.MaxScanRows());
+    case BudgetExceeded::kCancelled:
+        return "Query cancelled";
+    case BudgetExceeded::kNone:
+        break;
+    }
+    return "Query interrupted";
+}
+
+}  // namespace
+
+QueryBudget::QueryBudget(std::chrono::milliseconds timeout, int64_t max_scan_rows)
+    : timeout_(timeout), deadline_(Clock::now() + timeout), max_scan_rows_(max_scan_rows) {}
+
+BudgetExceeded QueryBudget::Check(int64_t scanned) {
+    if (exceeded_ != BudgetExceeded::kNone) return exceeded_;
+
+    scanned_ += scanned;
+    if (cancelled_.load(std::memory_order_acquire)) {
+        exceeded_ = BudgetExceeded::kCancelled;
+    } else if (max_scan_rows_ > 0 && scanned_ > max_scan_rows_) {
+        exceeded_ = BudgetExceeded::kScanLimit;
+    } else if (timeout_.count() > 0 && Clock::now() >= deadline_) {
+        exceeded_ = BudgetExceeded::kTimeout;
+    }
+    return exceeded_;
+}
+
+QueryInterrupted::QueryInterrupted(const QueryBudget& budget)
+    : std::runtime_error(describe(budget)), reason_(budget.Exceeded()) {}
+
+}  // namespace loglite
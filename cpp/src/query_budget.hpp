@@ -0,0 +1,74 @@
+#ifndef LOGLITE_QUERY_BUDGET_HPP_
+#define LOGLITE_QUERY_BUDGET_HPP_
+
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+
+namespace loglite {
+
+// ── Query budgets ─────────────────────────────────────────────────────────────
+//
+// Time and scan limits for one read request, enforced from SQLite's progress
+// handler (see ReaderDatabase::ScopedBudget): once a limit is exceeded, or the
+// request is cancelled, the running statement is interrupted and the query
+// throws QueryInterrupted.
+//   - The deadline starts when the budget is created, so time spent waiting for
+//     a reader connection counts against it.
+//   - Scanned rows are the rows SQLite stepped through in full table scans
+//     (SQLITE_STMTSTATUS_FULLSCAN_STEP), e.g. for unindexed `~=` filters; rows
+//     read through an index are only bounded by the deadline.
+//   - Cancel() may be called from any thread, e.g. when the client disconnects.
+// A zero timeout or scan limit means no limit.
+
+enum class BudgetExceeded { kNone, kTimeout, kScanLimit, kCancelled };
+
+class QueryBudget {
+   public:
+    using Clock = std::chrono::steady_clock;
+
+    // SQLite VM instructions between two checks.
+    static constexpr int kCheckInterval = 1000;
+
+    QueryBudget(std::chrono::milliseconds timeout, int64_t max_scan_rows);
+
+    void Cancel() noexcept { cancelled_.store(true, std::memory_order_release); }
+
+    // Adds `scanned` rows and reports whether the query must stop.  Once it
+    // returns something other than kNone, it keeps returning that.
+    BudgetExceeded Check(int64_t scanned = 0);
+
+    [[nodiscard]] BudgetExceeded Exceeded() const noexcept { return exceeded_; }
+    [[nodiscard]] bool Cancelled() const noexcept {
+        return cancelled_.load(std::memory_order_acquire);
+    }
+    [[nodiscard]] std::chrono::milliseconds Timeout() const noexcept { return timeout_; }
+    [[nodiscard]] int64_t MaxScanRows() const noexcept { return max_scan_rows_; }
+    [[nodiscard]] int64_t ScannedRows() const noexcept { return scanned_; }
+
+   private:
+    std::chrono::milliseconds timeout_;
+    Clock::time_point deadline_;
+    int64_t max_scan_rows_;
+    int64_t scanned_{};
+    BudgetExceeded exceeded_{BudgetExceeded::kNone};
+    std::atomic<bool> cancelled_{false};
+};
+
+// Thrown by ReaderDatabase when a statement was interrupted by its budget.
+class QueryInterrupted : public std::runtime_error {
+   public:
+    explicit QueryInterrupted(const QueryBudget& budget);
+
+    [[nodiscard]] BudgetExceeded Reason() const noexcept { return reason_; }
+
+   private:
+    BudgetExceeded reason_;
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_QUERY_BUDGET_HPP_
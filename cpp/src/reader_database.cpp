@@ -1,7 +1,9 @@
 #include "reader_database.hpp"
 
 #include "log.hpp"
+#include "utils.hpp"
 
+#include <chrono>
 #include <fmt/format.h>
 #include <ranges>
 #include <stdexcept>
@@ -11,79 +13,199 @@ namespace loglite {
 ReaderDatabase::ReaderDatabase(const Config& cfg, std::shared_ptr<DatabaseCatalog> catalog)
     : Database(cfg, std::move(catalog)) {}
 
+ReaderDatabase::ScopedBudget::ScopedBudget(ReaderDatabase& db, QueryBudget& budget)
+    : owner_(db) {
+    owner_.budget_ = &budget;
+    sqlite3_progress_handler(owner_.db_, QueryBudget::kCheckInterval, &ReaderDatabase::on_progress,
+                             &owner_);
+}
+
+ReaderDatabase::ScopedBudget::~ScopedBudget() {
+    sqlite3_progress_handler(owner_.db_, 0, nullptr, nullptr);
+    owner_.budget_ = nullptr;
+}
+
+int ReaderDatabase::on_progress(void* self) {
+    auto* db = static_cast<ReaderDatabase*>(self);
+    int64_t scanned = 0;
+    for (auto* stmt = sqlite3_next_stmt(db->db_, nullptr); stmt;
+         stmt = sqlite3_next_stmt(db->db_, stmt)) {
+        scanned += sqlite3_stmt_status(stmt, SQLITE_STMTSTATUS_FULLSCAN_STEP, 1);
+    }
+    return db->budget_->Check(scanned) != BudgetExceeded::kNone;
+}
+
+int ReaderDatabase::step(sqlite3_stmt* stmt) const {
+    const int rc = sqlite3_step(stmt);
+    if (rc == SQLITE_INTERRUPT && budget_ && budget_->Exceeded() != BudgetExceeded::kNone)
+        throw QueryInterrupted(*budget_);
+    return rc;
+}
+
 void ReaderDatabase::Open() {
     auto path = cfg_.db_path.string();
     ensure_ok(
         sqlite3_open_v2(path.c_str(), &db_, SQLITE_OPEN_READONLY | SQLITE_OPEN_NOMUTEX, nullptr),
         "sqlite3_open_v2");
     apply_params(AccessMode::READ);
+    register_functions();
     log::DEBUG("Opened reader SQLite connection: {}", path);
 }
 
-PaginatedQueryResult ReaderDatabase::Query(const std::vector<std::string>& fields,
-                                           const std::vector<QueryFilter>& filters, int limit,
-                                           int offset) const {
-    std::vector<std::string> effective_fields;
+ReaderDatabase::PreparedQuery ReaderDatabase::prepare_query(
+    const std::vector<std::string>& fields, const std::vector<QueryFilter>& filters, int limit,
+    int offset, std::optional<int64_t> before_id) const {
+    PreparedQuery q;
     if (fields.size() == 1 && fields[0] == "*") {
-        for (const auto& ci : catalog_->log_column_info) effective_fields.push_back(ci.name);
+        for (const auto& ci : catalog_->log_column_info) q.fields.push_back(ci.name);
     } else {
-        effective_fields.assign(fields.begin(), fields.end());
-        for (const auto& f : effective_fields) validate_field(f);
+        q.fields.assign(fields.begin(), fields.end());
+        for (const auto& f : q.fields) validate_field(f);
     }
 
-    auto [where, params] = build_where_clause(filters);
+    std::vector<QueryFilter> keyset;
+    if (before_id) {
+        keyset = filters;
+        keyset.push_back({"id", "<", *before_id});
+    }
+    auto [where, params] = build_where_clause(before_id ? keyset : filters);
 
     // Get the total row number count (use quick estimate if no filters are applied).
-    int total = 0;
-    if (filters.empty()) {
-        total = static_cast<int>(EstimateLogRowCount());
+    // Keyset pages skip it: each would recount the rest of the table.
+    if (before_id) {
+        q.total = -1;
+    } else if (filters.empty()) {
+        q.total = static_cast<int>(EstimateLogRowCount());
     } else {
         auto count_sql =
             fmt::format("SELECT COUNT(id) FROM {} WHERE {}", cfg_.log_table_name, where);
         Statement count_stmt{db_, count_sql};
         for (int i = 0; i < static_cast<int>(params.size()); ++i)
             bind_param(count_stmt, i + 1, params[i]);
-        if (sqlite3_step(count_stmt) == SQLITE_ROW) total = sqlite3_column_int(count_stmt, 0);
+        if (step(count_stmt) == SQLITE_ROW) q.total = sqlite3_column_int(count_stmt, 0);
     }
-    if (total == 0) return {total, offset, limit, {}};
+    if (q.total == 0) return q;
 
-    // Execute the main query.
+    // Prepare the main query.
     std::string field_list;
-    for (size_t i = 0; i < effective_fields.size(); ++i) {
+    for (size_t i = 0; i < q.fields.size(); ++i) {
         if (i) field_list += ",";
-        field_list += effective_fields[i];
+        field_list += q.fields[i];
     }
     auto select_sql = fmt::format("SELECT {} FROM {} WHERE {} ORDER BY {} DESC LIMIT ? OFFSET ?",
-                                  field_list, cfg_.log_table_name, where, cfg_.log_timestamp_field);
+                                  field_list, cfg_.log_table_name, where,
+                                  before_id ? "id" : cfg_.log_timestamp_field);
 
-    Statement sel{db_, select_sql};
+    q.stmt = Statement{db_, select_sql};
     int pi = 1;
-    for (const auto& p : params) bind_param(sel, pi++, p);
-    bind_param(sel, pi++, nlohmann::json(limit));
-    bind_param(sel, pi++, nlohmann::json(offset));
+    for (const auto& p : params) bind_param(q.stmt, pi++, p);
+    bind_param(q.stmt, pi++, nlohmann::json(limit));
+    bind_param(q.stmt, pi++, nlohmann::json(offset));
+    return q;
+}
+
+PaginatedQueryResult ReaderDatabase::Query(const std::vector<std::string>& fields,
+                                           const std::vector<QueryFilter>& filters, int limit,
+                                           int offset, std::optional<int64_t> before_id) const {
+    auto q = prepare_query(fields, filters, limit, offset, before_id);
+    if (q.total == 0) return {q.total, offset, limit, {}};
 
     // Build JSON results.
     std::vector<nlohmann::json> results;
     results.reserve(static_cast<size_t>(limit));
-    while (sqlite3_step(sel) == SQLITE_ROW) {
+    while (step(q.stmt) == SQLITE_ROW) {
         nlohmann::json row;
-        for (int c = 0; c < static_cast<int>(effective_fields.size()); ++c) {
-            const auto& fname = effective_fields[c];
-            auto val = column_to_json(sel, c);
-            if (catalog_->compressed_columns.contains(fname) && val.is_number_integer()) {
-                val = catalog_->col_dict->GetValue(fname, val.get<int>());
-            }
-            row[fname] = std::move(val);
+        for (int c = 0; c < static_cast<int>(q.fields.size()); ++c) {
+            const auto& fname = q.fields[c];
+            row[fname] = log_column_to_json(q.stmt, c, fname);
         }
         results.push_back(std::move(row));
     }
 
-    return {total, offset, limit, std::move(results)};
+    return {q.total, offset, limit, std::move(results)};
+}
+
+ColumnarQueryResult ReaderDatabase::QueryColumns(const std::vector<std::string>& fields,
+                                                 const std::vector<QueryFilter>& filters,
+                                                 int limit, int offset,
+                                                 std::optional<int64_t> before_id) const {
+    auto q = prepare_query(fields, filters, limit, offset, before_id);
+    ColumnarQueryResult result{q.total, offset, limit, 0, {}};
+    if (q.total == 0) return result;
+
+    std::vector<ColumnBuilder> builders;
+    std::vector<bool> encoded;  // dictionary / zstd columns decode through log_column_to_json
+    for (const auto& f : q.fields) {
+        builders.emplace_back(f);
+        encoded.push_back(catalog_->compressed_columns.contains(f) ||
+                          catalog_->zstd_columns.contains(f));
+    }
+
+    // Values go from SQLite straight into the column buffers; no per-row JSON.
+    while (step(q.stmt) == SQLITE_ROW) {
+        for (int c = 0; c < static_cast<int>(q.fields.size()); ++c) {
+            auto& b = builders[c];
+            if (encoded[c]) {
+                auto val = log_column_to_json(q.stmt, c, q.fields[c]);
+                if (val.is_string())
+                    b.AppendText(val.get_ref<const std::string&>());
+                else if (val.is_number_integer())
+                    b.AppendInt(val.get<int64_t>());
+                else
+                    b.AppendNull();
+                continue;
+            }
+
+            switch (sqlite3_column_type(q.stmt, c)) {
+            case SQLITE_INTEGER:
+                b.AppendInt(sqlite3_column_int64(q.stmt, c));
+                break;
+            case SQLITE_FLOAT:
+                b.AppendDouble(sqlite3_column_double(q.stmt, c));
+                break;
+            case SQLITE_TEXT: {
+                const auto* txt = reinterpret_cast<const char*>(sqlite3_column_text(q.stmt, c));
+                b.AppendText({txt ? txt : "", static_cast<size_t>(sqlite3_column_bytes(q.stmt, c))});
+                break;
+            }
+            default:
+                b.AppendNull();
+                break;
+            }
+        }
+        ++result.rows;
+    }
+
+    result.columns.reserve(builders.size());
+    for (auto& b : builders) result.columns.push_back(std::move(b).Finish());
+    return result;
+}
+
+int ReaderDatabase::pick_stats_resolution(std::string_view since, std::string_view until,
+                                          int max_points) const {
+    if (max_points <= 0) return 0;
+    const auto since_tp = parse_iso8601(since);
+    const auto until_tp = parse_iso8601(until);
+    if (!since_tp || !until_tp) return 0;
+
+    using std::chrono::hours;
+    using std::chrono::seconds;
+    const auto window = std::chrono::duration_cast<seconds>(*until_tp - *since_tp).count();
+    const auto now = std::chrono::system_clock::now();
+    auto fits = [&](int resolution, int retention_hours) {
+        return window / resolution <= max_points && now - hours{retention_hours} <= *since_tp;
+    };
+
+    if (fits(cfg_.task_diagnostics_interval, cfg_.stats_retention_hours)) return 0;
+    for (const auto& tier : cfg_.stats_rollups)
+        if (fits(tier.resolution, tier.retention_hours)) return tier.resolution;
+    return cfg_.stats_rollups.empty() ? 0 : cfg_.stats_rollups.back().resolution;
 }
 
 StatsQueryResult ReaderDatabase::QueryActivityStats(std::string_view since, std::string_view until,
                                                     const std::vector<std::string>& fields,
-                                                    std::string_view ordering) const {
+                                                    std::string_view ordering,
+                                                    int max_points) const {
     const auto known = pluck_column_names(catalog_->activity_stats_column_info);
     const auto query_all_fields = fields.empty() || (fields.size() == 1 && fields[0] == "*");
     const auto resolved = query_all_fields ? known : fields;
@@ -102,15 +224,18 @@ StatsQueryResult ReaderDatabase::QueryActivityStats(std::string_view since, std:
     std::string order = "DESC";
     if (ordering == "asc") order = "ASC";
 
+    const int resolution = pick_stats_resolution(since, until, max_points);
     auto sql = fmt::format(
-        "SELECT {} FROM activity_stats WHERE until >= ? AND until <= ? ORDER BY until {}", col_list,
-        order);
+        "SELECT {} FROM {} WHERE {}until >= ? AND until <= ? ORDER BY until {}", col_list,
+        resolution ? "activity_stats_rollup" : "activity_stats",
+        resolution ? fmt::format("resolution = {} AND ", resolution) : "", order);
     Statement stmt{db_, sql};
     sqlite3_bind_text(stmt, 1, since.data(), static_cast<int>(since.size()), SQLITE_TRANSIENT);
     sqlite3_bind_text(stmt, 2, until.data(), static_cast<int>(until.size()), SQLITE_TRANSIENT);
 
     StatsQueryResult result;
     result.fields = resolved;
+    result.resolution = resolution ? resolution : cfg_.task_diagnostics_interval;
     while (sqlite3_step(stmt) == SQLITE_ROW) {
         std::vector<nlohmann::json> row;
         row.reserve(resolved.size());
@@ -124,7 +249,8 @@ StatsQueryResult ReaderDatabase::QueryActivityStats(std::string_view since, std:
 
 StatsQueryResult ReaderDatabase::QueryDatabaseStats(std::string_view since, std::string_view until,
                                                     const std::vector<std::string>& fields,
-                                                    std::string_view ordering) const {
+                                                    std::string_view ordering,
+                                                    int max_points) const {
     const auto known = pluck_column_names(catalog_->db_stats_column_info);
     const auto query_all_fields = fields.empty() || (fields.size() == 1 && fields[0] == "*");
     const auto resolved = query_all_fields ? known : fields;
@@ -143,16 +269,18 @@ StatsQueryResult ReaderDatabase::QueryDatabaseStats(std::string_view since, std:
     std::string order = "DESC";
     if (ordering == "asc") order = "ASC";
 
+    const int resolution = pick_stats_resolution(since, until, max_points);
     auto sql = fmt::format(
-        "SELECT {} FROM database_stats WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp "
-        "{}",
-        col_list, order);
+        "SELECT {} FROM {} WHERE {}timestamp >= ? AND timestamp <= ? ORDER BY timestamp {}",
+        col_list, resolution ? "database_stats_rollup" : "database_stats",
+        resolution ? fmt::format("resolution = {} AND ", resolution) : "", order);
     Statement stmt{db_, sql};
     sqlite3_bind_text(stmt, 1, since.data(), static_cast<int>(since.size()), SQLITE_TRANSIENT);
     sqlite3_bind_text(stmt, 2, until.data(), static_cast<int>(until.size()), SQLITE_TRANSIENT);
 
     StatsQueryResult result;
     result.fields = resolved;
+    result.resolution = resolution ? resolution : cfg_.task_diagnostics_interval;
     while (sqlite3_step(stmt) == SQLITE_ROW) {
         std::vector<nlohmann::json> row;
         row.reserve(resolved.size());
@@ -173,6 +301,50 @@ bool ReaderDatabase::Ping() const {
     }
 }
 
+std::vector<IndexInfo> ReaderDatabase::ListLogIndexes() const {
+    std::vector<IndexInfo> out;
+    {
+        // seq, name, unique, origin, partial
+        Statement stmt{db_, fmt::format("PRAGMA index_list({})", cfg_.log_table_name)};
+        while (sqlite3_step(stmt) == SQLITE_ROW) {
+            IndexInfo ii;
+            ii.name = reinterpret_cast<const char*>(sqlite3_column_text(stmt, 1));
+            ii.unique = sqlite3_column_int(stmt, 2) != 0;
+            ii.partial = sqlite3_column_int(stmt, 4) != 0;
+            out.push_back(std::move(ii));
+        }
+    }
+
+    for (auto& ii : out) {
+        // seqno, cid, name (NULL for an expression)
+        Statement cols{db_, fmt::format("PRAGMA index_info(\"{}\")", ii.name)};
+        while (sqlite3_step(cols) == SQLITE_ROW) {
+            const auto* name = reinterpret_cast<const char*>(sqlite3_column_text(cols, 2));
+            ii.columns.emplace_back(name ? name : "<expr>");
+        }
+
+        Statement sql{db_, "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?"};
+        sqlite3_bind_text(sql, 1, ii.name.c_str(), -1, SQLITE_TRANSIENT);
+        if (sqlite3_step(sql) == SQLITE_ROW && sqlite3_column_type(sql, 0) != SQLITE_NULL)
+            ii.sql = reinterpret_cast<const char*>(sqlite3_column_text(sql, 0));
+    }
+    return out;
+}
+
+std::vector<std::string> ReaderDatabase::ExplainQuery(
+    const std::vector<QueryFilter>& filters) const {
+    auto [where, params] = build_where_clause(filters);
+    Statement stmt{db_, fmt::format("EXPLAIN QUERY PLAN SELECT COUNT(id) FROM {} WHERE {}",
+                                    cfg_.log_table_name, where)};
+    for (int i = 0; i < static_cast<int>(params.size()); ++i) bind_param(stmt, i + 1, params[i]);
+
+    // id, parent, notused, detail
+    std::vector<std::string> plan;
+    while (sqlite3_step(stmt) == SQLITE_ROW)
+        plan.emplace_back(reinterpret_cast<const char*>(sqlite3_column_text(stmt, 3)));
+    return plan;
+}
+
 // ── ReadDatabasePool ───────────────────────────────────────────────────────────
 
 ReadDatabasePool::ReadDatabasePool(const Config& cfg, std::shared_ptr<DatabaseCatalog> catalog,
@@ -184,18 +356,35 @@ ReadDatabasePool::ReadDatabasePool(const Config& cfg, std::shared_ptr<DatabaseCa
         available_.push(db.get());
         readers_.push_back(std::move(db));
     }
+    priority_reader_ = std::make_unique<ReaderDatabase>(cfg, std::move(catalog));
+    priority_reader_->Open();
 }
 
 ReadDatabasePool::~ReadDatabasePool() { Close(); }
 
 void ReadDatabasePool::Close() {
+    {
+        std::lock_guard lock(mtx_);
+        if (closed_) return;
+        closed_ = true;
+        while (!available_.empty()) available_.pop();
+        for (auto& db : readers_) db->Close();
+        readers_.clear();
+        cv_.notify_all();
+    }
+
+    // Let a priority read in progress finish before closing its connection.
+    priority_lane_.stop();
+    priority_lane_.join();
+    priority_reader_->Close();
+    priority_reader_.reset();
+}
+
+std::size_t ReadDatabasePool::InUse() const {
     std::lock_guard lock(mtx_);
-    if (closed_) return;
-    closed_ = true;
-    while (!available_.empty()) available_.pop();
-    for (auto& db : readers_) db->Close();
-    readers_.clear();
-    cv_.notify_all();
+    if (closed_) return 0;
+    return readers_.size() - available_.size() +
+           (priority_busy_.load(std::memory_order_relaxed) ? 1 : 0);
 }
 
 ReaderDatabase& ReadDatabasePool::acquire() {
@@ -1,18 +1,23 @@
 #ifndef LOGLITE_READER_DATABASE_HPP_
 #define LOGLITE_READER_DATABASE_HPP_
 
+#include "columnar.hpp"
 #include "database.hpp"
+#include "query_budget.hpp"
 
 #include <boost/asio.hpp>
 
 namespace asio = boost::asio;
 
+#include <atomic>
 #include <concepts>
 #include <condition_variable>
 #include <cstddef>
 #include <memory>
 #include <mutex>
+#include <optional>
 #include <queue>
+#include <stdexcept>
 #include <string>
 #include <type_traits>
 #include <utility>
@@ -22,24 +27,86 @@ namespace loglite {
 
 class ReaderDatabase final : public Database {
    public:
+    // Enforces a QueryBudget on Query() / QueryColumns() while alive: a statement
+    // that exceeds it is interrupted and the query throws QueryInterrupted.
+    class ScopedBudget {
+       public:
+        ScopedBudget(ReaderDatabase& db, QueryBudget& budget);
+        ~ScopedBudget();
+
+        ScopedBudget(const ScopedBudget&) = delete;
+        ScopedBudget& operator=(const ScopedBudget&) = delete;
+
+       private:
+        ReaderDatabase& owner_;
+    };
+
     ReaderDatabase(const Config& cfg, std::shared_ptr<DatabaseCatalog> catalog);
 
     void Open();
 
+    // With `before_id`, pages by keyset instead: rows with an id below it, highest
+    // id first, and no COUNT (`total` is -1).
     PaginatedQueryResult Query(const std::vector<std::string>& fields,
-                               const std::vector<QueryFilter>& filters, int limit,
-                               int offset) const;
-
+                               const std::vector<QueryFilter>& filters, int limit, int offset,
+                               std::optional<int64_t> before_id = std::nullopt) const;
+
+    // Same selection as Query(), returned column-wise for bulk consumers.
+    ColumnarQueryResult QueryColumns(const std::vector<std::string>& fields,
+                                     const std::vector<QueryFilter>& filters, int limit,
+                                     int offset,
+                                     std::optional<int64_t> before_id = std::nullopt) const;
+
+    // With `max_points` > 0, rows come from the finest tier (raw stats or one of
+    // cfg.stats_rollups) that still holds `since` and returns at most that many rows for the
+    // window, or from the coarsest tier when none does.
     StatsQueryResult QueryActivityStats(std::string_view since, std::string_view until,
                                         const std::vector<std::string>& fields,
-                                        std::string_view ordering) const;
+                                        std::string_view ordering, int max_points = 0) const;
     StatsQueryResult QueryDatabaseStats(std::string_view since, std::string_view until,
                                         const std::vector<std::string>& fields,
-                                        std::string_view ordering) const;
+                                        std::string_view ordering, int max_points = 0) const;
 
     bool Ping() const;
+
+    // Indexes on the log table (PRAGMA index_list / index_info).
+    [[nodiscard]] std::vector<IndexInfo> ListLogIndexes() const;
+
+    // EXPLAIN QUERY PLAN detail lines for the row count GET /logs runs with `filters`.
+    [[nodiscard]] std::vector<std::string> ExplainQuery(
+        const std::vector<QueryFilter>& filters) const;
+
+   private:
+    struct PreparedQuery {
+        int total{};  // -1 when not counted
+        std::vector<std::string> fields;
+        Statement stmt;  // unset when total == 0
+    };
+
+    // Resolution of the stats tier to read, in seconds; 0 for the raw tables.
+    int pick_stats_resolution(std::string_view since, std::string_view until,
+                              int max_points) const;
+
+    PreparedQuery prepare_query(const std::vector<std::string>& fields,
+                                const std::vector<QueryFilter>& filters, int limit, int offset,
+                                std::optional<int64_t> before_id) const;
+
+    // sqlite3_step() that throws QueryInterrupted if the budget stopped it.
+    int step(sqlite3_stmt* stmt) const;
+
+    static int on_progress(void* self);
+
+    QueryBudget* budget_{};
 };
 
+// ── ReadDatabasePool ───────────────────────────────────────────────────────────
+//
+// `size` reader connections, leased to reads posted to the caller's reader
+// executor.  One more connection with a thread of its own forms the priority
+// lane (AsyncUsePriorityConnection): short reads that must not queue behind
+// long queries, such as SSE polls and health checks, run there even while every
+// other connection is busy.
+
 class ReadDatabasePool {
    public:
     ReadDatabasePool(const Config& cfg, std::shared_ptr<DatabaseCatalog> catalog, size_t size);
@@ -64,8 +131,20 @@ class ReadDatabasePool {
         co_return result;
     }
 
+    template <std::invocable<ReaderDatabase&> F>
+    asio::awaitable<std::invoke_result_t<F, ReaderDatabase&>> AsyncUsePriorityConnection(F&& f) {
+        auto caller_ex = co_await asio::this_coro::executor;
+        co_await asio::post(priority_lane_.get_executor(), asio::use_awaitable);
+        auto result = use_priority_connection(std::forward<F>(f));
+        co_await asio::post(caller_ex, asio::use_awaitable);
+        co_return result;
+    }
+
     void Close();
 
+    // Connections currently leased out (priority lane included), i.e. reads in progress.
+    [[nodiscard]] std::size_t InUse() const;
+
    private:
     class ConnectionLease {
        public:
@@ -85,11 +164,27 @@ class ReadDatabasePool {
     ReaderDatabase& acquire();
     void release(ReaderDatabase& db);
 
+    // Runs on the priority lane's only thread, so its connection is never shared.
+    template <std::invocable<ReaderDatabase&> F>
+    auto use_priority_connection(F&& f) -> std::invoke_result_t<F, ReaderDatabase&> {
+        if (!priority_reader_) throw std::runtime_error("read database pool is closed");
+        priority_busy_.store(true, std::memory_order_relaxed);
+        struct Idle {
+            std::atomic<bool>& busy;
+            ~Idle() { busy.store(false, std::memory_order_relaxed); }
+        } idle{priority_busy_};
+        return std::invoke(std::forward<F>(f), *priority_reader_);
+    }
+
     std::vector<std::unique_ptr<ReaderDatabase>> readers_;
     std::queue<ReaderDatabase*> available_;
-    std::mutex mtx_;
+    mutable std::mutex mtx_;
     std::condition_variable cv_;
     bool closed_{false};
+
+    asio::thread_pool priority_lane_{1};
+    std::unique_ptr<ReaderDatabase> priority_reader_;
+    std::atomic<bool> priority_busy_{false};
 };
 
 }  // namespace loglite
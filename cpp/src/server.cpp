@@ -5,15 +5,21 @@
 #include <csignal>
 
 #include "handlers/router.hpp"
+#include "handlers/snapshot.hpp"
 #include "handlers/sse.hpp"
+#include "handlers/stream.hpp"
 
+#include "tasks/checkpoint.hpp"
 #include "tasks/diagnostics.hpp"
 #include "tasks/flush_backlog.hpp"
 #include "tasks/vacuum.hpp"
 
 #include <boost/asio.hpp>
+#include <boost/asio/experimental/awaitable_operators.hpp>
 #include <boost/beast.hpp>
 #include <chrono>
+#include <optional>
+#include <variant>
 
 namespace asio = boost::asio;
 namespace beast = boost::beast;
@@ -39,6 +45,26 @@ void log_exception(std::exception_ptr eptr, std::string_view tag) {
     }
 }
 
+// Completes when the peer closes, resets or fails the connection while a request
+// is being handled.  EOF counts as a disconnect: a client that gives up closes
+// its socket with a FIN, and HTTP/1.1 clients do not half-close while waiting
+// for a response.  If the peer pipelines another request instead, that data is
+// left for the next read and this waits until cancelled.
+asio::awaitable<void> wait_for_disconnect(beast::tcp_stream& stream) {
+    auto& socket = stream.socket();
+    auto [ec] = co_await socket.async_wait(ip::tcp::socket::wait_read,
+                                           asio::as_tuple(asio::use_awaitable));
+    if (ec == asio::error::operation_aborted) co_return;
+    if (!ec) {
+        char byte;
+        socket.receive(asio::buffer(&byte, 1), ip::tcp::socket::message_peek, ec);
+        if (!ec) {
+            asio::steady_timer never{socket.get_executor(), asio::steady_timer::time_point::max()};
+            co_await never.async_wait(asio::as_tuple(asio::use_awaitable));
+        }
+    }
+}
+
 }  // namespace
 
 Server::Server(ServerContext& ctx) : ctx_(ctx), pool_(1u), acceptor_(pool_) {}
@@ -71,8 +97,11 @@ void Server::Run() {
     };
 
     // ── Background tasks ──────────────────────────────────────────────────────
-    asio::co_spawn(ex, tasks::FlushBacklogTask(ctx_), on_task_error);
-    asio::co_spawn(ex, tasks::VacuumTask(ctx_), on_task_error);
+    for (auto& shard : ctx_.shards) {
+        asio::co_spawn(ex, tasks::FlushBacklogTask(ctx_, shard), on_task_error);
+        asio::co_spawn(ex, tasks::VacuumTask(ctx_, shard), on_task_error);
+        asio::co_spawn(ex, tasks::CheckpointTask(ctx_, shard), on_task_error);
+    }
     asio::co_spawn(ex, tasks::DiagnosticsTask(ctx_), on_task_error);
 
     // ── Accept loop ───────────────────────────────────────────────────────────
@@ -125,17 +154,30 @@ asio::awaitable<void> Server::HandleConnection(beast::tcp_stream stream) {
         // Per-request idle timeout: re-arm each keep-alive iteration (not once at accept).
         stream.expires_after(kHttpIdleTimeout);
 
-        http::request<http::string_body> req;
-
+        // Read the header first: streaming ingest consumes its body incrementally.
+        http::request_parser<http::empty_body> header;
         try {
-            co_await http::async_read(stream, buf, req, asio::use_awaitable);
+            co_await http::async_read_header(stream, buf, header, asio::use_awaitable);
         } catch (...) {
             co_return;
         }
 
-        auto target = std::string(req.target());
+        auto target = std::string(header.get().target());
         auto [path, _] = handlers::SplitURLTarget(target);
-        auto method = req.method();
+        auto method = header.get().method();
+
+        if (path == "/logs/stream" && method == http::verb::post) {
+            co_await handlers::HandleLogStream(std::move(stream), std::move(buf), header, ctx_);
+            co_return;
+        }
+
+        http::request_parser<http::string_body> parser{std::move(header)};
+        try {
+            co_await http::async_read(stream, buf, parser, asio::use_awaitable);
+        } catch (...) {
+            co_return;
+        }
+        auto req = parser.release();
 
         // ── CORS preflight ────────────────────────────────────────────────────
         if (method == http::verb::options) {
@@ -163,8 +205,23 @@ asio::awaitable<void> Server::HandleConnection(beast::tcp_stream stream) {
             co_await handlers::HandleSSE(std::move(stream), std::move(req), ctx_);
             co_return;
         }
+        if (path == "/admin/snapshot/download" && method == http::verb::get) {
+            co_await handlers::HandleSnapshotDownload(std::move(stream), std::move(req), ctx_);
+            co_return;
+        }
 
-        auto routed = co_await handlers::Dispatch(path, method, req, ctx_);
+        // A closed connection during GET /logs cancels the query (see HandleQuery);
+        // there is then nobody to send the response to.
+        std::optional<http::response<http::string_body>> routed;
+        if (path == "/logs" && method == http::verb::get) {
+            using namespace asio::experimental::awaitable_operators;
+            auto outcome = co_await (handlers::Dispatch(path, method, req, ctx_) ||
+                                     wait_for_disconnect(stream));
+            if (outcome.index() == 1) co_return;
+            routed = std::move(std::get<0>(outcome));
+        } else {
+            routed = co_await handlers::Dispatch(path, method, req, ctx_);
+        }
         http::response<http::string_body> res =
             routed ? std::move(*routed)
                    : handlers::MakeFailResp(404, "not found", req, cfg.allow_origin);
@@ -0,0 +1,101 @@
+#include "shards.hpp"
+
+#include <algorithm>
+#include <cstdint>
+#include <iterator>
+#include <string_view>
+#include <utility>
+
+namespace loglite {
+
+namespace {
+
+// FNV-1a: unlike std::hash, stable across builds and platforms.
+uint64_t fnv1a(std::string_view data) {
+    uint64_t h = 14695981039346656037ull;
+    for (unsigned char c : data) {
+        h ^= c;
+        h *= 1099511628211ull;
+    }
+    return h;
+}
+
+}  // namespace
+
+ShardRouter::ShardRouter(std::size_t count, std::string key)
+    : count_(std::max<std::size_t>(count, 1)), key_(std::move(key)) {}
+
+std::size_t ShardRouter::ShardOf(const nlohmann::json& entry) const {
+    if (count_ == 1 || !entry.is_object()) return 0;
+    auto it = entry.find(key_);
+    if (it == entry.end() || it->is_null()) return 0;
+    return static_cast<std::size_t>(fnv1a(it->dump()) % count_);
+}
+
+PaginatedQueryResult MergeShardPages(std::vector<PaginatedQueryResult> pages,
+                                     const std::string& order_field, int limit, int offset) {
+    PaginatedQueryResult out{0, offset, limit, {}};
+    static const nlohmann::json kNull;
+    auto order_of = [&](const nlohmann::json& row) -> const nlohmann::json& {
+        auto it = row.find(order_field);
+        return it == row.end() ? kNull : *it;
+    };
+    auto newer = [&](const nlohmann::json& a, const nlohmann::json& b) {
+        return order_of(b) < order_of(a);
+    };
+
+    for (auto& page : pages) {
+        out.total = (out.total < 0 || page.total < 0) ? -1 : out.total + page.total;
+        const auto mid = static_cast<std::ptrdiff_t>(out.results.size());
+        out.results.insert(out.results.end(), std::make_move_iterator(page.results.begin()),
+                           std::make_move_iterator(page.results.end()));
+        std::inplace_merge(out.results.begin(), out.results.begin() + mid, out.results.end(),
+                           newer);
+    }
+
+    const auto size = static_cast<int>(out.results.size());
+    const int first = std::clamp(offset, 0, size);
+    const int last = std::clamp(first + std::max(limit, 0), first, size);
+    out.results.erase(out.results.begin() + last, out.results.end());
+    out.results.erase(out.results.begin(), out.results.begin() + first);
+    return out;
+}
+
+bool SelectOrderField(std::vector<std::string>& fields, const std::string& order_field) {
+    if (std::ranges::find(fields, "*") != fields.end() ||
+        std::ranges::find(fields, order_field) != fields.end())
+        return false;
+    fields.push_back(order_field);
+    return true;
+}
+
+void StripField(PaginatedQueryResult& page, const std::string& field) {
+    for (auto& row : page.results) row.erase(field);
+}
+
+ColumnarQueryResult ToColumnar(const PaginatedQueryResult& page,
+                               const std::vector<std::string>& fields) {
+    ColumnarQueryResult result{page.total, page.offset, page.limit,
+                               static_cast<int>(page.results.size()), {}};
+    result.columns.reserve(fields.size());
+    for (const auto& field : fields) {
+        ColumnBuilder b{field};
+        for (const auto& row : page.results) {
+            auto it = row.find(field);
+            if (it == row.end() || it->is_null())
+                b.AppendNull();
+            else if (it->is_number_integer())
+                b.AppendInt(it->get<int64_t>());
+            else if (it->is_number_float())
+                b.AppendDouble(it->get<double>());
+            else if (it->is_string())
+                b.AppendText(it->get_ref<const std::string&>());
+            else
+                b.AppendNull();
+        }
+        result.columns.push_back(std::move(b).Finish());
+    }
+    return result;
+}
+
+}  // namespace loglite
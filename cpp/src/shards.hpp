@@ -0,0 +1,66 @@
+#ifndef LOGLITE_SHARDS_HPP_
+#define LOGLITE_SHARDS_HPP_
+
+#include "columnar.hpp"
+#include "types.hpp"
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+// ── Sharded writers ────────────────────────────────────────────────────────────
+//
+// Opt-in with `shards.count` > 1: entries are routed by the value of
+// `shards.key` to one of N database files, each with its own writer connection,
+// write strand, backlog and flush task (see LogShard), so that inserts into
+// different shards run in parallel.  Ids stay unique across the files
+// (WriterDatabase::SetIdStride).
+//
+// Reads query every shard for the first offset + limit rows and merge the pages
+// here, newest first; SSE merges the new rows of each shard the same way.  Deep
+// offsets therefore cost every shard offset + limit rows, and GET /logs caps them
+// at shards.max_offset.  With before_id the pages are merged by id: that order is
+// complete and stable for keyset paging, but not chronological across shards,
+// since each shard's ids advance at its own ingest rate.
+
+class ShardRouter {
+   public:
+    ShardRouter(std::size_t count, std::string key);
+
+    // The shard an entry belongs to: a stable hash of its key value, so the same
+    // value always lands in the same file.  Entries without the key go to shard 0.
+    [[nodiscard]] std::size_t ShardOf(const nlohmann::json& entry) const;
+
+    [[nodiscard]] std::size_t Count() const noexcept { return count_; }
+
+   private:
+    std::size_t count_;
+    std::string key_;
+};
+
+// Merges the pages the shards returned for the first offset + limit rows into
+// rows [offset, offset + limit) ordered by `order_field`, descending (ties keep
+// shard order).  Each page must already be in that order.  `total` is the sum of
+// the shards' totals, or -1 if any of them was not counted.
+[[nodiscard]] PaginatedQueryResult MergeShardPages(std::vector<PaginatedQueryResult> pages,
+                                                   const std::string& order_field, int limit,
+                                                   int offset);
+
+// Adds `order_field` to `fields` unless it is selected already, since merging
+// needs it; returns whether it was added, i.e. has to be stripped again.
+bool SelectOrderField(std::vector<std::string>& fields, const std::string& order_field);
+
+// Removes `field` from every row of `page`.
+void StripField(PaginatedQueryResult& page, const std::string& field);
+
+// The rows of a merged page laid out column-wise, one block per field.
+[[nodiscard]] ColumnarQueryResult ToColumnar(const PaginatedQueryResult& page,
+                                             const std::vector<std::string>& fields);
+
+}  // namespace loglite
+
+#endif  // LOGLITE_SHARDS_HPP_
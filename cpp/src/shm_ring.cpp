@@ -0,0 +1,216 @@
+#include "shm_ring.hpp"
+
+#include <cerrno>
+#include <cstring>
+#include <fcntl.h>
+#include <fmt/format.h>
+#include <new>
+#include <stdexcept>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <utility>
+
+namespace loglite {
+
+namespace {
+
+constexpr uint64_t kMagic = 0x474e49524c4c534cULL;  // "LSLLRING"
+constexpr uint32_t kVersion = 1;
+constexpr uint32_t kWrapMarker = 0xFFFFFFFFu;
+constexpr std::size_t kLengthBytes = sizeof(uint32_t);
+constexpr std::size_t kAlign = 8;
+
+static_assert(std::atomic<uint64_t>::is_always_lock_free,
+              "the shared-memory ring needs lock-free 64-bit atomics");
+
+constexpr std::size_t align_up(std::size_t n) { return (n + kAlign - 1) & ~(kAlign - 1); }
+
+[[noreturn]] void throw_errno(std::string_view what, const std::string& name) {
+    throw std::runtime_error(
+        fmt::format("shared-memory ring {}: {} failed: {}", name, what, std::strerror(errno)));
+}
+
+}  // namespace
+
+// Producer and consumer cursors sit on separate cache lines.
+struct ShmRing::Header {
+    uint64_t magic;
+    uint32_t version;
+    uint32_t reserved;
+    uint64_t capacity;
+    alignas(64) std::atomic<uint64_t> head;
+    alignas(64) std::atomic<uint64_t> tail;
+    std::atomic<uint64_t> dropped;
+};
+
+ShmRing ShmRing::Create(const std::string& name, std::size_t capacity) {
+    capacity &= ~(kAlign - 1);
+    if (capacity < kMinCapacity) {
+        throw std::invalid_argument(fmt::format(
+            "shared-memory ring {}: capacity must be at least {} bytes", name, kMinCapacity));
+    }
+
+    ::shm_unlink(name.c_str());  // stale ring left by a crashed server with the same pid
+    const int fd = ::shm_open(name.c_str(), O_RDWR | O_CREAT | O_EXCL, 0600);
+    if (fd < 0) throw_errno("shm_open", name);
+
+    const std::size_t mapped = sizeof(Header) + capacity;
+    if (::ftruncate(fd, static_cast<off_t>(mapped)) != 0) {
+        ::close(fd);
+        ::shm_unlink(name.c_str());
+        throw_errno("ftruncate", name);
+    }
+    void* base = ::mmap(nullptr, mapped, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    ::close(fd);
+    if (base == MAP_FAILED) {
+        ::shm_unlink(name.c_str());
+        throw_errno("mmap", name);
+    }
+
+    auto* header = new (base) Header{};
+    header->version = kVersion;
+    header->capacity = capacity;
+    // Published last: Open() rejects the ring until the header is complete.
+    std::atomic_ref<uint64_t>(header->magic).store(kMagic, std::memory_order_release);
+    return ShmRing{name, base, mapped, true};
+}
+
+ShmRing ShmRing::Open(const std::string& name) {
+    const int fd = ::shm_open(name.c_str(), O_RDWR, 0);
+    if (fd < 0) throw_errno("shm_open", name);
+
+    struct stat st {};
+    if (::fstat(fd, &st) != 0) {
+        ::close(fd);
+        throw_errno("fstat", name);
+    }
+    const auto mapped = static_cast<std::size_t>(st.st_size);
+    if (mapped < sizeof(Header) + kMinCapacity) {
+        ::close(fd);
+        throw std::runtime_error(fmt::format("shared-memory ring {}: not initialized", name));
+    }
+    void* base = ::mmap(nullptr, mapped, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    ::close(fd);
+    if (base == MAP_FAILED) throw_errno("mmap", name);
+
+    ShmRing ring{name, base, mapped, false};
+    const Header* header = ring.header_;
+    const uint64_t magic =
+        std::atomic_ref<uint64_t>(ring.header_->magic).load(std::memory_order_acquire);
+    if (magic != kMagic || header->version != kVersion ||
+        header->capacity != mapped - sizeof(Header)) {
+        throw std::runtime_error(
+            fmt::format("shared-memory ring {}: not initialized or incompatible", name));
+    }
+    return ring;
+}
+
+std::string ShmRing::NameFor(std::string_view worker) {
+    // FNV-1a keeps the name short: macOS caps POSIX shm names at 31 characters.
+    uint32_t hash = 2166136261u;
+    for (const unsigned char c : worker) {
+        hash = (hash ^ c) * 16777619u;
+    }
+    return fmt::format("/loglite-{}-{:08x}", ::getpid(), hash);
+}
+
+ShmRing::ShmRing(std::string name, void* base, std::size_t mapped, bool owner)
+    : name_(std::move(name)), header_(static_cast<Header*>(base)), mapped_(mapped), owner_(owner) {}
+
+ShmRing::ShmRing(ShmRing&& other) noexcept
+    : name_(std::move(other.name_)),
+      header_(std::exchange(other.header_, nullptr)),
+      mapped_(std::exchange(other.mapped_, 0)),
+      owner_(std::exchange(other.owner_, false)) {}
+
+ShmRing& ShmRing::operator=(ShmRing&& other) noexcept {
+    if (this != &other) {
+        release();
+        name_ = std::move(other.name_);
+        header_ = std::exchange(other.header_, nullptr);
+        mapped_ = std::exchange(other.mapped_, 0);
+        owner_ = std::exchange(other.owner_, false);
+    }
+    return *this;
+}
+
+ShmRing::~ShmRing() { release(); }
+
+void ShmRing::release() noexcept {
+    if (header_ == nullptr) return;
+    ::munmap(header_, mapped_);
+    if (owner_) ::shm_unlink(name_.c_str());
+    header_ = nullptr;
+    mapped_ = 0;
+    owner_ = false;
+}
+
+unsigned char* ShmRing::data() const noexcept {
+    return reinterpret_cast<unsigned char*>(header_) + sizeof(Header);
+}
+
+std::size_t ShmRing::Capacity() const noexcept { return header_->capacity; }
+
+std::size_t ShmRing::Used() const noexcept {
+    return header_->head.load(std::memory_order_acquire) -
+           header_->tail.load(std::memory_order_acquire);
+}
+
+uint64_t ShmRing::Dropped() const noexcept {
+    return header_->dropped.load(std::memory_order_relaxed);
+}
+
+void ShmRing::RecordDrop(uint64_t n) { header_->dropped.fetch_add(n, std::memory_order_relaxed); }
+
+bool ShmRing::TryPush(std::string_view record) {
+    const std::size_t capacity = header_->capacity;
+    if (record.size() > capacity / 2 - kLengthBytes) return false;
+
+    const std::size_t need = align_up(kLengthBytes + record.size());
+    const uint64_t head = header_->head.load(std::memory_order_relaxed);
+    const uint64_t tail = header_->tail.load(std::memory_order_acquire);
+    std::size_t pos = head % capacity;
+    const std::size_t to_end = capacity - pos;
+    const std::size_t total = need > to_end ? to_end + need : need;
+    if (head - tail + total > capacity) return false;
+
+    unsigned char* buf = data();
+    if (need > to_end) {
+        std::memcpy(buf + pos, &kWrapMarker, kLengthBytes);
+        pos = 0;
+    }
+    const auto len = static_cast<uint32_t>(record.size());
+    std::memcpy(buf + pos, &len, kLengthBytes);
+    std::memcpy(buf + pos + kLengthBytes, record.data(), record.size());
+    header_->head.store(head + total, std::memory_order_release);
+    return true;
+}
+
+bool ShmRing::TryPop(std::string& out) {
+    const std::size_t capacity = header_->capacity;
+    uint64_t tail = header_->tail.load(std::memory_order_relaxed);
+    const uint64_t head = header_->head.load(std::memory_order_acquire);
+    const unsigned char* buf = data();
+
+    while (tail != head) {
+        const std::size_t pos = tail % capacity;
+        uint32_t len = 0;
+        std::memcpy(&len, buf + pos, kLengthBytes);
+        if (len == kWrapMarker) {
+            tail += capacity - pos;
+            continue;
+        }
+        if (len > capacity - pos - kLengthBytes) {
+            tail = head;  // corrupt length from a misbehaving producer: discard what is queued
+            break;
+        }
+        out.assign(reinterpret_cast<const char*>(buf + pos + kLengthBytes), len);
+        header_->tail.store(tail + align_up(kLengthBytes + len), std::memory_order_release);
+        return true;
+    }
+    header_->tail.store(tail, std::memory_order_release);
+    return false;
+}
+
+}  // namespace loglite
@@ -0,0 +1,74 @@
+#ifndef LOGLITE_SHM_RING_HPP_
+#define LOGLITE_SHM_RING_HPP_
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <string_view>
+
+namespace loglite {
+
+// ── Shared-memory ring ────────────────────────────────────────────────────────
+//
+// Single-producer / single-consumer byte ring in a POSIX shared memory object,
+// used to pass serialized log entries from a harvester worker process to the
+// server.  The server creates (and later unlinks) the ring; the worker opens it
+// by name.
+//
+// Records are a 4-byte length and the payload, padded to 8 bytes.  A record
+// that does not fit before the end of the buffer is preceded by a wrap marker
+// and written at the start.  `head` and `tail` count bytes ever written / read
+// and are only advanced after the record bytes, so a producer that dies
+// mid-write leaves nothing half-visible.  A full ring rejects the record, and
+// the producer counts it in the shared `dropped` counter.
+
+class ShmRing {
+   public:
+    static constexpr std::size_t kMinCapacity = 64 * 1024;
+
+    // Creates a ring of `capacity` data bytes (rounded down to 8), replacing any
+    // stale object of the same name.  The ring is unlinked when this handle is destroyed.
+    static ShmRing Create(const std::string& name, std::size_t capacity);
+    // Opens a ring created by another process; throws if it does not exist.
+    static ShmRing Open(const std::string& name);
+
+    // Ring name for worker group `worker` of the server running in this process.
+    [[nodiscard]] static std::string NameFor(std::string_view worker);
+
+    ShmRing(ShmRing&& other) noexcept;
+    ShmRing& operator=(ShmRing&& other) noexcept;
+    ShmRing(const ShmRing&) = delete;
+    ShmRing& operator=(const ShmRing&) = delete;
+    ~ShmRing();
+
+    // Producer side.  False when the record does not fit (ring full, or larger
+    // than half the capacity); the caller decides whether to count a drop.
+    bool TryPush(std::string_view record);
+    void RecordDrop(uint64_t n = 1);
+
+    // Consumer side.  Moves the oldest record into `out`; false when empty.
+    bool TryPop(std::string& out);
+
+    [[nodiscard]] const std::string& Name() const noexcept { return name_; }
+    [[nodiscard]] std::size_t Capacity() const noexcept;
+    // Bytes written but not yet read.
+    [[nodiscard]] std::size_t Used() const noexcept;
+    [[nodiscard]] uint64_t Dropped() const noexcept;
+
+   private:
+    struct Header;
+
+    ShmRing(std::string name, void* base, std::size_t mapped, bool owner);
+    void release() noexcept;
+    [[nodiscard]] unsigned char* data() const noexcept;
+
+    std::string name_;
+    Header* header_{nullptr};
+    std::size_t mapped_{};
+    bool owner_{false};
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_SHM_RING_HPP_
@@ -0,0 +1,273 @@
+#include "snapshot.hpp"
+
+#include "log.hpp"
+#include "utils.hpp"
+
+#include <algorithm>
+#include <cerrno>
+#include <climits>
+#include <cstdio>
+#include <cstring>
+#include <fmt/format.h>
+#include <memory>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+namespace loglite {
+
+using namespace std::chrono_literals;
+
+namespace fs = std::filesystem;
+
+namespace {
+
+// Give up on batched copying after this many restarts caused by other writers.
+constexpr int kMaxRestarts = 3;
+
+constexpr std::string_view kSnapshotPrefix = "logs-";
+constexpr std::string_view kSnapshotSuffix = ".db";
+
+std::string_view state_name(SnapshotState s) {
+    switch (s) {
+    case SnapshotState::kRunning:
+        return "running";
+    case SnapshotState::kDone:
+        return "done";
+    case SnapshotState::kFailed:
+        return "failed";
+    case SnapshotState::kIdle:
+    default:
+        return "idle";
+    }
+}
+
+// Snapshot files in `dir`, newest first.
+std::vector<fs::path> list_snapshots(const fs::path& dir) {
+    std::vector<fs::path> files;
+    if (!fs::is_directory(dir)) return files;
+    for (const auto& entry : fs::directory_iterator(dir)) {
+        const auto name = entry.path().filename().string();
+        if (entry.is_regular_file() && name.starts_with(kSnapshotPrefix) &&
+            name.ends_with(kSnapshotSuffix))
+            files.push_back(entry.path());
+    }
+    std::ranges::sort(files, std::greater<>{});
+    return files;
+}
+
+struct ConnectionCloser {
+    void operator()(sqlite3* db) const { sqlite3_close_v2(db); }
+};
+
+}  // namespace
+
+// ── OnlineBackup ──────────────────────────────────────────────────────────────
+
+OnlineBackup::OnlineBackup(sqlite3* src, const fs::path& dest) {
+    const auto path = dest.string();
+
+    // Claim the file exclusively, so two snapshots to the same path cannot overwrite each
+    // other; an empty file is a valid (empty) SQLite database.
+    std::FILE* claimed = std::fopen(path.c_str(), "wbx");
+    if (!claimed) {
+        throw std::runtime_error(fmt::format("Cannot create snapshot file {}: {}", path,
+                                             errno == EEXIST ? "file already exists"
+                                                             : std::strerror(errno)));
+    }
+    std::fclose(claimed);
+
+    auto fail = [&](std::string msg) {
+        sqlite3_close_v2(dest_);
+        std::error_code ec;
+        fs::remove(dest, ec);
+        throw std::runtime_error(std::move(msg));
+    };
+
+    if (sqlite3_open_v2(path.c_str(), &dest_, SQLITE_OPEN_READWRITE, nullptr) != SQLITE_OK) {
+        fail(fmt::format("Cannot create snapshot file {}: {}", path,
+                         dest_ ? sqlite3_errmsg(dest_) : "out of memory"));
+    }
+
+    backup_ = sqlite3_backup_init(dest_, "main", src, "main");
+    if (!backup_) fail(fmt::format("sqlite3_backup_init: {}", sqlite3_errmsg(dest_)));
+}
+
+OnlineBackup::~OnlineBackup() {
+    if (backup_) sqlite3_backup_finish(backup_);
+    sqlite3_close_v2(dest_);
+}
+
+bool OnlineBackup::Step(int pages) {
+    if (!backup_) throw std::logic_error("OnlineBackup::Step called after Finish");
+
+    const int rc = sqlite3_backup_step(backup_, pages);
+    switch (rc) {
+    case SQLITE_DONE:
+        return true;
+    case SQLITE_OK:
+    case SQLITE_BUSY:
+    case SQLITE_LOCKED:
+        return false;
+    default:
+        throw std::runtime_error(fmt::format("sqlite3_backup_step: {}", sqlite3_errstr(rc)));
+    }
+}
+
+void OnlineBackup::Finish() {
+    const int rc = sqlite3_backup_finish(std::exchange(backup_, nullptr));
+    if (rc != SQLITE_OK)
+        throw std::runtime_error(fmt::format("sqlite3_backup_finish: {}", sqlite3_errstr(rc)));
+
+    // The copied header still says WAL; a snapshot should not need -wal/-shm siblings.
+    char* errmsg{};
+    if (sqlite3_exec(dest_, "PRAGMA journal_mode=DELETE", nullptr, nullptr, &errmsg) !=
+        SQLITE_OK) {
+        std::string msg = errmsg ? errmsg : "unknown error";
+        sqlite3_free(errmsg);
+        throw std::runtime_error(fmt::format("Failed to finalise snapshot: {}", msg));
+    }
+}
+
+BackupProgress OnlineBackup::Progress() const {
+    if (!backup_) return {};
+    return {sqlite3_backup_pagecount(backup_), sqlite3_backup_remaining(backup_)};
+}
+
+// ── Standalone snapshot ───────────────────────────────────────────────────────
+
+void SnapshotDatabaseFile(const fs::path& src, const fs::path& dest, int step_pages,
+                          const BackupProgressFn& on_progress) {
+    if (!fs::exists(src))
+        throw std::runtime_error(fmt::format("Database not found: {}", src.string()));
+
+    sqlite3* raw{};
+    const auto src_path = src.string();
+    int rc = sqlite3_open_v2(src_path.c_str(), &raw, SQLITE_OPEN_READONLY, nullptr);
+    std::unique_ptr<sqlite3, ConnectionCloser> conn{raw};
+    if (rc != SQLITE_OK)
+        throw std::runtime_error(fmt::format("Cannot open {}: {}", src_path,
+                                             raw ? sqlite3_errmsg(raw) : "out of memory"));
+    sqlite3_busy_timeout(conn.get(), 5000);
+
+    if (dest.has_parent_path()) fs::create_directories(dest.parent_path());
+    auto partial = dest;
+    partial += ".partial";
+
+    OnlineBackup backup{conn.get(), partial};
+    try {
+        int restarts = 0;
+        int last_remaining = INT_MAX;
+
+        while (true) {
+            const bool done = backup.Step(restarts >= kMaxRestarts ? -1 : step_pages);
+            const auto progress = backup.Progress();
+            if (on_progress) on_progress(progress);
+            if (done) break;
+
+            if (progress.remaining > last_remaining) {
+                ++restarts;
+                log::DEBUG("Snapshot restarted by a concurrent writer ({}/{})", restarts,
+                           kMaxRestarts);
+            } else if (progress.remaining == last_remaining) {
+                std::this_thread::sleep_for(50ms);  // source busy
+            }
+            last_remaining = progress.remaining;
+        }
+        backup.Finish();
+    } catch (...) {
+        std::error_code ec;
+        fs::remove(partial, ec);
+        throw;
+    }
+
+    fs::rename(partial, dest);
+}
+
+// ── Snapshot files ────────────────────────────────────────────────────────────
+
+std::string SnapshotFileName(std::chrono::system_clock::time_point tp) {
+    const auto ms = std::chrono::floor<std::chrono::milliseconds>(tp.time_since_epoch());
+    const auto sec = std::chrono::floor<std::chrono::seconds>(ms);
+    return fmt::format("{}{:%Y%m%dT%H%M%S}.{:03}Z{}", kSnapshotPrefix, date::sys_seconds{sec},
+                       (ms - sec).count(), kSnapshotSuffix);
+}
+
+std::optional<fs::path> LatestSnapshot(const fs::path& dir) {
+    auto files = list_snapshots(dir);
+    if (files.empty()) return std::nullopt;
+    return files.front();
+}
+
+void PruneSnapshots(const fs::path& dir, int keep) {
+    if (keep <= 0) return;
+
+    const auto files = list_snapshots(dir);
+    for (std::size_t i = keep; i < files.size(); ++i) {
+        std::error_code ec;
+        fs::remove(files[i], ec);
+        if (ec)
+            log::WARN("Failed to remove old snapshot {}: {}", files[i].string(), ec.message());
+        else
+            log::INFO("Removed old snapshot {}", files[i].filename().string());
+    }
+}
+
+// ── SnapshotTracker ───────────────────────────────────────────────────────────
+
+nlohmann::json SnapshotStatus::ToJSON() const {
+    const int copied = progress.page_count - progress.remaining;
+    nlohmann::json out = {
+        {"state", state_name(state)},
+        {"file", file.empty() ? nlohmann::json(nullptr) : nlohmann::json(file.string())},
+        {"page_count", progress.page_count},
+        {"remaining", progress.remaining},
+        {"progress", progress.page_count > 0 ? static_cast<double>(copied) / progress.page_count
+                                             : 0.0},
+        {"size_bytes", size_bytes},
+        {"started_at", started_at},
+        {"finished_at", finished_at},
+        {"elapsed_ms", elapsed_ms},
+    };
+    if (state == SnapshotState::kFailed) out["error"] = error;
+    return out;
+}
+
+bool SnapshotTracker::TryStart(fs::path file) {
+    std::lock_guard lk(mtx_);
+    if (status_.state == SnapshotState::kRunning) return false;
+    status_ = SnapshotStatus{};
+    status_.state = SnapshotState::kRunning;
+    status_.file = std::move(file);
+    status_.started_at = format_utc(std::chrono::system_clock::now());
+    return true;
+}
+
+void SnapshotTracker::Progress(const BackupProgress& progress) {
+    std::lock_guard lk(mtx_);
+    status_.progress = progress;
+}
+
+void SnapshotTracker::Finish(int64_t size_bytes, double elapsed_ms) {
+    std::lock_guard lk(mtx_);
+    status_.state = SnapshotState::kDone;
+    status_.progress.remaining = 0;
+    status_.size_bytes = size_bytes;
+    status_.elapsed_ms = elapsed_ms;
+    status_.finished_at = format_utc(std::chrono::system_clock::now());
+}
+
+void SnapshotTracker::Fail(std::string error, double elapsed_ms) {
+    std::lock_guard lk(mtx_);
+    status_.state = SnapshotState::kFailed;
+    status_.error = std::move(error);
+    status_.elapsed_ms = elapsed_ms;
+    status_.finished_at = format_utc(std::chrono::system_clock::now());
+}
+
+SnapshotStatus SnapshotTracker::Get() const {
+    std::lock_guard lk(mtx_);
+    return status_;
+}
+
+}  // namespace loglite
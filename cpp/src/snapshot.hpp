@@ -0,0 +1,110 @@
+#ifndef LOGLITE_SNAPSHOT_HPP_
+#define LOGLITE_SNAPSHOT_HPP_
+
+#include <sqlite3.h>
+
+#include <chrono>
+#include <cstdint>
+#include <filesystem>
+#include <functional>
+#include <mutex>
+#include <optional>
+#include <string>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+// ── Online snapshots ──────────────────────────────────────────────────────────
+//
+// Thin wrapper over the SQLite online backup API.  Pages are copied in batches
+// (Step) so the caller can yield between batches; the source connection is only
+// locked while a batch is being copied.
+//
+// When the source is the writer connection, rows inserted between steps are
+// written through to the snapshot.  When it is a separate connection, any write
+// by another connection makes SQLite restart the copy on the next step.
+
+struct BackupProgress {
+    int page_count{};
+    int remaining{};
+};
+
+class OnlineBackup {
+   public:
+    // Starts copying the "main" schema of `src` into a new database file at `dest`; throws
+    // if `dest` already exists.
+    OnlineBackup(sqlite3* src, const std::filesystem::path& dest);
+    ~OnlineBackup();
+
+    OnlineBackup(const OnlineBackup&) = delete;
+    OnlineBackup& operator=(const OnlineBackup&) = delete;
+
+    // Copy up to `pages` pages (-1 = everything left).  Returns true once the
+    // copy is complete.  A busy/locked source is not an error; try again later.
+    bool Step(int pages);
+
+    // Release the source and switch the snapshot to a self-contained (non-WAL)
+    // journal so it is a single portable file.  Must be called after Step()
+    // returned true.
+    void Finish();
+
+    [[nodiscard]] BackupProgress Progress() const;
+
+   private:
+    sqlite3* dest_{};
+    sqlite3_backup* backup_{};
+};
+
+// Snapshot a database file from a separate read-only connection (for the CLI).
+// Restarts caused by concurrent writers are tolerated a few times before the
+// remainder is copied in one step under a single read transaction.
+using BackupProgressFn = std::function<void(const BackupProgress&)>;
+void SnapshotDatabaseFile(const std::filesystem::path& src, const std::filesystem::path& dest,
+                          int step_pages, const BackupProgressFn& on_progress = {});
+
+// "logs-20260102T030405.123Z.db" – sorts chronologically by name.
+[[nodiscard]] std::string SnapshotFileName(std::chrono::system_clock::time_point tp);
+
+// Newest snapshot file in `dir`, if any (in-progress ".partial" files are ignored).
+[[nodiscard]] std::optional<std::filesystem::path> LatestSnapshot(const std::filesystem::path& dir);
+
+// Keep the `keep` newest snapshot files in `dir` (per SnapshotFileName), removing the rest.
+void PruneSnapshots(const std::filesystem::path& dir, int keep);
+
+// ── Server-side snapshot state ────────────────────────────────────────────────
+
+enum class SnapshotState { kIdle, kRunning, kDone, kFailed };
+
+struct SnapshotStatus {
+    SnapshotState state{SnapshotState::kIdle};
+    std::filesystem::path file;
+    BackupProgress progress;
+    int64_t size_bytes{};
+    std::string started_at;
+    std::string finished_at;
+    double elapsed_ms{};
+    std::string error;
+
+    [[nodiscard]] nlohmann::json ToJSON() const;
+};
+
+// At most one snapshot runs at a time; handlers read the status concurrently.
+class SnapshotTracker {
+   public:
+    // False when a snapshot is already running.
+    bool TryStart(std::filesystem::path file);
+    void Progress(const BackupProgress& progress);
+    void Finish(int64_t size_bytes, double elapsed_ms);
+    void Fail(std::string error, double elapsed_ms);
+
+    [[nodiscard]] SnapshotStatus Get() const;
+
+   private:
+    mutable std::mutex mtx_;
+    SnapshotStatus status_;
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_SNAPSHOT_HPP_
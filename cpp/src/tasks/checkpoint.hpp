@@ -0,0 +1,74 @@
+#ifndef LOGLITE_TASKS_CHECKPOINT_HPP_
+#define LOGLITE_TASKS_CHECKPOINT_HPP_
+
+#include "../context.hpp"
+#include "../log.hpp"
+#include "../metrics.hpp"
+#include "../utils.hpp"
+
+#include <boost/asio.hpp>
+#include <algorithm>
+#include <chrono>
+#include <memory>
+#include <string>
+#include <tuple>
+
+namespace asio = boost::asio;
+
+namespace loglite::tasks {
+
+using namespace std::chrono_literals;
+
+// ── WAL checkpoint task ────────────────────────────────────────────────────────
+//
+// Every task_checkpoint_interval seconds, asks shard.checkpoints for a mode (see
+// WalCheckpointManager) given the -wal file size and the reads in progress,
+// runs it on the write strand, and publishes the remaining lag as the
+// wal_checkpoint_lag gauge (the highest lag of any shard).
+
+inline asio::awaitable<void> CheckpointTask(ServerContext& ctx, LogShard& shard) {
+    auto ex = co_await asio::this_coro::executor;
+    auto& cfg = ctx.config;
+    auto timer = std::make_shared<asio::steady_timer>(ex);
+    ctx.RegisterShutdownTimer(timer);
+
+    log::INFO("Checkpoint task started (shard={}, interval={}s, wal_limit={})", shard.index,
+              cfg.task_checkpoint_interval, cfg.wal_checkpoint_size);
+
+    while (true) {
+        timer->expires_after(cfg.task_checkpoint_interval * 1s);
+        co_await timer->async_wait(asio::as_tuple(asio::use_awaitable));
+        if (ctx.StopRequested()) {
+            log::INFO("[Termination] checkpoint task stopped");
+            co_return;
+        }
+
+        const auto mode =
+            shard.checkpoints.Plan(shard.db_write.GetWalSizeBytes(), shard.db_read.InUse());
+        if (mode == CheckpointMode::kNone) continue;
+        const std::string name{CheckpointModeName(mode)};
+
+        auto [result, wal_bytes, elapsed] =
+            co_await shard.db_write.AsyncUseConnection(shard.write_strand, [&](WriterDatabase& db) {
+                Timer t;
+                auto r = db.Checkpoint(name, WalCheckpointManager::kBusyTimeoutMs);
+                return std::make_tuple(r, db.GetWalSizeBytes(), t.elapsed_ms());
+            });
+        shard.checkpoints.Observe(mode, result, wal_bytes, elapsed);
+        int lag = 0;
+        for (const auto& s : ctx.shards) lag = std::max(lag, s.checkpoints.LagFrames());
+        metrics::MetricsRegistry::Instance().SetGauge(metrics::kWalCheckpointLag, lag);
+
+        if (mode == CheckpointMode::kPassive) {
+            log::DEBUG("[checkpoint] PASSIVE lag={} frames wal={}B in {:.1f} ms", result.Lag(),
+                       wal_bytes, elapsed);
+        } else {
+            log::INFO("[checkpoint] {}{} lag={} frames wal={}B in {:.1f} ms", name,
+                      result.busy ? " (busy)" : "", result.Lag(), wal_bytes, elapsed);
+        }
+    }
+}
+
+}  // namespace loglite::tasks
+
+#endif  // LOGLITE_TASKS_CHECKPOINT_HPP_
@@ -13,7 +13,9 @@
 #include <cmath>
 #include <concepts>
 #include <limits>
+#include <ranges>
 #include <string>
+#include <utility>
 #include <vector>
 
 namespace asio = boost::asio;
@@ -106,7 +108,9 @@ inline ActivityStatsRow build_activity_stats(std::string since, std::string unti
 
 // ── Diagnostics task ───────────────────────────────────────────────────────────
 //
-// Periodically snapshots process-wide metrics, persists them, and prunes old stats rows.
+// Periodically snapshots process-wide metrics, persists them, folds finished buckets into
+// the cfg.stats_rollups tiers, and prunes each tier past its retention.  Stats are kept in
+// shard 0; its database_stats rows count the rows and bytes of every shard.
 
 inline asio::awaitable<void> DiagnosticsTask(ServerContext& ctx) {
     auto ex = co_await asio::this_coro::executor;
@@ -127,30 +131,49 @@ inline asio::awaitable<void> DiagnosticsTask(ServerContext& ctx) {
 
         auto window_until = std::chrono::system_clock::now();
         auto samples = metrics::MetricsRegistry::Instance().Flush();
+        const auto [flush] = detail::summarize_observations(samples, metrics::kFlushBatchTarget);
         auto row = detail::build_activity_stats(loglite::format_utc(window_since),
                                                 loglite::format_utc(window_until), samples);
         auto cutoff = loglite::format_utc(window_until - cfg.stats_retention_hours * 1h);
         window_since = window_until;
 
+        DatabaseStatsRow db_row{row.until, 0, 0};
+        for (auto& shard : ctx.shards | std::views::drop(1)) {
+            auto [rows, bytes] = co_await shard.db_write.AsyncUseConnection(
+                shard.write_strand, [](WriterDatabase& db) {
+                    return std::make_pair(db.EstimateLogRowCount(), db.GetSizeBytes());
+                });
+            db_row.rows_count += rows;
+            db_row.db_size += bytes;
+        }
+
+        int rolled = 0;
         int pruned =
             co_await ctx.db_write.AsyncUseConnection(ctx.write_strand, [&](WriterDatabase& db) {
                 db.InsertActivityStats(row);
-                db.InsertDatabaseStats({
-                    row.until,
-                    db.EstimateLogRowCount(),
-                    db.GetSizeBytes(),
-                });
-                return db.DeleteStatsBefore(cutoff);
+                db_row.rows_count += db.EstimateLogRowCount();
+                db_row.db_size += db.GetSizeBytes();
+                db.InsertDatabaseStats(db_row);
+                rolled = db.RollupStats(cfg.stats_rollups, window_until);
+                int removed = db.DeleteStatsBefore(cutoff);
+                for (const auto& tier : cfg.stats_rollups) {
+                    removed += db.DeleteStatsRollupBefore(
+                        tier.resolution,
+                        loglite::format_utc(window_until - tier.retention_hours * 1h));
+                }
+                return removed;
             });
 
         log::INFO(
             "[query]: count={} avg={}ms max={}ms | "
             "[ingest]: count={} avg_size={}B drops={} | "
             "[insert]: batches={} rows={} total={}ms | "
-            "sse_sessions={} http_conns={} pruned={}",
+            "[flush]: target_avg={} target_max={} | "
+            "sse_sessions={} http_conns={} rolled_up={} pruned={}",
             row.query_count, row.query_avg, row.query_max, row.ingest_count, row.ingest_size_avg,
             row.ingest_drop_count, row.insert_batch_count, row.insert_total_count,
-            row.insert_total_cost, row.sse_session_count, row.http_conn_count, pruned);
+            row.insert_total_cost, detail::round_stat(flush.avg), detail::round_stat(flush.max),
+            row.sse_session_count, row.http_conn_count, rolled, pruned);
     }
 }
 
@@ -8,7 +8,12 @@
 
 #include <boost/asio.hpp>
 #include <chrono>
+#include <exception>
+#include <memory>
 #include <thread>
+#include <tuple>
+#include <utility>
+#include <vector>
 
 namespace asio = boost::asio;
 
@@ -16,54 +21,199 @@ namespace loglite::tasks {
 
 using namespace std::chrono_literals;
 
+namespace detail {
+
+// A batch ready for the write strand: the encoded rows and the dedup bookkeeping
+// that resolves their ids (see LogCoalescer).
+struct FlushBatch {
+    EncodedBatch encoded;
+    DedupPlan dedup;
+};
+
+// Coalesces and encodes a batch on the encode pool as soon as it is constructed,
+// so the write strand only has to bind and step rows.  Await() resumes on the
+// caller's executor; completion is signalled by cancelling a timer, as
+// LogNotifier does.
+class PendingEncode {
+   public:
+    PendingEncode(ServerContext& ctx, LogShard& shard, const asio::any_io_executor& ex,
+                  std::vector<nlohmann::json> logs)
+        : state_(std::make_shared<State>(ex)) {
+        asio::post(ctx.encode_executor, [state = state_, &shard, logs = std::move(logs)]() mutable {
+            try {
+                state->batch.dedup = shard.dedup.Coalesce(std::move(logs));
+                state->batch.encoded = shard.db_write.EncodeRows(state->batch.dedup.rows);
+            } catch (...) {
+                state->error = std::current_exception();
+            }
+            asio::post(state->done.get_executor(), [state] {
+                state->finished = true;
+                state->done.cancel();
+            });
+        });
+    }
+
+    asio::awaitable<FlushBatch> Await() {
+        auto state = state_;
+        while (!state->finished) {
+            co_await state->done.async_wait(asio::as_tuple(asio::use_awaitable));
+        }
+        if (state->error) std::rethrow_exception(state->error);
+        co_return std::move(state->batch);
+    }
+
+   private:
+    struct State {
+        explicit State(const asio::any_io_executor& ex)
+            : done(ex, asio::steady_timer::time_point::max()) {}
+
+        asio::steady_timer done;
+        bool finished{false};
+        FlushBatch batch;
+        std::exception_ptr error;
+    };
+
+    std::shared_ptr<State> state_;
+};
+
+// Returns the number of rows inserted and the time spent on the write strand.
+// Duplicates of rows inserted by earlier batches are added to those rows' counts
+// in the same strand pass.
+inline asio::awaitable<std::pair<int, double>> insert_encoded(ServerContext& ctx,
+                                                               LogShard& shard,
+                                                               FlushBatch& batch) {
+    if (batch.encoded.rows.empty() && batch.dedup.updates.empty())
+        co_return std::make_pair(0, 0.0);
+
+    auto [count, max_id, elapsed] =
+        co_await shard.db_write.AsyncUseConnection(shard.write_strand, [&](WriterDatabase& db) {
+            Timer t;
+            std::vector<int64_t> row_ids;
+            int c = 0;
+            try {
+                c = db.InsertEncoded(batch.encoded, shard.dedup.Enabled() ? &row_ids : nullptr);
+            } catch (...) {
+                shard.dedup.Abort(batch.dedup);
+                throw;
+            }
+            db.ApplyDedupUpdates(shard.dedup.Commit(batch.dedup, batch.encoded.sources, row_ids));
+            int64_t m = db.GetMaxLogId();
+            return std::make_tuple(c, m, t.elapsed_ms());
+        });
+
+    metrics::MetricsRegistry::Instance().Collect(metrics::kInsertBatch, elapsed, count);
+    shard.flush_policy.ObserveInsert(static_cast<std::size_t>(count), elapsed);
+    ctx.notifier.Notify(max_id, shard.index);
+
+    log::DEBUG("Inserted {} row(s) into shard {} in {:.1f} ms, max_log_id={}", count, shard.index,
+               elapsed, max_id);
+    co_return std::make_pair(count, elapsed);
+}
+
+// Drains up to one batch and feeds the observed ingest rate to the flush policy.
+class BacklogDrainer {
+   public:
+    BacklogDrainer(ServerContext& ctx, LogShard& shard)
+        : ctx_(ctx),
+          shard_(shard),
+          added_(shard.backlog.TotalAdded()),
+          at_(std::chrono::steady_clock::now()) {}
+
+    std::vector<nlohmann::json> Drain(std::size_t target) {
+        const auto now = std::chrono::steady_clock::now();
+        const auto added = shard_.backlog.TotalAdded();
+        shard_.flush_policy.ObserveIngest(static_cast<std::size_t>(added - added_), now - at_);
+        added_ = added;
+        at_ = now;
+
+        auto logs =
+            shard_.backlog.Flush(static_cast<std::size_t>(ctx_.config.task_backlog_max_batch));
+        if (!logs.empty()) {
+            metrics::MetricsRegistry::Instance().Collect(metrics::kFlushBatchTarget,
+                                                         static_cast<double>(target),
+                                                         static_cast<int64_t>(logs.size()));
+        }
+        return logs;
+    }
+
+   private:
+    ServerContext& ctx_;
+    LogShard& shard_;
+    uint64_t added_;
+    std::chrono::steady_clock::time_point at_;
+};
+
+}  // namespace detail
+
 // ── Backlog flush task ─────────────────────────────────────────────────────────
 //
-// Runs as an infinite Asio coroutine.  Every task_backlog_flush_interval seconds
-// (or when Backlog signals the high watermark via IsFull()), it:
-//   1. Drains the backlog.
-//   2. Dispatches to the write strand to INSERT into SQLite.
-//   3. Reads max_log_id and notifies SSE subscribers.
-
-inline asio::awaitable<void> FlushBacklogTask(ServerContext& ctx) {
+// Runs as an infinite Asio coroutine per shard, driven by the shard's backlog
+// rather than polling.  Each pass:
+//   1. Asks shard.flush_policy for a batch size and a maximum wait (see
+//      AdaptiveFlushPolicy), and sets the batch size as the backlog's flush
+//      threshold.
+//   2. Sleeps until the backlog reaches that threshold, or until its oldest
+//      entry has waited the maximum wait.  The backlog wakes the task by
+//      cancelling its timer; an empty backlog is only re-checked every
+//      task_backlog_flush_interval seconds.
+//   3. Drains up to task_backlog_max_batch entries, collapses duplicates when
+//      `dedup` is enabled, and encodes the rows (serialisation, dictionary ids,
+//      zstd) on the encode pool (ctx.encode_executor).
+//   4. Dispatches to the write strand to INSERT into SQLite, records the insert
+//      cost with the policy, and notifies SSE subscribers.
+// While the backlog keeps refilling to the threshold, steps 3 and 4 overlap: the
+// next batch is encoded while the current one is being inserted.
+
+inline asio::awaitable<void> FlushBacklogTask(ServerContext& ctx, LogShard& shard) {
     auto ex = co_await asio::this_coro::executor;
     auto& cfg = ctx.config;
+    auto& backlog = shard.backlog;
     auto timer = std::make_shared<asio::steady_timer>(ex);
     ctx.RegisterShutdownTimer(timer);
+    backlog.SetWaker(timer);
+
+    detail::BacklogDrainer drainer{ctx, shard};
 
-    log::INFO("Backlog flush task started");
+    log::INFO("Backlog flush task started (shard={}, target_latency={}ms, max_batch={})",
+              shard.index, cfg.task_backlog_target_latency_ms, cfg.task_backlog_max_batch);
 
     while (true) {
-        // Poll every 100 ms; break early when the backlog hits the flush watermark.
-        auto deadline = std::chrono::steady_clock::now() + cfg.task_backlog_flush_interval * 1s;
+        auto plan = shard.flush_policy.Plan();
+        backlog.SetFlushThreshold(plan.batch_size);
 
-        while (std::chrono::steady_clock::now() < deadline && !ctx.backlog.IsFull() &&
-               !ctx.StopRequested()) {
-            timer->expires_after(100ms);
+        while (!backlog.IsFull() && !ctx.StopRequested()) {
+            const auto now = std::chrono::steady_clock::now();
+            const auto oldest = backlog.OldestAt();
+            const auto deadline =
+                oldest ? *oldest + plan.max_wait : now + cfg.task_backlog_flush_interval * 1s;
+            if (oldest && now >= deadline) break;
+
+            timer->expires_at(deadline);
             co_await timer->async_wait(asio::as_tuple(asio::use_awaitable));
         }
 
         if (ctx.StopRequested()) {
+            backlog.SetWaker(nullptr);
             log::INFO("[Termination] backlog flush task stopped");
             co_return;
         }
 
-        auto logs = ctx.backlog.Flush();
+        auto logs = drainer.Drain(plan.batch_size);
         if (logs.empty()) continue;
 
-        log::DEBUG("Flushing {} log(s) from backlog", logs.size());
-
-        auto [count, max_id, elapsed] =
-            co_await ctx.db_write.AsyncUseConnection(ctx.write_strand, [&](WriterDatabase& db) {
-                Timer t;
-                int c = db.Insert(logs);
-                int64_t m = db.GetMaxLogId();
-                return std::make_tuple(c, m, t.elapsed_ms());
-            });
+        log::DEBUG("Flushing {} log(s) from backlog (target batch {}, max wait {} ms)",
+                   logs.size(), plan.batch_size, plan.max_wait.count());
 
-        metrics::MetricsRegistry::Instance().Collect(metrics::kInsertBatch, elapsed, count);
-        ctx.notifier.Notify(max_id);
+        auto batch = co_await detail::PendingEncode{ctx, shard, ex, std::move(logs)}.Await();
+        while (backlog.IsFull() && !ctx.StopRequested()) {
+            detail::PendingEncode next{ctx, shard, ex, drainer.Drain(plan.batch_size)};
+            co_await detail::insert_encoded(ctx, shard, batch);
+            batch = co_await next.Await();
 
-        log::DEBUG("Inserted {} row(s), max_log_id={}", count, max_id);
+            plan = shard.flush_policy.Plan();
+            backlog.SetFlushThreshold(plan.batch_size);
+        }
+        co_await detail::insert_encoded(ctx, shard, batch);
     }
 }
 
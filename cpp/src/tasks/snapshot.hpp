@@ -0,0 +1,109 @@
+#ifndef LOGLITE_TASKS_SNAPSHOT_HPP_
+#define LOGLITE_TASKS_SNAPSHOT_HPP_
+
+#include "../context.hpp"
+#include "../log.hpp"
+#include "../snapshot.hpp"
+#include "../utils.hpp"
+
+#include <boost/asio.hpp>
+#include <chrono>
+#include <exception>
+#include <filesystem>
+#include <memory>
+
+namespace asio = boost::asio;
+
+namespace loglite::tasks {
+
+using namespace std::chrono_literals;
+
+// ── Snapshot task ──────────────────────────────────────────────────────────────
+//
+// One-shot coroutine spawned by POST /admin/snapshot.  It copies the database via
+// the writer connection, snapshot_step_pages at a time:
+//   1. Each step is dispatched to the write strand, so it never overlaps an INSERT
+//      and rows flushed between steps are written through to the snapshot.
+//   2. Between steps it sleeps snapshot_step_interval_ms, letting
+//      FlushBacklogTask and the vacuum task take the strand.
+//   3. The copy is written to "<file>.partial" and renamed when complete, then
+//      old snapshots beyond snapshot_keep are pruned.
+// Progress is published through ctx.snapshot (GET /admin/snapshot).
+
+inline asio::awaitable<void> SnapshotTask(ServerContext& ctx, std::filesystem::path dest) {
+    auto ex = co_await asio::this_coro::executor;
+    auto& cfg = ctx.config;
+    asio::steady_timer timer{ex};
+
+    auto partial = dest;
+    partial += ".partial";
+
+    log::INFO("[snapshot] writing {}", dest.string());
+    Timer t;
+    std::unique_ptr<OnlineBackup> backup;
+    bool claimed = false;  // `partial` was created by this task
+    std::exception_ptr eptr;
+
+    try {
+        std::filesystem::create_directories(dest.parent_path());
+        backup = co_await ctx.db_write.AsyncUseConnection(
+            ctx.write_strand, [&](WriterDatabase& db) { return db.BeginBackup(partial); });
+        claimed = true;
+
+        while (true) {
+            auto [done, progress] = co_await ctx.db_write.AsyncUseConnection(
+                ctx.write_strand, [&](WriterDatabase&) {
+                    bool d = backup->Step(cfg.snapshot_step_pages);
+                    return std::make_pair(d, backup->Progress());
+                });
+            ctx.snapshot.Progress(progress);
+            if (done) break;
+
+            if (ctx.StopRequested()) throw std::runtime_error("server is shutting down");
+            timer.expires_after(cfg.snapshot_step_interval_ms * 1ms);
+            co_await timer.async_wait(asio::as_tuple(asio::use_awaitable));
+        }
+
+        co_await ctx.db_write.AsyncUseConnection(ctx.write_strand, [&](WriterDatabase&) {
+            backup->Finish();
+            backup.reset();
+        });
+        std::filesystem::rename(partial, dest);
+    } catch (...) {
+        eptr = std::current_exception();
+    }
+
+    if (eptr) {
+        // Release the source connection on the strand it belongs to.
+        if (backup) {
+            co_await ctx.db_write.AsyncUseConnection(ctx.write_strand,
+                                                     [&](WriterDatabase&) { backup.reset(); });
+        }
+        if (claimed) {
+            std::error_code ec;
+            std::filesystem::remove(partial, ec);
+        }
+
+        std::string msg = "unknown error";
+        try {
+            std::rethrow_exception(eptr);
+        } catch (const std::exception& e) {
+            msg = e.what();
+        } catch (...) {
+        }
+        log::ERROR("[snapshot] failed: {}", msg);
+        ctx.snapshot.Fail(std::move(msg), t.elapsed_ms());
+        co_return;
+    }
+
+    const auto size = static_cast<int64_t>(std::filesystem::file_size(dest));
+    ctx.snapshot.Finish(size, t.elapsed_ms());
+    log::INFO("[snapshot] wrote {} ({:.1f} MB) in {:.0f} ms", dest.filename().string(),
+              bytes_to_mb(size), t.elapsed_ms());
+
+    PruneSnapshots(dest.parent_path(), cfg.snapshot_keep);
+}
+
+}  // namespace loglite::tasks
+
+#endif  // LOGLITE_TASKS_SNAPSHOT_HPP_
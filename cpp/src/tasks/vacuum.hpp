@@ -6,8 +6,11 @@
 #include "../utils.hpp"
 
 #include <boost/asio.hpp>
+#include <algorithm>
 #include <chrono>
 #include <limits>
+#include <utility>
+#include <vector>
 
 namespace asio = boost::asio;
 
@@ -17,11 +20,22 @@ using namespace std::chrono_literals;
 
 namespace detail {
 
-// Remove log entries older than max_age_days; returns deleted count.
-// When limit_mb > 0, at most ~limit_mb MB worth of rows are removed per call.
-inline int remove_stale_logs(WriterDatabase& db, const Config& cfg, int limit_mb) {
+inline constexpr int kDeleteChunkMinRows = 100;
+inline constexpr int kDeleteChunkMaxRows = 100000;
+inline constexpr auto kDeleteBackpressurePause = 10ms;
+
+// Number of rows that make up about `limit_mb` MB, at the table's average row size.
+inline int64_t rows_in_mb(const WriterDatabase& db, int64_t rowcnt, int limit_mb) {
+    int64_t avg_row_bytes = std::max<int64_t>(1, db.GetSizeBytes() / std::max<int64_t>(1, rowcnt));
+    return static_cast<int64_t>(limit_mb) * 1024 * 1024 / avg_row_bytes;
+}
+
+// Filters selecting log entries older than max_age_days; empty when there are none.
+// When limit_mb > 0, at most ~limit_mb MB worth of rows are selected per call.
+inline std::vector<QueryFilter> stale_logs_filters(WriterDatabase& db, const Config& cfg,
+                                                   int limit_mb) {
     auto min_ts = db.GetMinTimestamp();
-    if (min_ts.empty()) return 0;
+    if (min_ts.empty()) return {};
 
     // Build cutoff ISO timestamp string (UTC).
     auto now = std::chrono::system_clock::now();
@@ -32,54 +46,103 @@ inline int remove_stale_logs(WriterDatabase& db, const Config& cfg, int limit_mb
     std::string cutoff_str{buf};
 
     // Only bother if the oldest log pre-dates the cutoff.
-    if (min_ts >= cutoff_str) return 0;
+    if (min_ts >= cutoff_str) return {};
 
     std::vector<QueryFilter> flt{{cfg.log_timestamp_field, "<=", cutoff_str}};
 
     if (limit_mb > 0) {
         // Control how much data to actually delete
-        int64_t remove_max_id = db.GetMaxLogId();
-        int64_t avg_row_bytes = db.EstimateAvgRowBytes();
-        int64_t max_rows = static_cast<int64_t>(limit_mb) * 1024 * 1024 / avg_row_bytes;
-        remove_max_id = std::min(remove_max_id, db.GetMinLogId() + max_rows - 1);
-
-        flt.push_back({"id", "<=", remove_max_id});
+        int64_t max_rows = rows_in_mb(db, db.CountLogRows(), limit_mb);
+        flt.push_back({"id", "<=", db.NthLogId(max_rows) - 1});
     }
-
-    int n = db.DeleteLogs(flt);
-    if (n > 0)
-        log::INFO("[vacuum] removed {} stale log(s) older than {} days", n, cfg.vacuum_max_days);
-    return n;
+    return flt;
 }
 
-// Delete oldest logs until DB size is below target; returns deleted count.
-// When limit_mb > 0, at most ~limit_mb MB worth of rows are removed per call.
-inline int remove_excessive_logs(WriterDatabase& db, const Config& cfg, int limit_mb) {
+// Filters selecting the oldest logs to delete until DB size is below target; empty while the
+// DB is within vacuum_max_size.  When limit_mb > 0, at most ~limit_mb MB worth of rows are
+// selected per call.
+inline std::vector<QueryFilter> excessive_logs_filters(WriterDatabase& db, const Config& cfg,
+                                                       int limit_mb) {
     double db_mb = db.GetSizeMB();
     double max_mb = bytes_to_mb(cfg.vacuum_max_size_bytes);
     double target_mb = bytes_to_mb(cfg.vacuum_target_size_bytes);
-    if (db_mb <= max_mb) return 0;
+    if (db_mb <= max_mb) return {};
 
-    int64_t min_id = db.GetMinLogId();
-    int64_t max_id = db.GetMaxLogId();
-    int64_t rowcnt = max_id - min_id + 1;
+    int64_t rowcnt = db.CountLogRows();
+    if (rowcnt == 0) return {};
 
     double ratio = (db_mb - target_mb) / db_mb;
-    int64_t remove_max_id = min_id + static_cast<int64_t>(rowcnt * ratio) - 1;
+    int64_t remove_rows = static_cast<int64_t>(rowcnt * ratio);
+    if (limit_mb > 0) remove_rows = std::min(remove_rows, rows_in_mb(db, rowcnt, limit_mb));
 
-    if (limit_mb > 0) {
-        int64_t avg_row_bytes = db.EstimateAvgRowBytes();
-        int64_t max_rows = static_cast<int64_t>(limit_mb) * 1024 * 1024 / avg_row_bytes;
-        remove_max_id = std::min(remove_max_id, min_id + max_rows - 1);
-    }
+    int64_t min_id = db.GetMinLogId();
+    int64_t remove_max_id = db.NthLogId(remove_rows) - 1;
 
     log::INFO("[vacuum] db={:.1f}MB limit={:.1f}MB target={:.1f}MB – deleting id {} to {}", db_mb,
               max_mb, target_mb, min_id, remove_max_id);
+    return {{"id", "<=", remove_max_id}};
+}
+
+// Sizes retention delete chunks so that each holds the write strand for about
+// `budget_ms`: the next chunk is the measured delete rate times the budget, at
+// most double the previous chunk, within [kDeleteChunkMinRows, kDeleteChunkMaxRows].
+class DeleteChunker {
+   public:
+    explicit DeleteChunker(double budget_ms, int initial_rows = 1000)
+        : budget_ms_(budget_ms),
+          rows_(std::clamp(initial_rows, kDeleteChunkMinRows, kDeleteChunkMaxRows)) {}
+
+    [[nodiscard]] int Rows() const noexcept { return rows_; }
+
+    void Observe(int deleted, double elapsed_ms) {
+        if (deleted <= 0) return;
+        const double per_ms = deleted / std::max(elapsed_ms, 0.01);
+        const auto next = static_cast<int64_t>(per_ms * budget_ms_);
+        rows_ = static_cast<int>(std::clamp<int64_t>(next, kDeleteChunkMinRows,
+                                                     std::min(int64_t{rows_} * 2,
+                                                              int64_t{kDeleteChunkMaxRows})));
+    }
+
+   private:
+    double budget_ms_;
+    int rows_;
+};
+
+// Deletes the logs matching `filters` one chunk per write-strand dispatch, so
+// backlog flushes queued behind a chunk run before the next one.  While the
+// backlog is near capacity it waits for the flushes to catch up.
+inline asio::awaitable<int64_t> delete_logs_chunked(ServerContext& ctx, LogShard& shard,
+                                                    std::vector<QueryFilter> filters) {
+    auto ex = co_await asio::this_coro::executor;
+    asio::steady_timer pause{ex};
+    DeleteChunker chunker{static_cast<double>(ctx.config.task_vacuum_chunk_ms)};
+    int64_t total = 0;
+    int chunks = 0;
+    Timer t;
+
+    while (!ctx.StopRequested()) {
+        while (shard.backlog.NearCapacity() && !ctx.StopRequested()) {
+            pause.expires_after(kDeleteBackpressurePause);
+            co_await pause.async_wait(asio::as_tuple(asio::use_awaitable));
+        }
+
+        const int limit = chunker.Rows();
+        auto [deleted, elapsed] =
+            co_await shard.db_write.AsyncUseConnection(shard.write_strand, [&](WriterDatabase& db) {
+                Timer chunk;
+                int n = db.DeleteLogs(filters, limit);
+                return std::make_pair(n, chunk.elapsed_ms());
+            });
+        total += deleted;
+        ++chunks;
+        chunker.Observe(deleted, elapsed);
+        if (deleted < limit) break;
+    }
 
-    std::vector<QueryFilter> flt{{"id", "<=", remove_max_id}};
-    int removed = db.DeleteLogs(flt);
-    log::INFO("[vacuum] ... removed {} entries", removed);
-    return removed;
+    if (total > 0)
+        log::INFO("[vacuum] ... removed {} entries in {} chunk(s) over {:.1f}s", total, chunks,
+                  t.elapsed_s());
+    co_return total;
 }
 
 inline int incremental_vacuum_pass(WriterDatabase& db, int max_size_mb) {
@@ -103,14 +166,25 @@ inline int incremental_vacuum_pass(WriterDatabase& db, int max_size_mb) {
 using namespace detail;
 
 // ── Vacuum task ────────────────────────────────────────────────────────────────
-
-inline asio::awaitable<void> VacuumTask(ServerContext& ctx) {
+//
+// Each pass runs on the write strand in short dispatches, so FlushBacklogTask is
+// never locked out for long:
+//   1. In INCREMENTAL auto_vacuum mode, reclaims up to task_vacuum_max_size MB of
+//      free pages; the pass ends there while free pages remain.
+//   2. Deletes logs older than vacuum_max_days, then the oldest logs while the
+//      database exceeds vacuum_max_size, in chunks sized to take about
+//      task_vacuum_chunk_ms each (see delete_logs_chunked).
+//   3. In FULL auto_vacuum mode, runs VACUUM and a FULL WAL checkpoint.
+// Each shard runs its own task, against its share of the size limits.
+
+inline asio::awaitable<void> VacuumTask(ServerContext& ctx, LogShard& shard) {
     auto ex = co_await asio::this_coro::executor;
-    auto& cfg = ctx.config;
+    const auto cfg = ctx.config.ForShard(static_cast<int>(shard.index));
     auto timer = std::make_shared<asio::steady_timer>(ex);
     ctx.RegisterShutdownTimer(timer);
 
-    log::INFO("Vacuum task started (interval={}s)", cfg.task_vacuum_interval);
+    log::INFO("Vacuum task started (shard={}, interval={}s)", shard.index,
+              cfg.task_vacuum_interval);
 
     while (true) {
         timer->expires_after(cfg.task_vacuum_interval * 1s);
@@ -122,32 +196,45 @@ inline asio::awaitable<void> VacuumTask(ServerContext& ctx) {
         }
 
         // All vacuum operations mutate the DB → run on write strand.
-        co_await ctx.db_write.AsyncUseConnection(ctx.write_strand, [&](WriterDatabase& db) {
-            auto vacuum_mode_str = db.GetPragma("auto_vacuum");
-            int vacuum_mode = vacuum_mode_str.empty() ? 0 : std::stoi(vacuum_mode_str);
-
-            int limit_mb = (vacuum_mode == 2) ? cfg.task_vacuum_max_size : 0;
-
-            if (vacuum_mode == 2) {  // INCREMENTAL
-                int remain = incremental_vacuum_pass(db, cfg.task_vacuum_max_size);
-                if (remain > 0) return;
-            }
-
-            bool has_ts = std::ranges::any_of(db.GetColumnInfo(), [&](const ColumnInfo& ci) {
-                return ci.name == cfg.log_timestamp_field;
+        auto [vacuum_mode, stale] =
+            co_await shard.db_write.AsyncUseConnection(shard.write_strand, [&](WriterDatabase& db) {
+                auto vacuum_mode_str = db.GetPragma("auto_vacuum");
+                int mode = vacuum_mode_str.empty() ? 0 : std::stoi(vacuum_mode_str);
+                std::vector<QueryFilter> flt;
+
+                if (mode == 2) {  // INCREMENTAL
+                    int remain = incremental_vacuum_pass(db, cfg.task_vacuum_max_size);
+                    if (remain > 0) return std::make_pair(-1, flt);
+                }
+
+                bool has_ts = std::ranges::any_of(db.GetColumnInfo(), [&](const ColumnInfo& ci) {
+                    return ci.name == cfg.log_timestamp_field;
+                });
+                if (has_ts)
+                    flt = stale_logs_filters(db, cfg, mode == 2 ? cfg.task_vacuum_max_size : 0);
+                return std::make_pair(mode, flt);
             });
+        if (vacuum_mode < 0) continue;
+        const int limit_mb = (vacuum_mode == 2) ? cfg.task_vacuum_max_size : 0;
 
-            if (has_ts) remove_stale_logs(db, cfg, limit_mb);
+        if (!stale.empty()) {
+            log::INFO("[vacuum] removing logs older than {} days", cfg.vacuum_max_days);
+            co_await delete_logs_chunked(ctx, shard, std::move(stale));
+        }
 
-            remove_excessive_logs(db, cfg, limit_mb);
+        auto excessive = co_await shard.db_write.AsyncUseConnection(
+            shard.write_strand,
+            [&](WriterDatabase& db) { return excessive_logs_filters(db, cfg, limit_mb); });
+        if (!excessive.empty()) co_await delete_logs_chunked(ctx, shard, std::move(excessive));
 
-            if (vacuum_mode == 1) {  // FULL
+        if (vacuum_mode == 1 && !ctx.StopRequested()) {  // FULL
+            co_await shard.db_write.AsyncUseConnection(shard.write_strand, [&](WriterDatabase& db) {
                 Timer t;
                 db.Vacuum();
                 db.WALCheckpoint("FULL");
                 log::INFO("[vacuum] full vacuum completed in {:.1f}s", t.elapsed_s());
-            }
-        });
+            });
+        }
     }
 }
 
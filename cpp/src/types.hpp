@@ -3,8 +3,13 @@
 
 #include <boost/describe.hpp>
 
+#include <algorithm>
+#include <cctype>
 #include <cstdint>
+#include <map>
+#include <optional>
 #include <string>
+#include <string_view>
 #include <vector>
 
 #include <nlohmann/json.hpp>
@@ -23,6 +28,60 @@ struct QueryFilter {
     nlohmann::json value;  // string, int64, double, or null
 };
 
+// ── JSON-path fields ──────────────────────────────────────────────────────────
+
+// A key path inside a JSON column, written "<column>.<key>[.<key>...]", e.g.
+// "extra.http.status".  Keys are restricted to [A-Za-z0-9_] so that the path and
+// the derived generated-column name are safe to splice into SQL.
+struct JsonFieldPath {
+    std::string column;
+    std::vector<std::string> keys;
+
+    static std::optional<JsonFieldPath> Parse(std::string_view field) {
+        auto is_ident = [](std::string_view s) {
+            return !s.empty() && std::ranges::all_of(s, [](unsigned char c) {
+                return std::isalnum(c) || c == '_';
+            });
+        };
+
+        JsonFieldPath out;
+        std::size_t pos = 0;
+        while (true) {
+            const auto dot = field.find('.', pos);
+            const auto part = field.substr(pos, dot == std::string_view::npos ? dot : dot - pos);
+            if (!is_ident(part)) return std::nullopt;
+            if (out.column.empty())
+                out.column = part;
+            else
+                out.keys.emplace_back(part);
+            if (dot == std::string_view::npos) break;
+            pos = dot + 1;
+        }
+        if (out.keys.empty()) return std::nullopt;
+        return out;
+    }
+
+    // SQLite JSON path: "$.http.status".
+    [[nodiscard]] std::string JsonPath() const {
+        std::string path = "$";
+        for (const auto& k : keys) (path += '.') += k;
+        return path;
+    }
+
+    // Name of the generated column that materializes this path: "extra__http__status".
+    [[nodiscard]] std::string GeneratedColumn() const {
+        std::string name = column;
+        for (const auto& k : keys) (name += "__") += k;
+        return name;
+    }
+
+    // The value at this path in `json_sql`; NULL for rows whose value is not valid JSON.
+    [[nodiscard]] std::string Extract(std::string_view json_sql) const {
+        return "CASE WHEN json_valid(" + std::string(json_sql) + ") THEN json_extract(" +
+               std::string(json_sql) + ", '" + JsonPath() + "') END";
+    }
+};
+
 // ── Schema ────────────────────────────────────────────────────────────────────
 
 struct ColumnInfo {
@@ -32,6 +91,14 @@ struct ColumnInfo {
     bool is_pk{false};
 };
 
+struct IndexInfo {
+    std::string name;
+    std::vector<std::string> columns;  // key columns in order; "<expr>" for expression keys
+    bool unique{false};
+    bool partial{false};
+    std::string sql;  // CREATE INDEX statement; empty for automatic indexes
+};
+
 // ── Migrations ────────────────────────────────────────────────────────────────
 
 struct Migration {
@@ -44,7 +111,76 @@ struct Migration {
 
 struct CompressionConfig {
     bool enabled{false};
-    std::vector<std::string> columns;
+    std::vector<std::string> columns;       // low-cardinality: integer ids (ColumnDictionary)
+    std::vector<std::string> zstd_columns;  // high-cardinality text: zstd frames (ZstdCodec)
+    int zstd_level{3};
+    int zstd_dict_size{64};        // max trained dictionary size, in KiB
+    int zstd_train_samples{1000};  // values sampled per column before training its dictionary
+};
+
+// ── Admission control ─────────────────────────────────────────────────────────
+
+struct AdmissionRule {
+    std::map<std::string, std::string> match;  // field → value ("*" = any); all must match
+    int rate{0};                               // entries/s per source; 0 = unlimited
+    int burst{0};                              // bucket size; 0 = one second of `rate`
+    double sample_rate{1.0};                   // fraction kept; 1.0 = never sample
+};
+
+struct AdmissionConfig {
+    bool enabled{false};
+    std::vector<std::string> key_fields{"service", "level"};  // fields identifying a source
+    std::vector<AdmissionRule> rules;                         // first match wins
+};
+
+// ── Deduplication ─────────────────────────────────────────────────────────────
+
+struct DedupConfig {
+    bool enabled{false};
+    std::vector<std::string> key_fields{"message", "level", "service"};  // identical → collapsed
+    int window_seconds{60};  // a row absorbs duplicates for this long after its first entry
+    int max_keys{10000};     // open windows tracked; the oldest is closed beyond this
+    std::string count_column{"count"};            // required in the log table
+    std::string first_seen_column{"first_seen"};  // optional in the log table
+    std::string last_seen_column{"last_seen"};    // optional in the log table
+};
+
+// Duplicates that arrived after row `row_id` was inserted.
+struct DedupUpdate {
+    int64_t row_id{};
+    int64_t count{};
+    nlohmann::json last_seen;
+};
+
+// ── Sharding ──────────────────────────────────────────────────────────────────
+
+struct ShardConfig {
+    int count{1};     // database files; 1 = no sharding
+    std::string key;  // column whose value picks an entry's shard; required when count > 1
+    // Highest GET /logs offset served while sharded: every shard reads offset + limit
+    // rows for a page, so deeper pages must use before_id.
+    int max_offset{10000};
+};
+
+// ── WAL checkpoints ───────────────────────────────────────────────────────────
+
+// Outcome of sqlite3_wal_checkpoint_v2(); frame counts are -1 outside WAL mode.
+struct WalCheckpointResult {
+    bool busy{};  // a reader or writer prevented the checkpoint from completing
+    int log_frames{-1};
+    int checkpointed_frames{-1};
+
+    [[nodiscard]] int Lag() const {
+        return log_frames > checkpointed_frames ? log_frames - checkpointed_frames : 0;
+    }
+};
+
+// ── Stats rollups ─────────────────────────────────────────────────────────────
+
+// One downsampled tier of activity_stats / database_stats.
+struct StatsRollup {
+    int resolution{};       // seconds per bucket; a multiple of the previous tier's
+    int retention_hours{};  // rows of this tier older than this are pruned
 };
 
 // ── Query result ──────────────────────────────────────────────────────────────
@@ -97,11 +233,21 @@ struct DatabaseStatsRow {
 struct StatsQueryResult {
     std::vector<std::string> fields;
     std::vector<std::vector<nlohmann::json>> data;
+    int resolution{};  // seconds per row of the tier that was read
 };
 
 // Boost.Describe — metadata for (de)serialization and config loading (see config.cpp).
 BOOST_DESCRIBE_STRUCT(Migration, (), (version, rollout, rollback))
-BOOST_DESCRIBE_STRUCT(CompressionConfig, (), (enabled, columns))
+BOOST_DESCRIBE_STRUCT(CompressionConfig, (),
+                      (enabled, columns, zstd_columns, zstd_level, zstd_dict_size,
+                       zstd_train_samples))
+BOOST_DESCRIBE_STRUCT(AdmissionRule, (), (match, rate, burst, sample_rate))
+BOOST_DESCRIBE_STRUCT(AdmissionConfig, (), (enabled, key_fields, rules))
+BOOST_DESCRIBE_STRUCT(DedupConfig, (),
+                      (enabled, key_fields, window_seconds, max_keys, count_column,
+                       first_seen_column, last_seen_column))
+BOOST_DESCRIBE_STRUCT(ShardConfig, (), (count, key, max_offset))
+BOOST_DESCRIBE_STRUCT(StatsRollup, (), (resolution, retention_hours))
 
 }  // namespace loglite
 
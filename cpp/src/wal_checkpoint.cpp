@@ -0,0 +1,85 @@
+#include "wal_checkpoint.hpp"
+
+namespace loglite {
+
+std::string_view CheckpointModeName(CheckpointMode mode) {
+    switch (mode) {
+    case CheckpointMode::kPassive:
+        return "PASSIVE";
+    case CheckpointMode::kRestart:
+        return "RESTART";
+    case CheckpointMode::kTruncate:
+        return "TRUNCATE";
+    case CheckpointMode::kNone:
+        break;
+    }
+    return "NONE";
+}
+
+WalCheckpointManager::WalCheckpointManager(int64_t wal_limit_bytes)
+    : wal_limit_(wal_limit_bytes) {}
+
+CheckpointMode WalCheckpointManager::Plan(int64_t wal_bytes, std::size_t active_reads) {
+    std::lock_guard lk(mtx_);
+    wal_bytes_ = wal_bytes;
+    if (wal_bytes <= 0) return CheckpointMode::kNone;  // not in WAL mode, or just truncated
+
+    if (wal_bytes > wal_limit_) {
+        if (active_reads == 0 || deferrals_ >= kMaxDeferrals) return CheckpointMode::kTruncate;
+        ++deferrals_;
+        return CheckpointMode::kPassive;
+    }
+    deferrals_ = 0;
+    if (lagging_passes_ >= kRestartAfterPasses) return CheckpointMode::kRestart;
+    return CheckpointMode::kPassive;
+}
+
+void WalCheckpointManager::Observe(CheckpointMode mode, const WalCheckpointResult& result,
+                                   int64_t wal_bytes, double elapsed_ms) {
+    std::lock_guard lk(mtx_);
+    wal_bytes_ = wal_bytes;
+    lag_frames_ = result.Lag();
+    last_mode_ = mode;
+    last_ms_ = elapsed_ms;
+
+    switch (mode) {
+    case CheckpointMode::kPassive:
+        ++passive_count_;
+        lagging_passes_ = lag_frames_ > 0 ? lagging_passes_ + 1 : 0;
+        break;
+    case CheckpointMode::kRestart:
+    case CheckpointMode::kTruncate:
+        if (result.busy) {
+            ++busy_count_;
+            break;
+        }
+        ++(mode == CheckpointMode::kRestart ? restart_count_ : truncate_count_);
+        lagging_passes_ = 0;
+        deferrals_ = 0;
+        break;
+    case CheckpointMode::kNone:
+        break;
+    }
+}
+
+int WalCheckpointManager::LagFrames() const {
+    std::lock_guard lk(mtx_);
+    return lag_frames_;
+}
+
+nlohmann::json WalCheckpointManager::ToJSON() const {
+    std::lock_guard lk(mtx_);
+    return {
+        {"wal_bytes", wal_bytes_},
+        {"wal_limit", wal_limit_},
+        {"lag_frames", lag_frames_},
+        {"last_mode", CheckpointModeName(last_mode_)},
+        {"last_ms", last_ms_},
+        {"passive", passive_count_},
+        {"restart", restart_count_},
+        {"truncate", truncate_count_},
+        {"busy", busy_count_},
+    };
+}
+
+}  // namespace loglite
@@ -0,0 +1,73 @@
+#ifndef LOGLITE_WAL_CHECKPOINT_HPP_
+#define LOGLITE_WAL_CHECKPOINT_HPP_
+
+#include "types.hpp"
+
+#include <cstddef>
+#include <cstdint>
+#include <mutex>
+#include <string_view>
+
+#include <nlohmann/json.hpp>
+
+namespace loglite {
+
+// ── WAL checkpoint manager ────────────────────────────────────────────────────
+//
+// Decides which checkpoint CheckpointTask runs on each pass, from the size of
+// the -wal file and the number of reads in progress.  SQLite's auto-checkpoint
+// only runs PASSIVE checkpoints, which cannot copy frames a reader's snapshot
+// still needs; with overlapping readers (SSE polling) the WAL never resets and
+// keeps growing.
+//   - Normally a PASSIVE checkpoint copies whatever frames it can.
+//   - When kRestartAfterPasses PASSIVE passes in a row leave frames behind, a
+//     RESTART waits for the pinning readers and makes the next writer reuse the
+//     file from the start.
+//   - Once the file exceeds `wal_limit` bytes, TRUNCATE does the same and gives
+//     the space back.  While reads are in progress it is deferred (running
+//     PASSIVE instead) for up to kMaxDeferrals passes, then forced.
+// RESTART and TRUNCATE wait at most kBusyTimeoutMs for readers.  Lag is the
+// number of WAL frames not yet copied into the database.
+
+enum class CheckpointMode { kNone, kPassive, kRestart, kTruncate };
+
+[[nodiscard]] std::string_view CheckpointModeName(CheckpointMode mode);
+
+class WalCheckpointManager {
+   public:
+    static constexpr int kRestartAfterPasses = 3;
+    static constexpr int kMaxDeferrals = 6;
+    static constexpr int kBusyTimeoutMs = 100;
+
+    explicit WalCheckpointManager(int64_t wal_limit_bytes);
+
+    // Mode for the next pass; `active_reads` is the number of leased reader connections.
+    [[nodiscard]] CheckpointMode Plan(int64_t wal_bytes, std::size_t active_reads);
+
+    // A `mode` checkpoint returned `result` in `elapsed_ms`, leaving a `wal_bytes` WAL file.
+    void Observe(CheckpointMode mode, const WalCheckpointResult& result, int64_t wal_bytes,
+                 double elapsed_ms);
+
+    [[nodiscard]] int LagFrames() const;
+
+    // Current state and counters, as reported by GET /stats.
+    [[nodiscard]] nlohmann::json ToJSON() const;
+
+   private:
+    mutable std::mutex mtx_;
+    int64_t wal_limit_;
+    int64_t wal_bytes_{};
+    int lag_frames_{};
+    int lagging_passes_{};  // consecutive PASSIVE passes that left frames behind
+    int deferrals_{};       // passes TRUNCATE has waited for readers
+    CheckpointMode last_mode_{CheckpointMode::kNone};
+    double last_ms_{};
+    int64_t passive_count_{};
+    int64_t restart_count_{};
+    int64_t truncate_count_{};
+    int64_t busy_count_{};
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_WAL_CHECKPOINT_HPP_
@@ -4,9 +4,11 @@
 #include "migrations.hpp"
 #include "utils.hpp"
 
+#include <algorithm>
 #include <fmt/format.h>
 #include <iterator>
 #include <ranges>
+#include <set>
 
 namespace loglite {
 
@@ -17,6 +19,7 @@ void WriterDatabase::Open() {
     auto path = cfg_.db_path.string();
     ensure_ok(sqlite3_open(path.c_str(), &db_), "sqlite3_open");
     apply_params(AccessMode::WRITE);
+    register_functions();
     log::DEBUG("Opened writer SQLite connection: {}", path);
 }
 
@@ -32,6 +35,13 @@ void WriterDatabase::CreateInternalTables() {
         value_id INTEGER NOT NULL,
         value    JSON
     ))");
+    exec_sql(R"(CREATE TABLE IF NOT EXISTS zstd_dictionary (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        column     TEXT    NOT NULL,
+        dict_id    INTEGER NOT NULL UNIQUE,
+        dict       BLOB    NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ))");
     exec_sql(R"(CREATE TABLE IF NOT EXISTS activity_stats (
         id                  INTEGER PRIMARY KEY,
         since               DATETIME NOT NULL,
@@ -57,6 +67,73 @@ void WriterDatabase::CreateInternalTables() {
         rows_count   INTEGER,
         db_size      INTEGER
     ))");
+    // Downsampled tiers of the two tables above, one set of rows per resolution (seconds).
+    exec_sql(R"(CREATE TABLE IF NOT EXISTS activity_stats_rollup (
+        id                  INTEGER PRIMARY KEY,
+        resolution          INTEGER NOT NULL,
+        since               DATETIME NOT NULL,
+        until               DATETIME NOT NULL,
+        query_count         INTEGER,
+        query_min           INTEGER,
+        query_max           INTEGER,
+        query_avg           INTEGER,
+        ingest_count        INTEGER,
+        ingest_size_min     INTEGER,
+        ingest_size_max     INTEGER,
+        ingest_size_avg     INTEGER,
+        ingest_drop_count   INTEGER,
+        insert_batch_count  INTEGER,
+        insert_total_count  INTEGER,
+        insert_total_cost   INTEGER,
+        sse_session_count   INTEGER,
+        http_conn_count     INTEGER,
+        UNIQUE (resolution, since)
+    ))");
+    exec_sql(R"(CREATE TABLE IF NOT EXISTS database_stats_rollup (
+        id           INTEGER PRIMARY KEY,
+        resolution   INTEGER NOT NULL,
+        timestamp    DATETIME,
+        rows_count   INTEGER,
+        db_size      INTEGER,
+        UNIQUE (resolution, timestamp)
+    ))");
+}
+
+void WriterDatabase::EnsureJsonFieldColumns() {
+    if (cfg_.json_fields.empty()) return;
+
+    // table_xinfo also lists generated columns, which table_info hides.
+    std::set<std::string> existing;
+    {
+        Statement stmt{db_, fmt::format("PRAGMA table_xinfo({})", cfg_.log_table_name)};
+        while (sqlite3_step(stmt) == SQLITE_ROW)
+            existing.emplace(reinterpret_cast<const char*>(sqlite3_column_text(stmt, 1)));
+    }
+    if (existing.empty()) {
+        log::WARN("Log table '{}' does not exist yet; json_fields are not materialized",
+                  cfg_.log_table_name);
+        return;
+    }
+
+    for (const auto& field : cfg_.json_fields) {
+        auto path = JsonFieldPath::Parse(field);
+        if (!path) throw std::runtime_error(fmt::format("Invalid json_fields entry: '{}'", field));
+        if (!existing.contains(path->column))
+            throw std::runtime_error(fmt::format("json_fields entry '{}': no column '{}' in {}",
+                                                 field, path->column, cfg_.log_table_name));
+
+        const auto column = path->GeneratedColumn();
+        if (!existing.contains(column)) {
+            log::INFO("Adding generated column {} for json field '{}'", column, field);
+            exec_sql(fmt::format("ALTER TABLE {} ADD COLUMN {} AS ({}) VIRTUAL",
+                                 cfg_.log_table_name, column, path->Extract(path->column)));
+            existing.insert(column);
+        }
+        // Building the index scans the table once; later starts find it in place.
+        exec_sql(fmt::format("CREATE INDEX IF NOT EXISTS idx_{0}_{1} ON {0}({1})",
+                             cfg_.log_table_name, column));
+        catalog_->json_field_columns[field] = column;
+    }
 }
 
 void WriterDatabase::Initialize() {
@@ -68,87 +145,262 @@ void WriterDatabase::Initialize() {
         }
     }
 
+    EnsureJsonFieldColumns();
     RefreshColumnInfo();
 
+    const auto& dedup = cfg_.dedup;
+    if (dedup.enabled && !catalog_->log_column_info.empty() &&
+        !has_log_column(dedup.count_column)) {
+        throw std::runtime_error(
+            fmt::format("dedup is enabled but {} has no '{}' column; add it in a migration",
+                        cfg_.log_table_name, dedup.count_column));
+    }
+
     LookupTable lut;
     for (const auto& [col, value, id] : GetColumnDictRows()) {
         lut[col][value] = id;
     }
     log::INFO("Loaded column dictionary ({} entries)", lut.size());
 
+    // New dictionary entries are created while encoding, which may run off the write
+    // strand; they are queued and written by the next InsertEncoded, in the same
+    // transaction as the first rows that reference them.
     catalog_->col_dict = std::make_shared<ColumnDictionary>(
         std::move(lut), [this](const std::string& col, const std::string& val, ValueId vid) {
-            return InsertColumnDictValue(col, val, vid);
+            std::lock_guard lk(pending_mtx_);
+            pending_dict_entries_.values.emplace_back(col, val, vid);
+            return true;
+        });
+
+    const auto& comp = cfg_.compression;
+    std::set<std::string> zstd_columns;
+    if (comp.enabled) zstd_columns.insert(comp.zstd_columns.begin(), comp.zstd_columns.end());
+    catalog_->zstd_codec = std::make_shared<ZstdCodec>(
+        std::move(zstd_columns),
+        ZstdCodec::Options{comp.zstd_level, static_cast<size_t>(comp.zstd_dict_size) * 1024,
+                           static_cast<size_t>(comp.zstd_train_samples)},
+        [this](const std::string& col, ZstdDictId id, const std::string& dict) {
+            std::lock_guard lk(pending_mtx_);
+            pending_dict_entries_.zstd_dicts.emplace_back(col, id, dict);
+            return true;
         });
+
+    auto zstd_dicts = GetZstdDictRows();
+    for (auto& [col, dict] : zstd_dicts) {
+        catalog_->zstd_columns.insert(col);
+        catalog_->zstd_codec->LoadDictionary(col, std::move(dict));
+    }
+    log::INFO("Loaded zstd dictionaries ({} entries)", zstd_dicts.size());
 }
 
-int WriterDatabase::Insert(const std::vector<nlohmann::json>& logs) {
-    std::vector<ColumnInfo> cols;
-    cols.reserve(catalog_->log_column_info.size());
-    std::ranges::copy_if(catalog_->log_column_info, std::back_inserter(cols),
-                         [](const ColumnInfo& ci) { return !ci.is_pk; });
+EncodedBatch WriterDatabase::EncodeRows(const std::vector<nlohmann::json>& logs) const {
+    EncodedBatch batch;
+    std::vector<const ColumnInfo*> cols;
+    for (const auto& ci : catalog_->log_column_info) {
+        if (ci.is_pk) continue;
+        cols.push_back(&ci);
+        batch.columns.push_back(ci.name);
+    }
+    if (cols.empty() || logs.empty()) return batch;
+
+    static const nlohmann::json kNull;
+    batch.rows.reserve(logs.size());
+    for (const auto& log : logs) {
+        std::vector<nlohmann::json> row;
+        row.reserve(cols.size());
+
+        bool valid = true;
+        for (const auto* ci : cols) {
+            auto it = log.find(ci->name);
+            const nlohmann::json& raw = (it != log.end()) ? *it : kNull;
+
+            if (ci->not_null && raw.is_null()) {
+                log::WARN("Skipping log: column '{}' required but missing", ci->name);
+                valid = false;
+                break;
+            }
+
+            nlohmann::json serialized = serialize_value(raw);
+            if (catalog_->compressed_columns.contains(ci->name) && !serialized.is_null()) {
+                std::string sv =
+                    serialized.is_string() ? serialized.get<std::string>() : serialized.dump();
+                serialized = catalog_->col_dict->GetOrCreate(ci->name, sv);
+            } else if (serialized.is_string() && catalog_->zstd_codec &&
+                       catalog_->zstd_codec->Handles(ci->name)) {
+                if (auto frame = catalog_->zstd_codec->Compress(
+                        ci->name, serialized.get_ref<const std::string&>())) {
+                    serialized = nlohmann::json::binary(std::move(*frame));
+                }
+            }
+            row.push_back(std::move(serialized));
+        }
+
+        if (valid) {
+            batch.rows.push_back(std::move(row));
+            batch.sources.push_back(static_cast<std::size_t>(&log - logs.data()));
+        }
+    }
+    return batch;
+}
 
-    if (cols.empty() || logs.empty()) return 0;
+int WriterDatabase::InsertEncoded(const EncodedBatch& batch, std::vector<int64_t>* row_ids) {
+    if (batch.columns.empty() || batch.rows.empty()) return 0;
 
-    std::string col_list, placeholders;
-    for (size_t i = 0; i < cols.size(); ++i) {
-        if (i) {
+    // Sharded: ids are assigned here rather than by SQLite (see SetIdStride).
+    const bool explicit_id = id_stride_ > 1;
+    std::string col_list = explicit_id ? "id" : "";
+    std::string placeholders = explicit_id ? "?" : "";
+    for (const auto& col : batch.columns) {
+        if (!col_list.empty()) {
             col_list += ",";
             placeholders += ",";
         }
-        col_list += cols[i].name;
+        col_list += col;
         placeholders += "?";
     }
     auto sql =
         fmt::format("INSERT INTO {} ({}) VALUES ({})", cfg_.log_table_name, col_list, placeholders);
     Statement stmt{db_, sql};
 
+    PendingDictEntries pending;
+    {
+        std::lock_guard lk(pending_mtx_);
+        std::swap(pending, pending_dict_entries_);
+    }
+
+    const int64_t next_id = next_id_;
     exec_sql("BEGIN");
     try {
+        persist_dict_entries(pending);
+
         int inserted = 0;
-        for (const auto& log : logs) {
+        const int first = explicit_id ? 2 : 1;
+        for (const auto& row : batch.rows) {
             sqlite3_reset(stmt);
             sqlite3_clear_bindings(stmt);
+            if (explicit_id) sqlite3_bind_int64(stmt, 1, next_id_);
+            for (int i = 0; i < static_cast<int>(row.size()); ++i)
+                bind_param(stmt, i + first, row[i]);
 
-            bool valid = true;
-            for (int i = 0; i < static_cast<int>(cols.size()); ++i) {
-                const auto& ci = cols[i];
-                auto it = log.find(ci.name);
-                nlohmann::json raw = (it != log.end()) ? *it : nlohmann::json(nullptr);
-
-                if (ci.not_null && raw.is_null()) {
-                    log::WARN("Skipping log: column '{}' required but missing", ci.name);
-                    valid = false;
-                    break;
-                }
-
-                nlohmann::json serialized = serialize_value(raw);
-                if (catalog_->compressed_columns.contains(ci.name) && !serialized.is_null()) {
-                    std::string sv =
-                        serialized.is_string() ? serialized.get<std::string>() : serialized.dump();
-                    serialized = catalog_->col_dict->GetOrCreate(ci.name, sv);
-                }
-                bind_param(stmt, i + 1, serialized);
-            }
-
-            if (!valid) continue;
             int rc = sqlite3_step(stmt);
-            if (rc == SQLITE_DONE)
+            if (rc == SQLITE_DONE) {
                 ++inserted;
-            else
+                next_id_ += id_stride_;
+            } else {
                 log::ERROR("Insert step failed: {}", sqlite3_errmsg(db_));
+            }
+            if (row_ids)
+                row_ids->push_back(rc == SQLITE_DONE ? sqlite3_last_insert_rowid(db_) : 0);
         }
         exec_sql("COMMIT");
         return inserted;
+    } catch (...) {
+        sqlite3_exec(db_, "ROLLBACK", nullptr, nullptr, nullptr);
+        next_id_ = next_id;
+        // The ids are already handed out in memory; keep them queued for the next batch.
+        std::lock_guard lk(pending_mtx_);
+        pending.values.insert(pending.values.end(),
+                              std::make_move_iterator(pending_dict_entries_.values.begin()),
+                              std::make_move_iterator(pending_dict_entries_.values.end()));
+        pending.zstd_dicts.insert(
+            pending.zstd_dicts.end(),
+            std::make_move_iterator(pending_dict_entries_.zstd_dicts.begin()),
+            std::make_move_iterator(pending_dict_entries_.zstd_dicts.end()));
+        pending_dict_entries_ = std::move(pending);
+        throw;
+    }
+}
+
+void WriterDatabase::SetIdStride(int64_t stride, int64_t offset, int64_t floor) {
+    id_stride_ = std::max<int64_t>(stride, 1);
+    const int64_t base = floor + 1;
+    next_id_ = base + ((offset - base) % id_stride_ + id_stride_) % id_stride_;
+}
+
+int64_t WriterDatabase::CountLogRows() const {
+    if (id_stride_ == 1) return EstimateLogRowCount();
+    Statement stmt{db_, fmt::format("SELECT COUNT(*) FROM {}", cfg_.log_table_name)};
+    if (sqlite3_step(stmt) == SQLITE_ROW) return sqlite3_column_int64(stmt, 0);
+    return 0;
+}
+
+int64_t WriterDatabase::NthLogId(int64_t n) const {
+    const int64_t max_id = GetMaxLogId();
+    if (n <= 0) return GetMinLogId();
+    if (id_stride_ == 1) return std::min(GetMinLogId() + n, max_id + 1);
+
+    auto sql =
+        fmt::format("SELECT id FROM {} ORDER BY id LIMIT 1 OFFSET ?", cfg_.log_table_name);
+    Statement stmt{db_, sql};
+    sqlite3_bind_int64(stmt, 1, n);
+    if (sqlite3_step(stmt) == SQLITE_ROW) return sqlite3_column_int64(stmt, 0);
+    return max_id + 1;
+}
+
+int WriterDatabase::Insert(const std::vector<nlohmann::json>& logs) {
+    return InsertEncoded(EncodeRows(logs));
+}
+
+int WriterDatabase::ApplyDedupUpdates(const std::vector<DedupUpdate>& updates) {
+    if (updates.empty()) return 0;
+
+    const auto& dedup = cfg_.dedup;
+    const bool has_last_seen = has_log_column(dedup.last_seen_column);
+    auto sql = has_last_seen
+                   ? fmt::format("UPDATE {0} SET {1} = {1} + ?, {2} = ? WHERE rowid = ?",
+                                 cfg_.log_table_name, dedup.count_column, dedup.last_seen_column)
+                   : fmt::format("UPDATE {0} SET {1} = {1} + ? WHERE rowid = ?",
+                                 cfg_.log_table_name, dedup.count_column);
+    Statement stmt{db_, sql};
+
+    exec_sql("BEGIN");
+    try {
+        int updated = 0;
+        for (const auto& u : updates) {
+            sqlite3_reset(stmt);
+            sqlite3_clear_bindings(stmt);
+            int idx = 1;
+            bind_param(stmt, idx++, u.count);
+            if (has_last_seen) bind_param(stmt, idx++, serialize_value(u.last_seen));
+            bind_param(stmt, idx, u.row_id);
+
+            if (sqlite3_step(stmt) == SQLITE_DONE)
+                updated += sqlite3_changes(db_);
+            else
+                log::ERROR("Dedup update failed: {}", sqlite3_errmsg(db_));
+        }
+        exec_sql("COMMIT");
+        return updated;
     } catch (...) {
         sqlite3_exec(db_, "ROLLBACK", nullptr, nullptr, nullptr);
         throw;
     }
 }
 
-int WriterDatabase::DeleteLogs(const std::vector<QueryFilter>& filters) {
+void WriterDatabase::persist_dict_entries(const PendingDictEntries& pending) {
+    for (const auto& [col, value, id] : pending.values) {
+        if (!InsertColumnDictValue(col, value, id))
+            throw std::runtime_error(
+                fmt::format("Failed to persist dictionary value {} for column '{}'", id, col));
+    }
+    for (const auto& [col, id, dict] : pending.zstd_dicts) {
+        if (!InsertZstdDict(col, id, dict))
+            throw std::runtime_error(
+                fmt::format("Failed to persist the zstd dictionary for column '{}'", col));
+    }
+}
+
+bool WriterDatabase::has_log_column(std::string_view name) const {
+    return std::ranges::any_of(catalog_->log_column_info,
+                               [&](const ColumnInfo& ci) { return ci.name == name; });
+}
+
+int WriterDatabase::DeleteLogs(const std::vector<QueryFilter>& filters, int limit) {
     auto [where, params] = build_where_clause(filters);
-    auto sql = fmt::format("DELETE FROM {} WHERE {}", cfg_.log_table_name, where);
+    auto sql = limit > 0 ? fmt::format("DELETE FROM {0} WHERE rowid IN (SELECT rowid FROM {0} "
+                                       "WHERE {1} ORDER BY rowid LIMIT {2})",
+                                       cfg_.log_table_name, where, limit)
+                         : fmt::format("DELETE FROM {} WHERE {}", cfg_.log_table_name, where);
     Statement stmt{db_, sql};
     for (int i = 0; i < static_cast<int>(params.size()); ++i) bind_param(stmt, i + 1, params[i]);
     ensure_ok(sqlite3_step(stmt), "delete_logs");
@@ -170,6 +422,46 @@ void WriterDatabase::WALCheckpoint(std::string_view mode) {
     exec_sql(fmt::format("PRAGMA wal_checkpoint({})", mode));
 }
 
+WalCheckpointResult WriterDatabase::Checkpoint(std::string_view mode, int busy_timeout_ms) {
+    int emode = SQLITE_CHECKPOINT_PASSIVE;
+    if (mode == "FULL") {
+        emode = SQLITE_CHECKPOINT_FULL;
+    } else if (mode == "RESTART") {
+        emode = SQLITE_CHECKPOINT_RESTART;
+    } else if (mode == "TRUNCATE") {
+        emode = SQLITE_CHECKPOINT_TRUNCATE;
+    } else if (mode != "PASSIVE") {
+        throw std::runtime_error(fmt::format("Unknown checkpoint mode: '{}'", mode));
+    }
+
+    // Blocking modes wait on the busy handler; bound that wait for this call only.
+    const bool blocking = emode != SQLITE_CHECKPOINT_PASSIVE;
+    const int prev_timeout = blocking ? std::stoi(GetPragma("busy_timeout")) : 0;
+    if (blocking) sqlite3_busy_timeout(db_, busy_timeout_ms);
+
+    WalCheckpointResult result;
+    const int rc = sqlite3_wal_checkpoint_v2(db_, nullptr, emode, &result.log_frames,
+                                             &result.checkpointed_frames);
+    if (blocking) sqlite3_busy_timeout(db_, prev_timeout);
+
+    if (rc == SQLITE_BUSY) {
+        result.busy = true;
+    } else {
+        ensure_ok(rc, "wal_checkpoint");
+    }
+    return result;
+}
+
+int64_t WriterDatabase::GetWalSizeBytes() const {
+    std::error_code ec;
+    auto size = std::filesystem::file_size(cfg_.db_path.string() + "-wal", ec);
+    return ec ? 0 : static_cast<int64_t>(size);
+}
+
+std::unique_ptr<OnlineBackup> WriterDatabase::BeginBackup(const std::filesystem::path& dest) {
+    return std::make_unique<OnlineBackup>(db_, dest);
+}
+
 bool WriterDatabase::InsertActivityStats(const ActivityStatsRow& row) {
     Statement stmt{db_, R"(INSERT INTO activity_stats (
         since, until,
@@ -231,6 +523,125 @@ int WriterDatabase::DeleteStatsBefore(std::string_view cutoff) {
     return removed;
 }
 
+namespace {
+
+// strftime() pattern producing the same text as format_utc().
+constexpr std::string_view kStatsTimeFormat = "%Y-%m-%dT%H:%M:%fZ";
+
+// Merge expressions for activity_stats columns: counts add up, min/max skip empty windows,
+// averages are weighted by their count, and the connection gauges keep their peak.
+constexpr std::string_view kActivityMergeColumns = R"(
+    SUM(query_count),
+    COALESCE(MIN(CASE WHEN query_count > 0 THEN query_min END), 0),
+    COALESCE(MAX(query_max), 0),
+    COALESCE(CAST(ROUND(SUM(query_avg * query_count) * 1.0 / NULLIF(SUM(query_count), 0))
+                 AS INTEGER), 0),
+    SUM(ingest_count),
+    COALESCE(MIN(CASE WHEN ingest_count > 0 THEN ingest_size_min END), 0),
+    COALESCE(MAX(ingest_size_max), 0),
+    COALESCE(CAST(ROUND(SUM(ingest_size_avg * ingest_count) * 1.0 / NULLIF(SUM(ingest_count), 0))
+                 AS INTEGER), 0),
+    SUM(ingest_drop_count),
+    SUM(insert_batch_count),
+    SUM(insert_total_count),
+    SUM(insert_total_cost),
+    MAX(sse_session_count),
+    MAX(http_conn_count))";
+
+}  // namespace
+
+int WriterDatabase::RollupStats(const std::vector<StatsRollup>& tiers,
+                                std::chrono::system_clock::time_point now) {
+    const int64_t now_s =
+        std::chrono::duration_cast<std::chrono::seconds>(now.time_since_epoch()).count();
+
+    // Start of the latest bucket already written for `resolution`, or -1.
+    auto last_bucket = [&](std::string_view table, std::string_view time_col, int resolution) {
+        Statement stmt{db_, fmt::format("SELECT CAST(strftime('%s', MAX({})) AS INTEGER) / ?1 * ?1 "
+                                        "FROM {} WHERE resolution = ?1",
+                                        time_col, table)};
+        sqlite3_bind_int(stmt, 1, resolution);
+        ensure_ok(sqlite3_step(stmt), "stats_rollup_watermark");
+        if (sqlite3_column_type(stmt, 0) == SQLITE_NULL) return int64_t{-1};
+        return static_cast<int64_t>(sqlite3_column_int64(stmt, 0));
+    };
+
+    int written = 0;
+    int source_resolution = 0;  // 0: the raw tables
+    for (const auto& tier : tiers) {
+        const auto source_filter =
+            source_resolution ? fmt::format("resolution = {} AND ", source_resolution) : "";
+        const auto activity_source =
+            source_resolution ? "activity_stats_rollup" : "activity_stats";
+        const auto database_source =
+            source_resolution ? "database_stats_rollup" : "database_stats";
+
+        // Buckets after the last one written whose end has passed.  Rows are assigned by their
+        // start so a rolled-up row (since = bucket start) lands in the same bucket again.
+        auto bind_window = [&](Statement& stmt, int64_t after) {
+            const int64_t from = after < 0 ? 0 : after + tier.resolution;
+            sqlite3_bind_int(stmt, 1, tier.resolution);
+            sqlite3_bind_int64(stmt, 2, from);
+            sqlite3_bind_int64(stmt, 3, now_s);
+        };
+
+        {
+            Statement stmt{
+                db_,
+                fmt::format(R"(INSERT OR REPLACE INTO activity_stats_rollup (
+                        resolution, since, until,
+                        query_count, query_min, query_max, query_avg,
+                        ingest_count, ingest_size_min, ingest_size_max, ingest_size_avg,
+                        ingest_drop_count, insert_batch_count, insert_total_count,
+                        insert_total_cost, sse_session_count, http_conn_count)
+                    SELECT ?1, strftime('{0}', bucket, 'unixepoch'),
+                           strftime('{0}', bucket + ?1, 'unixepoch'), {1}
+                    FROM (SELECT *, CAST(strftime('%s', since) AS INTEGER) / ?1 * ?1 AS bucket
+                          FROM {2} WHERE {3}since >= strftime('{0}', ?2, 'unixepoch'))
+                    WHERE bucket + ?1 <= ?3
+                    GROUP BY bucket)",
+                            kStatsTimeFormat, kActivityMergeColumns, activity_source,
+                            source_filter)};
+            bind_window(stmt, last_bucket("activity_stats_rollup", "since", tier.resolution));
+            ensure_ok(sqlite3_step(stmt), "rollup_activity_stats");
+            written += sqlite3_changes(db_);
+        }
+        {
+            // Gauges: the last sample of each bucket, found with SQLite's bare-column MAX().
+            Statement stmt{
+                db_,
+                fmt::format(R"(INSERT OR REPLACE INTO database_stats_rollup (
+                        resolution, timestamp, rows_count, db_size)
+                    SELECT ?1, MAX(timestamp), rows_count, db_size
+                    FROM (SELECT *, CAST(strftime('%s', timestamp) AS INTEGER) / ?1 * ?1 AS bucket
+                          FROM {1} WHERE {2}timestamp >= strftime('{0}', ?2, 'unixepoch'))
+                    WHERE bucket + ?1 <= ?3
+                    GROUP BY bucket)",
+                            kStatsTimeFormat, database_source, source_filter)};
+            bind_window(stmt, last_bucket("database_stats_rollup", "timestamp", tier.resolution));
+            ensure_ok(sqlite3_step(stmt), "rollup_database_stats");
+            written += sqlite3_changes(db_);
+        }
+        source_resolution = tier.resolution;
+    }
+    return written;
+}
+
+int WriterDatabase::DeleteStatsRollupBefore(int resolution, std::string_view cutoff) {
+    int removed = 0;
+    for (const auto* sql : {"DELETE FROM activity_stats_rollup WHERE resolution = ? AND until < ?",
+                            "DELETE FROM database_stats_rollup WHERE resolution = ? AND "
+                            "timestamp < ?"}) {
+        Statement stmt{db_, sql};
+        sqlite3_bind_int(stmt, 1, resolution);
+        sqlite3_bind_text(stmt, 2, cutoff.data(), static_cast<int>(cutoff.size()),
+                          SQLITE_TRANSIENT);
+        ensure_ok(sqlite3_step(stmt), "delete_stats_rollup");
+        removed += sqlite3_changes(db_);
+    }
+    return removed;
+}
+
 std::vector<int> WriterDatabase::GetAppliedVersions() const {
     Statement stmt{db_, "SELECT version FROM versions ORDER BY version"};
     std::vector<int> out;
@@ -302,4 +713,25 @@ bool WriterDatabase::InsertColumnDictValue(const std::string& col, const std::st
     return sqlite3_step(stmt) == SQLITE_DONE;
 }
 
+std::vector<std::pair<std::string, std::string>> WriterDatabase::GetZstdDictRows() const {
+    Statement stmt{db_, "SELECT column, dict FROM zstd_dictionary ORDER BY id"};
+    std::vector<std::pair<std::string, std::string>> rows;
+    while (sqlite3_step(stmt) == SQLITE_ROW) {
+        const auto* col = reinterpret_cast<const char*>(sqlite3_column_text(stmt, 0));
+        const auto* dict = static_cast<const char*>(sqlite3_column_blob(stmt, 1));
+        rows.emplace_back(col ? col : "",
+                          std::string(dict ? dict : "", sqlite3_column_bytes(stmt, 1)));
+    }
+    return rows;
+}
+
+bool WriterDatabase::InsertZstdDict(const std::string& col, ZstdDictId id,
+                                    const std::string& dict) {
+    Statement stmt{db_, "INSERT INTO zstd_dictionary (column, dict_id, dict) VALUES (?, ?, ?)"};
+    sqlite3_bind_text(stmt, 1, col.c_str(), -1, SQLITE_TRANSIENT);
+    sqlite3_bind_int64(stmt, 2, id);
+    sqlite3_bind_blob(stmt, 3, dict.data(), static_cast<int>(dict.size()), SQLITE_TRANSIENT);
+    return sqlite3_step(stmt) == SQLITE_DONE;
+}
+
 }  // namespace loglite
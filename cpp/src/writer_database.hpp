@@ -2,12 +2,18 @@
 #define LOGLITE_WRITER_DATABASE_HPP_
 
 #include "database.hpp"
+#include "snapshot.hpp"
 
 #include <boost/asio.hpp>
 
+#include <chrono>
 #include <concepts>
 #include <cstdint>
+#include <filesystem>
+#include <memory>
+#include <mutex>
 #include <string>
+#include <tuple>
 #include <type_traits>
 #include <utility>
 #include <vector>
@@ -18,6 +24,14 @@ namespace asio = boost::asio;
 
 namespace loglite {
 
+// Log rows converted to bind-ready values: serialized, mapped through the column
+// dictionary and zstd-compressed.  `rows` holds one value per entry in `columns`.
+struct EncodedBatch {
+    std::vector<std::string> columns;
+    std::vector<std::vector<nlohmann::json>> rows;
+    std::vector<std::size_t> sources;  // index of each row's entry in the encoded logs
+};
+
 class WriterDatabase final : public Database {
    public:
     explicit WriterDatabase(const Config& cfg);
@@ -26,18 +40,55 @@ class WriterDatabase final : public Database {
     void Initialize();
 
     void CreateInternalTables();
+    // Adds an indexed VIRTUAL generated column to the log table for each `json_fields`
+    // path that does not have one yet.  Idempotent; run after migrations.
+    void EnsureJsonFieldColumns();
 
+    // Insert = EncodeRows + InsertEncoded.  EncodeRows does not touch the connection
+    // and may run on any thread, so the next batch can be encoded while the write
+    // strand is busy inserting the current one.
     int Insert(const std::vector<nlohmann::json>& logs);
-    int DeleteLogs(const std::vector<QueryFilter>& filters);
+    [[nodiscard]] EncodedBatch EncodeRows(const std::vector<nlohmann::json>& logs) const;
+    // With `row_ids`, appends the rowid of each row in `batch.rows` (0 if it failed).
+    int InsertEncoded(const EncodedBatch& batch, std::vector<int64_t>* row_ids = nullptr);
+    // Shard mode: the ids InsertEncoded assigns are the values above `floor` that
+    // are congruent to `offset` modulo `stride`, so that the shards' ids never
+    // collide.  `floor` should be the highest id in any shard.
+    void SetIdStride(int64_t stride, int64_t offset, int64_t floor);
+    [[nodiscard]] int64_t IdStride() const noexcept { return id_stride_; }
+    // Row count, and the id of the `n`-th lowest-id row (0-based; MAX(id) + 1 past the
+    // end).  Unsharded ids are dense, so both follow from MIN/MAX(id); sharded ids jump
+    // past the other shards' on every restart, so they are read from the table.
+    [[nodiscard]] int64_t CountLogRows() const;
+    [[nodiscard]] int64_t NthLogId(int64_t n) const;
+    // Adds duplicates that arrived after a row was inserted to its dedup count (and
+    // last-seen column, when the table has one).
+    int ApplyDedupUpdates(const std::vector<DedupUpdate>& updates);
+    // With `limit` > 0, deletes only the `limit` lowest-id matching rows.
+    int DeleteLogs(const std::vector<QueryFilter>& filters, int limit = 0);
 
     void SetPragma(std::string_view name, std::string_view value);
     void IncrementalVacuum(int page_count);
     void Vacuum();
     void WALCheckpoint(std::string_view mode = "TRUNCATE");
+    // Runs a PASSIVE, FULL, RESTART or TRUNCATE checkpoint.  The blocking modes wait at most
+    // `busy_timeout_ms` for readers before reporting busy.
+    WalCheckpointResult Checkpoint(std::string_view mode, int busy_timeout_ms = 0);
+    [[nodiscard]] int64_t GetWalSizeBytes() const;
+
+    // Copy this connection's database into `dest`, step by step.  Rows inserted
+    // through this connection between steps are carried into the snapshot.
+    [[nodiscard]] std::unique_ptr<OnlineBackup> BeginBackup(const std::filesystem::path& dest);
 
     bool InsertActivityStats(const ActivityStatsRow& row);
     bool InsertDatabaseStats(const DatabaseStatsRow& row);
     int DeleteStatsBefore(std::string_view cutoff);
+    // Fold finished buckets into each tier, rolling it up from the tier before it (the raw
+    // stats tables for the first).  Buckets are aligned to the Unix epoch and written once,
+    // after `now` has passed their end.  Returns the number of rollup rows written.
+    int RollupStats(const std::vector<StatsRollup>& tiers,
+                    std::chrono::system_clock::time_point now);
+    int DeleteStatsRollupBefore(int resolution, std::string_view cutoff);
 
     std::vector<int> GetAppliedVersions() const;
     bool ApplyMigration(int version, const std::vector<std::string>& statements);
@@ -46,6 +97,9 @@ class WriterDatabase final : public Database {
     std::vector<std::tuple<std::string, std::string, ValueId>> GetColumnDictRows() const;
     bool InsertColumnDictValue(const std::string& col, const std::string& value, ValueId id);
 
+    std::vector<std::pair<std::string, std::string>> GetZstdDictRows() const;
+    bool InsertZstdDict(const std::string& col, ZstdDictId id, const std::string& dict);
+
     template <std::invocable<WriterDatabase&> F>
     asio::awaitable<std::invoke_result_t<F, WriterDatabase&>> AsyncUseConnection(
         asio::any_io_executor write_strand_ex, F&& f) {
@@ -61,6 +115,20 @@ class WriterDatabase final : public Database {
             co_return result;
         }
     }
+
+   private:
+    struct PendingDictEntries {
+        std::vector<std::tuple<std::string, std::string, ValueId>> values;
+        std::vector<std::tuple<std::string, ZstdDictId, std::string>> zstd_dicts;
+    };
+
+    void persist_dict_entries(const PendingDictEntries& pending);
+    [[nodiscard]] bool has_log_column(std::string_view name) const;
+
+    std::mutex pending_mtx_;
+    PendingDictEntries pending_dict_entries_;
+    int64_t id_stride_{1};
+    int64_t next_id_{0};  // used when id_stride_ > 1
 };
 
 }  // namespace loglite
@@ -0,0 +1,167 @@
+#include "zstd_codec.hpp"
+
+#include "log.hpp"
+
+#include <algorithm>
+#include <fmt/format.h>
+#include <memory>
+#include <stdexcept>
+#include <zdict.h>
+
+namespace loglite {
+
+namespace {
+
+// Only the head of long values is sampled; it's where the repetition lives.
+constexpr std::size_t kMaxSampleBytes = 16 * 1024;
+
+// Refuse to inflate a single value beyond this (a corrupt or hostile frame header).
+constexpr unsigned long long kMaxDecompressedBytes = 64ull * 1024 * 1024;
+
+struct DCtxDeleter {
+    void operator()(ZSTD_DCtx* ctx) const { ZSTD_freeDCtx(ctx); }
+};
+
+}  // namespace
+
+ZstdCodec::ZstdCodec(std::set<std::string> columns, Options opts, PersistFn persist)
+    : columns_(columns.begin(), columns.end()),
+      opts_(opts),
+      persist_(std::move(persist)),
+      cctx_(ZSTD_createCCtx()) {
+    if (!cctx_) throw std::runtime_error("ZSTD_createCCtx failed");
+}
+
+ZstdCodec::~ZstdCodec() {
+    for (auto& [_, state] : state_) ZSTD_freeCDict(state.cdict);
+    for (auto& [_, ddict] : ddicts_) ZSTD_freeDDict(ddict);
+    ZSTD_freeCCtx(cctx_);
+}
+
+void ZstdCodec::LoadDictionary(const std::string& col, std::string dict) {
+    std::lock_guard wl(write_mtx_);
+    activate(state_[col], dict);
+}
+
+void ZstdCodec::activate(ColumnState& state, const std::string& dict) {
+    const ZstdDictId id = ZDICT_getDictID(dict.data(), dict.size());
+    if (id == 0) throw std::runtime_error("Invalid zstd dictionary (missing dictionary id)");
+
+    ZSTD_DDict* ddict = ZSTD_createDDict(dict.data(), dict.size());
+    ZSTD_CDict* cdict = ZSTD_createCDict(dict.data(), dict.size(), opts_.level);
+    if (!ddict || !cdict) {
+        ZSTD_freeDDict(ddict);
+        ZSTD_freeCDict(cdict);
+        throw std::runtime_error(fmt::format("Failed to load zstd dictionary {}", id));
+    }
+
+    {
+        std::unique_lock lk(mtx_);
+        auto [it, inserted] = ddicts_.try_emplace(id, ddict);
+        if (!inserted) ZSTD_freeDDict(ddict);
+    }
+
+    ZSTD_freeCDict(state.cdict);
+    state.cdict = cdict;
+    state.dict_id = id;
+    state.samples.clear();
+    state.samples.shrink_to_fit();
+}
+
+void ZstdCodec::train(const std::string& col, ColumnState& state) {
+    std::string buffer;
+    std::vector<std::size_t> sizes;
+    sizes.reserve(state.samples.size());
+    for (const auto& s : state.samples) {
+        buffer += s;
+        sizes.push_back(s.size());
+    }
+    state.samples.clear();
+
+    // A dictionary larger than a fraction of its training set only memorises it.
+    const std::size_t capacity =
+        std::clamp<std::size_t>(buffer.size() / 4, 1024, opts_.dict_capacity);
+    std::string dict(capacity, '\0');
+    const std::size_t n = ZDICT_trainFromBuffer(dict.data(), dict.size(), buffer.data(),
+                                                sizes.data(), static_cast<unsigned>(sizes.size()));
+    if (ZDICT_isError(n)) {
+        log::WARN("zstd dictionary training for column '{}' failed ({}); retrying later", col,
+                  ZDICT_getErrorName(n));
+        return;
+    }
+    dict.resize(n);
+
+    const ZstdDictId id = ZDICT_getDictID(dict.data(), dict.size());
+    if (persist_ && !persist_(col, id, dict)) {
+        throw std::runtime_error(
+            fmt::format("Failed to persist the zstd dictionary for column '{}'", col));
+    }
+    activate(state, dict);
+    log::INFO("Trained zstd dictionary for column '{}' (id={}, {} bytes, {} samples)", col, id,
+              dict.size(), sizes.size());
+}
+
+std::optional<std::vector<uint8_t>> ZstdCodec::Compress(const std::string& col,
+                                                        std::string_view value) {
+    std::lock_guard wl(write_mtx_);
+    auto& state = state_[col];
+
+    if (!state.cdict) {
+        state.samples.emplace_back(value.substr(0, kMaxSampleBytes));
+        if (state.samples.size() >= opts_.train_samples) train(col, state);
+    }
+
+    std::vector<uint8_t> out(ZSTD_compressBound(value.size()));
+    const std::size_t n =
+        state.cdict ? ZSTD_compress_usingCDict(cctx_, out.data(), out.size(), value.data(),
+                                               value.size(), state.cdict)
+                    : ZSTD_compressCCtx(cctx_, out.data(), out.size(), value.data(), value.size(),
+                                        opts_.level);
+    if (ZSTD_isError(n))
+        throw std::runtime_error(
+            fmt::format("zstd compression failed for column '{}': {}", col, ZSTD_getErrorName(n)));
+    if (n >= value.size()) return std::nullopt;
+
+    out.resize(n);
+    return out;
+}
+
+std::string ZstdCodec::Decompress(std::string_view frame) const {
+    thread_local std::unique_ptr<ZSTD_DCtx, DCtxDeleter> dctx{ZSTD_createDCtx()};
+
+    const auto content_size = ZSTD_getFrameContentSize(frame.data(), frame.size());
+    if (content_size == ZSTD_CONTENTSIZE_ERROR || content_size == ZSTD_CONTENTSIZE_UNKNOWN ||
+        content_size > kMaxDecompressedBytes)
+        throw std::runtime_error("Invalid zstd frame");
+
+    const ZstdDictId id = ZSTD_getDictID_fromFrame(frame.data(), frame.size());
+    const ZSTD_DDict* ddict = nullptr;
+    if (id != 0) {
+        std::shared_lock rl(mtx_);
+        auto it = ddicts_.find(id);
+        if (it == ddicts_.end())
+            throw std::runtime_error(fmt::format("Unknown zstd dictionary id: {}", id));
+        ddict = it->second;
+    }
+
+    std::string out(static_cast<std::size_t>(content_size), '\0');
+    const std::size_t n =
+        ddict ? ZSTD_decompress_usingDDict(dctx.get(), out.data(), out.size(), frame.data(),
+                                           frame.size(), ddict)
+              : ZSTD_decompressDCtx(dctx.get(), out.data(), out.size(), frame.data(),
+                                    frame.size());
+    if (ZSTD_isError(n))
+        throw std::runtime_error(
+            fmt::format("zstd decompression failed: {}", ZSTD_getErrorName(n)));
+    out.resize(n);
+    return out;
+}
+
+std::optional<ZstdDictId> ZstdCodec::ActiveDictionary(const std::string& col) const {
+    std::lock_guard wl(write_mtx_);
+    auto it = state_.find(col);
+    if (it == state_.end() || !it->second.cdict) return std::nullopt;
+    return it->second.dict_id;
+}
+
+}  // namespace loglite
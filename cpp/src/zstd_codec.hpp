@@ -0,0 +1,98 @@
+#ifndef LOGLITE_ZSTD_CODEC_HPP_
+#define LOGLITE_ZSTD_CODEC_HPP_
+
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <mutex>
+#include <optional>
+#include <set>
+#include <shared_mutex>
+#include <string>
+#include <string_view>
+#include <unordered_map>
+#include <vector>
+
+#include <zstd.h>
+
+namespace loglite {
+
+// ── zstd compression for high-cardinality text columns ────────────────────────
+//
+// Complements ColumnDictionary: instead of mapping a handful of distinct values to
+// integer ids, each value is stored as a zstd frame (BLOB).  Log lines are short and
+// repetitive, so per-column dictionaries trained from the first few hundred values
+// do most of the work.  Until a column's dictionary is trained, values are compressed
+// without one.  Values that don't shrink are stored as plain text, so readers must
+// accept both representations.
+//
+// Every frame records the id of the dictionary it was compressed with, and
+// dictionaries are never dropped, so old rows stay readable after retraining or
+// after a column is removed from the config.
+
+using ZstdDictId = uint32_t;
+
+class ZstdCodec {
+   public:
+    struct Options {
+        int level{3};
+        std::size_t dict_capacity{64 * 1024};  // bytes
+        std::size_t train_samples{1000};       // values sampled before training
+    };
+
+    // Callback used to persist a freshly trained dictionary (writer connection).
+    using PersistFn = std::function<bool(const std::string& col, ZstdDictId id,
+                                         const std::string& dict)>;
+
+    ZstdCodec(std::set<std::string> columns, Options opts, PersistFn persist);
+    ~ZstdCodec();
+
+    ZstdCodec(const ZstdCodec&) = delete;
+    ZstdCodec& operator=(const ZstdCodec&) = delete;
+
+    // Register a persisted dictionary.  The last one loaded for a column is used for
+    // compression; all of them remain available for decompression.
+    void LoadDictionary(const std::string& col, std::string dict);
+
+    // Whether new values of `col` are compressed.
+    bool Handles(std::string_view col) const { return columns_.contains(col); }
+
+    // Compress one value, sampling it for dictionary training if the column has no
+    // dictionary yet.  Returns std::nullopt when the frame would not be smaller than the
+    // input (store the value as-is).  Writer-only.
+    std::optional<std::vector<uint8_t>> Compress(const std::string& col, std::string_view value);
+
+    // Decompress a frame produced by Compress().  Throws on corrupt input or when the
+    // frame references an unknown dictionary.  Safe to call from any thread.
+    std::string Decompress(std::string_view frame) const;
+
+    // Id of the dictionary currently used to compress `col`, if one was trained.
+    std::optional<ZstdDictId> ActiveDictionary(const std::string& col) const;
+
+   private:
+    struct ColumnState {
+        ZSTD_CDict* cdict{};
+        ZstdDictId dict_id{};
+        std::vector<std::string> samples;
+    };
+
+    void train(const std::string& col, ColumnState& state);
+    void activate(ColumnState& state, const std::string& dict);
+
+    std::set<std::string, std::less<>> columns_;
+    Options opts_;
+    PersistFn persist_;
+
+    // Compression side (writer strand only, but guarded for ActiveDictionary()).
+    mutable std::mutex write_mtx_;
+    ZSTD_CCtx* cctx_{};
+    std::unordered_map<std::string, ColumnState> state_;
+
+    // Decompression dictionaries, shared with the reader pool.
+    mutable std::shared_mutex mtx_;
+    std::unordered_map<ZstdDictId, ZSTD_DDict*> ddicts_;
+};
+
+}  // namespace loglite
+
+#endif  // LOGLITE_ZSTD_CODEC_HPP_
@@ -0,0 +1,150 @@
+#include <gtest/gtest.h>
+
+#include "admission.hpp"
+
+#include <thread>
+#include <vector>
+
+using namespace loglite;
+
+namespace {
+
+nlohmann::json entry(std::string service, std::string level) {
+    return {{"message", "m"}, {"service", std::move(service)}, {"level", std::move(level)}};
+}
+
+AdmissionConfig config(std::vector<AdmissionRule> rules) {
+    AdmissionConfig cfg;
+    cfg.enabled = true;
+    cfg.rules = std::move(rules);
+    return cfg;
+}
+
+}  // namespace
+
+TEST(AdmissionTest, DisabledAdmitsEverything) {
+    AdmissionController ctl{AdmissionConfig{}};
+    std::vector<nlohmann::json> batch(5, entry("a", "INFO"));
+    auto result = ctl.AdmitBatch(batch);
+    EXPECT_EQ(result.admitted, 5u);
+    EXPECT_EQ(batch.size(), 5u);
+    EXPECT_EQ(ctl.Admit(entry("a", "INFO")), AdmissionDecision::kAdmit);
+    EXPECT_TRUE(ctl.ToJSON()["sources"].empty());
+}
+
+TEST(AdmissionTest, TokenBucketPerSource) {
+    AdmissionController ctl{config({{{{"service", "*"}}, 1, 3, 1.0}})};
+
+    for (int i = 0; i < 3; ++i) EXPECT_EQ(ctl.Admit(entry("a", "INFO")), AdmissionDecision::kAdmit);
+    EXPECT_EQ(ctl.Admit(entry("a", "INFO")), AdmissionDecision::kReject);
+
+    // Same service, different level: a different source with its own bucket.
+    EXPECT_EQ(ctl.Admit(entry("a", "WARN")), AdmissionDecision::kAdmit);
+    // No service field: the rule does not match, so no limit.
+    for (int i = 0; i < 10; ++i)
+        EXPECT_EQ(ctl.Admit({{"level", "INFO"}}), AdmissionDecision::kAdmit);
+
+    auto stats = ctl.ToJSON();
+    ASSERT_TRUE(stats["enabled"].get<bool>());
+    bool found = false;
+    for (const auto& src : stats["sources"]) {
+        if (src["source"] == nlohmann::json{{"service", "a"}, {"level", "INFO"}}) {
+            EXPECT_EQ(src["admitted"], 3);
+            EXPECT_EQ(src["rejected"], 1);
+            EXPECT_EQ(src["rule"], 0);
+            found = true;
+        }
+    }
+    EXPECT_TRUE(found);
+}
+
+TEST(AdmissionTest, FirstMatchingRuleWinsSoErrorsAreNeverSampled) {
+    AdmissionController ctl{config({
+        {{{"level", "ERROR"}}, 0, 0, 1.0},
+        {{{"service", "noisy"}}, 0, 0, 0.0},
+    })};
+    for (int i = 0; i < 20; ++i) {
+        EXPECT_EQ(ctl.Admit(entry("noisy", "ERROR")), AdmissionDecision::kAdmit);
+        EXPECT_EQ(ctl.Admit(entry("noisy", "DEBUG")), AdmissionDecision::kSample);
+    }
+}
+
+TEST(AdmissionTest, BatchIsAllOrNothingAndReportsRetryAfter) {
+    AdmissionController ctl{config({{{{"service", "a"}}, 2, 4, 1.0}})};
+
+    std::vector<nlohmann::json> batch{entry("a", "INFO"), entry("a", "INFO"), entry("a", "INFO"),
+                                      entry("b", "INFO")};
+    auto first = ctl.AdmitBatch(batch);
+    EXPECT_EQ(first.admitted, 4u);
+    EXPECT_EQ(batch.size(), 4u);
+
+    std::vector<nlohmann::json> again{entry("a", "INFO"), entry("a", "INFO"), entry("b", "INFO")};
+    auto second = ctl.AdmitBatch(again);
+    EXPECT_EQ(second.admitted, 0u);
+    EXPECT_EQ(second.rejected, 3u);
+    EXPECT_TRUE(again.empty());
+    EXPECT_EQ(second.retry_after, std::chrono::seconds{1});  // (2 - 1) tokens at 2/s
+}
+
+TEST(AdmissionTest, RejectedBatchChargesOnlyOverBudgetSources) {
+    AdmissionController ctl{config({
+        {{{"level", "DEBUG"}}, 0, 0, 0.0},
+        {{{"service", "a"}}, 1, 1, 1.0},
+    })};
+    std::vector<nlohmann::json> fill{entry("a", "INFO")};
+    ASSERT_EQ(ctl.AdmitBatch(fill).admitted, 1u);
+
+    // Retried twice: "a" is out of tokens, "b" is within budget, DEBUG is sampled out.
+    for (int attempt = 0; attempt < 2; ++attempt) {
+        std::vector<nlohmann::json> batch{entry("a", "INFO"), entry("b", "INFO"),
+                                          entry("b", "DEBUG")};
+        auto result = ctl.AdmitBatch(batch);
+        EXPECT_EQ(result.rejected, 3u);
+        EXPECT_EQ(result.sampled, 0u);
+    }
+
+    for (const auto& src : ctl.ToJSON()["sources"]) {
+        const auto service = src["source"]["service"];
+        const auto level = src["source"]["level"];
+        if (service == "a") {
+            EXPECT_EQ(src["admitted"], 1);
+            EXPECT_EQ(src["rejected"], 2);
+        } else {
+            EXPECT_EQ(src["rejected"], 0) << service << " " << level;
+            EXPECT_EQ(src["sampled"], 0) << service << " " << level;
+        }
+    }
+}
+
+TEST(AdmissionTest, OversizedBatchAdmittedWhenBucketFull) {
+    AdmissionController ctl{config({{{{"service", "a"}}, 1, 2, 1.0}})};
+    std::vector<nlohmann::json> big(10, entry("a", "INFO"));
+    EXPECT_EQ(ctl.AdmitBatch(big).admitted, 10u);
+
+    // The bucket is now in debt: 10 s until a 2-entry batch fits again.
+    std::vector<nlohmann::json> next(2, entry("a", "INFO"));
+    auto result = ctl.AdmitBatch(next);
+    EXPECT_EQ(result.rejected, 2u);
+    EXPECT_GE(result.retry_after, std::chrono::seconds{9});
+}
+
+TEST(AdmissionTest, SamplingRemovesEntriesFromBatch) {
+    AdmissionController ctl{config({{{{"level", "DEBUG"}}, 0, 0, 0.0}})};
+    std::vector<nlohmann::json> batch{entry("a", "DEBUG"), entry("a", "INFO"), entry("a", "DEBUG")};
+    auto result = ctl.AdmitBatch(batch);
+    EXPECT_EQ(result.sampled, 2u);
+    EXPECT_EQ(result.admitted, 1u);
+    ASSERT_EQ(batch.size(), 1u);
+    EXPECT_EQ(batch[0]["level"], "INFO");
+}
+
+TEST(AdmissionTest, DistinctSourcesAreCapped) {
+    AdmissionController ctl{config({{{{"service", "*"}}, 0, 0, 1.0}})};
+    for (std::size_t i = 0; i < AdmissionController::kMaxSources + 50; ++i)
+        ctl.Admit(entry(std::to_string(i), "INFO"));
+
+    auto sources = ctl.ToJSON()["sources"];
+    EXPECT_EQ(sources.size(), AdmissionController::kMaxSources + 1);
+    EXPECT_EQ(sources[0]["source"]["source"], "(other)");
+    EXPECT_EQ(sources[0]["admitted"], 50);
+}
@@ -3,6 +3,10 @@
 #include "backlog.hpp"
 #include "metrics.hpp"
 
+#include <boost/asio.hpp>
+
+#include <chrono>
+#include <memory>
 #include <thread>
 #include <vector>
 
@@ -106,3 +110,124 @@ TEST_F(BacklogMetricsTest, OverflowRecordsDropMetrics) {
     ASSERT_EQ(samples.size(), 1u);
     EXPECT_EQ(samples[0].name, metrics::kBacklogDrop);
 }
+
+TEST_F(BacklogMetricsTest, AddBatchKeepsOrderAndDropsOldest) {
+    Backlog backlog{3};
+    backlog.Add({{"id", 0}});
+    backlog.AddBatch({{{"id", 1}}, {{"id", 2}}, {{"id", 3}}, {{"id", 4}}});
+
+    EXPECT_EQ(backlog.TotalAdded(), 5u);
+    auto samples = metrics::MetricsRegistry::Instance().Flush();
+    ASSERT_EQ(samples.size(), 1u);
+    EXPECT_EQ(samples[0].name, metrics::kBacklogDrop);
+    EXPECT_EQ(samples[0].item_count, 2);
+
+    auto entries = backlog.Flush();
+    ASSERT_EQ(entries.size(), 3u);
+    for (int i = 0; i < 3; ++i) EXPECT_EQ(entries[i]["id"].get<int>(), i + 2);
+}
+
+// ── Flush threshold / wakeup ─────────────────────────────────────────────────
+
+TEST(BacklogTest, FlushThresholdBelowWatermark) {
+    Backlog backlog{100};
+    backlog.SetFlushThreshold(3);
+    backlog.Add({{"id", 1}});
+    backlog.Add({{"id", 2}});
+    EXPECT_FALSE(backlog.IsFull());
+    backlog.Add({{"id", 3}});
+    EXPECT_TRUE(backlog.IsFull());
+
+    // Lowering the threshold re-evaluates the current size.
+    backlog.Flush();
+    backlog.Add({{"id", 4}});
+    EXPECT_FALSE(backlog.IsFull());
+    backlog.SetFlushThreshold(1);
+    EXPECT_TRUE(backlog.IsFull());
+}
+
+TEST(BacklogTest, PartialFlushKeepsRemainder) {
+    Backlog backlog{100};
+    backlog.SetFlushThreshold(2);
+    for (int i = 1; i <= 5; ++i) backlog.Add({{"id", i}});
+
+    auto first = backlog.Flush(2);
+    ASSERT_EQ(first.size(), 2u);
+    EXPECT_EQ(first[0]["id"].get<int>(), 1);
+    EXPECT_EQ(backlog.Size(), 3u);
+    EXPECT_TRUE(backlog.IsFull());
+    EXPECT_TRUE(backlog.OldestAt().has_value());
+
+    EXPECT_EQ(backlog.Flush().size(), 3u);
+    EXPECT_FALSE(backlog.IsFull());
+    EXPECT_FALSE(backlog.OldestAt().has_value());
+    EXPECT_EQ(backlog.TotalAdded(), 5u);
+}
+
+TEST(BacklogTest, WakerCancelledOnFirstEntryAndThreshold) {
+    asio::io_context ioc;
+    auto waker = std::make_shared<asio::steady_timer>(ioc);
+    Backlog backlog{100};
+    backlog.SetWaker(waker);
+    backlog.SetFlushThreshold(3);
+
+    int wakeups = 0;
+    auto wait = [&] {
+        ioc.restart();
+        waker->expires_after(std::chrono::hours(1));
+        waker->async_wait([&](boost::system::error_code ec) {
+            if (ec == asio::error::operation_aborted) ++wakeups;
+        });
+    };
+
+    wait();
+    std::thread producer{[&] { backlog.Add({{"id", 1}}); }};
+    producer.join();
+    ioc.poll();
+    EXPECT_EQ(wakeups, 1);
+
+    // Below the threshold: no wakeup.
+    wait();
+    backlog.Add({{"id", 2}});
+    ioc.poll();
+    EXPECT_EQ(wakeups, 1);
+
+    backlog.Add({{"id", 3}});
+    ioc.poll();
+    EXPECT_EQ(wakeups, 2);
+    EXPECT_TRUE(backlog.IsFull());
+}
+
+TEST(BacklogTest, NearCapacityIgnoresFlushThreshold) {
+    Backlog backlog{20};
+    backlog.SetFlushThreshold(2);
+    for (int i = 0; i < 18; ++i) backlog.Add({{"id", i}});
+    EXPECT_TRUE(backlog.IsFull());
+    EXPECT_FALSE(backlog.NearCapacity());
+    backlog.Add({{"id", 18}});
+    EXPECT_TRUE(backlog.NearCapacity());
+    backlog.Flush(10);
+    EXPECT_FALSE(backlog.NearCapacity());
+}
+
+// ── Shard routing ─────────────────────────────────────────────────────────────
+
+TEST(BacklogTest, RoutesEntriesToShardBacklogs) {
+    Backlog first{20};
+    Backlog second{20};
+    first.RouteTo({&first, &second},
+                  [](const nlohmann::json& e) { return e["service"] == "b" ? 1u : 0u; });
+
+    first.Add({{"service", "a"}});
+    first.Add({{"service", "b"}});
+    first.AddBatch({{{"service", "b"}}, {{"service", "a"}}, {{"service", "b"}}});
+
+    EXPECT_EQ(first.Size(), 2u);
+    EXPECT_EQ(second.Size(), 3u);
+    EXPECT_EQ(first.TotalAdded(), 2u);
+    EXPECT_EQ(second.TotalAdded(), 3u);
+    for (const auto& e : second.Flush()) EXPECT_EQ(e["service"], "b");
+
+    for (int i = 0; i < 19; ++i) first.Add({{"service", "b"}});
+    EXPECT_TRUE(first.NearCapacity());
+}
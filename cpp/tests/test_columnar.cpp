@@ -0,0 +1,119 @@
+#include <gtest/gtest.h>
+
+#include "columnar.hpp"
+
+#include <nlohmann/json.hpp>
+
+#include <cstring>
+#include <string>
+#include <vector>
+
+using namespace loglite;
+
+// ── Helpers ────────────────────────────────────────────────────────────────────
+
+template <class T>
+static std::vector<T> decode_values(const std::string& data) {
+    std::vector<T> out(data.size() / sizeof(T));
+    std::memcpy(out.data(), data.data(), data.size());
+    return out;
+}
+
+static std::vector<std::string> decode_utf8(const ColumnBlock& block) {
+    std::vector<std::string> out;
+    for (size_t i = 0; i + 1 < block.offsets.size(); ++i)
+        out.push_back(block.data.substr(block.offsets[i], block.offsets[i + 1] - block.offsets[i]));
+    return out;
+}
+
+// ── ColumnBuilder ──────────────────────────────────────────────────────────────
+
+TEST(ColumnBuilderTest, IntegersWithoutNulls) {
+    ColumnBuilder b{"id"};
+    b.AppendInt(3);
+    b.AppendInt(-1);
+    auto block = std::move(b).Finish();
+
+    EXPECT_EQ(block.name, "id");
+    EXPECT_EQ(block.type, ColumnType::kInt64);
+    EXPECT_TRUE(block.validity.empty());
+    EXPECT_EQ(decode_values<int64_t>(block.data), (std::vector<int64_t>{3, -1}));
+}
+
+TEST(ColumnBuilderTest, NullsAreMaskedAndZeroFilled) {
+    ColumnBuilder b{"pid"};
+    b.AppendNull();
+    b.AppendInt(42);
+    b.AppendNull();
+    auto block = std::move(b).Finish();
+
+    EXPECT_EQ(block.type, ColumnType::kInt64);
+    EXPECT_EQ(block.validity, (std::vector<uint8_t>{0, 1, 0}));
+    EXPECT_EQ(decode_values<int64_t>(block.data), (std::vector<int64_t>{0, 42, 0}));
+}
+
+TEST(ColumnBuilderTest, IntegersWidenToFloat) {
+    ColumnBuilder b{"latency"};
+    b.AppendInt(1);
+    b.AppendDouble(2.5);
+    b.AppendInt(3);
+    auto block = std::move(b).Finish();
+
+    EXPECT_EQ(block.type, ColumnType::kFloat64);
+    EXPECT_EQ(decode_values<double>(block.data), (std::vector<double>{1.0, 2.5, 3.0}));
+}
+
+TEST(ColumnBuilderTest, MixedValuesWidenToText) {
+    ColumnBuilder b{"value"};
+    b.AppendInt(7);
+    b.AppendNull();
+    b.AppendText("seven");
+    b.AppendDouble(0.5);
+    auto block = std::move(b).Finish();
+
+    EXPECT_EQ(block.type, ColumnType::kUtf8);
+    EXPECT_EQ(block.validity, (std::vector<uint8_t>{1, 0, 1, 1}));
+    EXPECT_EQ(block.offsets.size(), 5u);
+    EXPECT_EQ(decode_utf8(block), (std::vector<std::string>{"7", "", "seven", "0.5"}));
+}
+
+TEST(ColumnBuilderTest, AllNullColumn) {
+    ColumnBuilder b{"service"};
+    b.AppendNull();
+    b.AppendNull();
+    auto block = std::move(b).Finish();
+
+    EXPECT_EQ(block.type, ColumnType::kNull);
+    EXPECT_EQ(block.validity, (std::vector<uint8_t>{0, 0}));
+    EXPECT_TRUE(block.data.empty());
+}
+
+// ── MessagePack encoding ───────────────────────────────────────────────────────
+
+TEST(ColumnarQueryResultTest, ToMsgPack) {
+    ColumnBuilder ids{"id"};
+    ColumnBuilder messages{"message"};
+    ids.AppendInt(2);
+    ids.AppendInt(1);
+    messages.AppendText("hello");
+    messages.AppendText("héllo");
+
+    ColumnarQueryResult result{10, 0, 2, 2, {}};
+    result.columns.push_back(std::move(ids).Finish());
+    result.columns.push_back(std::move(messages).Finish());
+
+    auto doc = nlohmann::json::from_msgpack(result.ToMsgPack());
+    EXPECT_EQ(doc["total"], 10);
+    EXPECT_EQ(doc["rows"], 2);
+    ASSERT_EQ(doc["columns"].size(), 2u);
+
+    EXPECT_EQ(doc["columns"][0]["type"], "int64");
+    EXPECT_FALSE(doc["columns"][0].contains("offsets"));
+    EXPECT_EQ(doc["columns"][1]["type"], "utf8");
+    EXPECT_TRUE(doc["columns"][1]["validity"].is_null());
+
+    const auto& offsets = doc["columns"][1]["offsets"].get_binary();
+    std::vector<int32_t> decoded(offsets.size() / sizeof(int32_t));
+    std::memcpy(decoded.data(), offsets.data(), offsets.size());
+    EXPECT_EQ(decoded, (std::vector<int32_t>{0, 5, 11}));
+}
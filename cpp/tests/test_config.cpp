@@ -96,6 +96,7 @@ TEST(ConfigTest, DbPathDerived) {
     auto cfg = Config::from_file(path);
 
     EXPECT_EQ(cfg.db_path, cfg.sqlite_dir / "logs.db");
+    EXPECT_EQ(cfg.snapshot_dir, cfg.sqlite_dir / "snapshots");
     EXPECT_TRUE(fs::exists(cfg.sqlite_dir));
 }
 
@@ -113,6 +114,230 @@ TEST(ConfigTest, MissingMigrationsThrows) {
     EXPECT_THROW(Config::from_file(path), std::exception);
 }
 
+TEST(ConfigTest, ZstdCompressionParsed) {
+    auto yaml = std::string(kMinimalConfig) + R"yaml(
+compression:
+  enabled: true
+  columns: [service]
+  zstd_columns: [message, extra]
+  zstd_level: 5
+)yaml";
+    auto cfg = Config::from_file(write_temp_config(yaml));
+
+    EXPECT_EQ(cfg.compression.zstd_columns, (std::vector<std::string>{"message", "extra"}));
+    EXPECT_EQ(cfg.compression.zstd_level, 5);
+    EXPECT_EQ(cfg.compression.zstd_dict_size, 64);
+    EXPECT_EQ(cfg.compression.zstd_train_samples, 1000);
+}
+
+TEST(ConfigTest, ZstdCompressionInvalidThrows) {
+    auto overlap = std::string(kMinimalConfig) +
+                   "\ncompression:\n  columns: [message]\n  zstd_columns: [message]\n";
+    EXPECT_THROW(Config::from_file(write_temp_config(overlap)), std::exception);
+
+    auto bad_level = std::string(kMinimalConfig) + "\ncompression:\n  zstd_level: 0\n";
+    EXPECT_THROW(Config::from_file(write_temp_config(bad_level)), std::exception);
+}
+
+TEST(ConfigTest, SnapshotStepPagesInvalidThrows) {
+    auto yaml = std::string(kMinimalConfig) + "\nsnapshot_step_pages: 0\n";
+    EXPECT_THROW(Config::from_file(write_temp_config(yaml)), std::exception);
+}
+
+TEST(ConfigTest, BacklogFlushDefaultsAndValidation) {
+    auto cfg = Config::from_file(write_temp_config(kMinimalConfig));
+    EXPECT_EQ(cfg.task_backlog_max_size, 10000);
+    EXPECT_EQ(cfg.task_backlog_target_latency_ms, 250);
+    EXPECT_EQ(cfg.task_backlog_max_batch, 5000);
+
+    for (auto bad : {"task_backlog_target_latency_ms: 0", "task_backlog_max_batch: 0",
+                     "task_backlog_max_size: 0"}) {
+        auto yaml = std::string(kMinimalConfig) + "\n" + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(yaml)), std::exception) << bad;
+    }
+}
+
+TEST(ConfigTest, RetentionChunkAndCheckpointSettings) {
+    auto cfg = Config::from_file(write_temp_config(kMinimalConfig));
+    EXPECT_EQ(cfg.task_vacuum_chunk_ms, 50);
+    EXPECT_EQ(cfg.task_checkpoint_interval, 10);
+    EXPECT_EQ(cfg.wal_checkpoint_size_bytes, 64LL * 1024 * 1024);
+
+    auto yaml = std::string(kMinimalConfig) + "\nwal_checkpoint_size: 16MB\n";
+    EXPECT_EQ(Config::from_file(write_temp_config(yaml)).wal_checkpoint_size_bytes,
+              16LL * 1024 * 1024);
+
+    for (auto bad : {"task_vacuum_chunk_ms: 0", "task_checkpoint_interval: 0"}) {
+        auto y = std::string(kMinimalConfig) + "\n" + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(y)), std::exception) << bad;
+    }
+}
+
+TEST(ConfigTest, QueryBudgetSettings) {
+    auto cfg = Config::from_file(write_temp_config(kMinimalConfig));
+    EXPECT_EQ(cfg.query_timeout_ms, 30000);
+    EXPECT_EQ(cfg.query_max_scan_rows, 0);
+
+    auto yaml =
+        std::string(kMinimalConfig) + "\nquery_timeout_ms: 0\nquery_max_scan_rows: 1000000\n";
+    cfg = Config::from_file(write_temp_config(yaml));
+    EXPECT_EQ(cfg.query_timeout_ms, 0);
+    EXPECT_EQ(cfg.query_max_scan_rows, 1000000);
+
+    for (auto bad : {"query_timeout_ms: -1", "query_max_scan_rows: -1"}) {
+        auto y = std::string(kMinimalConfig) + "\n" + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(y)), std::exception) << bad;
+    }
+}
+
+TEST(ConfigTest, HarvesterWorkersAndRingSize) {
+    auto yaml = std::string(kMinimalConfig) + R"yaml(
+harvesters:
+  - type: my.SyslogHarvester
+    name: syslog
+    worker: parsers
+  - type: loglite.harvesters.SocketHarvester
+    name: tcp
+harvester_ring_size: 1MB
+)yaml";
+    auto cfg = Config::from_file(write_temp_config(yaml));
+    ASSERT_EQ(cfg.harvesters.size(), 2u);
+    EXPECT_EQ(cfg.harvesters[0].worker, "parsers");
+    EXPECT_EQ(cfg.harvesters[1].worker, "");
+    EXPECT_EQ(cfg.harvester_ring_size_bytes, 1024 * 1024);
+
+    EXPECT_EQ(Config::from_file(write_temp_config(kMinimalConfig)).harvester_ring_size_bytes,
+              4LL * 1024 * 1024);
+
+    auto bad = std::string(kMinimalConfig) + "\nharvester_ring_size: 16KB\n";
+    EXPECT_THROW(Config::from_file(write_temp_config(bad)), std::exception);
+}
+
+TEST(ConfigTest, DedupParsedAndValidated) {
+    auto yaml = std::string(kMinimalConfig) + R"yaml(
+dedup:
+  enabled: true
+  key_fields: [message]
+  window_seconds: 30
+)yaml";
+    auto cfg = Config::from_file(write_temp_config(yaml));
+    EXPECT_TRUE(cfg.dedup.enabled);
+    EXPECT_EQ(cfg.dedup.key_fields, std::vector<std::string>{"message"});
+    EXPECT_EQ(cfg.dedup.window_seconds, 30);
+    EXPECT_EQ(cfg.dedup.count_column, "count");
+    EXPECT_FALSE(Config::from_file(write_temp_config(kMinimalConfig)).dedup.enabled);
+
+    for (auto bad : {"window_seconds: 0", "max_keys: 0", "key_fields: []",
+                     "count_column: message"}) {
+        auto y = std::string(kMinimalConfig) + "\ndedup:\n  enabled: true\n  " + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(y)), std::exception) << bad;
+    }
+}
+
+TEST(ConfigTest, ShardsParsedAndValidated) {
+    auto cfg = Config::from_file(write_temp_config(kMinimalConfig));
+    EXPECT_EQ(cfg.shards.count, 1);
+    EXPECT_EQ(cfg.shards.max_offset, 10000);
+    EXPECT_EQ(cfg.ForShard(0).db_path, cfg.db_path);
+
+    auto yaml = std::string(kMinimalConfig) + R"yaml(
+vacuum_max_size: 4GB
+shards:
+  count: 4
+  key: service
+  max_offset: 500
+)yaml";
+    cfg = Config::from_file(write_temp_config(yaml));
+    EXPECT_EQ(cfg.shards.count, 4);
+    EXPECT_EQ(cfg.shards.key, "service");
+    EXPECT_EQ(cfg.shards.max_offset, 500);
+    EXPECT_EQ(cfg.ForShard(0).db_path, cfg.db_path);
+    EXPECT_EQ(cfg.ForShard(3).db_path, cfg.sqlite_dir / "logs-shard3.db");
+    EXPECT_EQ(cfg.ForShard(3).vacuum_max_size_bytes, cfg.vacuum_max_size_bytes / 4);
+
+    // Without a key, or with dedup keyed on other fields than the shard key.
+    for (auto bad : {"count: 0", "count: 65", "count: 2", "max_offset: -1",
+                     "count: 2\n  key: host\ndedup:\n  enabled: true"}) {
+        auto y = std::string(kMinimalConfig) + "\nshards:\n  " + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(y)), std::exception) << bad;
+    }
+}
+
+TEST(ConfigTest, AdmissionParsedAndValidated) {
+    auto yaml = std::string(kMinimalConfig) + R"yaml(
+admission:
+  enabled: true
+  key_fields: [service]
+  rules:
+    - match: {level: ERROR}
+    - match: {service: noisy}
+      rate: 100
+      burst: 500
+      sample_rate: 0.25
+)yaml";
+    auto cfg = Config::from_file(write_temp_config(yaml));
+    EXPECT_TRUE(cfg.admission.enabled);
+    EXPECT_EQ(cfg.admission.key_fields, std::vector<std::string>{"service"});
+    ASSERT_EQ(cfg.admission.rules.size(), 2u);
+    EXPECT_EQ(cfg.admission.rules[0].match.at("level"), "ERROR");
+    EXPECT_DOUBLE_EQ(cfg.admission.rules[0].sample_rate, 1.0);
+    EXPECT_EQ(cfg.admission.rules[1].rate, 100);
+    EXPECT_EQ(cfg.admission.rules[1].burst, 500);
+    EXPECT_DOUBLE_EQ(cfg.admission.rules[1].sample_rate, 0.25);
+
+    auto defaults = Config::from_file(write_temp_config(kMinimalConfig));
+    EXPECT_FALSE(defaults.admission.enabled);
+    EXPECT_EQ(defaults.admission.key_fields, (std::vector<std::string>{"service", "level"}));
+
+    auto bad = std::string(kMinimalConfig) +
+               "\nadmission:\n  rules:\n    - match: {level: DEBUG}\n      sample_rate: 1.5\n";
+    EXPECT_THROW(Config::from_file(write_temp_config(bad)), std::exception);
+}
+
+TEST(ConfigTest, JsonFieldsValidated) {
+    auto yaml =
+        std::string(kMinimalConfig) + "\njson_fields: [extra.request_id, extra.http.status]\n";
+    auto cfg = Config::from_file(write_temp_config(yaml));
+    EXPECT_EQ(cfg.json_fields,
+              (std::vector<std::string>{"extra.request_id", "extra.http.status"}));
+
+    for (auto bad : {"json_fields: [extra]", "json_fields: [\"extra.a-b\"]",
+                     "json_fields: [extra..id]"}) {
+        auto y = std::string(kMinimalConfig) + "\n" + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(y)), std::exception) << bad;
+    }
+
+    auto zstd = std::string(kMinimalConfig) +
+                "\njson_fields: [extra.id]\ncompression:\n  enabled: true\n"
+                "  zstd_columns: [extra]\n";
+    EXPECT_THROW(Config::from_file(write_temp_config(zstd)), std::exception);
+}
+
+TEST(ConfigTest, StatsRollupsValidated) {
+    auto cfg = Config::from_file(write_temp_config(kMinimalConfig));
+    ASSERT_EQ(cfg.stats_rollups.size(), 3u);
+    EXPECT_EQ(cfg.stats_rollups[1].resolution, 900);
+
+    cfg = Config::from_file(write_temp_config(
+        std::string(kMinimalConfig) +
+        "\nstats_rollups:\n  - {resolution: 300, retention_hours: 168}\n"));
+    ASSERT_EQ(cfg.stats_rollups.size(), 1u);
+    EXPECT_EQ(cfg.stats_rollups[0].retention_hours, 168);
+
+    for (auto bad : {
+             // not increasing
+             "[{resolution: 900, retention_hours: 24}, {resolution: 600, retention_hours: 24}]",
+             // not a multiple of the previous tier
+             "[{resolution: 300, retention_hours: 24}, {resolution: 450, retention_hours: 24}]",
+             "[{resolution: 300, retention_hours: 0}]",
+             // the 1 h source tier is pruned before a 2 h bucket fills
+             "[{resolution: 300, retention_hours: 1}, {resolution: 7200, retention_hours: 24}]",
+         }) {
+        auto y = std::string(kMinimalConfig) + "\nstats_rollups: " + bad + "\n";
+        EXPECT_THROW(Config::from_file(write_temp_config(y)), std::exception) << bad;
+    }
+}
+
 TEST(UtilsTest, ParseSizeToBytes) {
     EXPECT_EQ(parse_size_to_bytes("1KB"), 1024LL);
     EXPECT_EQ(parse_size_to_bytes("1MB"), 1024LL * 1024);
@@ -7,6 +7,7 @@
 #include "utils.hpp"
 
 #include <filesystem>
+#include <future>
 #include <fstream>
 
 namespace fs = std::filesystem;
@@ -101,6 +102,27 @@ TEST_F(DatabaseTest, InsertSkipsRequiredFieldMissing) {
     EXPECT_EQ(inserted, 0);
 }
 
+TEST_F(DatabaseTest, EncodeRowsThenInsertEncoded) {
+    std::vector<nlohmann::json> logs{
+        {{"timestamp", "2024-01-01T00:00:00"}, {"message", "a"}, {"level", "INFO"}},
+        {{"service", "svc"}},  // missing required columns → dropped while encoding
+        {{"timestamp", "2024-01-01T00:00:01"},
+         {"message", "b"},
+         {"level", "WARN"},
+         {"service", {{"name", "api"}}}},
+    };
+    auto batch = db_->EncodeRows(logs);
+    EXPECT_EQ(batch.columns,
+              (std::vector<std::string>{"timestamp", "message", "level", "service"}));
+    ASSERT_EQ(batch.rows.size(), 2u);
+    EXPECT_EQ(batch.rows[1][3], R"({"name":"api"})");
+    EXPECT_EQ(db_->GetMaxLogId(), 0);
+
+    EXPECT_EQ(db_->InsertEncoded(batch), 2);
+    auto result = reader_->Query({"message"}, {}, 10, 0);
+    EXPECT_EQ(result.total, 2);
+}
+
 TEST_F(DatabaseTest, InsertBatch) {
     std::vector<nlohmann::json> logs;
     for (int i = 0; i < 5; ++i) {
@@ -161,6 +183,73 @@ TEST_F(DatabaseTest, QueryPagination) {
     EXPECT_EQ(page2.results.size(), 5u);
 }
 
+TEST_F(DatabaseTest, QueryKeysetPagination) {
+    std::vector<nlohmann::json> logs;
+    for (int i = 0; i < 10; ++i) {
+        logs.push_back({
+            {"timestamp", fmt::format("2024-01-01T00:00:{:02d}", i)},
+            {"message", fmt::format("msg {}", i)},
+            {"level", i % 2 ? "INFO" : "ERROR"},
+        });
+    }
+    db_->Insert(logs);
+
+    const std::vector<QueryFilter> info{{"level", "=", "INFO"}};
+    auto page1 = reader_->Query({"id"}, info, 3, 0, INT64_MAX);
+    EXPECT_EQ(page1.total, -1) << "keyset pages are not counted";
+    ASSERT_EQ(page1.results.size(), 3u);
+    EXPECT_EQ(page1.results[0]["id"], 10);
+    EXPECT_EQ(page1.results[2]["id"], 6);
+
+    // A row inserted between pages does not shift the next one.
+    db_->Insert({{{"timestamp", "2024-01-01T00:01:00"}, {"message", "late"}, {"level", "INFO"}}});
+    auto page2 = reader_->QueryColumns({"id"}, info, 3, 0, 6);
+    EXPECT_EQ(page2.total, -1);
+    ASSERT_EQ(page2.rows, 2);
+}
+
+TEST_F(DatabaseTest, IdStrideAssignsShardIds) {
+    db_->Insert({{{"timestamp", "2024-01-01T00:00:00"}, {"message", "a"}, {"level", "INFO"}}});
+
+    // Shard 2 of 4, above a highest id of 9 in some other shard.
+    db_->SetIdStride(4, 2, 9);
+    EXPECT_EQ(db_->IdStride(), 4);
+    db_->Insert({
+        {{"timestamp", "2024-01-01T00:00:01"}, {"message", "b"}, {"level", "INFO"}},
+        {{"timestamp", "2024-01-01T00:00:02"}, {"message", "c"}, {"level", "INFO"}},
+    });
+
+    auto res = reader_->Query({"id", "message"}, {}, 10, 0);
+    ASSERT_EQ(res.results.size(), 3u);
+    EXPECT_EQ(res.results[0]["id"], 14);
+    EXPECT_EQ(res.results[1]["id"], 10);
+    EXPECT_EQ(res.results[2]["id"], 1);
+}
+
+TEST_F(DatabaseTest, NthLogIdReadsGappedShardIds) {
+    db_->Insert({
+        {{"timestamp", "2024-01-01T00:00:00"}, {"message", "a"}, {"level", "INFO"}},
+        {{"timestamp", "2024-01-01T00:00:01"}, {"message", "b"}, {"level", "INFO"}},
+        {{"timestamp", "2024-01-01T00:00:02"}, {"message", "c"}, {"level", "INFO"}},
+    });
+    EXPECT_EQ(db_->CountLogRows(), 3);
+    EXPECT_EQ(db_->NthLogId(1), 2);
+    EXPECT_EQ(db_->NthLogId(5), 4);
+
+    // Shard 1 of 4 after a restart where another shard had reached id 100.
+    db_->SetIdStride(4, 1, 100);
+    db_->Insert({
+        {{"timestamp", "2024-01-01T00:00:03"}, {"message", "d"}, {"level", "INFO"}},
+        {{"timestamp", "2024-01-01T00:00:04"}, {"message", "e"}, {"level", "INFO"}},
+    });
+    EXPECT_EQ(db_->CountLogRows(), 5);
+    EXPECT_EQ(db_->NthLogId(0), 1);
+    EXPECT_EQ(db_->NthLogId(2), 3);
+    EXPECT_EQ(db_->NthLogId(3), 101);
+    EXPECT_EQ(db_->NthLogId(4), 105);
+    EXPECT_EQ(db_->NthLogId(5), 106);
+}
+
 TEST_F(DatabaseTest, DeleteLogs) {
     std::vector<nlohmann::json> logs{
         {{"timestamp", "2024-01-01T00:00:00"}, {"message", "a"}, {"level", "INFO"}},
@@ -415,3 +504,314 @@ TEST_F(DatabaseTest, InsertAndPruneStatsRows) {
     EXPECT_EQ(db_->DeleteStatsBefore("2024-01-02T00:00:00Z"), 2);
     EXPECT_EQ(db_->DeleteStatsBefore("2024-01-03T00:00:00Z"), 2);
 }
+
+TEST_F(DatabaseTest, RollupStatsMergesFinishedBuckets) {
+    using namespace std::chrono;
+    cfg_.task_diagnostics_interval = 30;
+    cfg_.stats_rollups = {{60, 72}, {300, 72}};
+
+    // Six 30 s windows from an hour boundary two hours ago.
+    const auto base = floor<hours>(system_clock::now()) - 2h;
+    auto at = [&](int s) { return format_utc(base + seconds{s}); };
+    const int64_t counts[] = {1, 3, 0, 2, 0, 0};
+    const int64_t mins[] = {5, 8, 0, 12, 0, 0};
+    const int64_t maxs[] = {10, 50, 0, 25, 0, 0};
+    const int64_t avgs[] = {10, 30, 0, 20, 0, 0};
+    for (int i = 0; i < 6; ++i) {
+        ActivityStatsRow row;
+        row.since = at(i * 30);
+        row.until = at(i * 30 + 30);
+        row.query_count = counts[i];
+        row.query_min = mins[i];
+        row.query_max = maxs[i];
+        row.query_avg = avgs[i];
+        row.insert_total_count = 100;
+        row.http_conn_count = i;
+        db_->InsertActivityStats(row);
+        db_->InsertDatabaseStats({row.until, 1000 + i, 4096});
+    }
+
+    // Three finished minutes of activity; database samples at 0:30 … 2:30 (3:00 is unfinished).
+    EXPECT_EQ(db_->RollupStats(cfg_.stats_rollups, base + 180s), 6);
+    EXPECT_EQ(db_->RollupStats(cfg_.stats_rollups, base + 180s), 0);
+
+    auto minutes = reader_->QueryActivityStats(
+        at(0), at(300), {"query_count", "query_min", "query_max", "query_avg", "insert_total_count",
+                         "http_conn_count"},
+        "asc", 5);
+    EXPECT_EQ(minutes.resolution, 60);
+    ASSERT_EQ(minutes.data.size(), 3u);
+    EXPECT_EQ(nlohmann::json(minutes.data[0]), nlohmann::json({4, 5, 50, 25, 200, 1}));
+    EXPECT_EQ(nlohmann::json(minutes.data[1]), nlohmann::json({2, 12, 25, 20, 200, 3}));
+    EXPECT_EQ(nlohmann::json(minutes.data[2]), nlohmann::json({0, 0, 0, 0, 200, 5}));
+
+    // The 5-minute tier is rolled up from the 1-minute one.
+    EXPECT_EQ(db_->RollupStats(cfg_.stats_rollups, base + 300s), 3);
+    auto coarse = reader_->QueryActivityStats(
+        at(0), at(300), {"since", "until", "query_count", "query_avg"}, "asc", 2);
+    EXPECT_EQ(coarse.resolution, 300);
+    ASSERT_EQ(coarse.data.size(), 1u);
+    EXPECT_EQ(nlohmann::json(coarse.data[0]), nlohmann::json({at(0), at(300), 6, 23}));
+
+    auto gauges =
+        reader_->QueryDatabaseStats(at(0), at(300), {"timestamp", "rows_count"}, "asc", 2);
+    ASSERT_EQ(gauges.data.size(), 1u);
+    EXPECT_EQ(nlohmann::json(gauges.data[0]), nlohmann::json({at(180), 1005}));
+
+    // Within budget, the raw rows are returned.
+    auto raw = reader_->QueryActivityStats(at(0), at(300), {"query_count"}, "asc", 10);
+    EXPECT_EQ(raw.resolution, 30);
+    EXPECT_EQ(raw.data.size(), 6u);
+
+    EXPECT_EQ(db_->DeleteStatsRollupBefore(60, at(300)), 7);
+    EXPECT_EQ(db_->DeleteStatsRollupBefore(300, at(600)), 2);
+}
+
+// ── zstd column compression ───────────────────────────────────────────────────
+
+class ZstdDatabaseTest : public DatabaseTest {
+   protected:
+    void SetUp() override {
+        DatabaseTest::SetUp();
+        reader_.reset();
+        db_.reset();
+
+        cfg_.compression.enabled = true;
+        cfg_.compression.zstd_columns = {"message"};
+        cfg_.compression.zstd_train_samples = 50;
+        reopen();
+    }
+
+    void reopen() {
+        reader_.reset();
+        db_.reset();
+        db_ = std::make_unique<WriterDatabase>(cfg_);
+        db_->Open();
+        db_->Initialize();
+        reader_ = std::make_unique<ReaderDatabase>(cfg_, db_->catalog());
+        reader_->Open();
+    }
+
+    static std::string message(int i) {
+        return fmt::format("worker {} finished job id={} after {} retries", i % 8, 1000 + i,
+                           i % 3);
+    }
+
+    void insert_rows(int n) {
+        std::vector<nlohmann::json> logs;
+        for (int i = 0; i < n; ++i) {
+            logs.push_back({{"timestamp", fmt::format("2024-01-01T00:{:02}:{:02}", i / 60, i % 60)},
+                            {"message", message(i)},
+                            {"level", "INFO"}});
+        }
+        ASSERT_EQ(db_->Insert(logs), n);
+    }
+
+    int count_blob_messages() const {
+        sqlite3* raw{};
+        sqlite3_open(cfg_.db_path.string().c_str(), &raw);
+        sqlite3_stmt* stmt{};
+        sqlite3_prepare_v2(raw, "SELECT COUNT(*) FROM TestLog WHERE typeof(message) = 'blob'", -1,
+                           &stmt, nullptr);
+        sqlite3_step(stmt);
+        int n = sqlite3_column_int(stmt, 0);
+        sqlite3_finalize(stmt);
+        sqlite3_close(raw);
+        return n;
+    }
+};
+
+TEST_F(ZstdDatabaseTest, StoresFramesAndQueriesPlainText) {
+    insert_rows(100);
+
+    EXPECT_GT(count_blob_messages(), 0);
+    EXPECT_EQ(db_->GetZstdDictRows().size(), 1u);
+
+    auto result = reader_->Query({"*"}, {}, 200, 0);
+    ASSERT_EQ(result.results.size(), 100u);
+    for (const auto& row : result.results) {
+        const int i = row["id"].get<int>() - 1;
+        EXPECT_EQ(row["message"], message(i));
+    }
+}
+
+TEST_F(ZstdDatabaseTest, FiltersMatchDecompressedText) {
+    insert_rows(100);
+
+    auto like = reader_->Query({"message"}, {{"message", "~=", "id=1042"}}, 10, 0);
+    ASSERT_EQ(like.total, 1);
+    EXPECT_EQ(like.results[0]["message"], message(42));
+
+    auto eq = reader_->Query({"message"}, {{"message", "=", message(7)}}, 10, 0);
+    EXPECT_EQ(eq.total, 1);
+
+    EXPECT_EQ(db_->DeleteLogs({{"message", "~=", "worker 3 "}}), 13);
+}
+
+TEST_F(ZstdDatabaseTest, DictionaryPersistedWithFirstInsertedBatch) {
+    std::vector<nlohmann::json> logs;
+    for (int i = 0; i < 60; ++i)
+        logs.push_back(
+            {{"timestamp", "2024-01-01T00:00:00"}, {"message", message(i)}, {"level", "INFO"}});
+
+    // Encoding trains the dictionary but leaves the connection alone.
+    auto batch = db_->EncodeRows(logs);
+    EXPECT_TRUE(db_->catalog()->zstd_codec->ActiveDictionary("message").has_value());
+    EXPECT_TRUE(db_->GetZstdDictRows().empty());
+
+    ASSERT_EQ(db_->InsertEncoded(batch), 60);
+    EXPECT_EQ(db_->GetZstdDictRows().size(), 1u);
+}
+
+TEST_F(ZstdDatabaseTest, EncodeConcurrentlyWithInsert) {
+    auto make_logs = [](int from, int n) {
+        std::vector<nlohmann::json> logs;
+        for (int i = from; i < from + n; ++i)
+            logs.push_back(
+                {{"timestamp", "2024-01-01T00:00:00"}, {"message", message(i)}, {"level", "INFO"}});
+        return logs;
+    };
+
+    auto first = db_->EncodeRows(make_logs(0, 100));
+    for (int round = 1; round < 5; ++round) {
+        auto next = std::async(std::launch::async,
+                               [&, round] { return db_->EncodeRows(make_logs(round * 100, 100)); });
+        ASSERT_EQ(db_->InsertEncoded(first), 100);
+        first = next.get();
+    }
+    ASSERT_EQ(db_->InsertEncoded(first), 100);
+
+    auto result = reader_->Query({"id", "message"}, {}, 1000, 0);
+    ASSERT_EQ(result.total, 500);
+    for (const auto& row : result.results)
+        EXPECT_EQ(row["message"], message(row["id"].get<int>() - 1));
+}
+
+TEST_F(ZstdDatabaseTest, DictionarySurvivesRestart) {
+    insert_rows(100);
+    reopen();
+
+    auto result = reader_->Query({"message"}, {{"message", "~=", "id=1099"}}, 10, 0);
+    ASSERT_EQ(result.total, 1);
+    EXPECT_EQ(result.results[0]["message"], message(99));
+
+    // Dropping the column from the config stops compressing new rows, old rows still decode.
+    cfg_.compression.zstd_columns.clear();
+    reopen();
+    db_->Insert(
+        {{{"timestamp", "2024-01-02T00:00:00"}, {"message", message(500)}, {"level", "INFO"}}});
+    auto all = reader_->Query({"message"}, {}, 200, 0);
+    EXPECT_EQ(all.results.size(), 101u);
+    EXPECT_EQ(all.results[0]["message"], message(500));
+    EXPECT_EQ(all.results[1]["message"], message(99));
+}
+
+// ── JSON-path fields ──────────────────────────────────────────────────────────
+
+class JsonFieldDatabaseTest : public DatabaseTest {
+   protected:
+    void SetUp() override {
+        DatabaseTest::SetUp();
+        reader_.reset();
+        db_.reset();
+
+        Migration m;
+        m.version = 2;
+        m.rollout = {"ALTER TABLE TestLog ADD COLUMN extra JSON"};
+        m.rollback = {"ALTER TABLE TestLog DROP COLUMN extra"};
+        cfg_.migrations.push_back(m);
+        cfg_.json_fields = {"extra.request_id", "extra.http.status"};
+        reopen();
+
+        std::vector<nlohmann::json> logs;
+        for (int i = 0; i < 20; ++i) {
+            logs.push_back({{"timestamp", fmt::format("2024-01-01T00:00:{:02}", i)},
+                            {"message", fmt::format("m{}", i)},
+                            {"level", "INFO"},
+                            {"extra",
+                             {{"request_id", fmt::format("r{}", i % 4)},
+                              {"http", {{"status", i % 2 ? 500 : 200}}},
+                              {"user", i < 5 ? "alice" : "bob"}}}});
+        }
+        logs.push_back({{"timestamp", "2024-01-01T00:01:00"},
+                        {"message", "plain"},
+                        {"level", "INFO"},
+                        {"extra", "not json"}});
+        ASSERT_EQ(db_->Insert(logs), 21);
+    }
+
+    void reopen() {
+        reader_.reset();
+        db_.reset();
+        db_ = std::make_unique<WriterDatabase>(cfg_);
+        db_->Open();
+        db_->Initialize();
+        reader_ = std::make_unique<ReaderDatabase>(cfg_, db_->catalog());
+        reader_->Open();
+    }
+
+    std::string query_plan(std::string_view where) const {
+        sqlite3* raw{};
+        sqlite3_open(cfg_.db_path.string().c_str(), &raw);
+        sqlite3_stmt* stmt{};
+        auto sql = fmt::format("EXPLAIN QUERY PLAN SELECT id FROM TestLog WHERE {}", where);
+        sqlite3_prepare_v2(raw, sql.c_str(), -1, &stmt, nullptr);
+        std::string plan;
+        while (sqlite3_step(stmt) == SQLITE_ROW)
+            plan += reinterpret_cast<const char*>(sqlite3_column_text(stmt, 3));
+        sqlite3_finalize(stmt);
+        sqlite3_close(raw);
+        return plan;
+    }
+};
+
+TEST_F(JsonFieldDatabaseTest, DeclaredPathsBecomeIndexedHiddenColumns) {
+    EXPECT_EQ(db_->catalog()->json_field_columns.at("extra.request_id"), "extra__request_id");
+    for (const auto& ci : db_->GetColumnInfo()) EXPECT_NE(ci.name, "extra__request_id");
+    EXPECT_FALSE(reader_->Query({"*"}, {}, 1, 0).results[0].contains("extra__request_id"));
+    EXPECT_NE(query_plan("extra__request_id = 'r1'").find("idx_TestLog_extra__request_id"),
+              std::string::npos);
+
+    // Idempotent across restarts.
+    reopen();
+    EXPECT_EQ(reader_->Query({"id"}, {}, 100, 0).total, 21);
+}
+
+TEST_F(JsonFieldDatabaseTest, FiltersOnDeclaredAndUndeclaredPaths) {
+    auto by_id = reader_->Query({"message"}, {{"extra.request_id", "=", "r1"}}, 100, 0);
+    EXPECT_EQ(by_id.total, 5);
+
+    // Numeric-looking query-string values compare as JSON numbers.
+    auto errors = reader_->Query({"id"}, {{"extra.http.status", ">=", "500"}}, 100, 0);
+    EXPECT_EQ(errors.total, 10);
+
+    // Not declared: falls back to json_extract on the column.
+    auto alice = reader_->Query({"id"}, {{"extra.user", "=", "alice"}}, 100, 0);
+    EXPECT_EQ(alice.total, 5);
+    auto substring = reader_->Query({"id"}, {{"extra.user", "~=", "li"}}, 100, 0);
+    EXPECT_EQ(substring.total, 5);
+
+    EXPECT_THROW(reader_->Query({"id"}, {{"nope.user", "=", "x"}}, 10, 0), std::runtime_error);
+    EXPECT_THROW(reader_->ValidateFilters({{"extra.a-b", "=", "x"}}), std::runtime_error);
+}
+
+TEST_F(JsonFieldDatabaseTest, NumericLookingFiltersMatchStringAndNumberValues) {
+    ASSERT_EQ(db_->Insert({
+                  {{"timestamp", "2024-01-01T00:02:00"},
+                   {"message", "string id"},
+                   {"level", "INFO"},
+                   {"extra", {{"request_id", "123"}, {"http", {{"status", "503"}}}}}},
+                  {{"timestamp", "2024-01-01T00:02:01"},
+                   {"message", "number id"},
+                   {"level", "INFO"},
+                   {"extra", {{"request_id", 123}}}},
+              }),
+              2);
+
+    EXPECT_EQ(reader_->Query({"id"}, {{"extra.request_id", "=", "123"}}, 100, 0).total, 2);
+    EXPECT_EQ(reader_->Query({"id"}, {{"extra.request_id", "!=", "123"}}, 100, 0).total, 20);
+
+    // Ordering compares numbers only: the string "503" is not a status >= 500.
+    EXPECT_EQ(reader_->Query({"id"}, {{"extra.http.status", ">=", "500"}}, 100, 0).total, 10);
+    EXPECT_EQ(reader_->Query({"id"}, {{"extra.http.status", "=", "503"}}, 100, 0).total, 1);
+}
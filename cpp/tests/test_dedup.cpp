@@ -0,0 +1,234 @@
+#include <gtest/gtest.h>
+
+#include "config.hpp"
+#include "dedup.hpp"
+#include "reader_database.hpp"
+#include "writer_database.hpp"
+
+#include <chrono>
+#include <filesystem>
+#include <vector>
+
+namespace fs = std::filesystem;
+using namespace loglite;
+using namespace std::chrono_literals;
+
+namespace {
+
+nlohmann::json entry(std::string message, std::string ts, std::string level = "ERROR") {
+    return {{"timestamp", std::move(ts)},
+            {"message", std::move(message)},
+            {"level", std::move(level)},
+            {"service", "api"}};
+}
+
+DedupConfig enabled(int window_seconds = 60, int max_keys = 100) {
+    DedupConfig cfg;
+    cfg.enabled = true;
+    cfg.window_seconds = window_seconds;
+    cfg.max_keys = max_keys;
+    return cfg;
+}
+
+// Row ids 1..n for every row of the plan, as if all inserts succeeded.
+std::vector<DedupUpdate> commit_all(LogCoalescer& dedup, DedupPlan& plan, int64_t first_id) {
+    std::vector<std::size_t> sources;
+    std::vector<int64_t> ids;
+    for (std::size_t i = 0; i < plan.rows.size(); ++i) {
+        sources.push_back(i);
+        ids.push_back(first_id + static_cast<int64_t>(i));
+    }
+    return dedup.Commit(plan, sources, ids);
+}
+
+}  // namespace
+
+// ── LogCoalescer ──────────────────────────────────────────────────────────────
+
+TEST(LogCoalescerTest, DisabledPassesEntriesThrough) {
+    LogCoalescer dedup{DedupConfig{}, "timestamp"};
+    auto plan = dedup.Coalesce({entry("boom", "t1"), entry("boom", "t2")});
+    ASSERT_EQ(plan.rows.size(), 2u);
+    EXPECT_FALSE(plan.rows[0].contains("count"));
+    EXPECT_TRUE(plan.slots.empty());
+    EXPECT_TRUE(commit_all(dedup, plan, 1).empty());
+}
+
+TEST(LogCoalescerTest, CollapsesDuplicatesWithinBatch) {
+    LogCoalescer dedup{enabled(), "timestamp"};
+    auto plan = dedup.Coalesce({entry("boom", "t1"), entry("other", "t2"), entry("boom", "t3"),
+                                entry("boom", "t4", "WARNING")});
+
+    ASSERT_EQ(plan.rows.size(), 3u);
+    EXPECT_EQ(plan.rows[0]["count"], 2);
+    EXPECT_EQ(plan.rows[0]["first_seen"], "t1");
+    EXPECT_EQ(plan.rows[0]["last_seen"], "t3");
+    EXPECT_EQ(plan.rows[1]["count"], 1);
+    EXPECT_EQ(plan.rows[2]["level"], "WARNING");
+    EXPECT_TRUE(plan.updates.empty());
+    EXPECT_EQ(dedup.ToJSON()["collapsed"], 1);
+}
+
+TEST(LogCoalescerTest, LaterBatchesUpdateTheOpenRow) {
+    LogCoalescer dedup{enabled(), "timestamp"};
+    const auto t0 = LogCoalescer::Clock::now();
+
+    auto first = dedup.Coalesce({entry("boom", "t1")}, t0);
+    auto second = dedup.Coalesce({entry("boom", "t2"), entry("boom", "t3")}, t0 + 1s);
+    EXPECT_TRUE(second.rows.empty());
+
+    // The first batch is committed before the second, as on the write strand.
+    EXPECT_TRUE(commit_all(dedup, first, 42).empty());
+    auto updates = commit_all(dedup, second, 100);
+    ASSERT_EQ(updates.size(), 1u);
+    EXPECT_EQ(updates[0].row_id, 42);
+    EXPECT_EQ(updates[0].count, 2);
+    EXPECT_EQ(updates[0].last_seen, "t3");
+}
+
+TEST(LogCoalescerTest, WindowExpiryStartsANewRow) {
+    LogCoalescer dedup{enabled(10), "timestamp"};
+    const auto t0 = LogCoalescer::Clock::now();
+
+    auto first = dedup.Coalesce({entry("boom", "t1")}, t0);
+    commit_all(dedup, first, 1);
+    auto later = dedup.Coalesce({entry("boom", "t2")}, t0 + 10s);
+    ASSERT_EQ(later.rows.size(), 1u);
+    EXPECT_EQ(later.rows[0]["count"], 1);
+    EXPECT_EQ(dedup.ToJSON()["open_windows"], 1);
+}
+
+TEST(LogCoalescerTest, EvictsOldestWindowBeyondMaxKeys) {
+    LogCoalescer dedup{enabled(60, 2), "timestamp"};
+    auto plan = dedup.Coalesce({entry("a", "t1"), entry("b", "t2"), entry("c", "t3")});
+    commit_all(dedup, plan, 1);
+
+    auto next = dedup.Coalesce({entry("a", "t4"), entry("c", "t5")});
+    ASSERT_EQ(next.rows.size(), 1u) << "'a' was evicted and starts a new row";
+    EXPECT_EQ(next.rows[0]["message"], "a");
+    ASSERT_EQ(next.updates.size(), 1u);
+
+    auto stats = dedup.ToJSON();
+    EXPECT_EQ(stats["evicted"], 2);
+    EXPECT_EQ(stats["open_windows"], 2);
+}
+
+TEST(LogCoalescerTest, FailedInsertClosesWindowAndRequeuesDuplicates) {
+    LogCoalescer dedup{enabled(), "timestamp"};
+    auto first = dedup.Coalesce({entry("boom", "t1")});
+    auto second = dedup.Coalesce({entry("boom", "t2"), entry("boom", "t3")});
+    ASSERT_EQ(second.updates.size(), 1u);
+
+    // The first row's insert fails, so the duplicates have no row to update.
+    EXPECT_TRUE(dedup.Commit(first, {0}, {0}).empty());
+    EXPECT_TRUE(commit_all(dedup, second, 5).empty());
+    auto stats = dedup.ToJSON();
+    EXPECT_EQ(stats["open_windows"], 0);
+    EXPECT_EQ(stats["failed"], 1);
+    EXPECT_EQ(stats["requeued"], 1);
+
+    // They become a new row of the next batch, together with later duplicates.
+    auto third = dedup.Coalesce({entry("boom", "t4")});
+    ASSERT_EQ(third.rows.size(), 1u);
+    EXPECT_EQ(third.rows[0]["count"], 3);
+    EXPECT_EQ(third.rows[0]["first_seen"], "t2");
+    EXPECT_EQ(third.rows[0]["last_seen"], "t4");
+    EXPECT_TRUE(third.updates.empty());
+    EXPECT_EQ(dedup.ToJSON()["collapsed"], 2);
+}
+
+TEST(LogCoalescerTest, AbortedBatchRequeuesItsUpdates) {
+    LogCoalescer dedup{enabled(), "timestamp"};
+    auto first = dedup.Coalesce({entry("boom", "t1")});
+    commit_all(dedup, first, 7);
+
+    // Rolled back: its new row is lost, its update of row 7 is retried.
+    auto second = dedup.Coalesce({entry("boom", "t2"), entry("other", "t3")});
+    dedup.Abort(second);
+    EXPECT_EQ(dedup.ToJSON()["open_windows"], 1);
+
+    auto third = dedup.Coalesce({entry("other", "t4")});
+    ASSERT_EQ(third.rows.size(), 1u);
+    EXPECT_EQ(third.rows[0]["message"], "other");
+    EXPECT_EQ(third.rows[0]["count"], 1);
+    auto updates = commit_all(dedup, third, 8);
+    ASSERT_EQ(updates.size(), 1u);
+    EXPECT_EQ(updates[0].row_id, 7);
+    EXPECT_EQ(updates[0].count, 1);
+    EXPECT_EQ(updates[0].last_seen, "t2");
+}
+
+// ── WriterDatabase ────────────────────────────────────────────────────────────
+
+class DedupDatabaseTest : public ::testing::Test {
+   protected:
+    void SetUp() override {
+        db_dir_ = fs::temp_directory_path() / "loglite_test_dedup";
+        fs::remove_all(db_dir_);
+        fs::create_directories(db_dir_);
+
+        cfg_.sqlite_dir = db_dir_;
+        cfg_.db_path = db_dir_ / "logs.db";
+        cfg_.log_table_name = "TestLog";
+        cfg_.auto_rollout = true;
+        cfg_.dedup = enabled();
+
+        Migration m;
+        m.version = 1;
+        m.rollout = {
+            "CREATE TABLE IF NOT EXISTS TestLog ("
+            "  id         INTEGER PRIMARY KEY,"
+            "  timestamp  TEXT    NOT NULL,"
+            "  message    TEXT    NOT NULL,"
+            "  level      TEXT    NOT NULL,"
+            "  service    TEXT,"
+            "  count      INTEGER NOT NULL DEFAULT 1,"
+            "  first_seen TEXT,"
+            "  last_seen  TEXT"
+            ")"};
+        m.rollback = {"DROP TABLE IF EXISTS TestLog"};
+        cfg_.migrations.push_back(m);
+    }
+
+    void TearDown() override { fs::remove_all(db_dir_); }
+
+    // Coalesce → encode → insert → commit → update, as the flush task does.
+    void flush(WriterDatabase& db, LogCoalescer& dedup, std::vector<nlohmann::json> logs) {
+        auto plan = dedup.Coalesce(std::move(logs));
+        auto batch = db.EncodeRows(plan.rows);
+        std::vector<int64_t> ids;
+        db.InsertEncoded(batch, &ids);
+        db.ApplyDedupUpdates(dedup.Commit(plan, batch.sources, ids));
+    }
+
+    Config cfg_;
+    fs::path db_dir_;
+};
+
+TEST_F(DedupDatabaseTest, CountsAccumulateAcrossFlushes) {
+    WriterDatabase db{cfg_};
+    db.Open();
+    db.Initialize();
+    LogCoalescer dedup{cfg_.dedup, cfg_.log_timestamp_field};
+
+    flush(db, dedup, {entry("boom", "2026-01-01T00:00:00Z"), entry("boom", "2026-01-01T00:00:01Z"),
+                      {{"service", "missing required columns"}}});
+    flush(db, dedup, {entry("boom", "2026-01-01T00:00:05Z"), entry("fine", "2026-01-01T00:00:06Z")});
+
+    ReaderDatabase reader{cfg_, db.catalog()};
+    reader.Open();
+    auto result = reader.Query({"message", "count", "first_seen", "last_seen"}, {}, 10, 0);
+    ASSERT_EQ(result.total, 2);
+    const auto& boom = result.results[1]["message"] == "boom" ? result.results[1]
+                                                              : result.results[0];
+    EXPECT_EQ(boom["count"], 3);
+    EXPECT_EQ(boom["first_seen"], "2026-01-01T00:00:00Z");
+    EXPECT_EQ(boom["last_seen"], "2026-01-01T00:00:05Z");
+}
+
+TEST_F(DedupDatabaseTest, InitializeRequiresCountColumn) {
+    cfg_.dedup.count_column = "occurrences";
+    WriterDatabase db{cfg_};
+    db.Open();
+    EXPECT_THROW(db.Initialize(), std::runtime_error);
+}
@@ -0,0 +1,68 @@
+#include <gtest/gtest.h>
+
+#include "flush_policy.hpp"
+
+#include <chrono>
+
+using namespace loglite;
+using namespace std::chrono_literals;
+
+TEST(FlushPolicyTest, IdleFlushesSingleEntriesAfterTargetLatency) {
+    AdaptiveFlushPolicy policy{250ms, 5000, 5s};
+    auto plan = policy.Plan();
+    EXPECT_EQ(plan.batch_size, 1u);
+    EXPECT_EQ(plan.max_wait, 250ms);
+}
+
+TEST(FlushPolicyTest, BatchGrowsWithIngestRate) {
+    AdaptiveFlushPolicy policy{200ms, 100000, 5s};
+    policy.ObserveInsert(1000, 10.0);  // 0.01 ms/row
+    policy.ObserveIngest(1000, 1s);    // 1 row/ms
+
+    // B = r·T / (1 + r·c) = 200 / 1.01
+    auto plan = policy.Plan();
+    EXPECT_EQ(plan.batch_size, 198u);
+    EXPECT_EQ(plan.max_wait, 198ms);  // 200 - 198·0.01
+    EXPECT_DOUBLE_EQ(policy.IngestRate(), 1000.0);
+    EXPECT_DOUBLE_EQ(policy.InsertCostMs(), 0.01);
+
+    for (int i = 0; i < 20; ++i) policy.ObserveIngest(10000, 1s);
+    EXPECT_GT(policy.Plan().batch_size, 1000u);
+}
+
+TEST(FlushPolicyTest, SaturatedBatchBoundedByLatencyAndMaxBatch) {
+    AdaptiveFlushPolicy policy{100ms, 100000, 5s};
+    policy.ObserveInsert(100, 10.0);    // 0.1 ms/row
+    policy.ObserveIngest(1000000, 1s);  // far more than inserts can absorb
+
+    // Approaches T / c: the largest batch whose insert fits the latency budget.
+    auto plan = policy.Plan();
+    EXPECT_LE(plan.batch_size, 1000u);
+    EXPECT_GE(plan.batch_size, 990u);
+    EXPECT_LE(plan.max_wait, 1ms);
+
+    AdaptiveFlushPolicy capped{100ms, 50, 5s};
+    capped.ObserveIngest(1000000, 1s);
+    EXPECT_EQ(capped.Plan().batch_size, 50u);
+}
+
+TEST(FlushPolicyTest, WaitCappedByMaxWait) {
+    AdaptiveFlushPolicy policy{10000ms, 10, 2s};
+    EXPECT_EQ(policy.Plan().max_wait, 2000ms);
+}
+
+TEST(FlushPolicyTest, EstimatesAreSmoothed) {
+    AdaptiveFlushPolicy policy{250ms, 5000, 5s};
+    policy.ObserveIngest(1000, 1s);
+    policy.ObserveIngest(0, 1s);
+    EXPECT_DOUBLE_EQ(policy.IngestRate(), 700.0);
+
+    policy.ObserveIngest(10, 0s);  // ignored
+    EXPECT_DOUBLE_EQ(policy.IngestRate(), 700.0);
+
+    auto json = policy.ToJSON();
+    EXPECT_EQ(json["max_batch"], 5000);
+    EXPECT_EQ(json["target_latency_ms"], 250);
+    EXPECT_TRUE(json.contains("batch_size"));
+    EXPECT_TRUE(json.contains("max_wait_ms"));
+}
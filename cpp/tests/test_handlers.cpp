@@ -2,12 +2,15 @@
 
 #include "handlers/common.hpp"
 #include "handlers/health.hpp"
+#include "handlers/index_advice.hpp"
 #include "handlers/version_route.hpp"
 #include "handlers/settings.hpp"
 #include "handlers/schema.hpp"
 #include "version.hpp"
 #include "handlers/insert.hpp"
 #include "handlers/query.hpp"
+#include "handlers/snapshot.hpp"
+#include "handlers/stream.hpp"
 #include "config.hpp"
 #include "writer_database.hpp"
 #include "context.hpp"
@@ -74,11 +77,13 @@ class HandlersTest : public ::testing::Test {
 
         db_ops_pool_ = std::make_unique<asio::thread_pool>(1u);
         reader_pool_ = std::make_unique<asio::thread_pool>(1u);
+        encode_pool_ = std::make_unique<asio::thread_pool>(1u);
         db_read_ = std::make_unique<ReadDatabasePool>(cfg_, db_->catalog(), 1u);
 
         ctx_ = std::make_unique<ServerContext>(cfg_, *db_, *db_read_, *backlog_, *notifier_,
                                                asio::make_strand(db_ops_pool_->get_executor()),
-                                               reader_pool_->get_executor());
+                                               reader_pool_->get_executor(),
+                                               encode_pool_->get_executor());
     }
 
     void TearDown() override {
@@ -87,6 +92,8 @@ class HandlersTest : public ::testing::Test {
         db_read_.reset();
         reader_pool_->join();
         reader_pool_.reset();
+        encode_pool_->join();
+        encode_pool_.reset();
         db_ops_pool_->join();
         db_ops_pool_.reset();
         db_->Close();
@@ -113,6 +120,7 @@ class HandlersTest : public ::testing::Test {
     std::unique_ptr<LogNotifier> notifier_;
     std::unique_ptr<asio::thread_pool> db_ops_pool_;
     std::unique_ptr<asio::thread_pool> reader_pool_;
+    std::unique_ptr<asio::thread_pool> encode_pool_;
     std::unique_ptr<ServerContext> ctx_;
 };
 
@@ -276,6 +284,116 @@ TEST_F(HandlersTest, InsertWrongType) {
     EXPECT_EQ(body["error"], "Body must be a JSON object or array");
 }
 
+TEST_F(HandlersTest, InsertOverBudgetReturns429WithRetryAfter) {
+    cfg_.admission.enabled = true;
+    cfg_.admission.rules = {{{{"service", "noisy"}}, 1, 2, 1.0}};
+    ctx_ = std::make_unique<ServerContext>(cfg_, *db_, *db_read_, *backlog_, *notifier_,
+                                           asio::make_strand(db_ops_pool_->get_executor()),
+                                           reader_pool_->get_executor(),
+                                           encode_pool_->get_executor());
+
+    auto noisy = R"([{"message":"a","level":"INFO","service":"noisy"},
+                     {"message":"b","level":"INFO","service":"noisy"}])";
+    auto ok = sync_await(handlers::HandleInsert(make_req(http::verb::post, "/logs", noisy), *ctx_));
+    EXPECT_EQ(ok.result(), http::status::ok);
+    EXPECT_EQ(backlog_->Size(), 2u);
+
+    auto res =
+        sync_await(handlers::HandleInsert(make_req(http::verb::post, "/logs", noisy), *ctx_));
+    EXPECT_EQ(res.result(), http::status::too_many_requests);
+    EXPECT_EQ(res[http::field::retry_after], "2");
+    EXPECT_EQ(backlog_->Size(), 2u);  // nothing from the refused batch
+
+    // Other sources keep their own budget.
+    auto other = R"({"message":"c","level":"INFO","service":"quiet"})";
+    auto res2 =
+        sync_await(handlers::HandleInsert(make_req(http::verb::post, "/logs", other), *ctx_));
+    EXPECT_EQ(res2.result(), http::status::ok);
+    EXPECT_EQ(backlog_->Size(), 3u);
+}
+
+// ── NDJSON line splitting (POST /logs/stream) ─────────────────────────────────
+
+TEST(NdjsonLineBufferTest, ReassemblesLinesAcrossReads) {
+    handlers::NdjsonLineBuffer buf;
+    std::vector<std::string> lines;
+    auto collect = [&](std::string_view l) { lines.emplace_back(l); };
+
+    EXPECT_TRUE(buf.Feed("{\"a\":1}\n{\"b\"", collect));
+    EXPECT_TRUE(buf.Feed(":2}\r\n\n   \n{\"c\"", collect));
+    ASSERT_EQ(lines.size(), 2u);
+    EXPECT_EQ(lines[0], "{\"a\":1}");
+    EXPECT_EQ(lines[1], "{\"b\":2}");
+
+    buf.Finish(collect);
+    ASSERT_EQ(lines.size(), 3u);
+    EXPECT_EQ(lines[2], "{\"c\"");
+}
+
+TEST(NdjsonLineBufferTest, RejectsOverlongLine) {
+    handlers::NdjsonLineBuffer buf{8};
+    int calls = 0;
+    auto count = [&](std::string_view) { ++calls; };
+
+    EXPECT_TRUE(buf.Feed("12345678\n1234", count));
+    EXPECT_FALSE(buf.Feed("56789", count));
+    EXPECT_EQ(calls, 1);
+}
+
+// gzip.compress(b'[{...a...},{...b...}]', mtime=0)
+static const std::string kGzipTwoLogs{
+    "\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\x03\x8b\xae\x56\x2a\xc9\xcc\x4d\x2d\x2e\x49\xcc\x2d"
+    "\x50\xb2\x52\x32\x32\x30\x32\xd1\x35\x30\x04\xa2\x10\x03\x03\x2b\x30\x8a\x52\xd2\x51\x02"
+    "\x2a\x28\x4e\x4c\x4f\x05\x2a\x48\x04\xf2\x72\x52\xcb\x52\x73\x80\x6c\x4f\x3f\x37\x7f\xa5"
+    "\x5a\x1d\x42\x26\x18\xa2\x9a\x90\x84\x64\x82\x6b\x50\x90\x7f\x90\x52\x6d\x2c\x00\x2c\xa6"
+    "\x3b\x1c\x86\x00\x00\x00",
+    94};
+
+TEST_F(HandlersTest, InsertGzipBody) {
+    auto req = make_req(http::verb::post, "/logs", kGzipTwoLogs);
+    req.set(http::field::content_encoding, "gzip");
+    auto res = sync_await(handlers::HandleInsert(req, *ctx_));
+    EXPECT_EQ(res.result(), http::status::ok);
+
+    auto logs = backlog_->Flush();
+    ASSERT_EQ(logs.size(), 2u);
+    EXPECT_EQ(logs[0]["message"], "a");
+    EXPECT_EQ(logs[1]["level"], "ERROR");
+}
+
+TEST_F(HandlersTest, InsertCorruptGzipBody) {
+    auto corrupt = kGzipTwoLogs;
+    corrupt[corrupt.size() - 6] ^= 0x01;  // flip a CRC bit
+    auto req = make_req(http::verb::post, "/logs", corrupt);
+    req.set(http::field::content_encoding, "gzip");
+    auto res = sync_await(handlers::HandleInsert(req, *ctx_));
+    EXPECT_EQ(static_cast<int>(res.result()), 400);
+    EXPECT_EQ(backlog_->Size(), 0u);
+
+    req = make_req(http::verb::post, "/logs", kGzipTwoLogs.substr(0, 40));
+    req.set(http::field::content_encoding, "gzip");
+    res = sync_await(handlers::HandleInsert(req, *ctx_));
+    EXPECT_EQ(static_cast<int>(res.result()), 400);
+}
+
+TEST(GunzipTest, TrailerSizeOnlyChecksTheResult) {
+    auto forged = kGzipTwoLogs;
+    // ISIZE claims 64MB; the body is rejected rather than trusted for sizing.
+    forged.replace(forged.size() - 4, 4, std::string{"\x00\x00\x00\x04", 4});
+    EXPECT_FALSE(handlers::Gunzip(forged).has_value());
+
+    auto out = handlers::Gunzip(kGzipTwoLogs);
+    ASSERT_TRUE(out.has_value());
+    EXPECT_EQ(out->size(), 0x86u);
+}
+
+TEST_F(HandlersTest, InsertUnsupportedContentEncoding) {
+    auto req = make_req(http::verb::post, "/logs", "{}");
+    req.set(http::field::content_encoding, "br");
+    auto res = sync_await(handlers::HandleInsert(req, *ctx_));
+    EXPECT_EQ(static_cast<int>(res.result()), 415);
+}
+
 // ── Query handler ───────────────────────────────────────────────────────────
 
 TEST_F(HandlersTest, QueryMissingFieldsParam) {
@@ -349,6 +467,29 @@ TEST_F(HandlersTest, QueryWithFilter) {
     EXPECT_EQ(body["results"][0]["level"], "ERROR");
 }
 
+TEST_F(HandlersTest, IndexAdviceFromRecordedQueries) {
+    auto query = make_req(http::verb::get, "/logs?fields=*&limit=10&offset=0&service==api");
+    ASSERT_EQ(sync_await(handlers::HandleQuery(query, *ctx_)).result(), http::status::ok);
+
+    auto res = sync_await(handlers::HandleIndexAdvice(
+        make_req(http::verb::get, "/debug/index-advice"), *ctx_));
+    ASSERT_EQ(res.result(), http::status::ok);
+    auto body = nlohmann::json::parse(res.body());
+    EXPECT_EQ(body["table"], "TestLog");
+    ASSERT_EQ(body["shapes"].size(), 1u);
+    EXPECT_EQ(body["shapes"][0]["count"], 1);
+    EXPECT_EQ(body["suggestions"][0]["name"], "idx_TestLog_service");
+
+    auto yaml = sync_await(handlers::HandleIndexAdvice(
+        make_req(http::verb::get, "/debug/index-advice?format=migration"), *ctx_));
+    EXPECT_EQ(yaml[http::field::content_type], "application/yaml; charset=utf-8");
+    EXPECT_NE(yaml.body().find("version: 2"), std::string::npos);
+
+    auto bad = sync_await(handlers::HandleIndexAdvice(
+        make_req(http::verb::get, "/debug/index-advice?format=sql"), *ctx_));
+    EXPECT_EQ(bad.result(), http::status::bad_request);
+}
+
 TEST_F(HandlersTest, QueryNonNumericLimit) {
     auto req = make_req(http::verb::get, "/logs?fields=*&limit=abc&offset=0");
     auto res = sync_await(handlers::HandleQuery(req, *ctx_));
@@ -367,6 +508,79 @@ TEST_F(HandlersTest, QueryInvalidFilterExpression) {
     EXPECT_EQ(static_cast<int>(res.result()), 400);
 }
 
+TEST_F(HandlersTest, QueryRejectsInvalidBudgetParams) {
+    for (auto params : {"timeout_ms=0", "timeout_ms=abc", "max_scan_rows=-5"}) {
+        auto req = make_req(http::verb::get,
+                            fmt::format("/logs?fields=*&limit=10&offset=0&{}", params));
+        auto res = sync_await(handlers::HandleQuery(req, *ctx_));
+        EXPECT_EQ(static_cast<int>(res.result()), 400) << params;
+    }
+}
+
+TEST_F(HandlersTest, QueryKeysetPage) {
+    std::vector<nlohmann::json> logs;
+    for (int i = 0; i < 5; ++i) {
+        logs.push_back({{"timestamp", "2024-01-01T00:00:00Z"},
+                        {"message", fmt::format("m{}", i)},
+                        {"level", "INFO"}});
+    }
+    db_->Insert(logs);
+
+    auto req = make_req(http::verb::get, "/logs?fields=id&limit=2&offset=0&before_id=4");
+    auto res = sync_await(handlers::HandleQuery(req, *ctx_));
+    ASSERT_EQ(res.result(), http::status::ok);
+    auto body = nlohmann::json::parse(res.body());
+    EXPECT_EQ(body["total"], -1);
+    ASSERT_EQ(body["results"].size(), 2u);
+    EXPECT_EQ(body["results"][0]["id"], 3);
+
+    for (auto params : {"before_id=0", "before_id=x"}) {
+        req = make_req(http::verb::get, fmt::format("/logs?fields=*&limit=10&offset=0&{}", params));
+        res = sync_await(handlers::HandleQuery(req, *ctx_));
+        EXPECT_EQ(static_cast<int>(res.result()), 400) << params;
+    }
+}
+
+TEST_F(HandlersTest, ShardedQueryCapsOffsetAndAcceptsBeforeId) {
+    // A second shard over the same database is enough to switch to the merged path.
+    ctx_->config.shards.max_offset = 10;
+    ctx_->AddShard(*db_, *db_read_, *backlog_, asio::make_strand(db_ops_pool_->get_executor()));
+    ASSERT_TRUE(ctx_->Sharded());
+
+    auto req = make_req(http::verb::get, "/logs?fields=id&limit=5&offset=11");
+    auto res = sync_await(handlers::HandleQuery(req, *ctx_));
+    EXPECT_EQ(static_cast<int>(res.result()), 400);
+    EXPECT_NE(res.body().find("before_id"), std::string::npos);
+
+    for (auto target : {"/logs?fields=id&limit=5&offset=10",
+                        "/logs?fields=id&limit=5&offset=0&before_id=100"}) {
+        res = sync_await(handlers::HandleQuery(make_req(http::verb::get, target), *ctx_));
+        EXPECT_EQ(res.result(), http::status::ok) << target;
+    }
+}
+
+TEST_F(HandlersTest, QueryOverScanBudgetReturns400) {
+    std::vector<nlohmann::json> logs;
+    for (int i = 0; i < 2000; ++i) {
+        logs.push_back({{"timestamp", "2024-01-01T00:00:00Z"},
+                        {"message", fmt::format("m{}", i)},
+                        {"level", "INFO"}});
+    }
+    db_->Insert(logs);
+
+    auto req = make_req(http::verb::get,
+                        "/logs?fields=*&limit=10&offset=0&message=~=m1&max_scan_rows=100");
+    auto res = sync_await(handlers::HandleQuery(req, *ctx_));
+    EXPECT_EQ(static_cast<int>(res.result()), 400);
+    EXPECT_TRUE(nlohmann::json::parse(res.body())["error"].get<std::string>().contains("scan"));
+
+    // Without the limit (and with a generous deadline) the same query succeeds.
+    req = make_req(http::verb::get,
+                   "/logs?fields=*&limit=10&offset=0&message=~=m1&timeout_ms=10000");
+    res = sync_await(handlers::HandleQuery(req, *ctx_));
+    EXPECT_EQ(res.result(), http::status::ok);
+}
+
 TEST_F(HandlersTest, QuerySpecificFields) {
     nlohmann::json log1{
         {"timestamp", "2024-01-01T00:00:00Z"}, {"message", "hello"}, {"level", "INFO"}};
@@ -414,6 +628,72 @@ TEST_F(HandlersTest, QueryPagination) {
     EXPECT_EQ(body["results"].size(), 2u);
 }
 
+TEST_F(HandlersTest, QueryMsgPackReturnsColumns) {
+    db_->Insert({
+        {{"timestamp", "2024-01-01T00:00:00Z"}, {"message", "a"}, {"level", "INFO"}},
+        {{"timestamp", "2024-01-01T00:00:01Z"}, {"message", "b"}, {"level", "ERROR"}},
+    });
+
+    auto req = make_req(http::verb::get, "/logs?fields=id,message,service&limit=10&offset=0");
+    req.set(http::field::accept, "application/msgpack");
+    auto res = sync_await(handlers::HandleQuery(req, *ctx_));
+    EXPECT_EQ(res.result(), http::status::ok);
+    EXPECT_EQ(res[http::field::content_type], "application/msgpack");
+
+    auto body = nlohmann::json::from_msgpack(res.body());
+    EXPECT_EQ(body["total"], 2);
+    EXPECT_EQ(body["rows"], 2);
+    ASSERT_EQ(body["columns"].size(), 3u);
+
+    const auto& id = body["columns"][0];
+    EXPECT_EQ(id["name"], "id");
+    EXPECT_EQ(id["type"], "int64");
+    EXPECT_TRUE(id["validity"].is_null());
+    EXPECT_EQ(id["data"].get_binary().size(), 16u);
+
+    const auto& message = body["columns"][1];
+    EXPECT_EQ(message["type"], "utf8");
+    const auto& text = message["data"].get_binary();
+    EXPECT_EQ(std::string(text.begin(), text.end()), "ba");  // newest first
+    EXPECT_EQ(message["offsets"].get_binary().size(), 3 * sizeof(int32_t));
+
+    const auto& service = body["columns"][2];
+    EXPECT_EQ(service["type"], "null");
+    EXPECT_EQ(service["validity"].get_binary(), (std::vector<uint8_t>{0, 0}));
+}
+
+// ── Snapshot handlers ───────────────────────────────────────────────────────
+
+TEST_F(HandlersTest, SnapshotCreateRunsToCompletion) {
+    cfg_.snapshot_dir = tmp_ / "snapshots";
+    db_->Insert({{{"timestamp", "2024-01-01T00:00:00Z"}, {"message", "a"}, {"level", "INFO"}}});
+
+    auto req = make_req(http::verb::post, "/admin/snapshot");
+    auto res = sync_await(handlers::HandleSnapshotCreate(req, *ctx_));
+    EXPECT_EQ(res.result(), http::status::accepted);
+    EXPECT_EQ(nlohmann::json::parse(res.body())["snapshot"]["state"], "running");
+
+    // sync_await drains the io_context, so the spawned snapshot task has finished.
+    auto status = sync_await(
+        handlers::HandleSnapshotStatus(make_req(http::verb::get, "/admin/snapshot"), *ctx_));
+    auto body = nlohmann::json::parse(status.body())["snapshot"];
+    EXPECT_EQ(body["state"], "done");
+    EXPECT_EQ(body["remaining"], 0);
+    EXPECT_GT(body["size_bytes"].get<int64_t>(), 0);
+    EXPECT_TRUE(fs::exists(body["file"].get<std::string>()));
+    EXPECT_EQ(LatestSnapshot(cfg_.snapshot_dir), fs::path(body["file"].get<std::string>()));
+}
+
+TEST_F(HandlersTest, SnapshotCreateConflictsWhileRunning) {
+    cfg_.snapshot_dir = tmp_ / "snapshots";
+    ASSERT_TRUE(ctx_->snapshot.TryStart(tmp_ / "snapshots" / "in-progress.db"));
+
+    auto req = make_req(http::verb::post, "/admin/snapshot");
+    auto res = sync_await(handlers::HandleSnapshotCreate(req, *ctx_));
+    EXPECT_EQ(res.result(), http::status::conflict);
+    EXPECT_EQ(nlohmann::json::parse(res.body())["snapshot"]["state"], "running");
+}
+
 // ── Response helpers ────────────────────────────────────────────────────────
 
 TEST(ResponseHelperTest, MakeFailResp) {
@@ -0,0 +1,190 @@
+#include <gtest/gtest.h>
+
+#include "config.hpp"
+#include "index_advisor.hpp"
+#include "reader_database.hpp"
+#include "writer_database.hpp"
+
+#include <filesystem>
+#include <fmt/format.h>
+#include <yaml-cpp/yaml.h>
+
+namespace fs = std::filesystem;
+using namespace loglite;
+
+// ── FilterWorkload ────────────────────────────────────────────────────────────
+
+TEST(FilterWorkloadTest, GroupsByFieldAndOperatorClass) {
+    FilterWorkload wl;
+    wl.Record({{"level", "=", "ERROR"}, {"timestamp", ">=", "2024-01-01"}}, 4.0);
+    wl.Record({{"timestamp", "<", "2024-02-01"}, {"level", "=", "WARNING"}}, 6.0);
+    wl.Record({{"message", "~=", "timeout"}}, 1.0);
+    wl.Record({}, 100.0);  // unfiltered queries are not recorded
+
+    auto shapes = wl.Snapshot();
+    ASSERT_EQ(shapes.size(), 2u);
+    EXPECT_EQ(shapes[0].Key(), "level =, timestamp range");
+    EXPECT_EQ(shapes[0].count, 2);
+    EXPECT_DOUBLE_EQ(shapes[0].total_ms, 10.0);
+    EXPECT_DOUBLE_EQ(shapes[0].max_ms, 6.0);
+    EXPECT_EQ(shapes[0].eq_values.at("level").size(), 2u);
+    EXPECT_EQ(shapes[0].sample[0].value, "2024-02-01");
+    EXPECT_EQ(shapes[1].Key(), "message ~=");
+}
+
+TEST(FilterWorkloadTest, CountsScannedRowsAndInterruptedQueries) {
+    FilterWorkload wl;
+    wl.Record({{"message", "~=", "timeout"}}, 2.0, 1000);
+    wl.Record({{"message", "~=", "refused"}}, 30.0, 50000, true);
+
+    auto shapes = wl.Snapshot();
+    ASSERT_EQ(shapes.size(), 1u);
+    EXPECT_EQ(shapes[0].count, 2);
+    EXPECT_EQ(shapes[0].scanned_rows, 51000);
+    EXPECT_EQ(shapes[0].interrupted, 1);
+    EXPECT_DOUBLE_EQ(shapes[0].max_ms, 30.0);
+}
+
+TEST(FilterWorkloadTest, CapsShapesAndValues) {
+    FilterWorkload wl;
+    for (std::size_t i = 0; i <= FilterWorkload::kMaxValuesPerField; ++i)
+        wl.Record({{"service", "=", fmt::format("s{}", i)}}, 1.0);
+    auto shape = wl.Snapshot().at(0);
+    EXPECT_TRUE(shape.eq_values.at("service").empty());
+    EXPECT_TRUE(shape.eq_overflow.at("service"));
+
+    for (std::size_t i = 0; i < FilterWorkload::kMaxShapes + 5; ++i)
+        wl.Record({{fmt::format("f{}", i), "=", "x"}}, 1.0);
+    EXPECT_EQ(wl.Snapshot().size(), FilterWorkload::kMaxShapes);
+    EXPECT_EQ(wl.Dropped(), 6);
+}
+
+// ── AdviseIndexes ─────────────────────────────────────────────────────────────
+
+class IndexAdvisorTest : public ::testing::Test {
+   protected:
+    void SetUp() override {
+        tmp_ = fs::temp_directory_path() / "loglite_index_advisor_test";
+        fs::remove_all(tmp_);
+        fs::create_directories(tmp_);
+
+        cfg_.sqlite_dir = tmp_;
+        cfg_.db_path = tmp_ / "logs.db";
+        cfg_.log_table_name = "TestLog";
+        cfg_.auto_rollout = true;
+        cfg_.compression = {false, {}};
+
+        Migration m;
+        m.version = 1;
+        m.rollout = {
+            "CREATE TABLE IF NOT EXISTS TestLog ("
+            "  id        INTEGER PRIMARY KEY,"
+            "  timestamp TEXT    NOT NULL,"
+            "  message   TEXT    NOT NULL,"
+            "  level     TEXT    NOT NULL,"
+            "  service   TEXT,"
+            "  extra     JSON"
+            ")",
+            "CREATE INDEX IF NOT EXISTS idx_timestamp ON TestLog(timestamp)"};
+        m.rollback = {"DROP TABLE IF EXISTS TestLog"};
+        cfg_.migrations.push_back(m);
+
+        db_ = std::make_unique<WriterDatabase>(cfg_);
+        db_->Open();
+        db_->Initialize();
+        reader_ = std::make_unique<ReaderDatabase>(cfg_, db_->catalog());
+        reader_->Open();
+    }
+
+    void TearDown() override {
+        reader_.reset();
+        db_.reset();
+        fs::remove_all(tmp_);
+    }
+
+    void exec(const std::string& sql) {
+        sqlite3* raw{};
+        sqlite3_open(cfg_.db_path.string().c_str(), &raw);
+        ASSERT_EQ(sqlite3_exec(raw, sql.c_str(), nullptr, nullptr, nullptr), SQLITE_OK) << sql;
+        sqlite3_close(raw);
+    }
+
+    fs::path tmp_;
+    Config cfg_;
+    std::unique_ptr<WriterDatabase> db_;
+    std::unique_ptr<ReaderDatabase> reader_;
+};
+
+TEST_F(IndexAdvisorTest, ListsExistingIndexes) {
+    auto indexes = reader_->ListLogIndexes();
+    ASSERT_EQ(indexes.size(), 1u);
+    EXPECT_EQ(indexes[0].name, "idx_timestamp");
+    EXPECT_EQ(indexes[0].columns, std::vector<std::string>{"timestamp"});
+    EXPECT_FALSE(indexes[0].partial);
+    EXPECT_NE(indexes[0].sql.find("CREATE INDEX"), std::string::npos);
+}
+
+TEST_F(IndexAdvisorTest, ProposesCompositeAndPartialIndexForScans) {
+    FilterWorkload wl;
+    for (int i = 0; i < 3; ++i)
+        wl.Record({{"level", "=", "ERROR"}, {"service", "=", fmt::format("svc{}", i)}}, 2.0);
+
+    auto advice = AdviseIndexes(*reader_, cfg_, wl.Snapshot());
+    ASSERT_EQ(advice.shapes.size(), 1u);
+    EXPECT_FALSE(advice.shapes[0]["uses_index"].get<bool>());
+    ASSERT_EQ(advice.suggestions.size(), 2u);
+
+    const auto& full = advice.suggestions[0];
+    EXPECT_EQ(full.kind, "index");
+    EXPECT_EQ(full.create_sql,
+              "CREATE INDEX IF NOT EXISTS idx_TestLog_level_service ON TestLog(level, service)");
+    EXPECT_EQ(full.queries, 3);
+
+    const auto& partial = advice.suggestions[1];
+    EXPECT_EQ(partial.kind, "partial");
+    EXPECT_EQ(partial.create_sql,
+              "CREATE INDEX IF NOT EXISTS idx_TestLog_service_where_level ON TestLog(service) "
+              "WHERE level = 'ERROR'");
+
+    // The partial index alone serves `level = ? AND service = ?` with bound values.
+    exec(partial.create_sql);
+    auto after = AdviseIndexes(*reader_, cfg_, wl.Snapshot());
+    EXPECT_TRUE(after.shapes[0]["uses_index"].get<bool>()) << after.shapes[0]["plan"].dump();
+    EXPECT_TRUE(after.suggestions.empty());
+}
+
+TEST_F(IndexAdvisorTest, RangeOnIndexedTimestampNeedsNoAdvice) {
+    FilterWorkload wl;
+    wl.Record({{"timestamp", ">=", "2024-01-01"}, {"timestamp", "<", "2024-01-02"}}, 1.0);
+    auto advice = AdviseIndexes(*reader_, cfg_, wl.Snapshot());
+    EXPECT_TRUE(advice.shapes[0]["uses_index"].get<bool>());
+    EXPECT_TRUE(advice.suggestions.empty());
+}
+
+TEST_F(IndexAdvisorTest, UnindexableFiltersBecomeNotes) {
+    FilterWorkload wl;
+    wl.Record({{"message", "~=", "timeout"}, {"extra.user", "=", "alice"}}, 1.0);
+    auto advice = AdviseIndexes(*reader_, cfg_, wl.Snapshot());
+    ASSERT_EQ(advice.shapes.size(), 1u);
+    EXPECT_TRUE(advice.suggestions.empty());
+    auto notes = advice.shapes[0]["notes"].dump();
+    EXPECT_NE(notes.find("substring filters"), std::string::npos);
+    EXPECT_NE(notes.find("json_fields"), std::string::npos);
+}
+
+TEST_F(IndexAdvisorTest, MigrationBlockIsValidYaml) {
+    FilterWorkload wl;
+    wl.Record({{"service", "=", "api"}}, 1.0);
+    auto advice = AdviseIndexes(*reader_, cfg_, wl.Snapshot());
+
+    auto doc = YAML::Load(advice.ToMigrationYAML(2));
+    const auto& mg = doc["migrations"][0];
+    EXPECT_EQ(mg["version"].as<int>(), 2);
+    // The partial alternative is only a comment.
+    ASSERT_EQ(mg["rollout"].size(), 1u);
+    EXPECT_EQ(mg["rollout"][0].as<std::string>(),
+              "CREATE INDEX IF NOT EXISTS idx_TestLog_service ON TestLog(service)");
+    EXPECT_EQ(mg["rollback"][0].as<std::string>(), "DROP INDEX IF EXISTS idx_TestLog_service");
+
+    EXPECT_EQ(IndexAdvice{}.ToMigrationYAML(2).rfind("# No index suggestions", 0), 0u);
+}
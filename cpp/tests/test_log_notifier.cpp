@@ -56,6 +56,17 @@ TEST_F(LogNotifierTest, NotifyUpdatesLastId) {
     EXPECT_EQ(notifier.GetLastId(), 100);
 }
 
+TEST_F(LogNotifierTest, TracksLastIdPerShard) {
+    LogNotifier notifier{3};
+    EXPECT_EQ(notifier.Shards(), 3u);
+
+    notifier.Notify(7, 1);
+    notifier.Notify(5, 2);
+    EXPECT_EQ(notifier.GetLastId(0), 0);
+    EXPECT_EQ(notifier.GetLastId(1), 7);
+    EXPECT_EQ(notifier.GetLastId(2), 5);
+}
+
 TEST_F(LogNotifierTest, NotifyWithoutSubscribersDoesNotCrash) {
     LogNotifier notifier;
     EXPECT_NO_THROW(notifier.Notify(1));
@@ -0,0 +1,161 @@
+#include <gtest/gtest.h>
+
+#include "config.hpp"
+#include "query_budget.hpp"
+#include "reader_database.hpp"
+#include "writer_database.hpp"
+#include "types.hpp"
+
+#include <chrono>
+#include <filesystem>
+#include <fmt/format.h>
+#include <thread>
+#include <vector>
+
+namespace fs = std::filesystem;
+using namespace loglite;
+using namespace std::chrono_literals;
+
+// ── QueryBudget ───────────────────────────────────────────────────────────────
+
+TEST(QueryBudgetTest, UnlimitedBudgetNeverTrips) {
+    QueryBudget budget{0ms, 0};
+    EXPECT_EQ(budget.Check(1'000'000), BudgetExceeded::kNone);
+    EXPECT_EQ(budget.ScannedRows(), 1'000'000);
+}
+
+TEST(QueryBudgetTest, ScanLimitIsSticky) {
+    QueryBudget budget{0ms, 100};
+    EXPECT_EQ(budget.Check(60), BudgetExceeded::kNone);
+    EXPECT_EQ(budget.Check(60), BudgetExceeded::kScanLimit);
+    budget.Cancel();
+    EXPECT_EQ(budget.Check(), BudgetExceeded::kScanLimit) << "the first reason is kept";
+}
+
+TEST(QueryBudgetTest, DeadlineAndCancel) {
+    QueryBudget timed{1ms, 0};
+    std::this_thread::sleep_for(5ms);
+    EXPECT_EQ(timed.Check(), BudgetExceeded::kTimeout);
+    EXPECT_STREQ(QueryInterrupted{timed}.what(), "Query exceeded its time budget of 1 ms");
+
+    QueryBudget cancelled{0ms, 0};
+    cancelled.Cancel();
+    EXPECT_TRUE(cancelled.Cancelled());
+    EXPECT_EQ(cancelled.Check(), BudgetExceeded::kCancelled);
+    EXPECT_EQ(QueryInterrupted{cancelled}.Reason(), BudgetExceeded::kCancelled);
+}
+
+// ── ReaderDatabase::ScopedBudget ──────────────────────────────────────────────
+
+class ScopedBudgetTest : public ::testing::Test {
+   protected:
+    static constexpr int kRows = 5000;
+
+    void SetUp() override {
+        tmp_ = fs::temp_directory_path() / "loglite_query_budget_test";
+        fs::remove_all(tmp_);
+        fs::create_directories(tmp_);
+
+        cfg_.sqlite_dir = tmp_;
+        cfg_.db_path = tmp_ / "logs.db";
+        cfg_.log_table_name = "TestLog";
+        cfg_.log_timestamp_field = "timestamp";
+        cfg_.auto_rollout = true;
+        cfg_.compression = {false, {}};
+
+        Migration m;
+        m.version = 1;
+        m.rollout = {
+            "CREATE TABLE IF NOT EXISTS TestLog ("
+            "  id        INTEGER PRIMARY KEY,"
+            "  timestamp TEXT    NOT NULL,"
+            "  message   TEXT    NOT NULL,"
+            "  level     TEXT    NOT NULL"
+            ")"};
+        m.rollback = {"DROP TABLE IF EXISTS TestLog"};
+        cfg_.migrations.push_back(m);
+
+        writer_ = std::make_unique<WriterDatabase>(cfg_);
+        writer_->Open();
+        writer_->Initialize();
+
+        std::vector<nlohmann::json> logs;
+        for (int i = 0; i < kRows; ++i) {
+            logs.push_back({{"timestamp", "2026-01-01T00:00:00Z"},
+                            {"message", fmt::format("request {} done", i)},
+                            {"level", "INFO"}});
+        }
+        writer_->Insert(logs);
+
+        reader_ = std::make_unique<ReaderDatabase>(cfg_, writer_->catalog());
+        reader_->Open();
+    }
+
+    void TearDown() override {
+        reader_->Close();
+        writer_->Close();
+        fs::remove_all(tmp_);
+    }
+
+    // Unindexed substring match: a full scan of the table.
+    const std::vector<QueryFilter> scan_filters_{{"message", "~=", "done"}};
+
+    fs::path tmp_;
+    Config cfg_;
+    std::unique_ptr<WriterDatabase> writer_;
+    std::unique_ptr<ReaderDatabase> reader_;
+};
+
+TEST_F(ScopedBudgetTest, ScanLimitInterruptsFullScans) {
+    QueryBudget budget{0ms, 100};
+    ReaderDatabase::ScopedBudget scope{*reader_, budget};
+    try {
+        reader_->Query({"*"}, scan_filters_, 10, 0);
+        FAIL() << "expected QueryInterrupted";
+    } catch (const QueryInterrupted& e) {
+        EXPECT_EQ(e.Reason(), BudgetExceeded::kScanLimit);
+        EXPECT_GT(budget.ScannedRows(), 100);
+    }
+}
+
+TEST_F(ScopedBudgetTest, DeadlineAndCancelInterruptQueries) {
+    {
+        QueryBudget budget{1ms, 0};
+        std::this_thread::sleep_for(5ms);
+        ReaderDatabase::ScopedBudget scope{*reader_, budget};
+        try {
+            reader_->QueryColumns({"*"}, scan_filters_, 10, 0);
+            FAIL() << "expected QueryInterrupted";
+        } catch (const QueryInterrupted& e) {
+            EXPECT_EQ(e.Reason(), BudgetExceeded::kTimeout);
+        }
+    }
+    {
+        QueryBudget budget{0ms, 0};
+        budget.Cancel();
+        ReaderDatabase::ScopedBudget scope{*reader_, budget};
+        try {
+            reader_->Query({"*"}, scan_filters_, 10, 0);
+            FAIL() << "expected QueryInterrupted";
+        } catch (const QueryInterrupted& e) {
+            EXPECT_EQ(e.Reason(), BudgetExceeded::kCancelled);
+        }
+    }
+}
+
+TEST_F(ScopedBudgetTest, WithinBudgetAndAfterScopeQueriesRun) {
+    {
+        QueryBudget budget{30s, kRows * 2};
+        ReaderDatabase::ScopedBudget scope{*reader_, budget};
+        EXPECT_EQ(reader_->Query({"*"}, scan_filters_, 10, 0).total, kRows);
+        EXPECT_EQ(budget.Exceeded(), BudgetExceeded::kNone);
+    }
+
+    // The connection is reused without a budget once the scope ends.
+    {
+        QueryBudget budget{0ms, 1};
+        ReaderDatabase::ScopedBudget scope{*reader_, budget};
+        EXPECT_THROW(reader_->Query({"*"}, scan_filters_, 10, 0), QueryInterrupted);
+    }
+    EXPECT_EQ(reader_->Query({"*"}, scan_filters_, 10, 0).total, kRows);
+}
@@ -41,6 +41,22 @@ TEST(FilterParseTest, EmptyExpressionReturnsEmpty) {
     EXPECT_TRUE(filters.empty());
 }
 
+// ── JSON-path fields ──────────────────────────────────────────────────────────
+
+TEST(JsonFieldPathTest, ParsesColumnAndKeys) {
+    auto path = JsonFieldPath::Parse("extra.http.status");
+    ASSERT_TRUE(path);
+    EXPECT_EQ(path->column, "extra");
+    EXPECT_EQ(path->keys, (std::vector<std::string>{"http", "status"}));
+    EXPECT_EQ(path->JsonPath(), "$.http.status");
+    EXPECT_EQ(path->GeneratedColumn(), "extra__http__status");
+}
+
+TEST(JsonFieldPathTest, RejectsPlainAndUnsafeNames) {
+    for (auto bad : {"level", "extra.", ".id", "extra..id", "extra.a-b", "extra.id'--", ""})
+        EXPECT_FALSE(JsonFieldPath::Parse(bad)) << bad;
+}
+
 // ── Query-string parsing ──────────────────────────────────────────────────────
 
 TEST(QueryStringTest, BasicParsing) {
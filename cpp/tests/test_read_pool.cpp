@@ -8,6 +8,7 @@
 #include <barrier>
 #include <filesystem>
 #include <fmt/format.h>
+#include <future>
 #include <thread>
 #include <vector>
 
@@ -84,3 +85,40 @@ TEST(ReadDatabasePoolTest, ConcurrentReadsAndWriterInserts) {
     writer.Close();
     fs::remove_all(tmp);
 }
+
+TEST(ReadDatabasePoolTest, PriorityLaneRunsWhilePoolIsBusy) {
+    auto tmp = fs::temp_directory_path() / "loglite_read_pool_priority_test";
+    fs::remove_all(tmp);
+    fs::create_directories(tmp);
+
+    auto cfg = make_cfg(tmp);
+    WriterDatabase writer{cfg};
+    writer.Open();
+    writer.Initialize();
+
+    ReadDatabasePool pool{cfg, writer.catalog(), 1};
+    std::promise<void> release;
+    std::promise<void> leased;
+    std::thread holder{[&] {
+        pool.UseConnection([&](ReaderDatabase&) {
+            leased.set_value();
+            release.get_future().wait();
+        });
+    }};
+    leased.get_future().wait();
+
+    // The only pooled connection is leased; the priority lane still answers.
+    asio::io_context ioc;
+    auto fut = asio::co_spawn(
+        ioc, pool.AsyncUsePriorityConnection([](ReaderDatabase& r) { return r.Ping(); }),
+        asio::use_future);
+    ioc.run();
+    EXPECT_TRUE(fut.get());
+    EXPECT_EQ(pool.InUse(), 1u);
+
+    release.set_value();
+    holder.join();
+    pool.Close();
+    writer.Close();
+    fs::remove_all(tmp);
+}
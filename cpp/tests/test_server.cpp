@@ -13,7 +13,9 @@
 #include <filesystem>
 #include <fmt/format.h>
 #include <fstream>
+#include <future>
 #include <thread>
+#include <zstd.h>
 
 namespace fs = std::filesystem;
 namespace asio = boost::asio;
@@ -133,6 +135,7 @@ class ServerTest : public ::testing::Test {
 
         db_ops_pool_ = std::make_unique<asio::thread_pool>(1u);
         reader_pool_ = std::make_unique<asio::thread_pool>(2u);
+        encode_pool_ = std::make_unique<asio::thread_pool>(1u);
 
         backlog_ = std::make_unique<Backlog>(200);
         notifier_ = std::make_unique<LogNotifier>();
@@ -142,7 +145,8 @@ class ServerTest : public ::testing::Test {
 
         ctx_ = std::make_unique<ServerContext>(cfg_, *db_, *db_read_, *backlog_, *notifier_,
                                                asio::make_strand(db_ops_pool_->get_executor()),
-                                               reader_pool_->get_executor());
+                                               reader_pool_->get_executor(),
+                                               encode_pool_->get_executor());
 
         server_ = std::make_unique<Server>(*ctx_);
 
@@ -178,6 +182,11 @@ class ServerTest : public ::testing::Test {
             reader_pool_->join();
             reader_pool_.reset();
         }
+        if (encode_pool_) {
+            encode_pool_->stop();
+            encode_pool_->join();
+            encode_pool_.reset();
+        }
 
         db_->Close();
         db_.reset();
@@ -193,6 +202,7 @@ class ServerTest : public ::testing::Test {
     std::unique_ptr<ServerContext> ctx_;
     std::unique_ptr<asio::thread_pool> db_ops_pool_;
     std::unique_ptr<asio::thread_pool> reader_pool_;
+    std::unique_ptr<asio::thread_pool> encode_pool_;
     std::unique_ptr<Server> server_;
     std::thread server_thread_;
 };
@@ -412,6 +422,9 @@ TEST_F(ServerTest, StatsWithValidParamsReturnsOk) {
     EXPECT_TRUE(body["database"].contains("data"));
     EXPECT_TRUE(body.contains("uptime"));
     EXPECT_GE(body["uptime"].get<int64_t>(), 0);
+    ASSERT_TRUE(body.contains("flush"));
+    EXPECT_GE(body["flush"]["batch_size"].get<int64_t>(), 1);
+    EXPECT_EQ(body["flush"]["max_batch"], cfg_.task_backlog_max_batch);
 }
 
 TEST_F(ServerTest, StatsWithPopulatedData) {
@@ -450,6 +463,32 @@ TEST_F(ServerTest, StatsWindowExceedsOneDay) {
     EXPECT_EQ(static_cast<int>(res.result()), 400);
 }
 
+TEST_F(ServerTest, StatsLongWindowNeedsPointBudget) {
+    auto url =
+        "/stats?since=2024-01-01T00:00:00Z&until=2024-01-08T00:00:00Z"
+        "&activity_stats_fields=*&database_stats_fields=*&max_points=500";
+    auto res = http_req("127.0.0.1", 17788, http::verb::get, url);
+    ASSERT_EQ(res.result(), http::status::ok) << res.body();
+    auto body = nlohmann::json::parse(res.body());
+    // 7 days in 500 points: the 15-minute tier (672 points) is too fine.
+    EXPECT_EQ(body["activities"]["resolution"], 3600);
+    EXPECT_EQ(body["database"]["resolution"], 3600);
+
+    for (auto bad : {"&max_points=0", "&max_points=abc"}) {
+        auto r = http_req("127.0.0.1", 17788, http::verb::get,
+                          fmt::format("/stats?since=2024-01-01T00:00:00Z&until=2024-01-01T01:00:00Z"
+                                      "&activity_stats_fields=*&database_stats_fields=*{}",
+                                      bad));
+        EXPECT_EQ(static_cast<int>(r.result()), 400) << bad;
+    }
+
+    auto too_long =
+        "/stats?since=2023-01-01T00:00:00Z&until=2024-01-01T00:00:00Z"
+        "&activity_stats_fields=*&database_stats_fields=*&max_points=500";
+    EXPECT_EQ(static_cast<int>(http_req("127.0.0.1", 17788, http::verb::get, too_long).result()),
+              400);
+}
+
 TEST_F(ServerTest, StatsUntilBeforeSince) {
     auto url = fmt::format(
         "/stats?since=2024-01-02T00:00:00Z&until=2024-01-01T00:00:00Z"
@@ -564,16 +603,18 @@ TEST_F(ServerTest, MultipleRequestsSequentially) {
                          "application/json");
     EXPECT_EQ(res2.result(), http::status::ok);
 
-    // Query (data was inserted via backlog, need to flush)
-    // Insert directly for the test
-    db_->Insert(
-        {{{"timestamp", "2024-01-01T00:00:00Z"}, {"message", "direct"}, {"level", "INFO"}}});
-
-    auto res3 = http_req("127.0.0.1", 17788, http::verb::get, "/logs?fields=*&limit=10&offset=0");
-    EXPECT_EQ(res3.result(), http::status::ok);
-
-    auto body = nlohmann::json::parse(res3.body());
+    // The backlog wakes the flush task as soon as the entry arrives.
+    nlohmann::json body;
+    for (int i = 0; i < 50; ++i) {
+        auto res3 =
+            http_req("127.0.0.1", 17788, http::verb::get, "/logs?fields=*&limit=10&offset=0");
+        ASSERT_EQ(res3.result(), http::status::ok);
+        body = nlohmann::json::parse(res3.body());
+        if (body["total"] >= 1) break;
+        std::this_thread::sleep_for(std::chrono::milliseconds(20));
+    }
     EXPECT_GE(body["total"], 1);
+    EXPECT_EQ(body["results"][0]["message"], "multi");
 }
 
 // ── SSE headers ────────────────────────────────────────────────────────────
@@ -626,6 +667,52 @@ TEST_F(ServerTest, SSEWithFieldsParam) {
     socket.shutdown(tcp::socket::shutdown_both, ec);
 }
 
+TEST_F(ServerTest, SSERejectsInvalidFilterBeforeStreaming) {
+    auto res = http_req("127.0.0.1", 17788, http::verb::get, "/logs/sse?fields=*&nope=ERROR");
+    EXPECT_EQ(res.result(), http::status::bad_request);
+
+    res = http_req("127.0.0.1", 17788, http::verb::get, "/logs/sse?fields=*&missing=%3DERROR");
+    EXPECT_EQ(res.result(), http::status::bad_request);
+    EXPECT_NE(res.body().find("Unknown field name"), std::string::npos);
+}
+
+// ── Snapshot endpoints ──────────────────────────────────────────────────────
+
+TEST_F(ServerTest, SnapshotCreatePollAndDownload) {
+    cfg_.snapshot_dir = tmp_ / "snapshots";
+
+    auto missing = http_req("127.0.0.1", 17788, http::verb::get, "/admin/snapshot/download");
+    EXPECT_EQ(static_cast<int>(missing.result()), 404);
+
+    auto res = http_req("127.0.0.1", 17788, http::verb::post, "/admin/snapshot");
+    EXPECT_EQ(static_cast<int>(res.result()), 202);
+
+    nlohmann::json status;
+    for (int i = 0; i < 50; ++i) {
+        auto poll = http_req("127.0.0.1", 17788, http::verb::get, "/admin/snapshot");
+        status = nlohmann::json::parse(poll.body())["snapshot"];
+        if (status["state"] != "running") break;
+        std::this_thread::sleep_for(std::chrono::milliseconds(20));
+    }
+    ASSERT_EQ(status["state"], "done");
+    const auto size = status["size_bytes"].get<std::size_t>();
+
+    auto plain = http_req("127.0.0.1", 17788, http::verb::get, "/admin/snapshot/download");
+    EXPECT_EQ(plain.result(), http::status::ok);
+    EXPECT_EQ(plain[http::field::content_type], "application/vnd.sqlite3");
+    EXPECT_EQ(plain.body().size(), size);
+    EXPECT_EQ(plain.body().substr(0, 15), "SQLite format 3");
+
+    auto zst = http_req("127.0.0.1", 17788, http::verb::get,
+                        "/admin/snapshot/download?compress=zstd");
+    EXPECT_EQ(zst[http::field::content_type], "application/zstd");
+    std::string restored(size, '\0');
+    auto n = ZSTD_decompress(restored.data(), restored.size(), zst.body().data(),
+                             zst.body().size());
+    ASSERT_FALSE(ZSTD_isError(n));
+    EXPECT_EQ(restored, plain.body());
+}
+
 // ── Handle connection error ─────────────────────────────────────────────────
 
 TEST_F(ServerTest, ImmediateDisconnectIsHandled) {
@@ -640,3 +727,99 @@ TEST_F(ServerTest, ImmediateDisconnectIsHandled) {
     // No crash expected — server handles this gracefully
     SUCCEED();
 }
+
+TEST_F(ServerTest, ClosingTheSocketCancelsARunningQuery) {
+    std::vector<nlohmann::json> logs;
+    for (int i = 0; i < 5000; ++i)
+        logs.push_back({{"timestamp", "2024-01-01T00:00:00Z"},
+                        {"message", fmt::format("entry {}", i)},
+                        {"level", "INFO"}});
+    db_->Insert(logs);
+
+    // Hold every pooled reader so the query stays queued until the client is gone.
+    std::promise<void> release;
+    auto released = release.get_future().share();
+    std::vector<std::thread> holders;
+    for (int i = 0; i < 2; ++i)
+        holders.emplace_back([&] { db_read_->UseConnection([&](auto&) { released.wait(); }); });
+    while (db_read_->InUse() < 2) std::this_thread::sleep_for(std::chrono::milliseconds(5));
+
+    asio::io_context ioc;
+    tcp::socket socket{ioc};
+    asio::connect(socket, tcp::resolver{ioc}.resolve("127.0.0.1", "17788"));
+    http::request<http::string_body> req{
+        http::verb::get, "/logs?fields=*&limit=10&offset=0&message=~=entry", 11};
+    req.set(http::field::host, "127.0.0.1");
+    http::write(socket, req);
+    std::this_thread::sleep_for(std::chrono::milliseconds(200));
+
+    // A client giving up closes its socket normally, with a FIN rather than a reset.
+    socket.close();
+    std::this_thread::sleep_for(std::chrono::milliseconds(200));
+    release.set_value();
+    for (auto& t : holders) t.join();
+
+    std::vector<FilterShapeStats> shapes;
+    for (int i = 0; i < 100; ++i) {
+        shapes = ctx_->workload.Snapshot();
+        if (!shapes.empty() && db_read_->InUse() == 0) break;
+        std::this_thread::sleep_for(std::chrono::milliseconds(20));
+    }
+    ASSERT_EQ(shapes.size(), 1u);
+    EXPECT_EQ(shapes[0].count, 1);
+    EXPECT_EQ(shapes[0].interrupted, 1);
+    EXPECT_EQ(db_read_->InUse(), 0u);
+}
+
+// ── Streaming NDJSON ingest ─────────────────────────────────────────────────
+
+TEST_F(ServerTest, LogStreamIngestsChunkedNdjson) {
+    asio::io_context ioc;
+    tcp::socket socket{ioc};
+    asio::connect(socket, tcp::resolver{ioc}.resolve("127.0.0.1", "17788"));
+
+    std::string head =
+        "POST /logs/stream HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+        "Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n";
+    asio::write(socket, asio::buffer(head));
+
+    // Lines are split across chunks; one line is not an object.
+    auto send_chunk = [&](std::string_view data) {
+        auto framed = fmt::format("{:x}\r\n{}\r\n", data.size(), data);
+        asio::write(socket, asio::buffer(framed));
+    };
+    send_chunk(R"({"timestamp":"2024-01-01T00:00:00Z","message":"s1","level":"INFO"})" "\n"
+               R"({"timestamp":"2024-01-01T00:00:00Z","mess)");
+    send_chunk(R"(age":"s2","level":"INFO"})" "\n[1,2]\n");
+    send_chunk(R"({"timestamp":"2024-01-01T00:00:00Z","message":"s3","level":"INFO"})");
+    asio::write(socket, asio::buffer(std::string_view{"0\r\n\r\n"}));
+
+    beast::flat_buffer buf;
+    http::response<http::string_body> res;
+    http::read(socket, buf, res);
+    EXPECT_EQ(res.result(), http::status::ok);
+    EXPECT_EQ(res[http::field::content_type], "application/x-ndjson");
+
+    auto body = res.body();
+    auto last = body.substr(body.rfind('\n', body.size() - 2) + 1);
+    auto ack = nlohmann::json::parse(last);
+    EXPECT_EQ(ack["accepted"], 3);
+    EXPECT_EQ(ack["rejected"], 1);
+    EXPECT_EQ(ack["last_rejection"], "line 3: must be a JSON object");
+    EXPECT_TRUE(ack["done"].get<bool>());
+
+    nlohmann::json logs;
+    for (int i = 0; i < 50; ++i) {
+        auto q = http_req("127.0.0.1", 17788, http::verb::get, "/logs?fields=*&limit=10&offset=0");
+        logs = nlohmann::json::parse(q.body());
+        if (logs["total"] >= 3) break;
+        std::this_thread::sleep_for(std::chrono::milliseconds(20));
+    }
+    EXPECT_EQ(logs["total"], 3);
+}
+
+TEST_F(ServerTest, LogStreamRejectsWrongContentType) {
+    auto res = http_req("127.0.0.1", 17788, http::verb::post, "/logs/stream", R"({"a":1})",
+                        "application/json");
+    EXPECT_EQ(res.result(), http::status::unsupported_media_type);
+}
@@ -0,0 +1,98 @@
+#include <gtest/gtest.h>
+
+#include "shards.hpp"
+
+#include <set>
+#include <string>
+#include <vector>
+
+using namespace loglite;
+
+namespace {
+
+PaginatedQueryResult page(int total, std::vector<std::pair<int64_t, std::string>> rows) {
+    PaginatedQueryResult out{total, 0, 0, {}};
+    for (auto& [id, ts] : rows) out.results.push_back({{"id", id}, {"timestamp", ts}});
+    return out;
+}
+
+}  // namespace
+
+TEST(ShardRouterTest, SameValueAlwaysPicksTheSameShard) {
+    ShardRouter router{4, "service"};
+    std::set<std::size_t> used;
+    for (int i = 0; i < 64; ++i) {
+        nlohmann::json entry{{"service", "svc-" + std::to_string(i)}};
+        auto shard = router.ShardOf(entry);
+        EXPECT_LT(shard, 4u);
+        EXPECT_EQ(router.ShardOf(entry), shard);
+        used.insert(shard);
+    }
+    EXPECT_EQ(used.size(), 4u) << "64 distinct values should reach every shard";
+}
+
+TEST(ShardRouterTest, EntriesWithoutTheKeyGoToShardZero) {
+    ShardRouter router{4, "service"};
+    EXPECT_EQ(router.ShardOf({{"message", "x"}}), 0u);
+    EXPECT_EQ(router.ShardOf({{"service", nullptr}}), 0u);
+    EXPECT_EQ(ShardRouter(1, "service").ShardOf({{"service", "api"}}), 0u);
+}
+
+TEST(MergeShardPagesTest, MergesNewestFirstAndAppliesOffset) {
+    std::vector<PaginatedQueryResult> pages{
+        page(10, {{8, "2024-01-01T00:00:09"},
+                  {4, "2024-01-01T00:00:05"},
+                  {0, "2024-01-01T00:00:01"}}),
+        page(5, {{9, "2024-01-01T00:00:08"},
+                 {5, "2024-01-01T00:00:06"},
+                 {1, "2024-01-01T00:00:02"}}),
+    };
+
+    auto merged = MergeShardPages(std::move(pages), "timestamp", 3, 1);
+    EXPECT_EQ(merged.total, 15);
+    EXPECT_EQ(merged.offset, 1);
+    EXPECT_EQ(merged.limit, 3);
+    ASSERT_EQ(merged.results.size(), 3u);
+    EXPECT_EQ(merged.results[0]["id"], 9);
+    EXPECT_EQ(merged.results[1]["id"], 5);
+    EXPECT_EQ(merged.results[2]["id"], 4);
+}
+
+TEST(MergeShardPagesTest, UncountedPagesHaveNoTotal) {
+    std::vector<PaginatedQueryResult> pages{page(-1, {{6, "a"}, {2, "b"}}), page(-1, {{5, "c"}})};
+    auto merged = MergeShardPages(std::move(pages), "id", 10, 0);
+    EXPECT_EQ(merged.total, -1);
+    ASSERT_EQ(merged.results.size(), 3u);
+    EXPECT_EQ(merged.results[0]["id"], 6);
+    EXPECT_EQ(merged.results[1]["id"], 5);
+    EXPECT_EQ(merged.results[2]["id"], 2);
+}
+
+TEST(MergeShardPagesTest, SelectsAndStripsTheOrderField) {
+    std::vector<std::string> fields{"message"};
+    EXPECT_TRUE(SelectOrderField(fields, "timestamp"));
+    EXPECT_EQ(fields, (std::vector<std::string>{"message", "timestamp"}));
+    EXPECT_FALSE(SelectOrderField(fields, "timestamp"));
+
+    std::vector<std::string> all{"*"};
+    EXPECT_FALSE(SelectOrderField(all, "timestamp"));
+
+    auto merged = page(1, {{1, "2024-01-01T00:00:01"}});
+    StripField(merged, "timestamp");
+    EXPECT_EQ(merged.results[0], (nlohmann::json{{"id", 1}}));
+}
+
+TEST(ToColumnarTest, KeepsFieldOrder) {
+    PaginatedQueryResult merged{2, 0, 10, {}};
+    merged.results.push_back({{"id", 2}, {"message", "b"}, {"level", nullptr}});
+    merged.results.push_back({{"id", 1}, {"message", "a"}, {"level", "INFO"}});
+
+    auto columns = ToColumnar(merged, {"message", "id", "level"});
+    EXPECT_EQ(columns.rows, 2);
+    EXPECT_EQ(columns.total, 2);
+    ASSERT_EQ(columns.columns.size(), 3u);
+    EXPECT_EQ(columns.columns[0].name, "message");
+    EXPECT_EQ(columns.columns[0].type, ColumnType::kUtf8);
+    EXPECT_EQ(columns.columns[1].type, ColumnType::kInt64);
+    EXPECT_EQ(columns.columns[2].validity, (std::vector<uint8_t>{0, 1}));
+}
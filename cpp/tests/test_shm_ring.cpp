@@ -0,0 +1,136 @@
+#include <gtest/gtest.h>
+
+#include "backlog.hpp"
+#include "harvesters/ring.hpp"
+#include "shm_ring.hpp"
+
+#include <chrono>
+#include <stdexcept>
+#include <string>
+#include <thread>
+
+using namespace loglite;
+using namespace loglite::harvesters;
+using namespace std::literals::chrono_literals;
+
+// ── ShmRing ───────────────────────────────────────────────────────────────────
+
+TEST(ShmRingTest, PushPopRoundTripAcrossHandles) {
+    auto owner = ShmRing::Create(ShmRing::NameFor("roundtrip"), ShmRing::kMinCapacity);
+    auto producer = ShmRing::Open(owner.Name());
+
+    EXPECT_TRUE(producer.TryPush("first"));
+    EXPECT_TRUE(producer.TryPush(""));
+    EXPECT_TRUE(producer.TryPush("third"));
+    EXPECT_GT(owner.Used(), 0u);
+
+    std::string out;
+    ASSERT_TRUE(owner.TryPop(out));
+    EXPECT_EQ(out, "first");
+    ASSERT_TRUE(owner.TryPop(out));
+    EXPECT_EQ(out, "");
+    ASSERT_TRUE(owner.TryPop(out));
+    EXPECT_EQ(out, "third");
+    EXPECT_FALSE(owner.TryPop(out));
+    EXPECT_EQ(owner.Used(), 0u);
+}
+
+TEST(ShmRingTest, RejectsWhenFullAndCountsDrops) {
+    auto ring = ShmRing::Create(ShmRing::NameFor("full"), ShmRing::kMinCapacity);
+    const std::string record(1000, 'x');
+
+    int pushed = 0;
+    while (ring.TryPush(record)) ++pushed;
+    EXPECT_EQ(pushed, static_cast<int>(ShmRing::kMinCapacity / 1008));
+    ring.RecordDrop();
+    EXPECT_EQ(ring.Dropped(), 1u);
+
+    // Too large for the ring regardless of free space.
+    std::string out;
+    while (ring.TryPop(out)) {
+    }
+    EXPECT_FALSE(ring.TryPush(std::string(ShmRing::kMinCapacity / 2, 'y')));
+}
+
+TEST(ShmRingTest, WrapsRecordsAroundTheEnd) {
+    auto ring = ShmRing::Create(ShmRing::NameFor("wrap"), ShmRing::kMinCapacity);
+    std::string out;
+    for (int i = 0; i < 5000; ++i) {
+        const std::string record = std::to_string(i) + std::string(i % 97, 'z');
+        ASSERT_TRUE(ring.TryPush(record));
+        ASSERT_TRUE(ring.TryPop(out));
+        ASSERT_EQ(out, record);
+    }
+}
+
+TEST(ShmRingTest, OpenFailsWithoutCreator) {
+    EXPECT_THROW(ShmRing::Open(ShmRing::NameFor("missing")), std::runtime_error);
+    {
+        auto ring = ShmRing::Create(ShmRing::NameFor("unlinked"), ShmRing::kMinCapacity);
+    }
+    EXPECT_THROW(ShmRing::Open(ShmRing::NameFor("unlinked")), std::runtime_error);
+    EXPECT_THROW(ShmRing::Create(ShmRing::NameFor("tiny"), 1024), std::invalid_argument);
+}
+
+TEST(ShmRingTest, ConcurrentProducerKeepsOrder) {
+    auto ring = ShmRing::Create(ShmRing::NameFor("spsc"), ShmRing::kMinCapacity);
+    auto producer = ShmRing::Open(ring.Name());
+    constexpr int kRecords = 50000;
+
+    std::thread t([&] {
+        for (int i = 0; i < kRecords;) {
+            if (producer.TryPush(std::to_string(i)))
+                ++i;
+            else
+                std::this_thread::yield();
+        }
+    });
+
+    std::string out;
+    for (int expected = 0; expected < kRecords;) {
+        if (!ring.TryPop(out)) continue;
+        ASSERT_EQ(out, std::to_string(expected));
+        ++expected;
+    }
+    t.join();
+}
+
+// ── RingHarvester ─────────────────────────────────────────────────────────────
+
+TEST(RingHarvesterTest, DrainsWorkerRecordsIntoBacklog) {
+    Backlog backlog{1000};
+    RingHarvester harvester{"ring-test", ShmRing::kMinCapacity, backlog};
+    auto producer = ShmRing::Open(ShmRing::NameFor("ring-test"));
+
+    harvester.Start();
+    ASSERT_TRUE(producer.TryPush(R"({"message":"from worker","level":"INFO"})"));
+    ASSERT_TRUE(producer.TryPush("not json"));
+    ASSERT_TRUE(producer.TryPush("[1, 2]"));
+    ASSERT_TRUE(producer.TryPush(R"({"message":"second"})"));
+
+    const auto deadline = std::chrono::steady_clock::now() + 2s;
+    while (backlog.Size() < 2 && std::chrono::steady_clock::now() < deadline) {
+        std::this_thread::sleep_for(10ms);
+    }
+    harvester.Stop();
+
+    auto entries = backlog.Flush();
+    ASSERT_EQ(entries.size(), 2u) << "malformed and non-object records are dropped";
+    EXPECT_EQ(entries[0]["message"], "from worker");
+    EXPECT_EQ(entries[1]["message"], "second");
+}
+
+TEST(RingHarvesterTest, DrainsRemainingRecordsOnStop) {
+    Backlog backlog{1000};
+    RingHarvester harvester{"ring-stop", ShmRing::kMinCapacity, backlog};
+    auto producer = ShmRing::Open(ShmRing::NameFor("ring-stop"));
+
+    for (int i = 0; i < 10; ++i) {
+        ASSERT_TRUE(producer.TryPush(R"({"message":"queued"})"));
+    }
+    harvester.Start();
+    harvester.Stop();
+
+    EXPECT_EQ(backlog.Size(), 10u);
+    EXPECT_EQ(harvester.Ring().Used(), 0u);
+}
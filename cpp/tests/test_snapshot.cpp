@@ -0,0 +1,194 @@
+#include <gtest/gtest.h>
+
+#include "config.hpp"
+#include "snapshot.hpp"
+#include "writer_database.hpp"
+
+#include <filesystem>
+#include <fmt/format.h>
+#include <fstream>
+
+namespace fs = std::filesystem;
+using namespace loglite;
+
+namespace {
+
+// Row count and journal mode of a snapshot, read through a fresh connection.
+std::pair<int64_t, std::string> inspect(const fs::path& path) {
+    sqlite3* db{};
+    EXPECT_EQ(sqlite3_open_v2(path.string().c_str(), &db, SQLITE_OPEN_READONLY, nullptr),
+              SQLITE_OK);
+    int64_t rows = -1;
+    std::string mode;
+    sqlite3_stmt* stmt{};
+    sqlite3_prepare_v2(db, "SELECT COUNT(*) FROM TestLog", -1, &stmt, nullptr);
+    if (sqlite3_step(stmt) == SQLITE_ROW) rows = sqlite3_column_int64(stmt, 0);
+    sqlite3_finalize(stmt);
+    sqlite3_prepare_v2(db, "PRAGMA journal_mode", -1, &stmt, nullptr);
+    if (sqlite3_step(stmt) == SQLITE_ROW)
+        mode = reinterpret_cast<const char*>(sqlite3_column_text(stmt, 0));
+    sqlite3_finalize(stmt);
+    sqlite3_close(db);
+    return {rows, mode};
+}
+
+}  // namespace
+
+class SnapshotTest : public ::testing::Test {
+   protected:
+    void SetUp() override {
+        tmp_ = fs::temp_directory_path() / "loglite_snapshot_test";
+        fs::remove_all(tmp_);
+        fs::create_directories(tmp_);
+
+        cfg_.sqlite_dir = tmp_;
+        cfg_.db_path = tmp_ / "logs.db";
+        cfg_.log_table_name = "TestLog";
+        cfg_.auto_rollout = true;
+        cfg_.compression = {false, {}};
+        cfg_.sqlite_params = {{"journal_mode", "WAL"}};
+
+        Migration m;
+        m.version = 1;
+        m.rollout = {
+            "CREATE TABLE IF NOT EXISTS TestLog ("
+            "  id        INTEGER PRIMARY KEY,"
+            "  timestamp TEXT    NOT NULL,"
+            "  message   TEXT    NOT NULL"
+            ")"};
+        m.rollback = {"DROP TABLE IF EXISTS TestLog"};
+        cfg_.migrations.push_back(m);
+
+        db_ = std::make_unique<WriterDatabase>(cfg_);
+        db_->Open();
+        db_->Initialize();
+    }
+
+    void TearDown() override {
+        db_.reset();
+        fs::remove_all(tmp_);
+    }
+
+    void insert_logs(int count) {
+        std::vector<nlohmann::json> logs;
+        for (int i = 0; i < count; ++i) {
+            logs.push_back({{"timestamp", "2024-01-01T00:00:00Z"},
+                            {"message", fmt::format("{:0>200}", i)}});
+        }
+        db_->Insert(logs);
+    }
+
+    fs::path tmp_;
+    Config cfg_;
+    std::unique_ptr<WriterDatabase> db_;
+};
+
+TEST_F(SnapshotTest, StepwiseBackupIncludesRowsWrittenBetweenSteps) {
+    insert_logs(500);
+    auto dest = tmp_ / "snap.db";
+
+    auto backup = db_->BeginBackup(dest);
+    EXPECT_FALSE(backup->Step(1));
+    auto progress = backup->Progress();
+    EXPECT_GT(progress.page_count, 1);
+    EXPECT_EQ(progress.remaining, progress.page_count - 1);
+
+    // Written through the same connection mid-backup: carried into the snapshot.
+    insert_logs(100);
+    while (!backup->Step(4)) {
+    }
+    backup->Finish();
+    backup.reset();
+
+    auto [rows, mode] = inspect(dest);
+    EXPECT_EQ(rows, 600);
+    EXPECT_EQ(mode, "delete");
+}
+
+TEST_F(SnapshotTest, SnapshotDatabaseFileFromSeparateConnection) {
+    insert_logs(300);
+    auto dest = tmp_ / "out" / "copy.db";
+
+    int calls = 0;
+    SnapshotDatabaseFile(cfg_.db_path, dest, 2, [&](const BackupProgress&) { ++calls; });
+
+    EXPECT_GT(calls, 1);
+    EXPECT_TRUE(fs::exists(dest));
+    EXPECT_FALSE(fs::exists(fs::path(dest) += ".partial"));
+    EXPECT_EQ(inspect(dest).first, 300);
+}
+
+TEST_F(SnapshotTest, ConcurrentBackupToSamePathFails) {
+    insert_logs(10);
+    auto dest = tmp_ / "snap.db";
+
+    auto first = db_->BeginBackup(dest);
+    EXPECT_THROW((void)db_->BeginBackup(dest), std::runtime_error);
+    while (!first->Step(4)) {
+    }
+    first->Finish();
+    first.reset();
+    EXPECT_EQ(inspect(dest).first, 10) << "the running backup is left intact";
+}
+
+TEST_F(SnapshotTest, SnapshotDatabaseFileMissingSourceThrows) {
+    EXPECT_THROW(SnapshotDatabaseFile(tmp_ / "missing.db", tmp_ / "x.db", 16), std::exception);
+}
+
+TEST(SnapshotFilesTest, FileNameSortsChronologically) {
+    using namespace std::chrono;
+    auto tp = sys_days{year{2026} / 1 / 2} + 3h + 4min + 5s;
+    EXPECT_EQ(SnapshotFileName(tp + 7ms), "logs-20260102T030405.007Z.db");
+    EXPECT_LT(SnapshotFileName(tp), SnapshotFileName(tp + 1ms));
+    EXPECT_LT(SnapshotFileName(tp + 999ms), SnapshotFileName(tp + 1s));
+}
+
+TEST(SnapshotFilesTest, PruneKeepsNewestAndLatestIgnoresPartial) {
+    auto dir = fs::temp_directory_path() / "loglite_snapshot_prune_test";
+    fs::remove_all(dir);
+    fs::create_directories(dir);
+    for (auto name : {"logs-20260101T000000Z.db", "logs-20260102T000000Z.db",
+                      "logs-20260103T000000Z.db", "logs-20260104T000000Z.db.partial",
+                      "notes.txt"}) {
+        std::ofstream{dir / name} << "x";
+    }
+
+    EXPECT_EQ(LatestSnapshot(dir), dir / "logs-20260103T000000Z.db");
+
+    PruneSnapshots(dir, 2);
+    EXPECT_FALSE(fs::exists(dir / "logs-20260101T000000Z.db"));
+    EXPECT_TRUE(fs::exists(dir / "logs-20260102T000000Z.db"));
+    EXPECT_TRUE(fs::exists(dir / "logs-20260103T000000Z.db"));
+    EXPECT_TRUE(fs::exists(dir / "logs-20260104T000000Z.db.partial"));
+    EXPECT_TRUE(fs::exists(dir / "notes.txt"));
+
+    EXPECT_EQ(LatestSnapshot(dir / "missing"), std::nullopt);
+    fs::remove_all(dir);
+}
+
+TEST(SnapshotTrackerTest, StateTransitions) {
+    SnapshotTracker tracker;
+    EXPECT_EQ(tracker.Get().ToJSON()["state"], "idle");
+
+    ASSERT_TRUE(tracker.TryStart("/tmp/a.db"));
+    EXPECT_FALSE(tracker.TryStart("/tmp/b.db"));
+
+    tracker.Progress({100, 25});
+    auto running = tracker.Get().ToJSON();
+    EXPECT_EQ(running["state"], "running");
+    EXPECT_EQ(running["file"], "/tmp/a.db");
+    EXPECT_DOUBLE_EQ(running["progress"].get<double>(), 0.75);
+
+    tracker.Fail("disk full", 5.0);
+    auto failed = tracker.Get().ToJSON();
+    EXPECT_EQ(failed["state"], "failed");
+    EXPECT_EQ(failed["error"], "disk full");
+
+    ASSERT_TRUE(tracker.TryStart("/tmp/b.db"));
+    tracker.Finish(4096, 12.0);
+    auto done = tracker.Get().ToJSON();
+    EXPECT_EQ(done["state"], "done");
+    EXPECT_EQ(done["remaining"], 0);
+    EXPECT_EQ(done["size_bytes"], 4096);
+    EXPECT_FALSE(done.contains("error"));
+}
@@ -5,6 +5,7 @@
 #include "writer_database.hpp"
 #include "tasks/vacuum.hpp"
 
+#include <algorithm>
 #include <filesystem>
 #include <fmt/format.h>
 
@@ -70,37 +71,51 @@ class VacuumTest : public ::testing::Test {
     std::unique_ptr<ReaderDatabase> reader_;
 };
 
-TEST_F(VacuumTest, RemoveStaleLogsEmptyDb) {
-    int removed = tasks::detail::remove_stale_logs(*db_, cfg_, 0);
-    EXPECT_EQ(removed, 0);
+TEST_F(VacuumTest, StaleLogsFiltersEmptyDb) {
+    EXPECT_TRUE(tasks::detail::stale_logs_filters(*db_, cfg_, 0).empty());
 }
 
-TEST_F(VacuumTest, RemoveStaleLogsNewData) {
+TEST_F(VacuumTest, StaleLogsFiltersNewData) {
     // Insert fresh logs — they should not be removed (max_days=3650 by default)
     insert_logs(10);
+    EXPECT_TRUE(tasks::detail::stale_logs_filters(*db_, cfg_, 0).empty());
+}
 
-    int removed = tasks::detail::remove_stale_logs(*db_, cfg_, 0);
-    EXPECT_EQ(removed, 0);
+TEST_F(VacuumTest, StaleLogsFiltersSelectExpiredRows) {
+    insert_logs(10);
+    cfg_.vacuum_max_days = 1;
 
-    auto result = reader_->Query({"*"}, {}, 100, 0);
-    EXPECT_EQ(result.total, 10);
+    auto flt = tasks::detail::stale_logs_filters(*db_, cfg_, 0);
+    ASSERT_EQ(flt.size(), 1u);
+    EXPECT_EQ(db_->DeleteLogs(flt), 10);
 }
 
-TEST_F(VacuumTest, RemoveExcessiveLogsUnderLimit) {
+TEST_F(VacuumTest, ExcessiveLogsFiltersUnderLimit) {
     insert_logs(10);
-    int removed = tasks::detail::remove_excessive_logs(*db_, cfg_, 0);
-    EXPECT_EQ(removed, 0);
+    EXPECT_TRUE(tasks::detail::excessive_logs_filters(*db_, cfg_, 0).empty());
 }
 
-TEST_F(VacuumTest, RemoveExcessiveLogsOverLimit) {
+TEST_F(VacuumTest, ExcessiveLogsOverLimitDeletedInChunks) {
     insert_logs(20);
 
     // Force deletion of oldest 50% of logs.
     cfg_.vacuum_max_size_bytes = 1;
     cfg_.vacuum_target_size_bytes = db_->GetSizeBytes() / 2;
 
-    int removed = tasks::detail::remove_excessive_logs(*db_, cfg_, 0);
+    auto flt = tasks::detail::excessive_logs_filters(*db_, cfg_, 0);
+    ASSERT_FALSE(flt.empty());
+
+    // Chunks of 3 rows, lowest id first, until a chunk comes back short.
+    int removed = 0;
+    std::vector<int> chunks;
+    while (true) {
+        int n = db_->DeleteLogs(flt, 3);
+        chunks.push_back(n);
+        removed += n;
+        if (n < 3) break;
+    }
     EXPECT_EQ(removed, 10);
+    EXPECT_EQ(chunks, (std::vector<int>{3, 3, 3, 1}));
 
     auto result = reader_->Query({"id"}, {}, 100, 0);
     EXPECT_EQ(result.total, 10);
@@ -114,6 +129,29 @@ TEST_F(VacuumTest, RemoveExcessiveLogsOverLimit) {
     EXPECT_EQ(remaining_ids, expected_ids);
 }
 
+TEST_F(VacuumTest, ExcessiveLogsOnUnevenShardDeletesByRowCount) {
+    // A quiet shard: 12 rows, then a restart after another shard reached id 10000.
+    db_->SetIdStride(4, 0, 0);
+    insert_logs(12);
+    db_->SetIdStride(4, 0, 10000);
+    insert_logs(8);
+
+    cfg_.vacuum_max_size_bytes = 1;
+    cfg_.vacuum_target_size_bytes = db_->GetSizeBytes() / 2;
+
+    auto flt = tasks::detail::excessive_logs_filters(*db_, cfg_, 0);
+    ASSERT_FALSE(flt.empty());
+    EXPECT_EQ(db_->DeleteLogs(flt), 10);
+
+    auto result = reader_->Query({"id"}, {}, 100, 0);
+    std::vector<int> remaining_ids;
+    for (const auto& log : result.results) remaining_ids.push_back(log["id"].get<int>());
+    std::ranges::sort(remaining_ids);
+    std::vector<int> expected_ids = {44,    48,    10004, 10008, 10012,
+                                     10016, 10020, 10024, 10028, 10032};
+    EXPECT_EQ(remaining_ids, expected_ids);
+}
+
 TEST_F(VacuumTest, IncrementalVacuumPassNoOp) {
     // No data deleted, so no freelist
     int remain = tasks::detail::incremental_vacuum_pass(*db_, 20);
@@ -160,9 +198,31 @@ TEST(VacuumUtilsTest, RemoveStaleLogsWithFreshData) {
     // Insert fresh data
     db.Insert({{{"timestamp", "2025-01-01T00:00:00Z"}, {"message", "hello"}}});
 
-    int removed = tasks::detail::remove_stale_logs(db, cfg, 0);
-    EXPECT_EQ(removed, 0);
+    EXPECT_TRUE(tasks::detail::stale_logs_filters(db, cfg, 0).empty());
 
     db.Close();
     fs::remove_all(tmp);
 }
+
+// ── DeleteChunker ─────────────────────────────────────────────────────────────
+
+TEST(DeleteChunkerTest, SizesChunksToTheTimeBudget) {
+    tasks::detail::DeleteChunker chunker{50.0};
+    EXPECT_EQ(chunker.Rows(), 1000);
+
+    // 1000 rows in 100 ms → 10 rows/ms → 500 rows fit in 50 ms.
+    chunker.Observe(1000, 100.0);
+    EXPECT_EQ(chunker.Rows(), 500);
+
+    // Fast deletes grow the chunk by at most 2× per step.
+    chunker.Observe(500, 1.0);
+    EXPECT_EQ(chunker.Rows(), 1000);
+    for (int i = 0; i < 20; ++i) chunker.Observe(chunker.Rows(), 0.0);
+    EXPECT_EQ(chunker.Rows(), tasks::detail::kDeleteChunkMaxRows);
+
+    // Very slow deletes bottom out at the minimum; empty chunks change nothing.
+    chunker.Observe(100, 10000.0);
+    EXPECT_EQ(chunker.Rows(), tasks::detail::kDeleteChunkMinRows);
+    chunker.Observe(0, 1.0);
+    EXPECT_EQ(chunker.Rows(), tasks::detail::kDeleteChunkMinRows);
+}
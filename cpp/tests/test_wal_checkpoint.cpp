@@ -0,0 +1,157 @@
+#include <gtest/gtest.h>
+
+#include "config.hpp"
+#include "wal_checkpoint.hpp"
+#include "writer_database.hpp"
+
+#include <filesystem>
+#include <fmt/format.h>
+
+namespace fs = std::filesystem;
+using namespace loglite;
+
+// ── WalCheckpointManager ──────────────────────────────────────────────────────
+
+namespace {
+
+WalCheckpointResult frames(int log, int done, bool busy = false) {
+    return {busy, log, done};
+}
+
+}  // namespace
+
+TEST(WalCheckpointManagerTest, PassiveWhileWalIsSmall) {
+    WalCheckpointManager mgr{1000};
+    EXPECT_EQ(mgr.Plan(0, 0), CheckpointMode::kNone);
+    EXPECT_EQ(mgr.Plan(500, 2), CheckpointMode::kPassive);
+    mgr.Observe(CheckpointMode::kPassive, frames(10, 10), 500, 1.0);
+    EXPECT_EQ(mgr.LagFrames(), 0);
+    EXPECT_EQ(mgr.Plan(500, 2), CheckpointMode::kPassive);
+}
+
+TEST(WalCheckpointManagerTest, RestartsAfterLaggingPassivePasses) {
+    WalCheckpointManager mgr{1000};
+    for (int i = 0; i < WalCheckpointManager::kRestartAfterPasses; ++i) {
+        ASSERT_EQ(mgr.Plan(500, 1), CheckpointMode::kPassive);
+        mgr.Observe(CheckpointMode::kPassive, frames(10, 4), 500, 1.0);
+    }
+    EXPECT_EQ(mgr.LagFrames(), 6);
+    ASSERT_EQ(mgr.Plan(500, 1), CheckpointMode::kRestart);
+
+    // A busy RESTART is retried on the next pass; a completed one resets the streak.
+    mgr.Observe(CheckpointMode::kRestart, frames(10, 4, true), 500, 100.0);
+    ASSERT_EQ(mgr.Plan(500, 1), CheckpointMode::kRestart);
+    mgr.Observe(CheckpointMode::kRestart, frames(10, 10), 500, 2.0);
+    EXPECT_EQ(mgr.Plan(500, 1), CheckpointMode::kPassive);
+
+    auto js = mgr.ToJSON();
+    EXPECT_EQ(js["passive"], 3);
+    EXPECT_EQ(js["restart"], 1);
+    EXPECT_EQ(js["busy"], 1);
+    EXPECT_EQ(js["last_mode"], "RESTART");
+}
+
+TEST(WalCheckpointManagerTest, TruncateWaitsForIdleReadersThenForces) {
+    WalCheckpointManager mgr{1000};
+    EXPECT_EQ(mgr.Plan(5000, 0), CheckpointMode::kTruncate);
+
+    for (int i = 0; i < WalCheckpointManager::kMaxDeferrals; ++i)
+        ASSERT_EQ(mgr.Plan(5000, 3), CheckpointMode::kPassive) << "pass " << i;
+    EXPECT_EQ(mgr.Plan(5000, 3), CheckpointMode::kTruncate);
+
+    mgr.Observe(CheckpointMode::kTruncate, frames(0, 0), 0, 5.0);
+    EXPECT_EQ(mgr.Plan(5000, 3), CheckpointMode::kPassive);
+    EXPECT_EQ(mgr.ToJSON()["truncate"], 1);
+}
+
+// ── WriterDatabase::Checkpoint ────────────────────────────────────────────────
+
+class WalCheckpointTest : public ::testing::Test {
+   protected:
+    void SetUp() override {
+        tmp_ = fs::temp_directory_path() / "loglite_wal_checkpoint_test";
+        fs::remove_all(tmp_);
+        fs::create_directories(tmp_);
+
+        cfg_.sqlite_dir = tmp_;
+        cfg_.db_path = tmp_ / "logs.db";
+        cfg_.log_table_name = "TestLog";
+        cfg_.auto_rollout = true;
+        cfg_.compression = {false, {}};
+        cfg_.sqlite_params = {{"journal_mode", "WAL"}, {"wal_autocheckpoint", "0"}};
+
+        Migration m;
+        m.version = 1;
+        m.rollout = {
+            "CREATE TABLE IF NOT EXISTS TestLog ("
+            "  id        INTEGER PRIMARY KEY,"
+            "  timestamp TEXT    NOT NULL,"
+            "  message   TEXT    NOT NULL"
+            ")"};
+        m.rollback = {"DROP TABLE IF EXISTS TestLog"};
+        cfg_.migrations.push_back(m);
+
+        db_ = std::make_unique<WriterDatabase>(cfg_);
+        db_->Open();
+        db_->Initialize();
+    }
+
+    void TearDown() override {
+        db_.reset();
+        fs::remove_all(tmp_);
+    }
+
+    void insert_logs(int count) {
+        std::vector<nlohmann::json> logs;
+        for (int i = 0; i < count; ++i) {
+            logs.push_back({{"timestamp", "2024-01-01T00:00:00Z"},
+                            {"message", fmt::format("{:0>200}", i)}});
+        }
+        db_->Insert(logs);
+    }
+
+    fs::path tmp_;
+    Config cfg_;
+    std::unique_ptr<WriterDatabase> db_;
+};
+
+TEST_F(WalCheckpointTest, TruncateEmptiesTheWal) {
+    insert_logs(200);
+    EXPECT_GT(db_->GetWalSizeBytes(), 0);
+
+    auto result = db_->Checkpoint("TRUNCATE", 100);
+    EXPECT_FALSE(result.busy);
+    EXPECT_EQ(result.Lag(), 0);
+    EXPECT_EQ(db_->GetWalSizeBytes(), 0);
+}
+
+TEST_F(WalCheckpointTest, ReaderSnapshotLeavesLagAndBlocksTruncate) {
+    insert_logs(50);
+    db_->Checkpoint("TRUNCATE");
+
+    // An open read transaction pins the snapshot taken before the next insert.
+    sqlite3* reader{};
+    ASSERT_EQ(sqlite3_open(cfg_.db_path.string().c_str(), &reader), SQLITE_OK);
+    ASSERT_EQ(sqlite3_exec(reader, "BEGIN; SELECT COUNT(*) FROM TestLog;", nullptr, nullptr,
+                           nullptr),
+              SQLITE_OK);
+    insert_logs(50);
+
+    auto passive = db_->Checkpoint("PASSIVE");
+    EXPECT_FALSE(passive.busy);
+    EXPECT_GT(passive.Lag(), 0);
+
+    auto truncate = db_->Checkpoint("TRUNCATE", 20);
+    EXPECT_TRUE(truncate.busy);
+    EXPECT_GT(db_->GetWalSizeBytes(), 0);
+
+    sqlite3_exec(reader, "COMMIT", nullptr, nullptr, nullptr);
+    sqlite3_close(reader);
+
+    EXPECT_FALSE(db_->Checkpoint("TRUNCATE", 20).busy);
+    EXPECT_EQ(db_->GetWalSizeBytes(), 0);
+}
+
+TEST_F(WalCheckpointTest, UnknownModeThrows) {
+    EXPECT_THROW(db_->Checkpoint("SOMETIMES"), std::runtime_error);
+}
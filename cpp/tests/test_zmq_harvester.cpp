@@ -0,0 +1,173 @@
+#ifdef LOGLITE_WITH_ZMQ
+
+#include <gtest/gtest.h>
+
+#include "backlog.hpp"
+#include "harvesters/zmq.hpp"
+
+#include <chrono>
+#include <filesystem>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include <zmq.h>
+
+namespace fs = std::filesystem;
+using namespace loglite;
+using namespace loglite::harvesters;
+using namespace std::literals::chrono_literals;
+
+// ── Helpers ───────────────────────────────────────────────────────────────────
+
+static bool wait_for(Backlog& bl, size_t n, std::chrono::milliseconds timeout = 2500ms) {
+    auto deadline = std::chrono::steady_clock::now() + timeout;
+    while (std::chrono::steady_clock::now() < deadline) {
+        if (bl.Size() >= n) return true;
+        std::this_thread::sleep_for(20ms);
+    }
+    return false;
+}
+
+// Sending side of the test: a PUSH or PUB socket bound to an ipc endpoint.
+class Sender {
+   public:
+    Sender(int type, const std::string& endpoint)
+        : context_(zmq_ctx_new()), socket_(zmq_socket(context_, type)) {
+        int linger = 0;
+        zmq_setsockopt(socket_, ZMQ_LINGER, &linger, sizeof(linger));
+        if (zmq_bind(socket_, endpoint.c_str()) != 0) {
+            throw std::runtime_error(zmq_strerror(zmq_errno()));
+        }
+    }
+
+    ~Sender() {
+        zmq_close(socket_);
+        zmq_ctx_term(context_);
+    }
+
+    void Send(const std::vector<std::string>& frames) {
+        for (std::size_t i = 0; i < frames.size(); ++i) {
+            const int flags = i + 1 < frames.size() ? ZMQ_SNDMORE : 0;
+            ASSERT_GE(zmq_send(socket_, frames[i].data(), frames[i].size(), flags), 0);
+        }
+    }
+
+   private:
+    void* context_;
+    void* socket_;
+};
+
+// ── Fixture ───────────────────────────────────────────────────────────────────
+
+class ZmqHarvesterTest : public ::testing::Test {
+   protected:
+    void SetUp() override {
+        tmp_dir_ = fs::temp_directory_path() / "loglite_zmq_test";
+        fs::remove_all(tmp_dir_);
+        fs::create_directories(tmp_dir_);
+        endpoint_ = "ipc://" + (tmp_dir_ / "logs.sock").string();
+    }
+
+    void TearDown() override {
+        if (harvester_) harvester_->Stop();
+        fs::remove_all(tmp_dir_);
+    }
+
+    void start(ZmqHarvester::Options options = {}) {
+        options.poll_interval = 20ms;
+        harvester_ = std::make_unique<ZmqHarvester>("test", endpoint_, backlog_, options);
+        harvester_->Start();
+    }
+
+    Backlog backlog_{1000};
+    fs::path tmp_dir_;
+    std::string endpoint_;
+    std::unique_ptr<ZmqHarvester> harvester_;
+};
+
+// ── Tests ─────────────────────────────────────────────────────────────────────
+
+TEST(ZmqHarvesterOptionsTest, ParsesConfigMap) {
+    auto options = ZmqHarvester::ParseOptions(
+        {{"endpoint", "tcp://127.0.0.1:5555"}, {"socket_type", "SUB"}, {"bind", "True"},
+         {"subscribe", "app"}});
+    EXPECT_EQ(options.socket_type, ZmqHarvester::SocketType::kSub);
+    EXPECT_TRUE(options.bind);
+    EXPECT_EQ(options.subscribe, "app");
+
+    auto defaults = ZmqHarvester::ParseOptions({{"endpoint", "tcp://127.0.0.1:5555"}});
+    EXPECT_EQ(defaults.socket_type, ZmqHarvester::SocketType::kPull);
+    EXPECT_FALSE(defaults.bind);
+
+    EXPECT_THROW(ZmqHarvester::ParseOptions({{"socket_type", "PUB"}}), std::invalid_argument);
+    EXPECT_THROW(ZmqHarvester::ParseOptions({{"bind", "maybe"}}), std::invalid_argument);
+}
+
+TEST_F(ZmqHarvesterTest, PullReceivesObjectsArraysAndMultipart) {
+    Sender sender{ZMQ_PUSH, endpoint_};
+    start();
+
+    sender.Send({R"({"message":"one","timestamp":"2026-01-01T00:00:00Z"})"});
+    sender.Send({R"([{"message":"two"},{"message":"three"},42])"});
+    sender.Send({"envelope", R"({"message":"four"})"});
+    sender.Send({"not json"});
+    ASSERT_TRUE(wait_for(backlog_, 4));
+
+    auto entries = backlog_.Flush();
+    ASSERT_EQ(entries.size(), 4u) << "non-object payloads are dropped";
+    EXPECT_EQ(entries[0]["message"], "one");
+    EXPECT_EQ(entries[0]["timestamp"], "2026-01-01T00:00:00Z");
+    EXPECT_EQ(entries[1]["message"], "two");
+    EXPECT_EQ(entries[2]["message"], "three");
+    EXPECT_EQ(entries[3]["message"], "four");
+    EXPECT_TRUE(entries[3]["timestamp"].is_string()) << "missing timestamps are filled in";
+}
+
+TEST_F(ZmqHarvesterTest, DrainsBurstsInBatches) {
+    Sender sender{ZMQ_PUSH, endpoint_};
+    start();
+
+    constexpr int kMessages = 500;
+    for (int i = 0; i < kMessages; ++i) {
+        sender.Send({R"({"message":")" + std::to_string(i) + R"("})"});
+    }
+    ASSERT_TRUE(wait_for(backlog_, kMessages));
+
+    auto entries = backlog_.Flush();
+    ASSERT_EQ(entries.size(), static_cast<size_t>(kMessages));
+    for (int i = 0; i < kMessages; ++i) EXPECT_EQ(entries[i]["message"], std::to_string(i));
+}
+
+TEST_F(ZmqHarvesterTest, SubFiltersByTopic) {
+    Sender sender{ZMQ_PUB, endpoint_};
+    ZmqHarvester::Options options;
+    options.socket_type = ZmqHarvester::SocketType::kSub;
+    options.subscribe = "app";
+    start(options);
+
+    // A new subscription takes a moment to reach the publisher.
+    const auto deadline = std::chrono::steady_clock::now() + 2500ms;
+    while (backlog_.Size() == 0 && std::chrono::steady_clock::now() < deadline) {
+        sender.Send({"other", R"({"message":"filtered"})"});
+        sender.Send({"app", R"({"message":"kept"})"});
+        std::this_thread::sleep_for(20ms);
+    }
+    harvester_->Stop();
+
+    auto entries = backlog_.Flush();
+    ASSERT_FALSE(entries.empty());
+    for (const auto& entry : entries) EXPECT_EQ(entry["message"], "kept");
+}
+
+TEST_F(ZmqHarvesterTest, InvalidEndpointEndsTheThread) {
+    endpoint_ = "nosuchtransport://x";
+    start();
+    std::this_thread::sleep_for(50ms);
+    harvester_->Stop();  // returns promptly; nothing was received
+    EXPECT_EQ(backlog_.Size(), 0u);
+}
+
+#endif  // LOGLITE_WITH_ZMQ
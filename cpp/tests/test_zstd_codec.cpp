@@ -0,0 +1,114 @@
+#include <gtest/gtest.h>
+
+#include "zstd_codec.hpp"
+
+#include <fmt/format.h>
+
+#include <string>
+#include <tuple>
+#include <vector>
+
+using namespace loglite;
+
+// ── Helpers ────────────────────────────────────────────────────────────────────
+
+static std::string sample_message(int i) {
+    return fmt::format(
+        "GET /api/v1/orders/{} completed with status=200 in {}ms (user_id={}, region=eu-west-1)",
+        i * 7919 % 100000, i % 250, i % 97);
+}
+
+static std::string as_string(const std::vector<uint8_t>& frame) {
+    return {reinterpret_cast<const char*>(frame.data()), frame.size()};
+}
+
+class ZstdCodecFixture : public ::testing::Test {
+   protected:
+    ZstdCodec::PersistFn make_persist() {
+        return [this](const std::string& col, ZstdDictId id, const std::string& dict) {
+            persisted_.emplace_back(col, id, dict);
+            return true;
+        };
+    }
+
+    ZstdCodec::Options opts_{.level = 3, .dict_capacity = 16 * 1024, .train_samples = 200};
+    std::vector<std::tuple<std::string, ZstdDictId, std::string>> persisted_;
+};
+
+// ── Tests ──────────────────────────────────────────────────────────────────────
+
+TEST_F(ZstdCodecFixture, HandlesOnlyConfiguredColumns) {
+    ZstdCodec codec{{"message"}, opts_, make_persist()};
+    EXPECT_TRUE(codec.Handles("message"));
+    EXPECT_FALSE(codec.Handles("level"));
+}
+
+TEST_F(ZstdCodecFixture, RoundTripWithoutDictionary) {
+    ZstdCodec codec{{"message"}, opts_, make_persist()};
+    std::string value(500, 'a');
+
+    auto frame = codec.Compress("message", value);
+    ASSERT_TRUE(frame.has_value());
+    EXPECT_LT(frame->size(), value.size());
+    EXPECT_EQ(codec.Decompress(as_string(*frame)), value);
+    EXPECT_FALSE(codec.ActiveDictionary("message").has_value());
+}
+
+TEST_F(ZstdCodecFixture, IncompressibleValueIsLeftAlone) {
+    ZstdCodec codec{{"message"}, opts_, make_persist()};
+    EXPECT_FALSE(codec.Compress("message", "ok").has_value());
+    EXPECT_FALSE(codec.Compress("message", "").has_value());
+}
+
+TEST_F(ZstdCodecFixture, TrainsDictionaryAfterEnoughSamples) {
+    ZstdCodec codec{{"message"}, opts_, make_persist()};
+
+    for (int i = 0; i < 199; ++i) (void)codec.Compress("message", sample_message(i));
+    EXPECT_TRUE(persisted_.empty());
+
+    (void)codec.Compress("message", sample_message(199));
+    ASSERT_EQ(persisted_.size(), 1u);
+    const auto& [col, id, dict] = persisted_[0];
+    EXPECT_EQ(col, "message");
+    EXPECT_NE(id, 0u);
+    EXPECT_LE(dict.size(), opts_.dict_capacity);
+    EXPECT_EQ(codec.ActiveDictionary("message"), id);
+
+    // Short, similar lines now compress well below their raw size.
+    const auto msg = sample_message(12345);
+    auto frame = codec.Compress("message", msg);
+    ASSERT_TRUE(frame.has_value());
+    EXPECT_LT(frame->size() * 2, msg.size());
+    EXPECT_EQ(codec.Decompress(as_string(*frame)), msg);
+}
+
+TEST_F(ZstdCodecFixture, LoadedDictionaryDecodesFramesFromAnotherInstance) {
+    ZstdCodec writer{{"message"}, opts_, make_persist()};
+    for (int i = 0; i < 200; ++i) (void)writer.Compress("message", sample_message(i));
+    ASSERT_EQ(persisted_.size(), 1u);
+
+    auto frame = writer.Compress("message", sample_message(777));
+    ASSERT_TRUE(frame.has_value());
+
+    // A fresh codec (e.g. after a restart) can't decode until the dictionary is loaded.
+    ZstdCodec restarted{{"message"}, opts_, nullptr};
+    EXPECT_THROW((void)restarted.Decompress(as_string(*frame)), std::runtime_error);
+
+    restarted.LoadDictionary("message", std::get<2>(persisted_[0]));
+    EXPECT_EQ(restarted.Decompress(as_string(*frame)), sample_message(777));
+    EXPECT_EQ(restarted.ActiveDictionary("message"), std::get<1>(persisted_[0]));
+}
+
+TEST_F(ZstdCodecFixture, DecompressRejectsGarbage) {
+    ZstdCodec codec{{"message"}, opts_, nullptr};
+    EXPECT_THROW((void)codec.Decompress("not a zstd frame"), std::runtime_error);
+    EXPECT_THROW((void)codec.Decompress(""), std::runtime_error);
+}
+
+TEST_F(ZstdCodecFixture, PersistFailureThrows) {
+    ZstdCodec codec{{"message"}, opts_,
+                    [](const std::string&, ZstdDictId, const std::string&) { return false; }};
+    for (int i = 0; i < 199; ++i) (void)codec.Compress("message", sample_message(i));
+    EXPECT_THROW((void)codec.Compress("message", sample_message(199)), std::runtime_error);
+    EXPECT_FALSE(codec.ActiveDictionary("message").has_value());
+}
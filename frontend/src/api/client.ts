@@ -30,10 +30,12 @@ export interface StatsResponse {
   activities: {
     fields: string[];
     data: any[][];
+    resolution: number;
   };
   database: {
     fields: string[];
     data: any[][];
+    resolution: number;
   };
   uptime: number;
 }
@@ -190,14 +192,17 @@ export async function fetchVersion(): Promise<VersionResponse> {
 export async function fetchStats(
   since: string,
   until: string,
+  maxPoints?: number,
 ): Promise<ReturnType<typeof transformStats>> {
   const params = new URLSearchParams({
     since,
     until,
     activity_stats_fields: '*',
     database_stats_fields: '*',
-    ordering: 'desc', // Server limits 1 day, query descending, we will reverse it for chart
+    ordering: 'desc', // Query descending, we will reverse it for chart
   });
+  // Without a point budget the server limits the window to 1 day of raw rows.
+  if (maxPoints) params.set('max_points', String(maxPoints));
 
   const res = await fetch(apiUrl(`/stats?${params.toString()}`));
   if (!res.ok) {
@@ -1,4 +1,4 @@
-import { useEffect, useRef, useState } from 'react';
+import { useLayoutEffect, useMemo, useState } from 'react';
 import { Play, Pause, Trash2, Search, ArrowDown, AlignLeft, Eye } from 'lucide-react';
 import JsonViewer from './JsonViewer';
 import { getLevelStyles } from '../logLevelStyles';
@@ -6,9 +6,13 @@ import { useTheme } from '../theme';
 import { useI18n } from '../i18n/locale';
 import { formatDateTimeMs, formatTimeMs } from '../utils/formatTimestamp';
 import { useLiveLogStream, type LiveLogRecord } from '../hooks/useLiveLogStream';
+import { useVirtualRows } from '../hooks/useVirtualRows';
 
 type LogRecord = LiveLogRecord;
 
+// Height of an unwrapped row plus the gap below it; wrapped rows are measured.
+const ROW_HEIGHT_ESTIMATE = 30;
+
 const TOOLBAR_INACTIVE =
   'bg-secondary text-muted-foreground border-border hover:bg-muted hover:text-foreground';
 
@@ -33,16 +37,23 @@ export default function LiveConsole() {
   const [wrapLines, setWrapLines] = useState(true);
   const [selectedLog, setSelectedLog] = useState<LogRecord | null>(null);
 
-  const { logs, clearLogs: clearStreamLogs } = useLiveLogStream(isPaused);
+  // Filtering runs in the stream's worker; `logs` only holds matching records.
+  const filter = useMemo(
+    () => ({ levels: levelFilter, search: searchQuery }),
+    [levelFilter, searchQuery],
+  );
+  const { logs, clearLogs: clearStreamLogs } = useLiveLogStream(isPaused, filter);
 
-  const consoleEndRef = useRef<HTMLDivElement>(null);
+  const { scrollRef, onScroll, measureRow, scrollToEnd, rows, totalSize } = useVirtualRows({
+    count: logs.length,
+    getKey: (index) => String(logs[index].id),
+    estimateSize: ROW_HEIGHT_ESTIMATE,
+  });
 
-  // Handle autoscroll
-  useEffect(() => {
-    if (autoScroll && consoleEndRef.current) {
-      consoleEndRef.current.scrollIntoView({ behavior: 'smooth' });
-    }
-  }, [logs, autoScroll]);
+  // Handle autoscroll; jump rather than smooth-scroll so high rates keep up.
+  useLayoutEffect(() => {
+    if (autoScroll) scrollToEnd();
+  }, [totalSize, autoScroll, scrollToEnd]);
 
   const clearLogs = () => {
     clearStreamLogs();
@@ -56,17 +67,6 @@ export default function LiveConsole() {
     }));
   };
 
-  // Filter logs for rendering
-  const filteredLogs = logs.filter((log) => {
-    const matchesLevel = levelFilter[log.level?.toUpperCase()] ?? true;
-    const matchesSearch = searchQuery
-      ? log.message?.toLowerCase().includes(searchQuery.toLowerCase()) ||
-        log.service?.toLowerCase().includes(searchQuery.toLowerCase()) ||
-        log.level?.toLowerCase().includes(searchQuery.toLowerCase())
-      : true;
-    return matchesLevel && matchesSearch;
-  });
-
   return (
     <div className="bg-card border border-border rounded-xl overflow-hidden flex flex-col h-[650px] shadow-sm">
       {/* Console toolbar control panel */}
@@ -171,62 +171,76 @@ export default function LiveConsole() {
       {/* Console Core Layout */}
       <div className="flex-1 flex flex-col lg:flex-row overflow-hidden">
         {/* Terminal logs list */}
-        <div className="flex-1 overflow-y-auto p-4 bg-background text-foreground font-mono text-xs selection:bg-muted flex flex-col gap-1.5">
-          {filteredLogs.length === 0 ? (
+        <div
+          ref={scrollRef}
+          onScroll={onScroll}
+          className="flex-1 overflow-y-auto p-4 bg-background text-foreground font-mono text-xs selection:bg-muted flex flex-col"
+        >
+          {logs.length === 0 ? (
             <div className="flex-1 flex flex-col items-center justify-center text-muted-foreground gap-1 mt-10">
               <div className="w-1.5 h-4 bg-primary rounded animate-pulse inline-block mr-1"></div>
               <span>{isPaused ? t('live.paused') : t('live.listening')}</span>
             </div>
           ) : (
-            filteredLogs.map((log) => {
-              const levelStyles = levelClasses[log.level?.toUpperCase()] || levelClasses.DEBUG;
-              return (
-                <div
-                  key={log.id}
-                  onClick={() => setSelectedLog(log)}
-                  className={`flex flex-col md:flex-row items-start gap-2.5 py-1 px-2.5 rounded hover:bg-muted cursor-pointer border border-transparent hover:border-border transition-colors group ${
-                    selectedLog?.id === log.id ? 'bg-muted border-border' : ''
-                  }`}
-                >
-                  {/* Timestamp */}
-                  <span className="text-muted-foreground select-none whitespace-nowrap">
-                    {formatTimeMs(log.timestamp)}
-                  </span>
-
-                  {/* Level Pill */}
-                  <span
-                    className={`px-1.5 py-0.5 rounded text-[10px] font-bold border leading-none ${levelStyles.bg} ${levelStyles.text} ${levelStyles.border}`}
+            // Only rows near the viewport are mounted; the spacer keeps the full scroll height.
+            <div className="relative shrink-0" style={{ height: totalSize }}>
+              {rows.map(({ index, key, start }) => {
+                const log = logs[index];
+                const levelStyles = levelClasses[log.level?.toUpperCase()] || levelClasses.DEBUG;
+                return (
+                  <div
+                    key={key}
+                    ref={measureRow}
+                    data-key={key}
+                    className="absolute inset-x-0 top-0 pb-1.5"
+                    style={{ transform: `translateY(${start}px)` }}
                   >
-                    {log.level || 'DEBUG'}
-                  </span>
+                    <div
+                      onClick={() => setSelectedLog(log)}
+                      className={`flex flex-col md:flex-row items-start gap-2.5 py-1 px-2.5 rounded hover:bg-muted cursor-pointer border border-transparent hover:border-border transition-colors group ${
+                        selectedLog?.id === log.id ? 'bg-muted border-border' : ''
+                      }`}
+                    >
+                      {/* Timestamp */}
+                      <span className="text-muted-foreground select-none whitespace-nowrap">
+                        {formatTimeMs(log.timestamp)}
+                      </span>
 
-                  {/* Service tag */}
-                  {log.service && (
-                    <span className={`select-all whitespace-nowrap ${serviceTagClass}`}>
-                      {log.service}
-                    </span>
-                  )}
+                      {/* Level Pill */}
+                      <span
+                        className={`px-1.5 py-0.5 rounded text-[10px] font-bold border leading-none ${levelStyles.bg} ${levelStyles.text} ${levelStyles.border}`}
+                      >
+                        {log.level || 'DEBUG'}
+                      </span>
 
-                  {/* Message */}
-                  <span
-                    className={`flex-1 text-foreground select-text ${
-                      wrapLines
-                        ? 'whitespace-pre-wrap break-all'
-                        : 'whitespace-nowrap overflow-x-hidden text-ellipsis'
-                    }`}
-                  >
-                    {log.message}
-                  </span>
+                      {/* Service tag */}
+                      {log.service && (
+                        <span className={`select-all whitespace-nowrap ${serviceTagClass}`}>
+                          {log.service}
+                        </span>
+                      )}
 
-                  {/* Quick Action icon */}
-                  <span className="opacity-0 group-hover:opacity-100 text-muted-foreground hover:text-foreground ml-auto transition-opacity">
-                    <Eye size={12} />
-                  </span>
-                </div>
-              );
-            })
+                      {/* Message */}
+                      <span
+                        className={`flex-1 text-foreground select-text ${
+                          wrapLines
+                            ? 'whitespace-pre-wrap break-all'
+                            : 'whitespace-nowrap overflow-x-hidden text-ellipsis'
+                        }`}
+                      >
+                        {log.message}
+                      </span>
+
+                      {/* Quick Action icon */}
+                      <span className="opacity-0 group-hover:opacity-100 text-muted-foreground hover:text-foreground ml-auto transition-opacity">
+                        <Eye size={12} />
+                      </span>
+                    </div>
+                  </div>
+                );
+              })}
+            </div>
           )}
-          <div ref={consoleEndRef} />
         </div>
 
         {/* Selected Log Drawer */}
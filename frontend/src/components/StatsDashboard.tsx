@@ -3,7 +3,11 @@ import { useQuery } from '@tanstack/react-query';
 import { fetchStats } from '../api/client';
 import { useTheme } from '../theme';
 import { useI18n } from '../i18n/locale';
-import { DEFAULT_SUB_METRICS, getStatsTimeWindow } from './stats-dashboard/constants';
+import {
+  DEFAULT_SUB_METRICS,
+  getStatsTimeWindow,
+  STATS_MAX_POINTS,
+} from './stats-dashboard/constants';
 import StatsDashboardHeader from './stats-dashboard/StatsDashboardHeader';
 import StatsChartPanel from './stats-dashboard/StatsChartPanel';
 import StatsMetricSidebar from './stats-dashboard/StatsMetricSidebar';
@@ -84,7 +88,7 @@ export default function StatsDashboard() {
     error,
   } = useQuery({
     queryKey: ['stats', timeRange],
-    queryFn: () => fetchStats(since, until),
+    queryFn: () => fetchStats(since, until, STATS_MAX_POINTS),
     refetchInterval: 15000,
   });
 
@@ -33,6 +33,8 @@ type ScaleOptionsParams = {
 
 function timeXScale(colors: ChartColors, window: StatsChartWindow) {
   const tickColor = colors.axis;
+  const multiDay =
+    new Date(window.until).getTime() - new Date(window.since).getTime() > 24 * 60 * 60 * 1000;
   return {
     type: 'time' as const,
     min: window.since,
@@ -42,7 +44,7 @@ function timeXScale(colors: ChartColors, window: StatsChartWindow) {
       maxRotation: 0,
       autoSkip: true,
       maxTicksLimit: 8,
-      callback: (value: string | number) => formatChartTimeFromMs(Number(value)),
+      callback: (value: string | number) => formatChartTimeFromMs(Number(value), multiDay),
     },
     grid: { color: colors.grid },
   };
@@ -14,8 +14,13 @@ const RANGE_MS: Record<TimeRange, number> = {
   '6h': 6 * 60 * 60 * 1000,
   '12h': 12 * 60 * 60 * 1000,
   '24h': 24 * 60 * 60 * 1000,
+  '7d': 7 * 24 * 60 * 60 * 1000,
+  '30d': 30 * 24 * 60 * 60 * 1000,
 };
 
+// Rows requested per chart; longer ranges are served from coarser stats rollups.
+export const STATS_MAX_POINTS = 1500;
+
 export type StatsChartWindow = {
   since: string;
   until: string;
@@ -32,19 +37,20 @@ export function activityBucketCenterMs(row: Pick<ActivityStatRecord, 'since' | '
 
 export type EnrichedActivityRow = ActivityStatRecord;
 
-export function formatChartTime(isoString: string): string {
+export function formatChartTime(isoString: string, withDate = false): string {
   try {
-    return new Date(isoString).toLocaleTimeString([], {
-      hour: '2-digit',
-      minute: '2-digit',
-    });
+    const date = new Date(isoString);
+    const time = { hour: '2-digit', minute: '2-digit' } as const;
+    return withDate
+      ? date.toLocaleString([], { month: '2-digit', day: '2-digit', ...time })
+      : date.toLocaleTimeString([], time);
   } catch {
     return isoString;
   }
 }
 
-export function formatChartTimeFromMs(ms: number): string {
-  return formatChartTime(new Date(ms).toISOString());
+export function formatChartTimeFromMs(ms: number, withDate = false): string {
+  return formatChartTime(new Date(ms).toISOString(), withDate);
 }
 
 export function formatChartTooltipLabel(value: unknown): string {
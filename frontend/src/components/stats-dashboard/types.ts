@@ -1,4 +1,4 @@
-export type TimeRange = '1h' | '3h' | '6h' | '12h' | '24h';
+export type TimeRange = '1h' | '3h' | '6h' | '12h' | '24h' | '7d' | '30d';
 export type ViewMode = 'activity' | 'database';
 export type ActivityCategory = 'query' | 'ingestion' | 'insertion' | 'connections';
 
@@ -20,4 +20,4 @@ export type ActivityCategoryConfig = {
   subs: { id: string; label: string }[];
 };
 
-export const TIME_RANGES: TimeRange[] = ['1h', '3h', '6h', '12h', '24h'];
+export const TIME_RANGES: TimeRange[] = ['1h', '3h', '6h', '12h', '24h', '7d', '30d'];
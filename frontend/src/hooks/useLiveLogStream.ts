@@ -1,53 +1,87 @@
 import { useEffect, useRef, useState } from 'react';
 import { getSSEUrl } from '../api/client';
+import { RingBuffer } from '../utils/ringBuffer';
+import type {
+  LiveLogFilter,
+  LiveLogRecord,
+  LiveLogWorkerRequest,
+  LiveLogWorkerResponse,
+} from '../workers/liveLogStreamProtocol';
 
-export type LiveLogRecord = {
-  id: number;
-  timestamp: string;
-  level: string;
-  service: string;
-  message: string;
-  [key: string]: unknown;
-};
+export type { LiveLogFilter, LiveLogRecord } from '../workers/liveLogStreamProtocol';
 
-export function useLiveLogStream(isPaused: boolean, maxLogs = 500) {
+/**
+ * Live `/logs/sse` records that pass `filter`, oldest first, at most `maxLogs`.
+ *
+ * SSE payloads are parsed and filtered in a Web Worker; the page only applies
+ * the worker's deltas to its own ring buffer and re-renders at most once per
+ * animation frame, however fast records arrive.
+ */
+export function useLiveLogStream(isPaused: boolean, filter: LiveLogFilter, maxLogs = 5000) {
   const [logs, setLogs] = useState<LiveLogRecord[]>([]);
-  const bufferRef = useRef<LiveLogRecord[]>([]);
-  const eventSourceRef = useRef<EventSource | null>(null);
+  const workerRef = useRef<Worker | null>(null);
+  const filterRef = useRef(filter);
 
   useEffect(() => {
-    if (isPaused) {
-      eventSourceRef.current?.close();
-      eventSourceRef.current = null;
-      return;
-    }
+    const worker = new Worker(new URL('../workers/liveLogStream.worker.ts', import.meta.url), {
+      type: 'module',
+    });
+    workerRef.current = worker;
 
-    const es = new EventSource(getSSEUrl('*'));
-    eventSourceRef.current = es;
+    const view = new RingBuffer<LiveLogRecord>(maxLogs);
+    let frame = 0;
+    worker.onmessage = (event: MessageEvent<LiveLogWorkerResponse>) => {
+      const response = event.data;
+      if (response.type === 'reset') view.clear();
+      else view.dropOldest(response.dropped);
+      for (const record of response.records) view.push(record);
 
-    es.onmessage = (event) => {
-      try {
-        const incoming = JSON.parse(event.data) as LiveLogRecord[];
-        if (incoming?.length > 0) {
-          const ascending = [...incoming].reverse();
-          bufferRef.current = [...bufferRef.current, ...ascending].slice(-maxLogs);
-          setLogs([...bufferRef.current]);
-        }
-      } catch (err) {
-        console.error('Failed to parse SSE payload:', err);
+      if (frame === 0) {
+        frame = requestAnimationFrame(() => {
+          frame = 0;
+          setLogs(view.toArray());
+        });
       }
     };
+    worker.postMessage({
+      type: 'init',
+      capacity: maxLogs,
+      filter: filterRef.current,
+    } satisfies LiveLogWorkerRequest);
+    setLogs([]);
+
+    return () => {
+      cancelAnimationFrame(frame);
+      worker.terminate();
+      workerRef.current = null;
+    };
+  }, [maxLogs]);
+
+  useEffect(() => {
+    if (filterRef.current === filter) return;
+    filterRef.current = filter;
+    workerRef.current?.postMessage({ type: 'filter', filter } satisfies LiveLogWorkerRequest);
+  }, [filter]);
 
+  useEffect(() => {
+    if (isPaused) return;
+
+    const es = new EventSource(getSSEUrl('*'));
+    es.onmessage = (event) => {
+      workerRef.current?.postMessage({
+        type: 'payload',
+        data: event.data,
+      } satisfies LiveLogWorkerRequest);
+    };
     es.onerror = (err) => {
       console.warn('SSE disconnected, browser will attempt reconnection:', err);
     };
 
     return () => es.close();
-  }, [isPaused, maxLogs]);
+  }, [isPaused]);
 
   const clearLogs = () => {
-    bufferRef.current = [];
-    setLogs([]);
+    workerRef.current?.postMessage({ type: 'clear' } satisfies LiveLogWorkerRequest);
   };
 
   return { logs, clearLogs };
@@ -0,0 +1,113 @@
+import { useCallback, useEffect, useRef, useState, type UIEvent } from 'react';
+
+type VirtualRowsOptions = {
+  count: number;
+  getKey: (index: number) => string;
+  /** Height in px assumed for rows that have not been measured yet. */
+  estimateSize: number;
+  /** Rows rendered beyond each edge of the viewport. */
+  overscan?: number;
+};
+
+export type VirtualRow = {
+  index: number;
+  key: string;
+  /** Offset of the row's top from the top of the list, in px. */
+  start: number;
+};
+
+/**
+ * Windowing for a scrollable list of variable-height rows: returns only the rows
+ * in (or near) the viewport, positioned inside a spacer of `totalSize` px.
+ *
+ * Attach `scrollRef` and `onScroll` to the scroll container, and `measureRow` as
+ * the ref of each rendered row element together with `data-key={row.key}`; rows
+ * are re-measured whenever their size changes (e.g. when text wraps).
+ */
+export function useVirtualRows({ count, getKey, estimateSize, overscan = 10 }: VirtualRowsOptions) {
+  const scrollRef = useRef<HTMLDivElement>(null);
+  const [viewport, setViewport] = useState({ top: 0, height: 0 });
+  const [sizes, setSizes] = useState<ReadonlyMap<string, number>>(() => new Map());
+  const rowObserverRef = useRef<ResizeObserver | null>(null);
+
+  useEffect(() => {
+    const el = scrollRef.current;
+    if (!el) return;
+    const update = () => setViewport({ top: el.scrollTop, height: el.clientHeight });
+    update();
+    const observer = new ResizeObserver(update);
+    observer.observe(el);
+    return () => {
+      observer.disconnect();
+      rowObserverRef.current?.disconnect();
+      rowObserverRef.current = null;
+    };
+  }, []);
+
+  // Forget sizes of rows that left the list once they outnumber the live ones.
+  useEffect(() => {
+    if (sizes.size <= 2 * count + 100) return;
+    const live = new Set<string>();
+    for (let i = 0; i < count; i++) live.add(getKey(i));
+    setSizes((prev) => new Map([...prev].filter(([key]) => live.has(key))));
+  }, [count, getKey, sizes]);
+
+  const measureRow = useCallback((el: HTMLElement | null) => {
+    if (!el) return;
+    rowObserverRef.current ??= new ResizeObserver((entries) => {
+      setSizes((prev) => {
+        let next: Map<string, number> | null = null;
+        for (const entry of entries) {
+          const target = entry.target as HTMLElement;
+          const key = target.dataset.key;
+          const size = entry.borderBoxSize?.[0]?.blockSize ?? target.offsetHeight;
+          if (key === undefined || prev.get(key) === size) continue;
+          next ??= new Map(prev);
+          next.set(key, size);
+        }
+        return next ?? prev;
+      });
+    });
+    const observer = rowObserverRef.current;
+    observer.observe(el);
+    return () => observer.unobserve(el);
+  }, []);
+
+  const onScroll = useCallback((event: UIEvent<HTMLElement>) => {
+    const top = event.currentTarget.scrollTop;
+    setViewport((prev) => (prev.top === top ? prev : { ...prev, top }));
+  }, []);
+
+  // Also updates the window right away, so the rows at the end render before paint.
+  const scrollToEnd = useCallback(() => {
+    const el = scrollRef.current;
+    if (!el) return;
+    el.scrollTop = el.scrollHeight;
+    const top = el.scrollTop;
+    setViewport((prev) => (prev.top === top ? prev : { ...prev, top }));
+  }, []);
+
+  // offsets[i] is the top of row i; offsets[count] the total height.
+  const offsets = new Float64Array(count + 1);
+  for (let i = 0; i < count; i++) {
+    offsets[i + 1] = offsets[i] + (sizes.get(getKey(i)) ?? estimateSize);
+  }
+
+  // First row whose bottom is below the top of the viewport.
+  let first = 0;
+  let last = count;
+  while (first < last) {
+    const mid = (first + last) >>> 1;
+    if (offsets[mid + 1] <= viewport.top) first = mid + 1;
+    else last = mid;
+  }
+  last = first;
+  while (last < count && offsets[last] < viewport.top + viewport.height) last++;
+
+  const rows: VirtualRow[] = [];
+  for (let i = Math.max(0, first - overscan); i < Math.min(count, last + overscan); i++) {
+    rows.push({ index: i, key: getKey(i), start: offsets[i] });
+  }
+
+  return { scrollRef, onScroll, measureRow, scrollToEnd, rows, totalSize: offsets[count] };
+}
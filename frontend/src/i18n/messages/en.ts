@@ -118,25 +118,42 @@ export const en = {
   'settingsDesc.log_table_name': 'SQLite table name used to store log records.',
   'settingsDesc.log_timestamp_field':
     'Column used for time-based retention and vacuum (ISO-8601 timestamps).',
+  'settingsDesc.json_fields':
+    'JSON paths stored as indexed generated columns for fast filtering.',
   'settingsDesc.sqlite_params': 'SQLite PRAGMA key/value pairs applied when opening the database.',
   'settingsDesc.auto_rollout':
     'Whether pending migrations are applied automatically on server startup.',
   'settingsDesc.db_pool_size': 'Reader connection pool size',
+  'settingsDesc.query_timeout_ms':
+    'Default and maximum time budget of a GET /logs query, in ms (0 = unlimited).',
+  'settingsDesc.query_max_scan_rows':
+    'Maximum rows a GET /logs query may scan without an index (0 = unlimited).',
   'settingsDesc.vacuum_max_days': 'Drop log rows older than this many days during vacuum.',
   'settingsDesc.vacuum_max_size': 'Trigger vacuum when the database file exceeds this size.',
   'settingsDesc.vacuum_target_size':
     'After vacuum, trim oldest rows until the database is under this size.',
   'settingsDesc.task_diagnostics_interval':
     'Seconds between activity and database stats collection passes.',
-  'settingsDesc.task_backlog_flush_interval': 'Seconds between backlog flush passes to SQLite.',
+  'settingsDesc.task_backlog_flush_interval':
+    'Upper bound in seconds on how long the backlog flush task sleeps.',
   'settingsDesc.task_backlog_max_size':
-    'Maximum backlog entries before a forced flush to the database.',
+    'Maximum backlog entries; the oldest are dropped beyond this.',
+  'settingsDesc.task_backlog_target_latency_ms':
+    'Target milliseconds from ingestion to commit; sizes adaptive flush batches.',
+  'settingsDesc.task_backlog_max_batch': 'Maximum rows written by one backlog flush transaction.',
   'settingsDesc.task_vacuum_interval': 'Seconds between incremental SQLite vacuum passes.',
   'settingsDesc.task_vacuum_max_size': 'Megabyte budget per incremental vacuum pass.',
+  'settingsDesc.task_vacuum_chunk_ms':
+    'Milliseconds each retention delete chunk aims to hold the writer for.',
+  'settingsDesc.task_checkpoint_interval': 'Seconds between WAL checkpoint passes.',
+  'settingsDesc.wal_checkpoint_size': 'WAL file size that triggers a truncating checkpoint.',
   'settingsDesc.stats_retention_hours': 'Hours to retain collected stats rows before pruning.',
+  'settingsDesc.stats_rollups':
+    'Downsampled stats tiers as resolution (seconds) : retention (hours).',
   'settingsDesc.compression_enabled':
     'Whether dictionary compression is enabled for configured log columns.',
   'settingsDesc.harvester_types': 'Harvester implementation types configured for this instance.',
+  'settingsDesc.harvester_ring_size': 'Shared-memory ring size per Python harvester worker process.',
   'test.colField': 'Field',
   'test.colType': 'Type',
   'test.colRequired': 'Required',
@@ -116,20 +116,30 @@ export const zh: Record<MessageKey, string> = {
   'json.copied': '已复制！',
   'settingsDesc.log_table_name': '日志记录的 SQLite 表名',
   'settingsDesc.log_timestamp_field': '日志记录时间戳字段名（ISO-8601 时间戳）',
+  'settingsDesc.json_fields': '以带索引的生成列存储、可快速过滤的 JSON 路径',
   'settingsDesc.sqlite_params': 'SQLite PRAGMA 配置键值对',
   'settingsDesc.auto_rollout': '启动时是否执行数据库迁移',
   'settingsDesc.task_diagnostics_interval': '统计数据采集间隔（秒）',
   'settingsDesc.task_vacuum_interval': '数据清理检查间隔（秒）',
-  'settingsDesc.task_backlog_flush_interval': '积压日志落盘前的最大缓存时间（秒）',
-  'settingsDesc.task_backlog_max_size': '积压条目数量超过该值时立刻落盘（个）',
+  'settingsDesc.task_backlog_flush_interval': '落盘任务的最长休眠时间（秒）',
+  'settingsDesc.task_backlog_max_size': '积压条目数量上限，超出后丢弃最旧的条目（个）',
+  'settingsDesc.task_backlog_target_latency_ms': '日志从接收到落盘的目标延迟，用于自适应批量大小（毫秒）',
+  'settingsDesc.task_backlog_max_batch': '单次落盘事务写入的最大条目数（个）',
   'settingsDesc.task_vacuum_max_size': '每个数据清理任务，最多清理多少数据（MB）',
+  'settingsDesc.task_vacuum_chunk_ms': '每批过期日志删除占用写入连接的目标时长（毫秒）',
+  'settingsDesc.task_checkpoint_interval': 'WAL 检查点任务的执行间隔（秒）',
+  'settingsDesc.wal_checkpoint_size': 'WAL 文件超过此体积时执行截断检查点',
   'settingsDesc.stats_retention_hours': '统计数据的保留时长（小时）',
+  'settingsDesc.stats_rollups': '降采样统计层级：分辨率（秒）: 保留时长（小时）',
   'settingsDesc.vacuum_max_days': '数据清理: 触发清理的日志条目保留天数',
   'settingsDesc.vacuum_max_size': '数据清理: 触发清理的存储体积上限（MB）',
   'settingsDesc.vacuum_target_size': '数据清理: 清理到此目标体积（MB）',
   'settingsDesc.db_pool_size': '数据库连接池大小',
+  'settingsDesc.query_timeout_ms': '日志查询的默认及最大时间预算（毫秒，0 表示不限制）',
+  'settingsDesc.query_max_scan_rows': '日志查询无索引时最多扫描的行数（0 表示不限制）',
   'settingsDesc.compression_enabled': '是否启用字典压缩',
   'settingsDesc.harvester_types': '启用的日期采集器',
+  'settingsDesc.harvester_ring_size': '每个 Python 采集器工作进程的共享内存环形缓冲区大小',
   'test.send': '发送测试日志',
   'test.colField': '字段',
   'test.colType': '类型',
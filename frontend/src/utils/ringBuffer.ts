@@ -0,0 +1,61 @@
+/** Fixed-capacity FIFO; pushing onto a full buffer evicts the oldest item. */
+export class RingBuffer<T> {
+  readonly capacity: number;
+  private items: (T | undefined)[];
+  private head = 0; // index of the oldest item
+  private size = 0;
+
+  constructor(capacity: number) {
+    this.capacity = Math.max(1, Math.floor(capacity));
+    this.items = new Array<T | undefined>(this.capacity);
+  }
+
+  get length(): number {
+    return this.size;
+  }
+
+  /** Item `index` positions after the oldest one. */
+  at(index: number): T | undefined {
+    if (index < 0 || index >= this.size) return undefined;
+    return this.items[(this.head + index) % this.capacity];
+  }
+
+  /** Appends `item`; returns the item it evicted, if the buffer was full. */
+  push(item: T): T | undefined {
+    const tail = (this.head + this.size) % this.capacity;
+    if (this.size < this.capacity) {
+      this.items[tail] = item;
+      this.size++;
+      return undefined;
+    }
+    const evicted = this.items[this.head];
+    this.items[this.head] = item;
+    this.head = (this.head + 1) % this.capacity;
+    return evicted;
+  }
+
+  /** Removes up to `count` of the oldest items. */
+  dropOldest(count: number): void {
+    const n = Math.min(Math.max(0, count), this.size);
+    for (let i = 0; i < n; i++) {
+      this.items[(this.head + i) % this.capacity] = undefined;
+    }
+    this.head = (this.head + n) % this.capacity;
+    this.size -= n;
+  }
+
+  clear(): void {
+    this.items = new Array<T | undefined>(this.capacity);
+    this.head = 0;
+    this.size = 0;
+  }
+
+  /** Items from oldest to newest. */
+  toArray(): T[] {
+    const out = new Array<T>(this.size);
+    for (let i = 0; i < this.size; i++) {
+      out[i] = this.items[(this.head + i) % this.capacity] as T;
+    }
+    return out;
+  }
+}
@@ -0,0 +1,101 @@
+// Parses and filters live SSE payloads off the main thread. Keeps the newest
+// `capacity` records in a ring buffer and tells the page which of them the
+// current filter shows.
+
+import { RingBuffer } from '../utils/ringBuffer';
+import type {
+  LiveLogFilter,
+  LiveLogRecord,
+  LiveLogWorkerRequest,
+  LiveLogWorkerResponse,
+} from './liveLogStreamProtocol';
+
+type Entry = {
+  record: LiveLogRecord;
+  level: string; // upper-case
+  haystack: string; // lower-case message, service and level
+  matches: boolean;
+};
+
+let entries = new RingBuffer<Entry>(500);
+let filter: LiveLogFilter = { levels: {}, search: '' }; // `search` lower-cased
+
+function post(message: LiveLogWorkerResponse) {
+  self.postMessage(message);
+}
+
+function matches(entry: Entry): boolean {
+  if (!(filter.levels[entry.level] ?? true)) return false;
+  return !filter.search || entry.haystack.includes(filter.search);
+}
+
+function toEntry(record: LiveLogRecord): Entry {
+  const text = (value: unknown) => (value == null ? '' : String(value));
+  const level = text(record.level);
+  const entry: Entry = {
+    record,
+    level: level.toUpperCase(),
+    haystack: [text(record.message), text(record.service), level].join('\n').toLowerCase(),
+    matches: false,
+  };
+  entry.matches = matches(entry);
+  return entry;
+}
+
+function setFilter(next: LiveLogFilter) {
+  filter = { levels: next.levels, search: next.search.toLowerCase() };
+}
+
+function resetView() {
+  const records: LiveLogRecord[] = [];
+  for (let i = 0; i < entries.length; i++) {
+    const entry = entries.at(i)!;
+    entry.matches = matches(entry);
+    if (entry.matches) records.push(entry.record);
+  }
+  post({ type: 'reset', records });
+}
+
+function ingest(data: string) {
+  let incoming: unknown;
+  try {
+    incoming = JSON.parse(data);
+  } catch (err) {
+    console.error('Failed to parse SSE payload:', err);
+    return;
+  }
+  if (!Array.isArray(incoming) || incoming.length === 0) return;
+
+  // Payloads are newest first; records beyond the capacity would be evicted at once.
+  const records: LiveLogRecord[] = [];
+  let dropped = 0;
+  for (let i = Math.min(incoming.length, entries.capacity) - 1; i >= 0; i--) {
+    const record = incoming[i];
+    if (record === null || typeof record !== 'object') continue;
+    const entry = toEntry(record as LiveLogRecord);
+    if (entries.push(entry)?.matches) dropped++;
+    if (entry.matches) records.push(entry.record);
+  }
+  if (records.length > 0 || dropped > 0) post({ type: 'append', records, dropped });
+}
+
+self.onmessage = (event: MessageEvent<LiveLogWorkerRequest>) => {
+  const request = event.data;
+  switch (request.type) {
+    case 'init':
+      entries = new RingBuffer<Entry>(request.capacity);
+      setFilter(request.filter);
+      break;
+    case 'payload':
+      ingest(request.data);
+      break;
+    case 'filter':
+      setFilter(request.filter);
+      resetView();
+      break;
+    case 'clear':
+      entries.clear();
+      post({ type: 'reset', records: [] });
+      break;
+  }
+};
@@ -0,0 +1,30 @@
+// Messages between useLiveLogStream and liveLogStream.worker.
+
+export type LiveLogRecord = {
+  id: number;
+  timestamp: string;
+  level: string;
+  service: string;
+  message: string;
+  [key: string]: unknown;
+};
+
+export type LiveLogFilter = {
+  /** Upper-case level → shown; levels missing from the map are shown. */
+  levels: Record<string, boolean>;
+  /** Case-insensitive substring of message, service or level; empty matches all. */
+  search: string;
+};
+
+export type LiveLogWorkerRequest =
+  | { type: 'init'; capacity: number; filter: LiveLogFilter }
+  /** Raw SSE `data`: a JSON array of records, newest first. */
+  | { type: 'payload'; data: string }
+  | { type: 'filter'; filter: LiveLogFilter }
+  | { type: 'clear' };
+
+export type LiveLogWorkerResponse =
+  /** Newly matching records (oldest first) after dropping the `dropped` oldest shown ones. */
+  | { type: 'append'; records: LiveLogRecord[]; dropped: number }
+  /** The complete filtered view, oldest first. */
+  | { type: 'reset'; records: LiveLogRecord[] };
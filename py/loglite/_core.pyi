@@ -6,6 +6,7 @@ class HarvesterDef:
     type: str
     name: str
     config: dict[str, str]
+    worker: str
 
 class Config:
     host: str
@@ -32,6 +33,34 @@ def rollback(config_path: str, version: int, force: bool = False) -> None:
     """Roll back a single migration."""
     ...
 
+def snapshot(config_path: str, output: str = "") -> str:
+    """Copy the database to ``output`` (default: a new file under ``<sqlite_dir>/snapshots``).
+
+    Returns the path written.
+    """
+    ...
+
 def push_to_backlog(log: dict) -> None:
     """Push a log entry dict into the active server backlog (thread-safe)."""
     ...
+
+def native_harvester_types() -> list[str]:
+    """Harvester type names run by the C++ core; the Python manager skips them."""
+    ...
+
+def harvester_ring_name(worker: str) -> str:
+    """Shared-memory ring name for harvester worker ``worker`` of the server in this process."""
+    ...
+
+class HarvesterRing:
+    """Producer end of a harvester worker's shared-memory ring.
+
+    Raises ``RuntimeError`` if the server has not created the ring (yet).
+    """
+
+    dropped: int
+
+    def __init__(self, name: str) -> None: ...
+    def push(self, log: dict) -> bool:
+        """Serialize a log entry into the ring; ``False`` if it was dropped (ring full)."""
+        ...
@@ -1,7 +1,7 @@
 import asyncio
 import threading
 
-from typer import Option, Typer
+from typer import Option, Typer, echo
 
 from loglite import _core
 from loglite.harvesters.manager import HarvesterManager
@@ -17,7 +17,8 @@ app.add_typer(migration_app, name="migrate")
 async def _run_python_harvesters(config_path: str, stop_event: threading.Event) -> None:
     cfg = _core.Config.from_file(config_path)
     harvester_defs = [
-        {"type": h.type, "name": h.name, "config": dict(h.config)} for h in cfg.harvesters
+        {"type": h.type, "name": h.name, "config": dict(h.config), "worker": h.worker}
+        for h in cfg.harvesters
     ]
     mgr = HarvesterManager()
     mgr.load_harvesters(harvester_defs)
@@ -67,3 +68,12 @@ def rollback(
     force: bool = Option(False, "--force", "-f"),
 ):
     _core.rollback(config, version_id, force)
+
+
+@app.command()
+def snapshot(
+    config: str = Option(..., "--config", "-c"),
+    output: str = Option("", "--output", "-o", help="Defaults to <sqlite_dir>/snapshots/"),
+):
+    """Copy the database to a standalone file; safe while the server is running."""
+    echo(_core.snapshot(config, output))
@@ -0,0 +1,285 @@
+"""Bulk query client for ``GET /logs``.
+
+Requests the columnar MessagePack response (``Accept: application/msgpack``) and
+exposes each column as NumPy arrays backed by the response buffers, so fetching a
+page of N rows creates a handful of arrays instead of N dicts. ``to_arrow()``
+wraps the same buffers as ``pyarrow`` arrays when pyarrow is installed.
+
+Requires the ``client`` extra: ``pip install loglite[client]``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import http.client
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Literal, Mapping
+from urllib.parse import urlencode
+
+import msgpack
+import numpy as np
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+__all__ = [
+    "Column",
+    "ColumnBatch",
+    "LogliteClient",
+    "QueryError",
+]
+
+ColumnType = Literal["int64", "float64", "utf8", "null"]
+
+_MSGPACK = "application/msgpack"
+_MAX_ID = 2**63 - 1
+_NUMPY_DTYPES = {"int64": np.dtype("<i8"), "float64": np.dtype("<f8")}
+
+
+class QueryError(Exception):
+    """The server rejected a query (non-200 response)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+@dataclass(frozen=True)
+class Column:
+    """One column of a result page, in Arrow-style buffers.
+
+    - ``validity``: one byte per row (1 = present), or ``None`` when nothing is null.
+    - ``data``: little-endian values for ``int64``/``float64``; concatenated UTF-8
+      for ``utf8``.
+    - ``offsets``: ``rows + 1`` int32 offsets into ``data`` (``utf8`` only).
+    """
+
+    name: str
+    type: ColumnType
+    length: int
+    data: bytes
+    validity: bytes | None = None
+    offsets: bytes | None = None
+
+    @property
+    def mask(self) -> np.ndarray | None:
+        """Boolean array, True where the value is null (NumPy masked-array convention)."""
+        if self.validity is None:
+            return None
+        return np.frombuffer(self.validity, dtype=np.uint8) == 0
+
+    @property
+    def values(self) -> np.ndarray:
+        """Zero-copy view of numeric values (nulls read as 0)."""
+        dtype = _NUMPY_DTYPES.get(self.type)
+        if dtype is None:
+            raise TypeError(f"column '{self.name}' of type {self.type} has no numeric values")
+        return np.frombuffer(self.data, dtype=dtype)
+
+    def to_numpy(self) -> np.ndarray:
+        """Numeric columns as (masked) arrays; text columns as an object array of str."""
+        if self.type in _NUMPY_DTYPES:
+            mask = self.mask
+            return self.values if mask is None else np.ma.MaskedArray(self.values, mask=mask)
+        return np.array(self.to_pylist(), dtype=object)
+
+    def to_pylist(self) -> list[Any]:
+        """Materialize Python objects, one per row (convenient, but slow for big pages)."""
+        mask = self.mask
+        if self.type == "null":
+            return [None] * self.length
+        if self.type in _NUMPY_DTYPES:
+            out = self.values.tolist()
+        else:
+            offsets = np.frombuffer(self.offsets or b"", dtype="<i4")
+            out = [self.data[offsets[i] : offsets[i + 1]].decode() for i in range(self.length)]
+        if mask is not None:
+            out = [None if m else v for v, m in zip(out, mask.tolist())]
+        return out
+
+    def to_arrow(self) -> pa.Array:
+        """Wrap the buffers as a ``pyarrow.Array`` without copying the values."""
+        import pyarrow as pa
+
+        if self.type == "null":
+            return pa.nulls(self.length)
+
+        bitmap = None
+        if self.validity is not None:
+            bits = np.packbits(np.frombuffer(self.validity, dtype=np.uint8), bitorder="little")
+            bitmap = pa.py_buffer(bits.tobytes())
+
+        if self.type == "utf8":
+            buffers = [bitmap, pa.py_buffer(self.offsets or b""), pa.py_buffer(self.data)]
+            return pa.Array.from_buffers(pa.string(), self.length, buffers)
+
+        arrow_type = pa.int64() if self.type == "int64" else pa.float64()
+        return pa.Array.from_buffers(arrow_type, self.length, [bitmap, pa.py_buffer(self.data)])
+
+
+@dataclass(frozen=True)
+class ColumnBatch:
+    """One page of ``GET /logs`` results, column-wise (newest rows first).
+
+    ``total`` is -1 on keyset pages (``before_id``), which the server does not count.
+    """
+
+    total: int
+    offset: int
+    limit: int
+    rows: int
+    columns: dict[str, Column]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def to_numpy(self) -> dict[str, np.ndarray]:
+        return {name: col.to_numpy() for name, col in self.columns.items()}
+
+    def to_arrow(self) -> pa.RecordBatch:
+        import pyarrow as pa
+
+        return pa.RecordBatch.from_arrays(
+            [c.to_arrow() for c in self.columns.values()], names=list(self.columns)
+        )
+
+    @classmethod
+    def from_msgpack(cls, payload: bytes) -> ColumnBatch:
+        doc = msgpack.unpackb(payload, raw=False)
+        rows = doc["rows"]
+        columns = {
+            c["name"]: Column(
+                name=c["name"],
+                type=c["type"],
+                length=rows,
+                data=c["data"],
+                validity=c.get("validity"),
+                offsets=c.get("offsets"),
+            )
+            for c in doc["columns"]
+        }
+        return cls(
+            total=doc["total"],
+            offset=doc["offset"],
+            limit=doc["limit"],
+            rows=rows,
+            columns=columns,
+        )
+
+
+class LogliteClient:
+    """Fetch query results from a loglite server in columnar form.
+
+    ``filters`` map a column to a loglite filter expression, exactly as on the
+    query string: ``{"level": "=ERROR", "timestamp": ">=2026-01-01,<2026-01-02"}``.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 7788, *, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._conn: http.client.HTTPConnection | None = None
+
+    def query(
+        self,
+        fields: str | list[str] = "*",
+        *,
+        limit: int = 1000,
+        offset: int = 0,
+        filters: Mapping[str, str] | None = None,
+        before_id: int | None = None,
+    ) -> ColumnBatch:
+        """Fetch one page.
+
+        With ``before_id``, the page holds the rows with a lower ``id``, highest
+        first, instead of being ordered by timestamp.
+        """
+        params: dict[str, Any] = {
+            "fields": fields if isinstance(fields, str) else ",".join(fields),
+            "limit": limit,
+            "offset": offset,
+        }
+        if before_id is not None:
+            params["before_id"] = before_id
+        params.update(filters or {})
+        return ColumnBatch.from_msgpack(self._get(f"/logs?{urlencode(params)}"))
+
+    def iter_batches(
+        self,
+        fields: str | list[str] = "*",
+        *,
+        batch_size: int = 10_000,
+        filters: Mapping[str, str] | None = None,
+        max_rows: int | None = None,
+    ) -> Iterator[ColumnBatch]:
+        """Page through every matching row, ``batch_size`` rows at a time.
+
+        Pages by ``id`` (``before_id`` is the lowest id of the previous page), so
+        rows inserted meanwhile neither shift nor repeat rows, and each page costs
+        the same however deep it is. ``id`` is fetched for that even when
+        ``fields`` does not name it, and then left out of the batches.
+        """
+        names = fields.split(",") if isinstance(fields, str) else list(fields)
+        extra_id = names != ["*"] and "id" not in names
+        if extra_id:
+            names.append("id")
+
+        before_id = _MAX_ID
+        fetched = 0
+        while max_rows is None or fetched < max_rows:
+            limit = batch_size if max_rows is None else min(batch_size, max_rows - fetched)
+            batch = self.query(names, limit=limit, filters=filters, before_id=before_id)
+            if batch.rows == 0:
+                return
+            before_id = int(batch["id"].values[-1])
+            if extra_id:
+                columns = {name: c for name, c in batch.columns.items() if name != "id"}
+                batch = dataclasses.replace(batch, columns=columns)
+            yield batch
+            fetched += batch.rows
+            if batch.rows < limit:
+                return
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> LogliteClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _get(self, target: str) -> bytes:
+        try:
+            status, content_type, body = self._request(target)
+        except ConnectionError:
+            # The server may have closed an idle keep-alive connection; retry once.
+            self.close()
+            status, content_type, body = self._request(target)
+
+        if status != 200:
+            try:
+                message = json.loads(body).get("error", "")
+            except ValueError:
+                message = body.decode(errors="replace")
+            raise QueryError(status, message)
+        if content_type != _MSGPACK:
+            raise QueryError(status, f"expected {_MSGPACK} response, got {content_type!r}")
+        return body
+
+    def _request(self, target: str) -> tuple[int, str, bytes]:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self._conn.request("GET", target, headers={"Accept": _MSGPACK})
+        resp = self._conn.getresponse()
+        body = resp.read()
+        if resp.will_close:
+            self.close()
+        return resp.status, resp.getheader("Content-Type", ""), body
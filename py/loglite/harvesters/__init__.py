@@ -1,10 +1,22 @@
 from .base import BaseHarvesterConfig, Harvester
 from .manager import HarvesterManager
 from .socket import SocketHarvester
+from .worker import HarvesterWorker
 
 __all__ = [
     "BaseHarvesterConfig",
     "Harvester",
     "HarvesterManager",
+    "HarvesterWorker",
     "SocketHarvester",
 ]
+
+
+def __getattr__(name: str):
+    # ZMQHarvester needs the optional pyzmq dependency; import it on first use so
+    # ``loglite.harvesters.ZMQHarvester`` resolves when the core has no ZeroMQ.
+    if name == "ZMQHarvester":
+        from .zmq import ZMQHarvester
+
+        return ZMQHarvester
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -31,6 +31,8 @@ class Harvester(ABC, Generic[T]):
         self.config = config
         self._running = False
         self._task: asyncio.Task | None = None
+        # Set when running in a harvester worker process (see loglite.harvesters.worker).
+        self.ring: _core.HarvesterRing | None = None
 
     def __init_subclass__(cls, **kwargs: Any):
         super().__init_subclass__(**kwargs)
@@ -73,4 +75,7 @@ class Harvester(ABC, Generic[T]):
         self._task = None
 
     def ingest(self, log: dict[str, Any]):
-        _core.push_to_backlog(log)
+        if self.ring is not None:
+            self.ring.push(log)
+        else:
+            _core.push_to_backlog(log)
@@ -1,17 +1,16 @@
+import asyncio
 import dataclasses
 import importlib
 from typing import Any, Optional, Type
 
 from loguru import logger
 
+from loglite import _core
 from loglite.harvesters.base import Harvester
+from loglite.harvesters.worker import HarvesterWorker
 
-# Harvester types that are handled natively by the C++ core.
-# The Python manager skips these so C++ doesn't double-start them.
-_NATIVE_TYPES = {
-    "FileHarvester",
-    "loglite.harvesters.FileHarvester",
-}
+# Seconds between liveness checks of harvester worker processes.
+SUPERVISE_INTERVAL = 1.0
 
 
 def import_class(fully_qualified_name: str) -> Optional[Type[Harvester]]:
@@ -27,23 +26,37 @@ def import_class(fully_qualified_name: str) -> Optional[Type[Harvester]]:
 class HarvesterManager:
     def __init__(self):
         self.harvesters: dict[str, Harvester] = {}
+        # Definitions of harvesters hosted by worker processes, by worker name.
+        self.worker_defs: dict[str, list[dict[str, Any]]] = {}
+        self.workers: dict[str, HarvesterWorker] = {}
+        self._supervisor: asyncio.Task | None = None
 
     def load_harvesters(self, configs: list[dict[str, Any]]) -> None:
         """Instantiate Python harvesters from a list of config dicts.
 
         Each dict must have a ``type`` key (fully-qualified class name) and
-        optionally ``name`` and ``config`` (dict of string params).
-        Native C++ harvester types are silently skipped.
+        optionally ``name``, ``config`` (dict of string params) and ``worker``.
+        Harvesters with a ``worker`` are not instantiated here; they run in that
+        worker's process once started.  Types the C++ core runs natively
+        (``_core.native_harvester_types()``) are silently skipped, so C++
+        doesn't double-start them; e.g. ``ZMQHarvester`` only runs here when the
+        core was built without ZeroMQ.
         """
+        native_types = set(_core.native_harvester_types())
         for config in configs:
             type_ = config.get("type")
             if not type_:
                 logger.warning("Harvester definition is missing 'type', skipping")
                 continue
 
-            if type_ in _NATIVE_TYPES:
+            if type_ in native_types:
                 continue  # handled by C++ core
 
+            if worker := config.get("worker"):
+                worker_def = {k: v for k, v in config.items() if k != "worker"}
+                self.worker_defs.setdefault(worker, []).append(worker_def)
+                continue
+
             name = config.get("name", type_)
             config_data: dict = config.get("config", {})
 
@@ -70,10 +83,35 @@ class HarvesterManager:
             logger.info(f"Starting harvester: {name}")
             await harvester.start()
 
+        for name, defs in self.worker_defs.items():
+            logger.info(f"Starting harvester worker: {name} ({len(defs)} harvesters)")
+            worker = self.workers[name] = HarvesterWorker(name, defs)
+            worker.start()
+        if self.workers:
+            self._supervisor = asyncio.create_task(self._supervise())
+
     async def stop_all(self) -> None:
+        if self._supervisor:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+        for name, worker in self.workers.items():
+            logger.info(f"Stopping harvester worker: {name}")
+            await asyncio.to_thread(worker.stop)
+
         for name, harvester in self.harvesters.items():
             logger.info(f"Stopping harvester: {name}")
             await harvester.stop()
 
+    async def _supervise(self) -> None:
+        while True:
+            for worker in self.workers.values():
+                worker.check()
+            await asyncio.sleep(SUPERVISE_INTERVAL)
+
     def __len__(self) -> int:
-        return len(self.harvesters)
+        return len(self.harvesters) + sum(len(defs) for defs in self.worker_defs.values())
@@ -0,0 +1,150 @@
+"""Run Python harvesters in supervised worker processes.
+
+Harvesters that set ``worker`` in their definition are grouped by that name and
+run in one process per group, each with its own event loop and GIL.  Entries are
+serialized in the worker and written to a shared-memory ring that the C++ core
+creates at startup and drains into the backlog.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from loguru import logger
+
+from loglite import _core
+
+# Spawn, not fork: the server process runs C++ threads that must not be forked.
+_mp = multiprocessing.get_context("spawn")
+
+# The server creates the rings after opening the database, which may finish
+# after a worker has already started.
+RING_OPEN_TIMEOUT = 10.0
+
+
+def _open_ring(ring_name: str, timeout: float) -> _core.HarvesterRing:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return _core.HarvesterRing(ring_name)
+        except RuntimeError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def _serve(
+    name: str, ring: _core.HarvesterRing, defs: list[dict[str, Any]], parent_pid: int
+) -> None:
+    from loglite.harvesters.manager import HarvesterManager
+
+    mgr = HarvesterManager()
+    mgr.load_harvesters(defs)
+    if len(mgr) == 0:
+        raise RuntimeError(f"Harvester worker {name}: no harvesters could be loaded")
+    for harvester in mgr.harvesters.values():
+        harvester.ring = ring
+
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+
+    await mgr.start_all()
+    try:
+        # Also exit if the server went away without stopping us.
+        while not stop.is_set() and os.getppid() == parent_pid:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await mgr.stop_all()
+        if ring.dropped:
+            logger.warning(f"Harvester worker {name}: {ring.dropped} entries dropped (ring full)")
+
+
+def run_worker(name: str, ring_name: str, defs: list[dict[str, Any]], parent_pid: int) -> None:
+    """Entry point of a worker process."""
+    # Ctrl-C reaches the whole process group; the server stops us with SIGTERM instead.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ring = _open_ring(ring_name, RING_OPEN_TIMEOUT)
+    asyncio.run(_serve(name, ring, defs, parent_pid))
+
+
+class HarvesterWorker:
+    """A worker process hosting a group of harvesters, restarted when it exits.
+
+    Restarts back off exponentially from ``min_backoff`` to ``max_backoff``
+    seconds; a worker that stayed up for ``max_backoff`` seconds starts over
+    from ``min_backoff``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        defs: list[dict[str, Any]],
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.name = name
+        self.defs = defs
+        self.ring_name = _core.harvester_ring_name(name)
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.restarts = 0
+        self._process: BaseProcess | None = None
+        self._started_at = 0.0
+        self._backoff = min_backoff
+        self._restart_at: float | None = None
+        self._stopping = False
+
+    def start(self) -> None:
+        self._stopping = False
+        self._restart_at = None
+        self._process = _mp.Process(
+            target=run_worker,
+            args=(self.name, self.ring_name, self.defs, os.getpid()),
+            name=f"loglite-harvester-{self.name}",
+            daemon=True,
+        )
+        self._process.start()
+        self._started_at = time.monotonic()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def check(self, now: float | None = None) -> None:
+        """Schedule or perform a restart if the process has exited."""
+        if self._stopping or self._process is None or self._process.is_alive():
+            return
+
+        now = time.monotonic() if now is None else now
+        if self._restart_at is None:
+            if now - self._started_at >= self.max_backoff:
+                self._backoff = self.min_backoff
+            logger.warning(
+                f"Harvester worker {self.name} exited with code {self._process.exitcode}, "
+                f"restarting in {self._backoff:.1f}s"
+            )
+            self._restart_at = now + self._backoff
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            return
+
+        if now >= self._restart_at:
+            self.restarts += 1
+            self.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping = True
+        process, self._process = self._process, None
+        if process is None or not process.is_alive():
+            return
+        process.terminate()
+        process.join(timeout)
+        if process.is_alive():
+            logger.warning(f"Harvester worker {self.name} did not exit, killing it")
+            process.kill()
+            process.join()
@@ -0,0 +1,352 @@
+"""Client-side log shipping to a loglite server.
+
+``LogShipper`` owns a bounded queue and a background worker thread. Log calls only
+enqueue a dict and return; the worker batches queued records into the JSON array form
+accepted by ``POST /logs`` and sends them over a single keep-alive connection, with
+retry/backoff on transient failures. Nothing here blocks the caller's thread on the
+network, and when the queue is full new records are dropped and counted instead.
+
+Adapters:
+
+- ``LogliteHandler``: a ``logging.Handler`` for the standard library.
+- ``loguru_sink``: a sink callable for ``loguru.logger.add``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import http.client
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+__all__ = [
+    "LogShipper",
+    "LogliteHandler",
+    "ShipperStats",
+    "loguru_sink",
+]
+
+# Internal diagnostics go through stdlib logging under this name. LogliteHandler
+# ignores records from it so a failing shipper can't feed on its own warnings.
+_logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class _Marker:
+    """Control item put on the queue alongside records (flush / stop requests)."""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+@dataclass
+class ShipperStats:
+    """Counters since the shipper was created (a snapshot; safe to read from any thread)."""
+
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0  # rejected at submit() because the queue was full or shipper closed
+    failed: int = 0  # gave up on after retries, or rejected by the server
+    batches: int = 0
+    retries: int = 0
+
+
+class LogShipper:
+    """Ship log records to ``POST /logs`` from a background thread.
+
+    Records are flushed when ``batch_size`` records are pending or ``flush_interval``
+    seconds after the first pending record arrived, whichever comes first. Payloads of at
+    least ``gzip_min_bytes`` are sent with ``Content-Encoding: gzip`` when ``compress``
+    is enabled.
+
+    Transient failures (connection errors, 429 and 5xx responses) are retried up to
+    ``max_retries`` times with exponential backoff and jitter, honoring ``Retry-After``.
+    Batches rejected with other 4xx responses are counted as failed and not retried.
+
+    ``close()`` is registered with ``atexit`` so pending records are flushed on normal
+    interpreter exit.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 7788,
+        *,
+        path: str = "/logs",
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        compress: bool = False,
+        gzip_min_bytes: int = 4096,
+        timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+    ):
+        if batch_size <= 0:
+            raise ValueError("'batch_size' must be positive")
+        if max_queue_size <= 0:
+            raise ValueError("'max_queue_size' must be positive")
+
+        self.host = host
+        self.port = port
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.gzip_min_bytes = gzip_min_bytes
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._queue: queue.Queue[dict[str, Any] | _Marker] = queue.Queue(max_queue_size)
+        self._stats = ShipperStats()
+        self._stats_lock = threading.Lock()
+        self._conn: http.client.HTTPConnection | None = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="loglite-shipper", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── Producer API ──────────────────────────────────────────────────────────
+
+    def submit(self, record: dict[str, Any]) -> bool:
+        """Enqueue one record without blocking. Returns False if it was dropped."""
+        if self._closed:
+            self._count(dropped=1)
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._count(dropped=1)
+            return False
+        self._count(enqueued=1)
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything submitted so far has been sent (or given up on)."""
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        marker = _Marker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flush pending records and stop the worker. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        marker = _Marker(stop=True)
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            _logger.warning("loglite shipper queue is full, pending records are discarded")
+            return
+        self._thread.join(timeout)
+
+    @property
+    def stats(self) -> ShipperStats:
+        with self._stats_lock:
+            return ShipperStats(**vars(self._stats))
+
+    # ── Worker ────────────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        batch: list[dict[str, Any]] = []
+        deadline: float | None = None
+
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, _Marker):
+                self._send(batch)
+                batch, deadline = [], None
+                item.done.set()
+                if item.stop:
+                    self._disconnect()
+                    return
+                continue
+
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if len(batch) >= self.batch_size or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                self._send(batch)
+                batch, deadline = [], None
+
+    def _send(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+
+        body = json.dumps(batch, default=str, separators=(",", ":")).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.compress and len(body) >= self.gzip_min_bytes:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        for attempt in range(self.max_retries + 1):
+            retry_after: float | None = None
+            try:
+                status, retry_after = self._post(body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                self._disconnect()
+                reason = str(e) or type(e).__name__
+            else:
+                if status < 300:
+                    self._count(sent=len(batch), batches=1)
+                    return
+                if status not in _RETRYABLE_STATUS:
+                    _logger.warning("loglite rejected %d record(s): HTTP %d", len(batch), status)
+                    self._count(failed=len(batch), batches=1)
+                    return
+                reason = f"HTTP {status}"
+
+            if attempt == self.max_retries:
+                _logger.warning(
+                    "Dropping %d record(s) after %d attempt(s): %s", len(batch), attempt + 1, reason
+                )
+                self._count(failed=len(batch), batches=1)
+                return
+
+            self._count(retries=1)
+            delay = min(self.max_backoff, self.backoff * 2**attempt) * random.uniform(0.5, 1.0)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+            time.sleep(delay)
+
+    def _post(self, body: bytes, headers: dict[str, str]) -> tuple[int, float | None]:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self._conn.request("POST", self.path, body=body, headers=headers)
+        resp = self._conn.getresponse()
+        resp.read()
+        if resp.will_close:
+            self._disconnect()
+
+        retry_after = None
+        if value := resp.getheader("Retry-After"):
+            try:
+                retry_after = float(value)
+            except ValueError:
+                pass
+        return resp.status, retry_after
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _count(self, **deltas: int) -> None:
+        with self._stats_lock:
+            for key, delta in deltas.items():
+                setattr(self._stats, key, getattr(self._stats, key) + delta)
+
+
+# ── Adapters ──────────────────────────────────────────────────────────────────
+
+# Attributes every LogRecord has; anything else was passed via `extra=`.
+_STD_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class LogliteHandler(logging.Handler):
+    """``logging.Handler`` that ships records through a ``LogShipper``.
+
+    Attributes passed via ``extra=`` are collected into the ``extra`` field.
+    """
+
+    def __init__(self, shipper: LogShipper, service: str, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.shipper = shipper
+        self.service = service
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.name == _logger.name:
+            return
+        try:
+            self.shipper.submit(self.serialize(record))
+        except Exception:
+            self.handleError(record)
+
+    def serialize(self, record: logging.LogRecord) -> dict[str, Any]:
+        extra = {k: v for k, v in vars(record).items() if k not in _STD_RECORD_ATTRS}
+        if record.exc_info:
+            extra["exception"] = self.formatException(record.exc_info)
+        return {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "message": record.getMessage(),
+            "level": record.levelname,
+            "service": extra.pop("service", self.service),
+            "pid": record.process,
+            "process_name": record.processName,
+            "function": record.funcName,
+            "filename": record.filename,
+            "line": record.lineno,
+            "extra": extra,
+        }
+
+    def flush(self) -> None:
+        self.shipper.flush(timeout=self.shipper.timeout)
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+def _serialize_loguru_record(record: dict[str, Any], service: str) -> dict[str, Any]:
+    extra = dict(record["extra"])
+    if record["exception"] is not None:
+        extra["exception"] = str(record["exception"])
+    return {
+        "timestamp": record["time"].isoformat(),
+        "message": record["message"],
+        "level": record["level"].name,
+        "service": extra.pop("service", service),
+        "pid": record["process"].id,
+        "process_name": record["process"].name,
+        "function": record["function"],
+        "filename": record["file"].name,
+        "line": record["line"],
+        "extra": extra,
+    }
+
+
+def loguru_sink(
+    shipper: LogShipper,
+    service: str,
+    serializer: Callable[[dict[str, Any], str], dict[str, Any]] = _serialize_loguru_record,
+) -> Callable[[Any], None]:
+    """Build a sink for ``logger.add(...)`` that ships records through ``shipper``.
+
+    Pass ``enqueue=False`` (the default) to ``logger.add``; the shipper already does
+    its own queueing.
+    """
+
+    def sink(message: Any) -> None:
+        shipper.submit(serializer(message.record, service))
+
+    return sink
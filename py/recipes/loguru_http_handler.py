@@ -1,63 +1,44 @@
 import sys
-from typing import Callable
+from typing import Any, Callable
 
-import orjson
-import requests as rq
 from loguru import logger
 
+from loglite.shipper import LogShipper, loguru_sink
+
 STDOUT_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level}</level> | <cyan>{module}:{function}</cyan> | {message} <dim>{extra}</dim>"
 TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
 
 
-def _default_loglite_serializer(record: dict) -> bytes:
-    if not (service_name := record.get("service_name")):
-        service_name = record["extra"].pop("service", "unknown")
-
-    return orjson.dumps(
-        {
-            "message": record["message"],
-            "timestamp": record["time"].strftime(TIME_FORMAT),
-            "level": record["level"].name,
-            "service": service_name,
-            "pid": record["process"].id,
-            "process_name": record["process"].name,
-            "function": record["function"],
-            "filename": record["file"].name,
-            "line": record["line"],
-            "extra": record["extra"],
-        },
-        default=str,
-    )
-
-
-class LogliteHandler:
-    def __init__(
-        self,
-        host: str,
-        port: int,
-        record_serializer: Callable[[dict], bytes],
-        timeout: float = 1,
-    ):
-        self.url = f"http://{host}:{port}/logs"
-        self.session = rq.Session()
-        self.record_serializer = record_serializer
-        self.timeout = timeout
-
-    def __call__(self, message):
-        record = message.record
-        data = self.record_serializer(record)
-        try:
-            self.session.post(self.url, data=data, timeout=self.timeout)
-        except rq.exceptions.RequestException as e:
-            logger.warning(f"Failed to send log to {self.url} due to: {e}")
+def _default_loglite_serializer(record: dict, service_name: str) -> dict[str, Any]:
+    extra = dict(record["extra"])
+    return {
+        "message": record["message"],
+        "timestamp": record["time"].strftime(TIME_FORMAT),
+        "level": record["level"].name,
+        "service": extra.pop("service", service_name),
+        "pid": record["process"].id,
+        "process_name": record["process"].name,
+        "function": record["function"],
+        "filename": record["file"].name,
+        "line": record["line"],
+        "extra": extra,
+    }
 
 
 def configure_loglite_handler(
     host: str = "localhost",
     port: int = 7788,
-    timeout: float = 1,
-    record_serializer: Callable[[dict], bytes] = _default_loglite_serializer,
-):
+    service_name: str = "unknown",
+    timeout: float = 5,
+    record_serializer: Callable[[dict, str], dict[str, Any]] = _default_loglite_serializer,
+    **shipper_options: Any,
+) -> LogShipper:
+    """Log to stderr and ship every record to loglite from a background thread.
+
+    ``shipper_options`` are passed to ``LogShipper`` (``batch_size``, ``flush_interval``,
+    ``compress``, ``max_queue_size``, ...). Pending records are flushed at exit; call
+    ``shipper.flush()`` to force it earlier.
+    """
     logger.remove()
 
     logger.add(
@@ -66,11 +47,12 @@ def configure_loglite_handler(
         format=STDOUT_FORMAT,
     )
 
-    handler = LogliteHandler(host, port, record_serializer, timeout)
-    logger.add(handler)
+    shipper = LogShipper(host, port, timeout=timeout, **shipper_options)
+    logger.add(loguru_sink(shipper, service_name, record_serializer))
+    return shipper
 
 
 """
-configure_loglite_handler()
+shipper = configure_loglite_handler(service_name="billing", compress=True)
 logger.info("This will be sent to the loglite server!")
 """
@@ -20,6 +20,7 @@ class _HarvesterDef:
     type: str = ""
     name: str = ""
     config: dict = field(default_factory=dict)
+    worker: str = ""
 
 
 @dataclass
@@ -42,7 +43,11 @@ def _make_stub() -> types.ModuleType:
     stub.stop_server = MagicMock()  # type: ignore[attr-defined]
     stub.rollout = MagicMock()  # type: ignore[attr-defined]
     stub.rollback = MagicMock()  # type: ignore[attr-defined]
+    stub.snapshot = MagicMock()  # type: ignore[attr-defined]
     stub.push_to_backlog = MagicMock()  # type: ignore[attr-defined]
+    stub.native_harvester_types = lambda: ["FileHarvester", "loglite.harvesters.FileHarvester"]  # type: ignore[attr-defined]
+    stub.harvester_ring_name = lambda worker: f"/loglite-test-{worker}"  # type: ignore[attr-defined]
+    stub.HarvesterRing = MagicMock()  # type: ignore[attr-defined]
     return stub
 
 
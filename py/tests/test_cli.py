@@ -13,7 +13,7 @@ from loglite import _core, cli
 @pytest.fixture(autouse=True)
 def reset_core_mocks():
     """Reset MagicMock call history before each test."""
-    for attr in ("run_server", "rollout", "rollback"):
+    for attr in ("run_server", "rollout", "rollback", "snapshot"):
         mock = getattr(_core, attr, None)
         if isinstance(mock, MagicMock):
             mock.reset_mock()
@@ -98,3 +98,19 @@ async def test_run_python_harvesters_skips_native_types(monkeypatch: pytest.Monk
 
     await cli._run_python_harvesters("cfg.yml", stop)
     # No Python harvester was instantiated — test passes if no exception is raised.
+
+
+# ── snapshot ──────────────────────────────────────────────────────────────────
+
+
+def test_snapshot_delegates_to_core(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    monkeypatch.setattr(_core, "snapshot", MagicMock(return_value="db/snapshots/logs-x.db"))
+    cli.snapshot("cfg.yml", output="")
+    _core.snapshot.assert_called_once_with("cfg.yml", "")  # pyright: ignore[reportAttributeAccessIssue]
+    assert capsys.readouterr().out.strip() == "db/snapshots/logs-x.db"
+
+
+def test_snapshot_passes_output_path(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_core, "snapshot", MagicMock(return_value="/tmp/backup.db"))
+    cli.snapshot("cfg.yml", output="/tmp/backup.db")
+    _core.snapshot.assert_called_once_with("cfg.yml", "/tmp/backup.db")  # pyright: ignore[reportAttributeAccessIssue]
@@ -0,0 +1,194 @@
+"""LogliteClient tests against an in-process server emitting the columnar msgpack format."""
+
+from __future__ import annotations
+
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator
+from urllib.parse import parse_qs, urlparse
+
+import msgpack
+import numpy as np
+import pytest
+
+from loglite.client import ColumnBatch, LogliteClient, QueryError
+
+# Newest first, like GET /logs.
+_ROWS = [
+    {"id": 3, "message": "gamma", "latency": 0.5, "service": None},
+    {"id": 2, "message": "béta", "latency": None, "service": None},
+    {"id": 1, "message": "alpha", "latency": 2.0, "service": None},
+]
+
+
+def _encode_columns(rows: list[dict[str, Any]], total: int, offset: int, limit: int) -> bytes:
+    """Mirror of ColumnarQueryResult::ToMsgPack for a fixed schema."""
+
+    def validity(values: list[Any]) -> bytes | None:
+        if all(v is not None for v in values):
+            return None
+        return bytes(0 if v is None else 1 for v in values)
+
+    ids = [r["id"] for r in rows]
+    latency = [r["latency"] for r in rows]
+    messages = [r["message"].encode() for r in rows]
+    offsets = [0]
+    for m in messages:
+        offsets.append(offsets[-1] + len(m))
+
+    columns = [
+        {"name": "id", "type": "int64", "data": struct.pack(f"<{len(ids)}q", *ids),
+         "validity": None},
+        {"name": "message", "type": "utf8", "data": b"".join(messages), "validity": None,
+         "offsets": struct.pack(f"<{len(offsets)}i", *offsets)},
+        {"name": "latency", "type": "float64",
+         "data": struct.pack(f"<{len(latency)}d", *[v or 0.0 for v in latency]),
+         "validity": validity(latency)},
+        {"name": "service", "type": "null", "data": b"", "validity": bytes(len(rows))},
+    ]  # fmt: skip
+    return msgpack.packb(
+        {"total": total, "offset": offset, "limit": limit, "rows": len(rows), "columns": columns}
+    )
+
+
+class _Server:
+    def __init__(self):
+        self.requests: list[dict[str, list[str]]] = []
+        self.accept: list[str | None] = []
+        self.rows = list(_ROWS)
+        self.on_page: Callable[[], None] | None = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                server.requests.append(params)
+                server.accept.append(self.headers.get("Accept"))
+
+                if "bad" in params:
+                    body, status, ctype = (
+                        b'{"error": "Unknown field name: \'bad\'"}',
+                        500,
+                        "application/json",
+                    )
+                else:
+                    limit, offset = int(params["limit"][0]), int(params["offset"][0])
+                    rows, total = server.rows, len(server.rows)
+                    if "before_id" in params:
+                        before_id = int(params["before_id"][0])
+                        rows, total = [r for r in rows if r["id"] < before_id], -1
+                    page = rows[offset : offset + limit]
+                    body = _encode_columns(page, total, offset, limit)
+                    status, ctype = 200, "application/msgpack"
+                    if server.on_page:
+                        server.on_page()
+
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server() -> Iterator[_Server]:
+    srv = _Server()
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def batch() -> ColumnBatch:
+    return ColumnBatch.from_msgpack(_encode_columns(_ROWS, 3, 0, 10))
+
+
+def test_numeric_columns_are_numpy_views(batch: ColumnBatch):
+    assert batch.rows == len(batch) == 3
+    ids = batch["id"].to_numpy()
+    assert ids.dtype == np.int64
+    assert ids.tolist() == [3, 2, 1]
+
+    latency = batch["latency"].to_numpy()
+    assert isinstance(latency, np.ma.MaskedArray)
+    assert latency.mask.tolist() == [False, True, False]
+    assert latency.compressed().tolist() == [0.5, 2.0]
+
+
+def test_text_and_null_columns(batch: ColumnBatch):
+    assert batch["message"].to_pylist() == ["gamma", "béta", "alpha"]
+    assert batch["service"].to_pylist() == [None, None, None]
+    with pytest.raises(TypeError):
+        batch["message"].values
+
+
+def test_to_arrow(batch: ColumnBatch):
+    pa = pytest.importorskip("pyarrow")
+    rb = batch.to_arrow()
+    assert rb.schema.names == ["id", "message", "latency", "service"]
+    assert rb.column("message").type == pa.string()
+    assert rb.to_pylist() == _ROWS
+
+
+def test_query_sends_filters_and_accept_header(server: _Server):
+    with LogliteClient("127.0.0.1", server.port) as client:
+        page = client.query(["id", "message"], limit=2, filters={"level": "=ERROR"})
+
+    assert page.total == 3
+    assert page["id"].to_numpy().tolist() == [3, 2]
+    assert server.accept == ["application/msgpack"]
+    assert server.requests[0]["fields"] == ["id,message"]
+    assert server.requests[0]["level"] == ["=ERROR"]
+
+
+def test_iter_batches_pages_until_exhausted(server: _Server):
+    with LogliteClient("127.0.0.1", server.port) as client:
+        batches = list(client.iter_batches(batch_size=2))
+
+    assert [b.rows for b in batches] == [2, 1]
+    assert [r["before_id"] for r in server.requests] == [[str(2**63 - 1)], ["2"]]
+    assert [r["offset"] for r in server.requests] == [["0"], ["0"]]
+    ids = np.concatenate([b["id"].values for b in batches])
+    assert ids.tolist() == [3, 2, 1]
+
+
+def test_iter_batches_is_stable_under_inserts(server: _Server):
+    # A newer row arrives after every page; offsets would repeat rows.
+    def insert():
+        server.rows.insert(0, {**_ROWS[-1], "id": server.rows[0]["id"] + 1})
+
+    server.on_page = insert
+    with LogliteClient("127.0.0.1", server.port) as client:
+        batches = list(client.iter_batches(["message"], batch_size=2))
+
+    assert server.requests[0]["fields"] == ["message,id"]
+    assert all("id" not in b.columns for b in batches)
+    messages = [m for b in batches for m in b["message"].to_pylist()]
+    assert messages == ["gamma", "béta", "alpha"]
+
+
+def test_iter_batches_respects_max_rows(server: _Server):
+    with LogliteClient("127.0.0.1", server.port) as client:
+        batches = list(client.iter_batches(batch_size=2, max_rows=1))
+    assert [b.rows for b in batches] == [1]
+
+
+def test_query_error_carries_server_message(server: _Server):
+    with LogliteClient("127.0.0.1", server.port) as client:
+        with pytest.raises(QueryError) as exc:
+            client.query(filters={"bad": "=1"})
+    assert exc.value.status == 500
+    assert "Unknown field name" in exc.value.message
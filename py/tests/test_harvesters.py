@@ -8,6 +8,7 @@ import pytest
 from loglite.harvesters.base import BaseHarvesterConfig, Harvester
 from loglite.harvesters.manager import HarvesterManager, import_class
 from loglite.harvesters.socket import SocketHarvester, SocketHarvesterConfig
+from loglite.harvesters.worker import HarvesterWorker
 from loglite.harvesters.zmq import ZMQHarvester, ZMQHarvesterConfig
 
 
@@ -88,6 +89,154 @@ async def test_harvester_lifecycle(manager: HarvesterManager):
     assert harvester._task is None
 
 
+class FakeProcess:
+    started: list["FakeProcess"] = []
+
+    def __init__(self, target, args, name, daemon):
+        self.args = args
+        self.alive = False
+        self.exitcode: int | None = None
+        self.terminated = False
+
+    def start(self):
+        self.alive = True
+        FakeProcess.started.append(self)
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def terminate(self):
+        self.terminated = True
+        self.alive = False
+
+    def join(self, timeout: float | None = None):
+        pass
+
+
+@pytest.fixture
+def fake_processes(monkeypatch: pytest.MonkeyPatch) -> list[FakeProcess]:
+    class Context:
+        Process = FakeProcess
+
+    FakeProcess.started = []
+    monkeypatch.setattr("loglite.harvesters.worker._mp", Context())
+    return FakeProcess.started
+
+
+def test_harvester_manager_groups_worker_harvesters(manager: HarvesterManager):
+    manager.load_harvesters(
+        [
+            {"type": "tests.test_harvesters.MockHarvester", "name": "a", "worker": "cpu"},
+            {"type": "tests.test_harvesters.MockHarvester", "name": "b", "worker": "cpu"},
+            {"type": "tests.test_harvesters.MockHarvester", "name": "c", "worker": ""},
+            {"type": "loglite.harvesters.FileHarvester", "name": "f", "worker": "cpu"},
+        ]
+    )
+
+    assert list(manager.harvesters) == ["c"]
+    assert [d["name"] for d in manager.worker_defs["cpu"]] == ["a", "b"]
+    assert all("worker" not in d for d in manager.worker_defs["cpu"])
+    assert len(manager) == 3
+
+
+@pytest.mark.parametrize("native_zmq", [True, False])
+def test_harvester_manager_skips_types_run_by_core(
+    manager: HarvesterManager, monkeypatch: pytest.MonkeyPatch, native_zmq: bool
+):
+    from loglite import _core
+
+    native = ["FileHarvester", "loglite.harvesters.FileHarvester"]
+    if native_zmq:
+        native += ["ZMQHarvester", "loglite.harvesters.ZMQHarvester"]
+    monkeypatch.setattr(_core, "native_harvester_types", lambda: native)
+
+    manager.load_harvesters(
+        [
+            {
+                "type": "loglite.harvesters.zmq.ZMQHarvester",
+                "name": "fallback",
+                "config": {"endpoint": "inproc://logs"},
+            },
+            {
+                "type": "loglite.harvesters.ZMQHarvester",
+                "name": "zmq",
+                "config": {"endpoint": "inproc://logs"},
+            },
+        ]
+    )
+
+    # The fully-qualified module path always selects the Python harvester.
+    expected = ["fallback"] if native_zmq else ["fallback", "zmq"]
+    assert sorted(manager.harvesters) == expected
+
+
+@pytest.mark.asyncio
+async def test_harvester_manager_starts_and_stops_workers(
+    manager: HarvesterManager, fake_processes: list[FakeProcess]
+):
+    manager.load_harvesters(
+        [{"type": "tests.test_harvesters.MockHarvester", "name": "a", "worker": "cpu"}]
+    )
+
+    await manager.start_all()
+    worker = manager.workers["cpu"]
+    assert worker.is_alive()
+    name, ring_name, defs, _ = fake_processes[0].args
+    assert (name, ring_name) == ("cpu", "/loglite-test-cpu")
+    assert defs == [{"type": "tests.test_harvesters.MockHarvester", "name": "a"}]
+
+    await manager.stop_all()
+    assert fake_processes[0].terminated
+    assert not worker.is_alive()
+
+
+def test_harvester_worker_restarts_with_backoff(fake_processes: list[FakeProcess]):
+    worker = HarvesterWorker("cpu", [], min_backoff=1.0, max_backoff=4.0)
+    worker.start()
+    t0 = worker._started_at
+
+    def crash():
+        fake_processes[-1].alive = False
+        fake_processes[-1].exitcode = 1
+
+    crash()
+    worker.check(now=t0)  # schedules a restart in 1s
+    worker.check(now=t0 + 0.5)
+    assert len(fake_processes) == 1
+    worker.check(now=t0 + 1.0)
+    assert len(fake_processes) == 2 and worker.restarts == 1
+
+    crash()
+    worker.check(now=t0 + 1.0)  # backoff doubled
+    worker.check(now=t0 + 2.5)
+    assert len(fake_processes) == 2
+    worker.check(now=t0 + 3.0)
+    assert len(fake_processes) == 3
+
+    worker.stop()
+    crash()
+    worker.check(now=t0 + 100.0)
+    assert len(fake_processes) == 3
+
+
+def test_harvester_ingest_goes_to_ring_when_set(captured_logs: list[dict]):
+    class Ring:
+        def __init__(self):
+            self.records: list[dict] = []
+
+        def push(self, log: dict) -> bool:
+            self.records.append(log)
+            return True
+
+    harvester = MockHarvester("mock", BaseHarvesterConfig())
+    harvester.ingest({"message": "in process"})
+    harvester.ring = ring = Ring()  # pyright: ignore[reportAttributeAccessIssue]
+    harvester.ingest({"message": "from worker"})
+
+    assert [log["message"] for log in captured_logs] == ["in process"]
+    assert [log["message"] for log in ring.records] == ["from worker"]
+
+
 @pytest.mark.asyncio
 async def test_socket_harvester(captured_logs: list[dict]):
     port = 9999
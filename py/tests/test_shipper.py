@@ -0,0 +1,196 @@
+"""LogShipper tests against a throwaway in-process HTTP server."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+from loguru import logger
+
+from loglite.shipper import LogliteHandler, LogShipper, loguru_sink
+
+
+class _Server:
+    def __init__(self):
+        self.batches: list[list[dict[str, Any]]] = []
+        self.encodings: list[str | None] = []
+        self.statuses: list[int] = []  # responses to hand out before falling back to 200
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                encoding = self.headers.get("Content-Encoding")
+                if encoding == "gzip":
+                    body = gzip.decompress(body)
+                status = server.statuses.pop(0) if server.statuses else 200
+                if status == 200:
+                    server.encodings.append(encoding)
+                    server.batches.append(json.loads(body))
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def records(self) -> list[dict[str, Any]]:
+        return [r for batch in self.batches for r in batch]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server() -> Iterator[_Server]:
+    srv = _Server()
+    yield srv
+    srv.close()
+
+
+def _shipper(server: _Server, **kwargs: Any) -> LogShipper:
+    kwargs.setdefault("flush_interval", 60)
+    return LogShipper("127.0.0.1", server.port, backoff=0.01, **kwargs)
+
+
+def test_shipper_batches_by_size(server: _Server):
+    shipper = _shipper(server, batch_size=3)
+    for i in range(7):
+        assert shipper.submit({"message": f"m{i}"})
+    shipper.close()
+
+    assert [len(b) for b in server.batches] == [3, 3, 1]
+    assert [r["message"] for r in server.records] == [f"m{i}" for i in range(7)]
+    stats = shipper.stats
+    assert (stats.enqueued, stats.sent, stats.batches, stats.dropped) == (7, 7, 3, 0)
+
+
+def test_shipper_flushes_on_interval(server: _Server):
+    shipper = _shipper(server, flush_interval=0.05)
+    shipper.submit({"message": "late"})
+
+    for _ in range(100):
+        if server.batches:
+            break
+        threading.Event().wait(0.02)
+    assert server.records == [{"message": "late"}]
+    shipper.close()
+
+
+def test_shipper_gzips_large_payloads(server: _Server):
+    shipper = _shipper(server, compress=True, gzip_min_bytes=64)
+    shipper.submit({"message": "tiny"})
+    assert shipper.flush(timeout=5)
+    shipper.submit({"message": "x" * 200})
+    shipper.close()
+
+    assert server.encodings == [None, "gzip"]
+    assert server.records[1]["message"] == "x" * 200
+
+
+def test_shipper_retries_transient_failures(server: _Server):
+    server.statuses = [503, 429]
+    shipper = _shipper(server, max_retries=2)
+    shipper.submit({"message": "eventually"})
+    shipper.close()
+
+    assert server.records == [{"message": "eventually"}]
+    assert shipper.stats.retries == 2
+    assert shipper.stats.sent == 1
+
+
+def test_shipper_gives_up_on_client_errors(server: _Server):
+    server.statuses = [400]
+    shipper = _shipper(server)
+    shipper.submit({"message": "bad"})
+    shipper.close()
+
+    assert server.records == []
+    assert shipper.stats.failed == 1
+    assert shipper.stats.retries == 0
+
+
+def test_shipper_counts_failures_when_server_is_down():
+    shipper = LogShipper("127.0.0.1", 9, max_retries=1, backoff=0.01, timeout=0.5)
+    shipper.submit({"message": "lost"})
+    shipper.close()
+
+    assert shipper.stats.failed == 1
+    assert shipper.stats.retries == 1
+
+
+def test_shipper_drops_when_queue_is_full(server: _Server, monkeypatch: pytest.MonkeyPatch):
+    release = threading.Event()
+    original_send = LogShipper._send
+
+    def blocked_send(self: LogShipper, batch: list[dict[str, Any]]):
+        release.wait(5)
+        original_send(self, batch)
+
+    monkeypatch.setattr(LogShipper, "_send", blocked_send)
+    shipper = _shipper(server, max_queue_size=2, batch_size=1)
+
+    # The worker takes the first record and blocks sending it; two more fill the queue.
+    results = [shipper.submit({"message": f"m{i}"}) for i in range(5)]
+    release.set()
+    shipper.close()
+
+    assert results.count(False) == shipper.stats.dropped >= 1
+    assert len(server.records) == results.count(True)
+    assert not shipper.submit({"message": "after close"})
+
+
+def test_logging_handler_serializes_records(server: _Server):
+    shipper = _shipper(server)
+    handler = LogliteHandler(shipper, service="billing")
+    std_logger = logging.getLogger("tests.shipper")
+    std_logger.addHandler(handler)
+    std_logger.setLevel(logging.INFO)
+    try:
+        std_logger.warning("charge %s failed", "ch_1", extra={"request_id": "r-1"})
+        std_logger.info("other service", extra={"service": "ledger"})
+        handler.flush()
+    finally:
+        std_logger.removeHandler(handler)
+        shipper.close()
+
+    first, second = server.records
+    assert first["message"] == "charge ch_1 failed"
+    assert first["level"] == "WARNING"
+    assert first["service"] == "billing"
+    assert first["extra"] == {"request_id": "r-1"}
+    assert first["function"] == "test_logging_handler_serializes_records"
+    assert first["timestamp"].endswith("+00:00")
+    assert second["service"] == "ledger"
+
+
+def test_loguru_sink(server: _Server):
+    shipper = _shipper(server)
+    sink_id = logger.add(loguru_sink(shipper, service="worker"), level="INFO")
+    try:
+        logger.bind(job="nightly").error("job failed")
+    finally:
+        logger.remove(sink_id)
+        shipper.close()
+
+    (record,) = server.records
+    assert record["message"] == "job failed"
+    assert record["level"] == "ERROR"
+    assert record["service"] == "worker"
+    assert record["extra"] == {"job": "nightly"}